@@ -1,6 +1,7 @@
 from flask import Flask, send_from_directory, jsonify
 from flask_cors import CORS
 import os
+import multiprocessing
 import threading
 import time
 import requests
@@ -13,6 +14,10 @@ _scheduler_enabled = True  # Control flag to pause/resume scheduler
 def create_app():
     app = Flask(__name__)
     
+    # Spawned pool processes (FTR batch rendering) re-import the entry script, which
+    # calls create_app() again - they get the app but no DDL, backfills or threads
+    startup = multiprocessing.parent_process() is None
+    
     # Load configuration
     app.config.from_object('config.Config')
     
@@ -48,8 +53,19 @@ def create_app():
     from app.models.qms_models import QMSDocument, QMSPartnerAudit, QMSActionPlan, QMSAuditLog, QMSDocumentVersion
     
     # Create tables
-    with app.app_context():
-        db.create_all()
+    if startup:
+        with app.app_context():
+            db.create_all()
+            from app.services.job_queue import ensure_job_queue_columns
+            ensure_job_queue_columns()
+            from app.services.stock_ledger import ensure_stock_ledger
+            ensure_stock_ledger()
+            from app.services.serial_ranges import ensure_serial_range_columns
+            ensure_serial_range_columns()
+            from app.services.serial_registry import ensure_serial_registry
+            ensure_serial_registry()
+            from app.services.serial_search import ensure_serial_search_tables
+            ensure_serial_search_tables()
     
     # Ensure QMS upload directory exists
     qms_upload_dir = os.path.join(app.config['UPLOAD_FOLDER'], 'qms_documents')
@@ -76,6 +92,8 @@ def create_app():
     from app.routes.calibration_routes import calibration_bp
     from app.routes.qms_routes import qms_bp
     from app.routes.pdi_doc_routes import pdi_doc_bp as pdi_doc_v5_bp
+    from app.routes.job_routes import jobs_bp
+    from app.routes.artifact_routes import artifacts_bp
     
     _pdi_doc_full_available = False
     pdi_doc_full_bp = None
@@ -107,6 +125,8 @@ def create_app():
     app.register_blueprint(witness_report_bp, url_prefix='/api')
     app.register_blueprint(calibration_bp)
     app.register_blueprint(qms_bp)
+    app.register_blueprint(jobs_bp)
+    app.register_blueprint(artifacts_bp)
     if _pdi_doc_full_available:
         # Full PDI docs - routes already have /pdi-docs/ prefix, register at /api
         app.register_blueprint(pdi_doc_full_bp, url_prefix='/api')
@@ -200,8 +220,19 @@ def create_app():
         scheduler_thread = threading.Thread(target=validation_loop, daemon=True)
         scheduler_thread.start()
     
+    if not startup:
+        return app
+    
     # Start scheduler when app starts (only in production mode)
     if os.environ.get('FLASK_ENV') != 'development' or os.environ.get('START_SCHEDULER') == 'true':
         run_packing_validation()
     
+    # Background job workers for heavy report generation (JOB_WORKERS=0 disables them in this process)
+    from app.services.job_queue import start_workers
+    start_workers(app, app.config.get('JOB_WORKERS', 2))
+    
+    # Keep the local COC catalog mirror fresh in the background
+    from app.services.coc_catalog import start_coc_catalog
+    start_coc_catalog(app)
+    
     return app
@@ -1,7 +1,8 @@
 # Models initialization
 from app.models.database import db, Company, ProductionRecord, BomMaterial, RejectedModule
 from app.models.whatsapp_alert_log import WhatsAppAlertLog
+from app.models.job_record import JobRecord
 from app.models.pdi_models import (
     MasterOrder, PDIBatch, ModuleSerialNumber, 
-    COCDocument, PDICOCUsage, PDIRawMaterial, MasterFTRTemplate
+    COCDocument, PDICOCUsage, PDIRawMaterial, MasterFTRTemplate, PDISerialRange
 )
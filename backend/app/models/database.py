@@ -55,6 +55,41 @@ class Company(db.Model):
             'productionRecords': [pr.to_dict() for pr in self.production_records],
             'rejectedModules': [rm.to_dict() for rm in self.rejected_modules]
         }
+    
+    def to_summary_dict(self, stats=None, iqc_data=False):
+        """Company fields without child collections, plus counts from company_stats()"""
+        cell_eff_received = {}
+        if self.cell_efficiency_received:
+            try:
+                cell_eff_received = json.loads(self.cell_efficiency_received)
+            except:
+                cell_eff_received = {}
+        
+        stats = stats or {}
+        summary = {
+            'id': self.id,
+            'companyName': self.company_name,
+            'moduleWattage': self.module_wattage,
+            'moduleType': self.module_type,
+            'cellsPerModule': self.cells_per_module,
+            'currentRunningOrder': self.current_running_order,
+            'cellsReceivedQty': self.cells_received_qty,
+            'cellsReceivedMW': self.cells_received_mw,
+            'cellEfficiencyReceived': cell_eff_received,
+            'createdDate': self.created_date.strftime('%Y-%m-%d') if self.created_date else None,
+            'productionRecordCount': stats.get('production_records', 0),
+            'rejectedModuleCount': stats.get('rejected_modules', 0),
+            'pdiCount': stats.get('pdis', 0),
+            'totalProduction': stats.get('total_production', 0),
+            'lastProductionDate': stats.get('last_production_date')
+        }
+        
+        if iqc_data:
+            try:
+                summary['iqcData'] = json.loads(self.iqc_data) if self.iqc_data else {}
+            except:
+                summary['iqcData'] = {}
+        return summary
 
 
 class ProductionRecord(db.Model):
@@ -0,0 +1,74 @@
+"""
+Job Registry Model - progress of long-running operations (uploads, syncs, report generation)
+Stored in the database so any worker process / host can report and read progress.
+Rows with a payload double as the background job queue (see services/job_queue.py).
+"""
+from datetime import datetime
+import json
+from app.models.database import db
+
+
+class JobRecord(db.Model):
+    __tablename__ = 'job_registry'
+    __table_args__ = (
+        db.Index('idx_job_type_ref', 'job_type', 'ref'),
+        db.Index('idx_job_state', 'state'),
+        {'extend_existing': True}
+    )
+
+    STATES = ('queued', 'running', 'completed', 'failed', 'cancelled')
+    ACTIVE_STATES = ('queued', 'running')
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), unique=True, nullable=False)  # Public UUID used by the progress API
+    job_type = db.Column(db.String(50), nullable=False)  # e.g. 'ftr_upload', 'mrp_dispatch_sync', 'pdi_documentation'
+    ref = db.Column(db.String(200), nullable=True)  # What the job works on: order id, company, PDI number
+    state = db.Column(db.String(20), nullable=False, default='queued')
+    percent = db.Column(db.Integer, default=0)
+    current = db.Column(db.Integer, default=0)
+    total = db.Column(db.Integer, default=0)
+    message = db.Column(db.String(500), nullable=True)
+    counters = db.Column(db.Text, nullable=True)  # JSON: job specific counters (inserted, updated, ...)
+    result_location = db.Column(db.String(500), nullable=True)  # File path / URL of the produced artifact
+    payload = db.Column(db.Text, nullable=True)  # JSON: input of a queued background job
+    attempts = db.Column(db.Integer, default=0)  # Times a queued job has been claimed by a worker
+    error = db.Column(db.Text, nullable=True)
+    worker = db.Column(db.String(100), nullable=True)  # host:pid that is running the job
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime, nullable=True)
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    finished_at = db.Column(db.DateTime, nullable=True)
+
+    def to_dict(self):
+        counters = {}
+        if self.counters:
+            try:
+                counters = json.loads(self.counters)
+            except:
+                counters = {}
+
+        elapsed = None
+        if self.started_at:
+            end = self.finished_at or datetime.utcnow()
+            elapsed = round((end - self.started_at).total_seconds(), 1)
+
+        return {
+            'job_id': self.job_id,
+            'job_type': self.job_type,
+            'ref': self.ref,
+            'state': self.state,
+            'percent': self.percent or 0,
+            'current': self.current or 0,
+            'total': self.total or 0,
+            'status': self.message or '',
+            'counters': counters,
+            'result_location': self.result_location,
+            'attempts': self.attempts or 0,
+            'error': self.error,
+            'worker': self.worker,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+            'elapsed_seconds': elapsed
+        }
@@ -26,7 +26,9 @@ class MasterOrder(db.Model):
     pdi_batches = db.relationship('PDIBatch', backref='order', lazy=True, cascade='all, delete-orphan')
     coc_documents = db.relationship('COCDocument', backref='order', lazy=True, cascade='all, delete-orphan')
     
-    def to_dict(self):
+    def to_summary_dict(self, stats=None):
+        """Order fields without child collections, plus counts from order_stats()"""
+        stats = stats or {}
         return {
             'id': self.id,
             'companyId': self.company_id,
@@ -39,9 +41,21 @@ class MasterOrder(db.Model):
             'orderDate': self.order_date.strftime('%Y-%m-%d') if self.order_date else None,
             'targetCompletionDate': self.target_completion_date.strftime('%Y-%m-%d') if self.target_completion_date else None,
             'status': self.status,
-            'pdiBatches': [batch.to_dict() for batch in self.pdi_batches],
-            'cocDocuments': [coc.to_dict() for coc in self.coc_documents]
+            'pdiBatchCount': stats.get('batches', 0),
+            'completedBatchCount': stats.get('completed_batches', 0),
+            'plannedModules': stats.get('planned_modules', 0),
+            'actualModules': stats.get('actual_modules', 0),
+            'serialCount': stats.get('serials', 0),
+            'cocDocumentCount': stats.get('coc_documents', 0)
         }
+    
+    def to_dict(self, stats=None, batch_counts=None):
+        """Detail view: summary + batch summaries (no serial rows) + COC documents"""
+        batch_counts = batch_counts or {}
+        detail = self.to_summary_dict(stats)
+        detail['pdiBatches'] = [batch.to_summary_dict(batch_counts.get(batch.id)) for batch in self.pdi_batches]
+        detail['cocDocuments'] = [coc.to_dict() for coc in self.coc_documents]
+        return detail
 
 
 class PDIBatch(db.Model):
@@ -70,11 +84,14 @@ class PDIBatch(db.Model):
     
     # Relationships
     serial_numbers = db.relationship('ModuleSerialNumber', backref='pdi_batch', lazy=True, cascade='all, delete-orphan')
+    serial_ranges = db.relationship('PDISerialRange', backref='pdi_batch', lazy=True, cascade='all, delete-orphan')
     raw_materials = db.relationship('PDIRawMaterial', backref='pdi_batch', lazy=True, cascade='all, delete-orphan')
     coc_usage = db.relationship('PDICOCUsage', backref='pdi_batch', lazy=True, cascade='all, delete-orphan')
     # production_records relationship removed - can be queried separately
     
-    def to_dict(self):
+    def to_summary_dict(self, counts=None):
+        """Batch fields without child collections, plus serial counts from batch_serial_counts()"""
+        counts = counts or {}
         return {
             'id': self.id,
             'orderId': self.order_id,
@@ -93,18 +110,63 @@ class PDIBatch(db.Model):
             'ftrReportPath': self.ftr_report_path,
             'cocReportPath': self.coc_report_path,
             'traceabilityReportPath': self.traceability_report_path,
-            'serialNumbers': [sn.to_dict() for sn in self.serial_numbers],
-            'rawMaterials': [rm.to_dict() for rm in self.raw_materials],
-            'cocUsage': [cu.to_dict() for cu in self.coc_usage]
+            'serialCount': counts.get('total', 0),
+            'serialStatusCounts': counts.get('by_status', {}),
+            'rejectedSerialCount': counts.get('rejected', 0),
+            'dispatchedSerialCount': counts.get('dispatched', 0)
+        }
+    
+    def to_dict(self, counts=None, serials=None):
+        """
+        Detail view: summary + raw materials + COC usage. Serials are paged through
+        /api/pdi-batches/<id>/serials; pass the expanded serial dicts to embed them (old payload).
+        """
+        detail = self.to_summary_dict(counts)
+        detail['rawMaterials'] = [rm.to_dict() for rm in self.raw_materials]
+        detail['cocUsage'] = [cu.to_dict() for cu in self.coc_usage]
+        if serials is not None:
+            detail['serialNumbers'] = serials
+        return detail
+
+
+class PDISerialRange(db.Model):
+    """A contiguous block of generated serials: f'{prefix}-{n:06d}' for start_no <= n <= end_no"""
+    __tablename__ = 'pdi_serial_ranges'
+    __table_args__ = (
+        db.Index('idx_range_prefix_start', 'prefix', 'start_no'),
+        {'extend_existing': True}
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    pdi_batch_id = db.Column(db.Integer, db.ForeignKey('pdi_batches.id'), nullable=False, index=True)
+    prefix = db.Column(db.String(50), nullable=False)
+    start_no = db.Column(db.Integer, nullable=False)
+    end_no = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'pdiBatchId': self.pdi_batch_id,
+            'prefix': self.prefix,
+            'start': self.start_no,
+            'end': self.end_no,
+            'count': self.end_no - self.start_no + 1
         }
 
 
 class ModuleSerialNumber(db.Model):
+    """
+    A serial with its own state. Serials generated as a PDISerialRange only get a row
+    once something happens to them (QC result, rejection, dispatch, reassignment);
+    serial_range_id points back at the range the serial was generated in.
+    """
     __tablename__ = 'module_serial_numbers'
     __table_args__ = {'extend_existing': True}
     
     id = db.Column(db.Integer, primary_key=True)
     pdi_batch_id = db.Column(db.Integer, db.ForeignKey('pdi_batches.id'), nullable=False)
+    serial_range_id = db.Column(db.Integer, db.ForeignKey('pdi_serial_ranges.id'), index=True)
     serial_number = db.Column(db.String(100), unique=True, nullable=False)
     production_date = db.Column(db.Date)
     qc_status = db.Column(db.String(50), default='pending')
@@ -1,7 +1,11 @@
 from flask import Blueprint, request, jsonify, send_file
 from app.models.database import db
 from app.models.whatsapp_alert_log import WhatsAppAlertLog
-from sqlalchemy import text
+from app.services.serial_registry import lookup_serial, lookup_serials
+from app.services.serial_reconcile import (
+    reconcile, keyed, index_serials, normalize_serial, LEFT_ONLY, RIGHT_ONLY, MISMATCH, MATCH, ALL_KINDS
+)
+from sqlalchemy import text, bindparam
 import requests
 import os
 import json
@@ -11,7 +15,7 @@ from datetime import datetime, timedelta
 
 try:
     import openpyxl
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from app.services import excel_styles as xs
     EXCEL_AVAILABLE = True
 except ImportError:
     EXCEL_AVAILABLE = False
@@ -202,6 +206,25 @@ def extract_ro_from_ro(running_order):
         return match.group(1).upper()
     return None
 
+def mrp_stage(barcode_item):
+    """'dispatched' / 'packed' / None for one MRP barcode record"""
+    if barcode_item.get('dispatch_party') or barcode_item.get('status') == 'dispatched':
+        return 'dispatched'
+    if barcode_item.get('status') == 'packed':
+        return 'packed'
+    return None
+
+MRP_STAGE_RANK = {None: 0, 'packed': 1, 'dispatched': 2}
+
+def mrp_stage_index(barcode_items):
+    """{barcode: record} keeping, for a barcode listed more than once, its furthest stage"""
+    index = {}
+    for serial, item in keyed(barcode_items, key='barcode'):
+        current = index.get(serial)
+        if current is None or MRP_STAGE_RANK[mrp_stage(item)] >= MRP_STAGE_RANK[mrp_stage(current)]:
+            index[serial] = item
+    return index
+
 # Company Name Mapping (Database name -> MRP API name)
 # EXACT names from production server
 COMPANY_NAME_MAPPING = {
@@ -814,26 +837,24 @@ def check_binning_mismatch(company):
         WHERE company_id = :cid AND binning IS NOT NULL
     """), {'cid': company_id})
     
-    db_binning = {row[0]: row[1] for row in db_result.fetchall()}
+    db_binning = index_serials(keyed(db_result.mappings()))
     
     # Get MRP data
     mrp_result = get_all_mrp_data(company)
     if not mrp_result.get('success'):
         return {'has_answer': False, 'error': 'MRP API failed'}
     
+    # MRP binning comes from the running order; reconcile yields the serials whose binning differs
+    mrp_binning = ((serial, {'binning': extract_binning_from_ro(b.get('running_order', '')), 'item': b})
+                   for serial, b in keyed(mrp_result.get('data', []), key='barcode'))
     mismatches = []
-    for b in mrp_result.get('data', []):
-        barcode = b.get('barcode', '')
-        mrp_binning = extract_binning_from_ro(b.get('running_order', ''))
-        db_bin = db_binning.get(barcode)
-        
-        if db_bin and mrp_binning and db_bin != mrp_binning:
-            mismatches.append({
-                'barcode': barcode,
-                'db_binning': db_bin,
-                'mrp_binning': mrp_binning,
-                'pallet': b.get('pallet_no', '')
-            })
+    for _, _, mrp, db_row, _ in reconcile(mrp_binning, db_binning, fields=('binning',), kinds=(MISMATCH,)):
+        mismatches.append({
+            'barcode': mrp['item'].get('barcode', ''),
+            'db_binning': db_row['binning'],
+            'mrp_binning': mrp['binning'],
+            'pallet': mrp['item'].get('pallet_no', '')
+        })
     
     answer_parts = [f"**🔍 {company} - Binning Mismatch Check**\n"]
     answer_parts.append(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
@@ -910,26 +931,26 @@ def check_missing_in_mrp(company):
     
     company_id = company_row[0]
     
-    # Get assigned serials from database
+    # Get MRP data
+    mrp_result = get_all_mrp_data(company)
+    mrp_barcodes = index_serials(keyed(mrp_result.get('data', []), key='barcode'))
+    
+    # Stream assigned serials from database against the MRP index
     db_result = db.session.execute(text("""
         SELECT serial_number, pdi_number FROM ftr_master_serials 
         WHERE company_id = :cid AND status = 'assigned'
     """), {'cid': company_id})
     
-    db_serials = {row[0]: row[1] for row in db_result.fetchall()}
-    
-    # Get MRP data
-    mrp_result = get_all_mrp_data(company)
-    mrp_barcodes = set(b.get('barcode', '') for b in mrp_result.get('data', []))
-    
+    assigned_count = 0
     missing = []
-    for serial, pdi in db_serials.items():
-        if serial not in mrp_barcodes:
-            missing.append({'barcode': serial, 'pdi': pdi})
+    for kind, _, row, _, _ in reconcile(keyed(db_result.mappings()), mrp_barcodes, kinds=(LEFT_ONLY, MATCH)):
+        assigned_count += 1
+        if kind is LEFT_ONLY:
+            missing.append({'barcode': row['serial_number'], 'pdi': row['pdi_number']})
     
     answer_parts = [f"**🔍 {company} - Missing in MRP Check**\n"]
     answer_parts.append(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
-    answer_parts.append(f"📊 **Assigned in DB:** {len(db_serials):,}")
+    answer_parts.append(f"📊 **Assigned in DB:** {assigned_count:,}")
     answer_parts.append(f"📦 **Found in MRP:** {len(mrp_barcodes):,}")
     answer_parts.append(f"⚠️ **Missing in MRP:** {len(missing):,}")
     
@@ -954,29 +975,30 @@ def check_extra_in_mrp(company):
     
     company_id = company_row[0]
     
-    # Get all serials from database
+    # Get MRP data
+    mrp_result = get_all_mrp_data(company)
+    
+    # Stream all serials from database against the MRP index; what is left over is extra
     db_result = db.session.execute(text("""
         SELECT serial_number FROM ftr_master_serials WHERE company_id = :cid
     """), {'cid': company_id})
     
-    db_serials = set(row[0] for row in db_result.fetchall())
-    
-    # Get MRP data
-    mrp_result = get_all_mrp_data(company)
-    
+    db_count = 0
     extra = []
-    for b in mrp_result.get('data', []):
-        barcode = b.get('barcode', '')
-        if barcode and barcode not in db_serials:
+    for kind, _, _, b, _ in reconcile(keyed(db_result.mappings()), keyed(mrp_result.get('data', []), key='barcode'),
+                                      kinds=ALL_KINDS):
+        if kind is RIGHT_ONLY:
             extra.append({
-                'barcode': barcode,
+                'barcode': b.get('barcode', ''),
                 'pallet': b.get('pallet_no', ''),
                 'running_order': b.get('running_order', '')
             })
+        else:
+            db_count += 1
     
     answer_parts = [f"**🔍 {company} - Extra in MRP Check**\n"]
     answer_parts.append(f"━━━━━━━━━━━━━━━━━━━━━━━━━━━━\n")
-    answer_parts.append(f"📊 **Total in DB:** {len(db_serials):,}")
+    answer_parts.append(f"📊 **Total in DB:** {db_count:,}")
     answer_parts.append(f"⚠️ **Extra in MRP (Not in DB):** {len(extra):,}")
     
     if extra:
@@ -1187,17 +1209,10 @@ def get_barcode_full_status(barcode):
             print(f"Error searching {company_name}: {str(e)}")
             continue
     
-    # Check in local database
+    # Check in local database - one primary-key read of the serial registry
     db_row = None
     try:
-        db_result = db.session.execute(text("""
-            SELECT m.serial_number, m.status, m.pdi_number, m.binning, m.class_status, m.pmax,
-                   c.company_name 
-            FROM ftr_master_serials m
-            JOIN companies c ON m.company_id = c.id
-            WHERE m.serial_number = :barcode
-        """), {'barcode': barcode})
-        db_row = db_result.fetchone()
+        db_row = lookup_serial(barcode)
     except Exception as e:
         print(f"Database error: {str(e)}")
     
@@ -1247,13 +1262,19 @@ def get_barcode_full_status(barcode):
     answer_parts.append(f"\n**💾 FTR Database:**")
     if db_row:
         answer_parts.append(f"   ✅ Found in Database")
-        answer_parts.append(f"   Company: {db_row.company_name}")
-        answer_parts.append(f"   Status: {db_row.status or 'N/A'}")
-        answer_parts.append(f"   PDI: {db_row.pdi_number or 'Not Assigned'}")
-        answer_parts.append(f"   DB Binning: {db_row.binning or 'N/A'}")
-        answer_parts.append(f"   Class: {db_row.class_status or 'OK'}")
-        if db_row.pmax:
-            answer_parts.append(f"   Pmax: {db_row.pmax}W")
+        answer_parts.append(f"   Company: {db_row['company_name'] or 'N/A'}")
+        answer_parts.append(f"   Status: {db_row['lifecycle_state'].upper()}")
+        answer_parts.append(f"   PDI: {db_row['pdi_number'] or 'Not Assigned'}")
+        answer_parts.append(f"   DB Binning: {db_row['binning'] or 'N/A'}")
+        answer_parts.append(f"   Class: {db_row['class_status'] or 'OK'}")
+        if db_row['pmax']:
+            answer_parts.append(f"   Pmax: {db_row['pmax']}W")
+        if db_row['is_rejected']:
+            answer_parts.append(f"   ❌ Rejected: {db_row['rejection_reason'] or 'Yes'}")
+        if db_row['pallet_no']:
+            answer_parts.append(f"   Pallet (cache): {db_row['pallet_no']}")
+        if db_row['dispatch_party']:
+            answer_parts.append(f"   Dispatched (cache): {db_row['dispatch_party']} on {db_row['dispatched_at'] or 'N/A'}")
     else:
         answer_parts.append(f"   ❌ Not in FTR Database")
     
@@ -1908,52 +1929,41 @@ def get_packed_not_in_pdi(company=None):
                 WHERE company_id = :cid
             """), {'cid': company_id})
             
-            db_serials = {}
-            for row in db_result.fetchall():
-                db_serials[row[0]] = {
-                    'pdi': row[1],
-                    'class_status': row[2]
-                }
+            # Packed (not dispatched) MRP modules against the DB serials, in one pass
+            packed = ((serial, b) for serial, b in keyed(mrp_result.get('data', []), key='barcode')
+                      if b.get('status', '') == 'packed' and not b.get('dispatch_party'))
             
-            # Filter MRP packed modules
             packed_not_pdi = []
             pallet_breakdown = {}
             
-            for b in mrp_result.get('data', []):
-                barcode = b.get('barcode', '')
+            for _, _, b, db_row, _ in reconcile(packed, keyed(db_result.mappings()), kinds=(LEFT_ONLY, MATCH)):
+                # Skip if in PDI or rejected
+                if db_row and (db_row['pdi_number'] or db_row['class_status'] == 'REJECTED'):
+                    continue
+                
                 pallet_no = b.get('pallet_no', '')
-                status = b.get('status', '')
-                dispatch_party = b.get('dispatch_party')
                 ro = b.get('running_order', '')
                 
-                # Check if packed (not dispatched)
-                if status == 'packed' and not dispatch_party:
-                    # Check if NOT in PDI and NOT rejected
-                    db_info = db_serials.get(barcode, {})
-                    has_pdi = db_info.get('pdi')
-                    is_rejected = db_info.get('class_status') == 'REJECTED'
-                    
-                    if not has_pdi and not is_rejected:
-                        # Extract binning from running_order
-                        bin_match = re.search(r'i-?(\d+)', ro, re.IGNORECASE)
-                        binning = f"I{bin_match.group(1)}" if bin_match else 'Unknown'
-                        
-                        packed_not_pdi.append({
-                            'barcode': barcode,
-                            'pallet': pallet_no,
-                            'running_order': ro,
-                            'binning': binning
-                        })
-                        
-                        # Pallet breakdown
-                        if pallet_no:
-                            if pallet_no not in pallet_breakdown:
-                                pallet_breakdown[pallet_no] = {
-                                    'count': 0,
-                                    'binnings': set()
-                                }
-                            pallet_breakdown[pallet_no]['count'] += 1
-                            pallet_breakdown[pallet_no]['binnings'].add(binning)
+                # Extract binning from running_order
+                bin_match = re.search(r'i-?(\d+)', ro, re.IGNORECASE)
+                binning = f"I{bin_match.group(1)}" if bin_match else 'Unknown'
+                
+                packed_not_pdi.append({
+                    'barcode': b.get('barcode', ''),
+                    'pallet': pallet_no,
+                    'running_order': ro,
+                    'binning': binning
+                })
+                
+                # Pallet breakdown
+                if pallet_no:
+                    if pallet_no not in pallet_breakdown:
+                        pallet_breakdown[pallet_no] = {
+                            'count': 0,
+                            'binnings': set()
+                        }
+                    pallet_breakdown[pallet_no]['count'] += 1
+                    pallet_breakdown[pallet_no]['binnings'].add(binning)
             
             results[comp] = {
                 'total': len(packed_not_pdi),
@@ -2007,8 +2017,6 @@ def compare_pdi_with_mrp(company, pdi_number):
     Compare PDI serial numbers from database with MRP system
     Returns exact dispatch/remaining counts
     """
-    import re
-    
     try:
         # Step 1: Get company_id
         company_result = db.session.execute(text("""
@@ -2029,15 +2037,13 @@ def compare_pdi_with_mrp(company, pdi_number):
             AND (class_status = 'OK' OR class_status IS NULL)
         """), {'cid': company_id, 'pdi': pdi_number})
         
-        pdi_serials = []
+        pdi_rows = pdi_serials_result.mappings().all()
         binning_breakdown = {}
-        for row in pdi_serials_result.fetchall():
-            serial = row[0]
-            binning = row[1] or 'Unknown'
-            pdi_serials.append(serial)
+        for row in pdi_rows:
+            binning = row['binning'] or 'Unknown'
             binning_breakdown[binning] = binning_breakdown.get(binning, 0) + 1
         
-        total_pdi = len(pdi_serials)
+        total_pdi = len(pdi_rows)
         
         if total_pdi == 0:
             return {
@@ -2057,34 +2063,9 @@ def compare_pdi_with_mrp(company, pdi_number):
             return {'has_answer': False, 'error': 'MRP API failed'}
         
         mrp_data = response.json()
-        mrp_barcodes = mrp_data.get('data', [])
-        
-        # Create lookup set for MRP barcodes
-        mrp_dispatched = set()
-        mrp_packed = set()
-        mrp_barcode_details = {}
+        mrp_barcode_details = mrp_stage_index(mrp_data.get('data', []))
         
-        for b in mrp_barcodes:
-            barcode = b.get('barcode', '')
-            ro = b.get('running_order', '') or ''
-            
-            # Extract binning from running_order
-            bin_match = re.search(r'i-?(\d+)', ro, re.IGNORECASE)
-            mrp_binning = f"I{bin_match.group(1)}" if bin_match else ''
-            
-            mrp_barcode_details[barcode] = {
-                'running_order': ro,
-                'binning': mrp_binning,
-                'pallet': b.get('pallet_no', ''),
-                'date': b.get('date', '')
-            }
-            
-            if b.get('dispatch_party') or b.get('status') == 'dispatched':
-                mrp_dispatched.add(barcode)
-            elif b.get('status') == 'packed':
-                mrp_packed.add(barcode)
-        
-        # Step 4: Compare PDI serials with MRP
+        # Step 4: Compare PDI serials with MRP in one pass
         dispatched_count = 0
         packed_count = 0
         remaining_count = 0
@@ -2094,17 +2075,19 @@ def compare_pdi_with_mrp(company, pdi_number):
         packed_serials = []
         remaining_serials = []
         
-        for serial in pdi_serials:
-            if serial in mrp_dispatched:
+        for kind, _, row, mrp_row, _ in reconcile(keyed(pdi_rows), mrp_barcode_details, kinds=(LEFT_ONLY, MATCH)):
+            serial = row['serial_number']
+            stage = mrp_stage(mrp_row) if mrp_row else None
+            if stage == 'dispatched':
                 dispatched_count += 1
                 dispatched_serials.append(serial)
-            elif serial in mrp_packed:
+            elif stage == 'packed':
                 packed_count += 1
                 packed_serials.append(serial)
             else:
                 remaining_count += 1
                 remaining_serials.append(serial)
-                if serial not in mrp_barcode_details:
+                if kind is LEFT_ONLY:
                     not_in_mrp += 1
         
         # Build answer
@@ -2130,15 +2113,15 @@ def compare_pdi_with_mrp(company, pdi_number):
         if dispatched_serials:
             answer_parts.append(f"\n\n**✅ Sample Dispatched ({min(5, len(dispatched_serials))} of {dispatched_count}):**")
             for s in dispatched_serials[:5]:
-                details = mrp_barcode_details.get(s, {})
-                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet', '')}")
+                details = mrp_barcode_details.get(normalize_serial(s), {})
+                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet_no', '')}")
         
         # Sample packed
         if packed_serials:
             answer_parts.append(f"\n\n**📦 Sample Packed ({min(5, len(packed_serials))} of {packed_count}):**")
             for s in packed_serials[:5]:
-                details = mrp_barcode_details.get(s, {})
-                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet', '')}")
+                details = mrp_barcode_details.get(normalize_serial(s), {})
+                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet_no', '')}")
         
         # Sample remaining
         if remaining_serials:
@@ -2169,8 +2152,6 @@ def compare_pdi_with_mrp_filtered(company, pdi_number, running_orders=None):
     Compare PDI with MRP but filter by specific running orders
     running_orders: list of running orders like ['R-1', 'R-2'] or single string 'R-1'
     """
-    import re
-    
     try:
         # Normalize running_orders to list
         if running_orders:
@@ -2199,15 +2180,13 @@ def compare_pdi_with_mrp_filtered(company, pdi_number, running_orders=None):
             AND (class_status = 'OK' OR class_status IS NULL)
         """), {'cid': company_id, 'pdi': pdi_number})
         
-        pdi_serials = []
+        pdi_rows = pdi_serials_result.mappings().all()
         binning_breakdown = {}
-        for row in pdi_serials_result.fetchall():
-            serial = row[0]
-            binning = row[1] or 'Unknown'
-            pdi_serials.append(serial)
+        for row in pdi_rows:
+            binning = row['binning'] or 'Unknown'
             binning_breakdown[binning] = binning_breakdown.get(binning, 0) + 1
         
-        total_pdi = len(pdi_serials)
+        total_pdi = len(pdi_rows)
         
         if total_pdi == 0:
             return {
@@ -2233,59 +2212,16 @@ def compare_pdi_with_mrp_filtered(company, pdi_number, running_orders=None):
         mrp_data = response.json()
         mrp_barcodes = mrp_data.get('data', [])
         
-        # OPTIMIZATION: Convert PDI serials to set for O(1) lookup
-        pdi_serials_set = set(pdi_serials)
-        
-        # Create lookup dictionaries - ONLY for PDI serials (much faster)
-        mrp_dispatched = set()
-        mrp_packed = set()
-        mrp_barcode_details = {}
-        
-        filtered_count = 0
+        # Only MRP records of the requested running orders take part
         total_mrp_count = len(mrp_barcodes)
+        if running_orders:
+            mrp_barcodes = [b for b in mrp_barcodes
+                            if (extract_ro_from_ro(b.get('running_order', '') or '') or '') in running_orders]
+        mrp_barcode_details = mrp_stage_index(mrp_barcodes)
         
-        print(f"[DEBUG] Processing {total_mrp_count} MRP barcodes, filtering for {total_pdi} PDI serials...")
-        
-        for b in mrp_barcodes:
-            barcode = b.get('barcode', '')
-            
-            # CRITICAL OPTIMIZATION: Skip barcodes not in PDI
-            if barcode not in pdi_serials_set:
-                continue
-            
-            ro = b.get('running_order', '') or ''
-            
-            # Extract R-O from running_order field
-            ro_match = re.search(r'(R-\d+)', ro, re.IGNORECASE)
-            extracted_ro = ro_match.group(1).upper() if ro_match else ''
-            
-            # Extract binning from running_order
-            bin_match = re.search(r'i-?(\d+)', ro, re.IGNORECASE)
-            mrp_binning = f"I{bin_match.group(1)}" if bin_match else ''
-            
-            # Filter by running order if specified
-            if running_orders and extracted_ro not in running_orders:
-                continue
-            
-            filtered_count += 1
-            
-            mrp_barcode_details[barcode] = {
-                'running_order': ro,
-                'extracted_ro': extracted_ro,
-                'binning': mrp_binning,
-                'pallet': b.get('pallet_no', ''),
-                'date': b.get('date', '')
-            }
-            
-            if b.get('dispatch_party') or b.get('status') == 'dispatched':
-                mrp_dispatched.add(barcode)
-            elif b.get('status') == 'packed':
-                mrp_packed.add(barcode)
-        
-        print(f"[DEBUG] Total MRP barcodes: {total_mrp_count}, Filtered by RO: {filtered_count}")
+        print(f"[DEBUG] Total MRP barcodes: {total_mrp_count}, Filtered by RO: {len(mrp_barcodes)}")
         
-        # Step 4: Compare PDI serials with FILTERED MRP
-        print(f"[DEBUG] Step 4: Comparing {total_pdi} PDI serials with {filtered_count} filtered MRP barcodes...")
+        # Step 4: Compare PDI serials with FILTERED MRP in one pass
         dispatched_count = 0
         packed_count = 0
         remaining_count = 0
@@ -2297,24 +2233,23 @@ def compare_pdi_with_mrp_filtered(company, pdi_number, running_orders=None):
         
         ro_breakdown = {}
         
-        print(f"[DEBUG] Starting serial comparison loop for {len(pdi_serials)} serials...")
-        for serial in pdi_serials:
-            if serial in mrp_dispatched:
+        for kind, _, row, mrp_row, _ in reconcile(keyed(pdi_rows), mrp_barcode_details, kinds=(LEFT_ONLY, MATCH)):
+            serial = row['serial_number']
+            stage = mrp_stage(mrp_row) if mrp_row else None
+            if stage:
+                ro = extract_ro_from_ro(mrp_row.get('running_order', '') or '') or 'Unknown'
+                ro_breakdown[ro] = ro_breakdown.get(ro, {'dispatched': 0, 'packed': 0})
+                ro_breakdown[ro][stage] += 1
+            if stage == 'dispatched':
                 dispatched_count += 1
                 dispatched_serials.append(serial)
-                ro = mrp_barcode_details.get(serial, {}).get('extracted_ro', 'Unknown')
-                ro_breakdown[ro] = ro_breakdown.get(ro, {'dispatched': 0, 'packed': 0})
-                ro_breakdown[ro]['dispatched'] += 1
-            elif serial in mrp_packed:
+            elif stage == 'packed':
                 packed_count += 1
                 packed_serials.append(serial)
-                ro = mrp_barcode_details.get(serial, {}).get('extracted_ro', 'Unknown')
-                ro_breakdown[ro] = ro_breakdown.get(ro, {'dispatched': 0, 'packed': 0})
-                ro_breakdown[ro]['packed'] += 1
             else:
                 remaining_count += 1
                 remaining_serials.append(serial)
-                if serial not in mrp_barcode_details:
+                if kind is LEFT_ONLY:
                     not_in_filtered_mrp += 1
         
         print(f"[DEBUG] Comparison complete: Dispatched={dispatched_count}, Packed={packed_count}, Remaining={remaining_count}")
@@ -2341,15 +2276,15 @@ def compare_pdi_with_mrp_filtered(company, pdi_number, running_orders=None):
         if dispatched_serials:
             answer_parts.append(f"\n\n**✅ Sample Dispatched ({min(5, len(dispatched_serials))} of {dispatched_count}):**")
             for s in dispatched_serials[:5]:
-                details = mrp_barcode_details.get(s, {})
-                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet', '')}")
+                details = mrp_barcode_details.get(normalize_serial(s), {})
+                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet_no', '')}")
         
         # Sample packed
         if packed_serials:
             answer_parts.append(f"\n\n**📦 Sample Packed ({min(5, len(packed_serials))} of {packed_count}):**")
             for s in packed_serials[:5]:
-                details = mrp_barcode_details.get(s, {})
-                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet', '')}")
+                details = mrp_barcode_details.get(normalize_serial(s), {})
+                answer_parts.append(f"   • {s} | {details.get('running_order', '')} | Pallet: {details.get('pallet_no', '')}")
         
         # Sample remaining
         if remaining_serials:
@@ -3426,15 +3361,12 @@ def generate_smart_excel(params):
     ws = wb.active
     
     # Styles
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    red_fill = PatternFill(start_color="FF6B6B", end_color="FF6B6B", fill_type="solid")
-    yellow_fill = PatternFill(start_color="FFE066", end_color="FFE066", fill_type="solid")
-    green_fill = PatternFill(start_color="69DB7C", end_color="69DB7C", fill_type="solid")
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
+    header_font = xs.font(bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("4472C4")
+    red_fill = xs.solid_fill("FF6B6B")
+    yellow_fill = xs.solid_fill("FFE066")
+    green_fill = xs.solid_fill("69DB7C")
+    thin_border = xs.border('thin')
     
     # ===== QUALITY CHECK EXCEL =====
     if quality_check:
@@ -3572,7 +3504,7 @@ def generate_smart_excel(params):
         
         # Summary row
         summary_row = row_idx + 2
-        ws.cell(row=summary_row, column=1, value="QUALITY CHECK SUMMARY:").font = Font(bold=True)
+        ws.cell(row=summary_row, column=1, value="QUALITY CHECK SUMMARY:").font = xs.font(bold=True)
         ws.cell(row=summary_row + 1, column=1, value=f"Company: {company}")
         ws.cell(row=summary_row + 2, column=1, value=f"Check Type: {quality_check.replace('_', ' ').title()}")
         ws.cell(row=summary_row + 3, column=1, value=f"Total Issues: {row_idx - 2}")
@@ -3666,12 +3598,9 @@ def generate_smart_excel(params):
     ws.title = "_".join(title_parts)[:31]  # Excel sheet name limit
     
     # Styles
-    header_font = Font(bold=True, color="FFFFFF")
-    header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
+    header_font = xs.font(bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("4472C4")
+    thin_border = xs.border('thin')
     
     headers = ["S.No", "Barcode", "Running Order", "Binning", "Pallet No", "Date", "Status"]
     for col, header in enumerate(headers, 1):
@@ -3697,7 +3626,7 @@ def generate_smart_excel(params):
     
     # Summary
     summary_row = len(filtered) + 3
-    ws.cell(row=summary_row, column=1, value="SUMMARY:").font = Font(bold=True)
+    ws.cell(row=summary_row, column=1, value="SUMMARY:").font = xs.font(bold=True)
     ws.cell(row=summary_row + 1, column=1, value=f"Company: {company}")
     ws.cell(row=summary_row + 2, column=1, value=f"Total Records: {len(filtered)}")
     if running_order_filter:
@@ -4116,14 +4045,9 @@ def export_to_excel():
         ws.title = "FTR Data"
         
         # Styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        header_font = xs.font(bold=True, color="FFFFFF")
+        header_fill = xs.solid_fill("4472C4")
+        thin_border = xs.border('thin')
         
         if export_type == 'pending':
             # Export pending barcodes (assigned but not packed)
@@ -4585,16 +4509,13 @@ def check_barcodes_status():
             ws.title = "Barcode Status"
             
             # Styles
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-            packed_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            dispatched_fill = PatternFill(start_color="BDD7EE", end_color="BDD7EE", fill_type="solid")
-            not_found_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            pending_fill = PatternFill(start_color="FFEB9C", end_color="FFEB9C", fill_type="solid")
-            thin_border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
+            header_font = xs.font(bold=True, color="FFFFFF")
+            header_fill = xs.solid_fill("4472C4")
+            packed_fill = xs.solid_fill("C6EFCE")
+            dispatched_fill = xs.solid_fill("BDD7EE")
+            not_found_fill = xs.solid_fill("FFC7CE")
+            pending_fill = xs.solid_fill("FFEB9C")
+            thin_border = xs.border('thin')
             
             headers = ["S.No", "Barcode", "Status", "Running Order", "Binning", "Pallet No", "Dispatch Party", "Date"]
             for col, header in enumerate(headers, 1):
@@ -4627,7 +4548,7 @@ def check_barcodes_status():
             
             # Summary row
             summary_row = len(results) + 3
-            ws.cell(row=summary_row, column=1, value="SUMMARY:").font = Font(bold=True)
+            ws.cell(row=summary_row, column=1, value="SUMMARY:").font = xs.font(bold=True)
             ws.cell(row=summary_row + 1, column=1, value=f"Total Checked: {len(results)}")
             ws.cell(row=summary_row + 2, column=1, value=f"📦 Packed: {packed_count}")
             ws.cell(row=summary_row + 3, column=1, value=f"🚚 Dispatched: {dispatched_count}")
@@ -4867,18 +4788,12 @@ def _do_validate_packing(company, send_alerts=True):
         # Get all serials for binning lookup
         all_serials = [b.get('barcode') for b in all_barcodes if b.get('barcode')]
         
-        if all_serials:
-            # Fetch binning data from Master FTR
-            binning_result = db.session.execute(text("""
-                SELECT serial_number, binning, class_status 
-                FROM ftr_master_serials 
-                WHERE company_id = :cid 
-                AND serial_number IN :serials
-            """), {'cid': company_id, 'serials': tuple(all_serials)})
-            
-            binning_lookup = {row[0]: {'binning': row[1], 'class_status': row[2]} for row in binning_result.fetchall()}
-        else:
-            binning_lookup = {}
+        # One primary-key read per serial (chunked) on the serial registry serves every check
+        registry = lookup_serials(all_serials)
+        binning_lookup = {
+            serial: {'binning': row['binning'], 'class_status': row['class_status'] or ''}
+            for serial, row in registry.items() if row['company_id'] == company_id
+        }
         
         # ============================================
         # CHECK 1: REJECTED MODULES PACKED (ALL TIME)
@@ -4890,39 +4805,19 @@ def _do_validate_packing(company, send_alerts=True):
             pallet_no = b.get('pallet_no', '')
             pack_date = b.get('date', '')
             
-            # Check in our rejection database (ModuleSerialNumber)
-            serial_record = db.session.execute(text("""
-                SELECT msn.serial_number, msn.rejection_reason, msn.qc_status, pb.pdi_number
-                FROM module_serial_numbers msn
-                JOIN pdi_batches pb ON msn.pdi_batch_id = pb.id
-                WHERE msn.serial_number = :barcode
-                AND (msn.rejection_reason IS NOT NULL AND msn.rejection_reason != '')
-            """), {'barcode': barcode}).fetchone()
-            
-            if serial_record:
+            # Rejected by any source (PDI QC, rejection uploads, FTR class status)
+            serial_record = registry.get(barcode)
+            if serial_record and serial_record['is_rejected'] and \
+                    not any(r['barcode'] == barcode for r in issues['rejected_packed']):
                 print(f"   ❌ REJECTED module found in pack: {barcode} (packed on {pack_date})")
                 issues['rejected_packed'].append({
                     'barcode': barcode,
                     'pallet_no': pallet_no,
                     'pack_date': pack_date,
-                    'rejection_reason': serial_record[1],
-                    'qc_status': serial_record[2],
-                    'pdi_number': serial_record[3]
+                    'rejection_reason': serial_record['rejection_reason'] or f"FTR Status: {serial_record['class_status']}",
+                    'qc_status': 'rejected',
+                    'pdi_number': serial_record['pdi_number'] or '-'
                 })
-            
-            # Also check class_status from FTR (might have rejected status)
-            ftr_data = binning_lookup.get(barcode, {})
-            if ftr_data.get('class_status', '').upper() in ['REJECTED', 'REJECT', 'REJ']:
-                if not any(r['barcode'] == barcode for r in issues['rejected_packed']):
-                    print(f"   ❌ FTR REJECTED module found: {barcode} (packed on {pack_date})")
-                    issues['rejected_packed'].append({
-                        'barcode': barcode,
-                        'pallet_no': pallet_no,
-                        'pack_date': pack_date,
-                        'rejection_reason': f"FTR Status: {ftr_data.get('class_status')}",
-                        'qc_status': 'rejected',
-                        'pdi_number': '-'
-                    })
         
         print(f"   Found {len(issues['rejected_packed'])} rejected modules in packing (ALL TIME)")
         
@@ -4933,6 +4828,19 @@ def _do_validate_packing(company, send_alerts=True):
         
         issues['wrong_party'] = []
         
+        # PDI batch -> (pdi_number, company) for every batch a dispatched serial belongs to, in one query
+        batch_ids = {registry[b.get('barcode')]['pdi_batch_id'] for b in all_barcodes
+                     if b.get('dispatch_party') and registry.get(b.get('barcode'), {}).get('pdi_batch_id')}
+        batch_companies = {}
+        if batch_ids:
+            batch_companies = {row[0]: (row[1], row[2]) for row in db.session.execute(text("""
+                SELECT pb.id, pb.pdi_number, c.company_name
+                FROM pdi_batches pb
+                JOIN master_orders mo ON pb.order_id = mo.id
+                JOIN companies c ON mo.company_id = c.id
+                WHERE pb.id IN :batch_ids
+            """).bindparams(bindparam('batch_ids', expanding=True)), {'batch_ids': list(batch_ids)})}
+        
         for b in all_barcodes:
             barcode = b.get('barcode', '')
             pallet_no = b.get('pallet_no', '')
@@ -4944,17 +4852,11 @@ def _do_validate_packing(company, send_alerts=True):
                 continue  # Skip if not dispatched yet
             
             # Check if this barcode belongs to a different company/party in PDI
-            pdi_record = db.session.execute(text("""
-                SELECT msn.serial_number, pb.pdi_number, mo.order_number, c.company_name
-                FROM module_serial_numbers msn
-                JOIN pdi_batches pb ON msn.pdi_batch_id = pb.id
-                JOIN master_orders mo ON pb.order_id = mo.id
-                JOIN companies c ON mo.company_id = c.id
-                WHERE msn.serial_number = :barcode
-            """), {'barcode': barcode}).fetchone()
+            # (its registry row, else the generated serial range covering it)
+            pdi_record = batch_companies.get(registry.get(barcode, {}).get('pdi_batch_id'))
             
             if pdi_record:
-                pdi_company = pdi_record[3]  # Company name from PDI
+                pdi_company = pdi_record[1]  # Company name from PDI
                 # Check if PDI company matches DISPATCH party
                 if pdi_company and pdi_company.lower().split()[0] not in dispatch_party.lower():
                     print(f"   ❌ WRONG DISPATCH: {barcode} - PDI for '{pdi_company}' but DISPATCHED to '{dispatch_party}'")
@@ -4964,7 +4866,7 @@ def _do_validate_packing(company, send_alerts=True):
                         'pack_date': pack_date,
                         'pdi_company': pdi_company,
                         'dispatched_to': dispatch_party,
-                        'pdi_number': pdi_record[1]
+                        'pdi_number': pdi_record[0]
                     })
         
         print(f"   Found {len(issues['wrong_party'])} modules DISPATCHED to wrong party")
@@ -5449,22 +5351,17 @@ def get_pallet_modules_excel():
                 ws.title = f"Pallet {pallet_number}"
                 
                 # Styles
-                header_font = Font(bold=True, color='FFFFFF', size=11)
-                header_fill = PatternFill(start_color='9b59b6', end_color='9b59b6', fill_type='solid')
-                border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-                center_align = Alignment(horizontal='center', vertical='center')
+                header_font = xs.font(bold=True, color='FFFFFF', size=11)
+                header_fill = xs.solid_fill('9b59b6')
+                border = xs.border('thin')
+                center_align = xs.alignment(horizontal='center', vertical='center')
                 
                 # Title Row
                 ws.merge_cells('A1:I1')
                 title_cell = ws['A1']
                 title_cell.value = f"📦 Pallet {pallet_number} - {company} (Total: {len(modules)} modules)"
-                title_cell.font = Font(bold=True, size=14, color='FFFFFF')
-                title_cell.fill = PatternFill(start_color='8e44ad', end_color='8e44ad', fill_type='solid')
+                title_cell.font = xs.font(bold=True, size=14, color='FFFFFF')
+                title_cell.fill = xs.solid_fill('8e44ad')
                 title_cell.alignment = center_align
                 
                 # Headers
@@ -5715,23 +5612,18 @@ def get_pallet_modules_from_excel():
                 ws.title = "All Modules"
                 
                 # Styles
-                header_font = Font(bold=True, color='FFFFFF', size=11)
-                header_fill = PatternFill(start_color='9b59b6', end_color='9b59b6', fill_type='solid')
-                border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
-                center_align = Alignment(horizontal='center', vertical='center')
+                header_font = xs.font(bold=True, color='FFFFFF', size=11)
+                header_fill = xs.solid_fill('9b59b6')
+                border = xs.border('thin')
+                center_align = xs.alignment(horizontal='center', vertical='center')
                 
                 # Title Row
                 source_label = "Packing (MRP)" if binning_source == 'packing' else "Total FTR (Master DB)"
                 ws.merge_cells('A1:J1')
                 title_cell = ws['A1']
                 title_cell.value = f"📦 {company} - {len(pallets_found)} Pallets, {len(all_modules)} Modules | Binning: {source_label}"
-                title_cell.font = Font(bold=True, size=14, color='FFFFFF')
-                title_cell.fill = PatternFill(start_color='8e44ad', end_color='8e44ad', fill_type='solid')
+                title_cell.font = xs.font(bold=True, size=14, color='FFFFFF')
+                title_cell.fill = xs.solid_fill('8e44ad')
                 title_cell.alignment = center_align
                 
                 # Headers
@@ -5766,8 +5658,8 @@ def get_pallet_modules_from_excel():
                 ws_summary = wb.create_sheet("Pallet Summary")
                 ws_summary.merge_cells('A1:D1')
                 ws_summary['A1'].value = f"📊 Pallet Summary - {company}"
-                ws_summary['A1'].font = Font(bold=True, size=14, color='FFFFFF')
-                ws_summary['A1'].fill = PatternFill(start_color='8e44ad', end_color='8e44ad', fill_type='solid')
+                ws_summary['A1'].font = xs.font(bold=True, size=14, color='FFFFFF')
+                ws_summary['A1'].fill = xs.solid_fill('8e44ad')
                 ws_summary['A1'].alignment = center_align
                 
                 summary_headers = ['Sr. No', 'Pallet No', 'Module Count', 'Binning Breakdown']
@@ -6153,14 +6045,11 @@ def check_serial_binning():
             ws.title = "Binning Report"
             
             # Styles
-            header_font = Font(bold=True, color="FFFFFF")
-            header_fill = PatternFill(start_color="1565C0", end_color="1565C0", fill_type="solid")
-            found_fill = PatternFill(start_color="C6EFCE", end_color="C6EFCE", fill_type="solid")
-            not_found_fill = PatternFill(start_color="FFC7CE", end_color="FFC7CE", fill_type="solid")
-            thin_border = Border(
-                left=Side(style='thin'), right=Side(style='thin'),
-                top=Side(style='thin'), bottom=Side(style='thin')
-            )
+            header_font = xs.font(bold=True, color="FFFFFF")
+            header_fill = xs.solid_fill("1565C0")
+            found_fill = xs.solid_fill("C6EFCE")
+            not_found_fill = xs.solid_fill("FFC7CE")
+            thin_border = xs.border('thin')
             
             # Headers
             headers = ["S.No", "Serial Number", "Binning", "Pmax", "Efficiency", "Class", "PDI Number", "Status"]
@@ -6169,7 +6058,7 @@ def check_serial_binning():
                 cell.font = header_font
                 cell.fill = header_fill
                 cell.border = thin_border
-                cell.alignment = Alignment(horizontal='center')
+                cell.alignment = xs.alignment(horizontal='center')
             
             # Data rows
             for idx, r in enumerate(results, 1):
@@ -6186,7 +6075,7 @@ def check_serial_binning():
                 fill = found_fill if '✅' in r['status'] else not_found_fill
                 for col in range(1, 9):
                     ws.cell(row=idx+1, column=col).fill = fill
-                    ws.cell(row=idx+1, column=col).alignment = Alignment(horizontal='center')
+                    ws.cell(row=idx+1, column=col).alignment = xs.alignment(horizontal='center')
             
             # Binning Summary sheet
             ws2 = wb.create_sheet("Binning Summary")
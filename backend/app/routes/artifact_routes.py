@@ -0,0 +1,28 @@
+"""
+Artifact Store Routes - hit rate / disk usage of the generated-report store
+"""
+from flask import Blueprint, jsonify
+from app.services.artifact_store import get_artifact_store
+
+artifacts_bp = Blueprint('artifacts', __name__, url_prefix='/api/artifacts')
+
+
+@artifacts_bp.route('/stats', methods=['GET'])
+def artifact_stats():
+    """Entries, bytes on disk, quota and hit rate of the artifact store"""
+    try:
+        store = get_artifact_store()
+        return jsonify({'success': True, 'stats': store.stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@artifacts_bp.route('/evict', methods=['POST'])
+def evict_artifacts():
+    """Run expiry / quota eviction now"""
+    try:
+        store = get_artifact_store()
+        removed = store.evict()
+        return jsonify({'success': True, 'removed': removed, 'stats': store.stats()}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
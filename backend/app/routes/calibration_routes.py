@@ -5,6 +5,7 @@ Calibration Routes - Manage calibration instruments and upload data
 from flask import Blueprint, request, jsonify, current_app, send_file
 from app.models.calibration_data import CalibrationInstrument, CalibrationHistory
 from app.models.database import db
+from app.services.artifact_store import get_artifact_store, artifact_key, send_artifact
 from datetime import datetime, date
 from werkzeug.utils import secure_filename
 import json
@@ -858,8 +859,6 @@ def export_to_excel():
     """Export calibration data to Excel"""
     try:
         import pandas as pd
-        from io import BytesIO
-        from flask import send_file
         
         instruments = CalibrationInstrument.query.order_by(CalibrationInstrument.sr_no).all()
         
@@ -886,19 +885,18 @@ def export_to_excel():
                 'Days Until Due': inst.get_days_until_due()
             })
         
-        df = pd.DataFrame(data)
-        
-        output = BytesIO()
-        with pd.ExcelWriter(output, engine='openpyxl') as writer:
-            df.to_excel(writer, index=False, sheet_name='Calibration Data')
-        output.seek(0)
+        def build(path):
+            df = pd.DataFrame(data)
+            with pd.ExcelWriter(path, engine='openpyxl') as writer:
+                df.to_excel(writer, index=False, sheet_name='Calibration Data')
         
         filename = f'Calibration_Data_{datetime.now().strftime("%Y%m%d_%H%M%S")}.xlsx'
         
-        return send_file(
-            output,
+        # Unchanged instrument data -> same workbook from the artifact store
+        return send_artifact(
+            'calibration_export', data, build,
+            suffix='.xlsx',
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
             download_name=filename
         )
         
@@ -997,7 +995,7 @@ def generate_calibration_report_pdf():
         from reportlab.lib import colors
         from reportlab.lib.units import mm, inch
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image as RLImage
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from app.services.pdf_styles import paragraph_style
         from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 
         # Get filter parameters
@@ -1018,6 +1016,25 @@ def generate_calibration_report_pdf():
             inst.update_status()
         db.session.commit()
 
+        report_date = datetime.now().strftime('%d-%b-%Y %I:%M %p')
+        filename = f'Calibration_Report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
+
+        # Same instruments + filters (and days until due) -> stored PDF, stamped with its first build time
+        store = get_artifact_store()
+        artifact = artifact_key('calibration_report', {
+            'status': status_filter,
+            'location': location_filter,
+            'instruments': [
+                (inst.sr_no, inst.instrument_id, inst.machine_name, inst.make, inst.range_capacity,
+                 inst.location, inst.date_of_calibration, inst.due_date, inst.status,
+                 inst.get_days_until_due(), inst.certificate_no, inst.calibration_agency)
+                for inst in instruments
+            ]
+        })
+        cached_path = store.get(artifact, '.pdf')
+        if cached_path:
+            return send_file(cached_path, mimetype='application/pdf', as_attachment=True, download_name=filename)
+
         # Build PDF
         buffer = BytesIO()
         doc = SimpleDocTemplate(
@@ -1029,35 +1046,33 @@ def generate_calibration_report_pdf():
             rightMargin=10*mm
         )
 
-        styles = getSampleStyleSheet()
-
         # Custom styles
-        title_style = ParagraphStyle(
+        title_style = paragraph_style(
             'CustomTitle',
-            parent=styles['Title'],
+            parent='Title',
             fontSize=18,
             spaceAfter=4*mm,
             textColor=colors.HexColor('#1a237e'),
             alignment=TA_CENTER
         )
-        subtitle_style = ParagraphStyle(
+        subtitle_style = paragraph_style(
             'Subtitle',
-            parent=styles['Normal'],
+            parent='Normal',
             fontSize=10,
             textColor=colors.HexColor('#555555'),
             alignment=TA_CENTER,
             spaceAfter=6*mm
         )
-        cell_style = ParagraphStyle(
+        cell_style = paragraph_style(
             'CellStyle',
-            parent=styles['Normal'],
+            parent='Normal',
             fontSize=7,
             leading=9,
             alignment=TA_LEFT
         )
-        cell_center = ParagraphStyle(
+        cell_center = paragraph_style(
             'CellCenter',
-            parent=styles['Normal'],
+            parent='Normal',
             fontSize=7,
             leading=9,
             alignment=TA_CENTER
@@ -1067,12 +1082,11 @@ def generate_calibration_report_pdf():
 
         # Title
         elements.append(Paragraph("GREENSTAR SOLAR PVT. LTD.", title_style))
-        elements.append(Paragraph("CALIBRATION INSTRUMENT REPORT", ParagraphStyle(
-            'ReportTitle', parent=styles['Normal'], fontSize=13, alignment=TA_CENTER,
+        elements.append(Paragraph("CALIBRATION INSTRUMENT REPORT", paragraph_style(
+            'ReportTitle', parent='Normal', fontSize=13, alignment=TA_CENTER,
             textColor=colors.HexColor('#333'), spaceAfter=2*mm, fontName='Helvetica-Bold'
         )))
         
-        report_date = datetime.now().strftime('%d-%b-%Y %I:%M %p')
         filter_text = "All Instruments"
         if status_filter and status_filter != 'all':
             filter_text = f"Status: {status_filter.upper()}"
@@ -1185,13 +1199,13 @@ def generate_calibration_report_pdf():
         elements.append(Spacer(1, 8*mm))
         elements.append(Paragraph(
             f"This report is auto-generated by GSPL Calibration Management System | Printed on: {report_date}",
-            ParagraphStyle('Footer', parent=styles['Normal'], fontSize=7, textColor=colors.grey, alignment=TA_CENTER)
+            paragraph_style('Footer', parent='Normal', fontSize=7, textColor=colors.grey, alignment=TA_CENTER)
         ))
 
         doc.build(elements)
+        store.put_bytes(artifact, buffer.getvalue(), '.pdf')
         buffer.seek(0)
 
-        filename = f'Calibration_Report_{datetime.now().strftime("%Y%m%d_%H%M%S")}.pdf'
         return send_file(
             buffer,
             mimetype='application/pdf',
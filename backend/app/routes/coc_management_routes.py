@@ -2,15 +2,23 @@
 COC Management Routes - Track COC usage per PDI and provide FIFO suggestions
 """
 from flask import Blueprint, request, jsonify
-from datetime import datetime, timedelta
+from datetime import datetime
 from app.models.database import db
 from app.models.coc_tracking import COCUsageTracking
 from app.models.database import ProductionRecord, Company
-import requests
+from app.services.coc_catalog import get_coc_catalog
 
 coc_mgmt_bp = Blueprint('coc_management', __name__)
 
-COC_API_URL = 'https://umanmrp.in/api/coc_api.php'
+
+def fifo_material_match(search_material, doc_material):
+    """FIFO suggestion material matching (both names lowercase)"""
+    if search_material in doc_material or doc_material in search_material:
+        return True
+    for keyword in ('cell', 'eva', 'glass', 'ribbon', 'frame'):
+        if keyword in search_material and keyword in doc_material:
+            return True
+    return 'jb' in search_material and ('jb' in doc_material or 'junction' in doc_material)
 
 
 @coc_mgmt_bp.route('/api/coc-management/usage-by-pdi', methods=['GET'])
@@ -76,7 +84,7 @@ def get_fifo_suggestions():
         if not company:
             return jsonify({'success': False, 'error': 'Company not found'}), 404
         
-        company_name = company.companyName.strip()
+        company_name = company.company_name.strip()
         
         # Company name mapping for API matching (API uses assigned_to field)
         COMPANY_NAME_MAPPING = {
@@ -94,107 +102,52 @@ def get_fifo_suggestions():
                 'error': f'Company mapping not found for: {company_name}. Available: {list(COMPANY_NAME_MAPPING.keys())}'
             }), 400
         
-        # Fetch COC data from API
-        to_date = datetime.now().strftime('%Y-%m-%d')
-        from_date = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d')
-        
-        post_data = {'from': from_date, 'to': to_date}
-        response = requests.post(COC_API_URL, json=post_data, timeout=10)
-        
-        if response.status_code != 200:
-            return jsonify({'success': False, 'error': 'Failed to fetch COC data'}), 500
-        
-        coc_data = response.json()
-        # API returns array directly
-        coc_documents = coc_data if isinstance(coc_data, list) else coc_data.get('data', [])
-        
-        # Filter COC documents for this company AND PDI
-        company_coc_documents = []
-        for doc in coc_documents:
-            if not isinstance(doc, dict):
-                continue
-            doc_company = (doc.get('assigned_to', '') or '').strip()
-            doc_pdi = (doc.get('pdi_no', '') or '').strip()
-            
-            # Match both company AND PDI
-            company_match = doc_company == api_company_name
-            pdi_match = (not pdi_number) or (doc_pdi == pdi_number)  # If no PDI provided, show all
-            
-            if company_match and pdi_match:
-                company_coc_documents.append(doc)
+        catalog = get_coc_catalog()
         
         suggestions = {}
         
         for material_name in material_names:
-            # Get brands that were previously used for this material in this company
-            previously_used_brands = db.session.query(COCUsageTracking.coc_brand)\
-                .filter_by(company_id=company_id, material_name=material_name)\
-                .distinct()\
-                .all()
+            search_material = material_name.lower()
             
-            used_brand_list = [b[0] for b in previously_used_brands if b[0]]
+            # Invoices previously used for this material in this company (one query, not one per COC)
+            used_invoices = {row[0] for row in db.session.query(COCUsageTracking.coc_invoice_number)
+                             .filter_by(company_id=company_id, material_name=material_name)
+                             .distinct() if row[0] is not None}
             
-            # Filter COCs for this material
+            # COCs of this company + material from the local catalog mirror
             material_cocs_used_brands = []  # COCs from previously used brands
             material_cocs_new_brands = []   # COCs from new brands
             
-            for doc in company_coc_documents:
-                if not isinstance(doc, dict):
+            for doc in catalog.fifo_documents(lambda group: fifo_material_match(search_material, group.name),
+                                              company=api_company_name):
+                # Match PDI too - if no PDI provided, show all
+                pdi_no = doc.get('pdi_no', '')
+                if pdi_number and (pdi_no or '').strip() != pdi_number:
                     continue
                 
-                doc_material = (doc.get('material_name', '') or '').lower()
-                search_material = material_name.lower()
+                invoice_no = doc.get('invoice_no', '')
+                remaining_qty = float(doc.get('remaining_qty', 0) or 0)
                 
-                # Material matching logic
-                is_match = False
-                if search_material in doc_material or doc_material in search_material:
-                    is_match = True
-                elif 'cell' in search_material and 'cell' in doc_material:
-                    is_match = True
-                elif 'eva' in search_material and 'eva' in doc_material:
-                    is_match = True
-                elif 'glass' in search_material and 'glass' in doc_material:
-                    is_match = True
-                elif 'ribbon' in search_material and 'ribbon' in doc_material:
-                    is_match = True
-                elif 'frame' in search_material and 'frame' in doc_material:
-                    is_match = True
-                elif 'jb' in search_material and ('jb' in doc_material or 'junction' in doc_material):
-                    is_match = True
-                
-                if is_match:
-                    invoice_no = doc.get('invoice_no', '')
-                    lot_batch_no = doc.get('lot_batch_no', '')
-                    pdi_no = doc.get('pdi_no', '')
-                    remaining_qty = float(doc.get('remaining_qty', 0))
+                # Only show COC if has remaining quantity from API
+                if remaining_qty > 0:
+                    previously_used = invoice_no in used_invoices
+                    
+                    coc_item = {
+                        'invoiceNo': invoice_no,
+                        'lotBatchNo': doc.get('lot_batch_no', ''),
+                        'pdiNo': pdi_no,
+                        'materialName': doc.get('material_name', ''),
+                        'assignedTo': doc.get('assigned_to', ''),
+                        'remainingQty': remaining_qty,
+                        'isPreviouslyUsed': previously_used,
+                        'fifoRank': invoice_no  # Can use ID or invoice for sorting
+                    }
                     
-                    # Only show COC if has remaining quantity from API
-                    if remaining_qty > 0:
-                        # Check if this invoice was previously used by this company
-                        previously_used = db.session.query(COCUsageTracking)\
-                            .filter_by(
-                                company_id=company_id,
-                                coc_invoice_number=invoice_no, 
-                                material_name=material_name
-                            )\
-                            .first()
-                        
-                        coc_item = {
-                            'invoiceNo': invoice_no,
-                            'lotBatchNo': lot_batch_no,
-                            'pdiNo': pdi_no,
-                            'materialName': doc.get('material_name', ''),
-                            'assignedTo': doc.get('assigned_to', ''),
-                            'remainingQty': remaining_qty,
-                            'isPreviouslyUsed': previously_used is not None,
-                            'fifoRank': invoice_no  # Can use ID or invoice for sorting
-                        }
-                        
-                        # Add to list (prioritize previously used ones)
-                        if previously_used:
-                            material_cocs_used_brands.append(coc_item)
-                        else:
-                            material_cocs_new_brands.append(coc_item)
+                    # Add to list (prioritize previously used ones)
+                    if previously_used:
+                        material_cocs_used_brands.append(coc_item)
+                    else:
+                        material_cocs_new_brands.append(coc_item)
             
             # Sort by invoice number/ID (FIFO)
             material_cocs_used_brands.sort(key=lambda x: x['invoiceNo'])
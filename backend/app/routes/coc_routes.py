@@ -3,6 +3,7 @@ COC Management Routes
 """
 from flask import Blueprint, request, jsonify
 from app.services.coc_service import COCService
+from app.services.coc_catalog import get_coc_catalog, DOCUMENTS, ASSIGNED
 from sqlalchemy import text
 from app.models.database import db
 
@@ -24,88 +25,50 @@ def sync_coc_data():
 
 @coc_bp.route('/list', methods=['GET'])
 def list_coc_documents():
-    """List all COC documents from real external API"""
+    """List all COC documents (local mirror of the external COC API)"""
     try:
         import requests
-        from datetime import datetime, timedelta
+        from datetime import datetime
         
         # Get query parameters
         invoice_no = request.args.get('invoice_no')
         
-        # Real COC API endpoint
-        COC_API_URL = 'https://umanmrp.in/api/coc_api.php'
-        
-        # Get date range (default: last 6 months to today)
-        to_date = datetime.now().strftime('%Y-%m-%d')
-        from_date = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d')
-        
-        # Prepare POST data
-        post_data = {
-            'from': from_date,
-            'to': to_date
-        }
-        
-        # Fetch from real COC API
-        response = requests.post(COC_API_URL, json=post_data, timeout=10)
-        
-        if response.status_code == 200:
-            coc_data = response.json()
-            
-            # Transform data to match frontend expectations
-            transformed_data = []
-            
-            # Handle different response structures
-            if isinstance(coc_data, dict):
-                if 'data' in coc_data:
-                    coc_documents = coc_data['data']
-                elif 'documents' in coc_data:
-                    coc_documents = coc_data['documents']
-                elif 'coc_data' in coc_data:
-                    coc_documents = coc_data['coc_data']
-                else:
-                    coc_documents = [coc_data]
-            elif isinstance(coc_data, list):
-                coc_documents = coc_data
-            else:
-                coc_documents = []
+        snapshot = get_coc_catalog().snapshot(DOCUMENTS, force=request.args.get('refresh') == 'true')
+        
+        # Transform data to match frontend expectations
+        transformed_data = []
+        for doc in snapshot.documents:
+            transformed_item = {
+                'id': doc.get('id'),
+                'invoice_no': doc.get('invoice_no'),
+                'material_name': doc.get('material_name'),
+                'brand': doc.get('brand'),
+                'lot_batch_no': doc.get('lot_batch_no'),
+                'coc_qty': doc.get('coc_qty'),
+                'invoice_qty': doc.get('invoice_qty'),
+                'invoice_date': doc.get('invoice_date'),
+                'entry_date': doc.get('entry_date'),
+                'coc_document_url': doc.get('coc_document_url'),
+                'iqc_document_url': doc.get('iqc_document_url'),
+                'store_name': doc.get('store_name'),
+                'product_type': doc.get('product_type')
+            }
             
-            for doc in coc_documents:
-                transformed_item = {
-                    'id': doc.get('id'),
-                    'invoice_no': doc.get('invoice_no'),
-                    'material_name': doc.get('material_name'),
-                    'brand': doc.get('brand'),
-                    'lot_batch_no': doc.get('lot_batch_no'),
-                    'coc_qty': doc.get('coc_qty'),
-                    'invoice_qty': doc.get('invoice_qty'),
-                    'invoice_date': doc.get('invoice_date'),
-                    'entry_date': doc.get('entry_date'),
-                    'coc_document_url': doc.get('coc_document_url'),
-                    'iqc_document_url': doc.get('iqc_document_url'),
-                    'store_name': doc.get('store_name'),
-                    'product_type': doc.get('product_type')
-                }
-                
-                # Filter by invoice number if provided
-                if invoice_no:
-                    if transformed_item['invoice_no'] and invoice_no.lower() in str(transformed_item['invoice_no']).lower():
-                        transformed_data.append(transformed_item)
-                else:
+            # Filter by invoice number if provided
+            if invoice_no:
+                if transformed_item['invoice_no'] and invoice_no.lower() in str(transformed_item['invoice_no']).lower():
                     transformed_data.append(transformed_item)
-            
-            return jsonify({
-                'success': True,
-                'coc_data': transformed_data,
-                'count': len(transformed_data),
-                'source': 'Real API (umanmrp.in)',
-                'date_range': {'from': from_date, 'to': to_date}
-            }), 200
-        else:
-            return jsonify({
-                'success': False,
-                'error': f'COC API returned status {response.status_code}',
-                'coc_data': []
-            }), 500
+            else:
+                transformed_data.append(transformed_item)
+        
+        return jsonify({
+            'success': True,
+            'coc_data': transformed_data,
+            'count': len(transformed_data),
+            'source': 'Real API (umanmrp.in)',
+            'date_range': {'from': snapshot.from_date, 'to': snapshot.to_date},
+            'synced_at': datetime.fromtimestamp(snapshot.fetched_at).isoformat()
+        }), 200
         
     except requests.exceptions.ConnectionError:
         return jsonify({
@@ -142,106 +105,20 @@ def get_assigned_coc_records():
         pdi_filter = request.args.get('pdi', '').lower()
         material_filter = request.args.get('material', '').lower()
         
-        # Fetch from MRP assigned COC API
-        ASSIGNED_COC_API = 'https://umanmrp.in/a/get_assigned_coc_records.php'
-        
-        print(f"🌐 Fetching assigned COC records from: {ASSIGNED_COC_API}")
-        response = requests.get(ASSIGNED_COC_API, timeout=15)
-        
-        if response.status_code != 200:
-            return jsonify({
-                'success': False,
-                'error': f'API returned status {response.status_code}',
-                'data': []
-            }), 500
-        
-        api_data = response.json()
-        
-        if api_data.get('status') != 'success':
-            return jsonify({
-                'success': False,
-                'error': 'API returned unsuccessful status',
-                'data': []
-            }), 500
-        
-        records = api_data.get('data', [])
-        
-        # Company name mapping (API -> Full name)
-        COMPANY_MAP = {
-            's&w': 'Sterlin and Wilson',
-            'l&t': 'Larsen & Toubro',
-            'rays power': 'Rays Power',
-            'rays': 'Rays Power'
-        }
+        # Assigned records from the local mirror (transformed once per refresh)
+        records = get_coc_catalog().snapshot(ASSIGNED, force=request.args.get('refresh') == 'true').assigned
         
-        # PDI number mapping (Lot 1 -> PDI-1)
-        def normalize_pdi(pdi_str):
-            if not pdi_str:
-                return None
-            pdi_lower = pdi_str.lower().strip()
-            # Handle "Lot 1", "Lot 2", etc.
-            if 'lot' in pdi_lower:
-                import re
-                match = re.search(r'lot\s*(\d+)', pdi_lower)
-                if match:
-                    return f"PDI-{match.group(1)}"
-            # Handle "PDI-1", "PDI1", etc.
-            if 'pdi' in pdi_lower:
-                import re
-                match = re.search(r'pdi[- ]?(\d+)', pdi_lower)
-                if match:
-                    return f"PDI-{match.group(1)}"
-            return pdi_str
-        
-        # Transform and filter data
+        # Apply filters
         transformed_records = []
-        for record in records:
-            assigned_to = (record.get('assigned_to') or '').lower().strip()
-            pdi_no = record.get('pdi_no', '')
-            material_name = record.get('material_name', '')
-            
-            # Get full company name
-            company_full = COMPANY_MAP.get(assigned_to, record.get('assigned_to', ''))
-            
-            # Normalize PDI number
-            pdi_normalized = normalize_pdi(pdi_no)
-            
-            # Apply filters
-            if company_filter and company_filter not in assigned_to and company_filter not in company_full.lower():
+        for rec in records:
+            assigned_to = (rec['company_short'] or '').lower().strip()
+            if company_filter and company_filter not in assigned_to and company_filter not in rec['company'].lower():
                 continue
-            if pdi_filter and pdi_filter not in (pdi_normalized or '').lower():
+            if pdi_filter and pdi_filter not in (rec['pdi_no'] or '').lower():
                 continue
-            if material_filter and material_filter not in material_name.lower():
+            if material_filter and material_filter not in rec['material_name'].lower():
                 continue
-            
-            # Parse remaining qty
-            remaining_qty = record.get('remaining_qty')
-            try:
-                remaining_qty = float(remaining_qty) if remaining_qty else 0
-            except:
-                remaining_qty = 0
-            
-            transformed_records.append({
-                'id': record.get('id'),
-                'material_name': material_name,
-                'material_id': record.get('material_id'),
-                'company': company_full,
-                'company_short': record.get('assigned_to'),
-                'pdi_no': pdi_normalized,
-                'pdi_original': pdi_no,
-                'lot_batch_no': record.get('lot_batch_no'),
-                'invoice_no': record.get('invoice_no'),
-                'invoice_date': record.get('invoice_date') or record.get('entry_date') or '',
-                'invoice_qty': record.get('invoice_qty') or record.get('coc_qty') or 0,
-                'brand': record.get('brand') or record.get('store_name') or '',
-                'coc_qty': record.get('coc_qty') or 0,
-                'consumed_qty': record.get('consumed_qty') or 0,
-                'remaining_qty': remaining_qty,
-                'product_type': record.get('product_type') or '',
-                'coc_document_url': record.get('coc_document_url') or '',
-                'iqc_document_url': record.get('iqc_document_url') or '',
-                'is_exhausted': remaining_qty <= 0
-            })
+            transformed_records.append(rec)
         
         # Group by material and company for summary
         summary_by_material = {}
@@ -320,6 +197,21 @@ def get_assigned_coc_records():
     except Exception as e:
         return jsonify({"success": False, "message": str(e)}), 500
 
+@coc_bp.route('/catalog', methods=['GET'])
+def coc_catalog_status():
+    """State of the local COC catalog mirror"""
+    return jsonify({"success": True, "catalog": get_coc_catalog().stats()}), 200
+
+@coc_bp.route('/catalog/refresh', methods=['POST'])
+def refresh_coc_catalog():
+    """Refresh the local COC catalog mirror now"""
+    try:
+        catalog = get_coc_catalog()
+        catalog.refresh()
+        return jsonify({"success": True, "catalog": catalog.stats()}), 200
+    except Exception as e:
+        return jsonify({"success": False, "message": str(e)}), 502
+
 @coc_bp.route('/stock', methods=['GET'])
 def get_material_stock():
     """Get raw material stock levels"""
@@ -523,7 +415,7 @@ def generate_pdi_coc_report():
         from reportlab.lib import colors
         from reportlab.lib.units import mm
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from app.services.pdf_styles import stylesheet, paragraph_style
         from reportlab.lib.enums import TA_CENTER
         from io import BytesIO
         from datetime import datetime
@@ -571,9 +463,9 @@ def generate_pdi_coc_report():
         doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=15*mm, leftMargin=15*mm,
                                topMargin=15*mm, bottomMargin=15*mm)
         
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=18, 
-                                     textColor=colors.HexColor('#1976d2'), alignment=TA_CENTER, spaceAfter=10)
+        styles = stylesheet()
+        title_style = paragraph_style('Title', parent='Heading1', fontSize=18, 
+                                      textColor=colors.HexColor('#1976d2'), alignment=TA_CENTER, spaceAfter=10)
         
         story = []
         
@@ -732,162 +624,165 @@ def list_ftr_documents():
         return jsonify({"success": False, "message": str(e)}), 500
 
 
+def build_ftr_merged_report(data):
+    """Merged FTR + Flash report PDF for the request body `data`, as (buffer, filename)"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib import colors
+    from reportlab.lib.units import mm
+    from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+    from app.services.pdf_styles import stylesheet, paragraph_style
+    from reportlab.lib.enums import TA_CENTER
+    from io import BytesIO
+    from datetime import datetime
+    import requests
+    from PyPDF2 import PdfMerger
+    from app.models.master_data import Production
+    
+    ftr_ids = data.get('ftr_ids', [])
+    include_flash = data.get('include_flash', True)
+    
+    if not ftr_ids:
+        raise ValueError('FTR IDs required')
+    
+    # Get production records
+    productions = Production.query.filter(Production.id.in_(ftr_ids)).all()
+    
+    if not productions:
+        raise LookupError('No FTR records found')
+    
+    # Create PDF report
+    buffer = BytesIO()
+    doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=15*mm, leftMargin=15*mm,
+                           topMargin=15*mm, bottomMargin=15*mm)
+    
+    styles = stylesheet()
+    title_style = paragraph_style('Title', parent='Heading1', fontSize=18, 
+                                  textColor=colors.HexColor('#667eea'), alignment=TA_CENTER, spaceAfter=10)
+    
+    story = []
+    
+    # Title Page
+    story.append(Spacer(1, 30*mm))
+    story.append(Paragraph(f"<b>FTR & FLASH TEST REPORT</b>", title_style))
+    story.append(Spacer(1, 10*mm))
+    story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
+    story.append(Paragraph(f"Total Modules: {len(productions)}", styles['Normal']))
+    story.append(PageBreak())
+    
+    # Index Page
+    story.append(Paragraph("<b>INDEX - Module Serial Numbers</b>", styles['Heading2']))
+    story.append(Spacer(1, 5*mm))
+    
+    index_data = [['Sr.', 'Serial Number', 'PDI Number', 'Production Date', 'Status', 'FTR', 'Flash']]
+    for idx, prod in enumerate(productions, 1):
+        has_ftr = '✓' if (hasattr(prod, 'ftr_document_path') and prod.ftr_document_path) else '✗'
+        has_flash = '✓' if (hasattr(prod, 'flash_document_path') and prod.flash_document_path) else '✗'
+        status = 'PASS' if not prod.is_rejected else 'FAIL'
+        
+        index_data.append([
+            str(idx),
+            prod.serial_number,
+            prod.pdi_number or 'N/A',
+            prod.production_date.strftime('%Y-%m-%d') if prod.production_date else 'N/A',
+            status,
+            has_ftr,
+            has_flash
+        ])
+    
+    index_table = Table(index_data, colWidths=[12*mm, 40*mm, 35*mm, 30*mm, 20*mm, 15*mm, 15*mm])
+    index_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 8),
+        ('GRID', (0, 0), (-1, -1), 1, colors.grey),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3e5f5')])
+    ]))
+    story.append(index_table)
+    
+    doc.build(story)
+    
+    # If include_flash is True, merge with actual FTR and Flash PDFs
+    if include_flash:
+        merger = PdfMerger()
+        
+        # Add main report
+        buffer.seek(0)
+        merger.append(buffer)
+        
+        # Try to fetch and add FTR and Flash PDFs
+        for prod in productions:
+            # Add FTR PDF
+            if hasattr(prod, 'ftr_document_path') and prod.ftr_document_path:
+                ftr_path = prod.ftr_document_path
+                # If it's a URL, fetch it
+                if ftr_path.startswith('http'):
+                    try:
+                        ftr_response = requests.get(ftr_path, timeout=10)
+                        if ftr_response.status_code == 200:
+                            ftr_buffer = BytesIO(ftr_response.content)
+                            merger.append(ftr_buffer)
+                    except Exception as e:
+                        print(f"Failed to fetch FTR PDF for {prod.serial_number}: {e}")
+                # If it's a local path
+                else:
+                    try:
+                        import os
+                        if os.path.exists(ftr_path):
+                            merger.append(ftr_path)
+                    except Exception as e:
+                        print(f"Failed to load FTR PDF for {prod.serial_number}: {e}")
+            
+            # Add Flash PDF
+            if hasattr(prod, 'flash_document_path') and prod.flash_document_path:
+                flash_path = prod.flash_document_path
+                # If it's a URL, fetch it
+                if flash_path.startswith('http'):
+                    try:
+                        flash_response = requests.get(flash_path, timeout=10)
+                        if flash_response.status_code == 200:
+                            flash_buffer = BytesIO(flash_response.content)
+                            merger.append(flash_buffer)
+                    except Exception as e:
+                        print(f"Failed to fetch Flash PDF for {prod.serial_number}: {e}")
+                # If it's a local path
+                else:
+                    try:
+                        import os
+                        if os.path.exists(flash_path):
+                            merger.append(flash_path)
+                    except Exception as e:
+                        print(f"Failed to load Flash PDF for {prod.serial_number}: {e}")
+        
+        # Write merged PDF
+        final_buffer = BytesIO()
+        merger.write(final_buffer)
+        merger.close()
+        buffer = final_buffer
+    
+    buffer.seek(0)
+    return buffer, f'FTR_Flash_Report_{datetime.now().strftime("%Y%m%d")}.pdf'
+
+
 @coc_bp.route('/ftr/generate-merged-report', methods=['POST'])
 def generate_ftr_merged_report():
     """Generate merged FTR + Flash report PDF"""
     try:
-        from reportlab.lib.pagesizes import A4
-        from reportlab.lib import colors
-        from reportlab.lib.units import mm
-        from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-        from reportlab.lib.enums import TA_CENTER
-        from io import BytesIO
-        from datetime import datetime
-        import requests
         from flask import send_file
-        from PyPDF2 import PdfMerger
-        from app.models.master_data import Production
-        
-        data = request.get_json()
-        ftr_ids = data.get('ftr_ids', [])
-        include_flash = data.get('include_flash', True)
-        
-        if not ftr_ids:
-            return jsonify({'error': 'FTR IDs required'}), 400
-        
-        # Get production records
-        productions = Production.query.filter(Production.id.in_(ftr_ids)).all()
-        
-        if not productions:
-            return jsonify({'error': 'No FTR records found'}), 404
-        
-        # Create PDF report
-        buffer = BytesIO()
-        doc = SimpleDocTemplate(buffer, pagesize=A4, rightMargin=15*mm, leftMargin=15*mm,
-                               topMargin=15*mm, bottomMargin=15*mm)
-        
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=18, 
-                                     textColor=colors.HexColor('#667eea'), alignment=TA_CENTER, spaceAfter=10)
-        
-        story = []
-        
-        # Title Page
-        story.append(Spacer(1, 30*mm))
-        story.append(Paragraph(f"<b>FTR & FLASH TEST REPORT</b>", title_style))
-        story.append(Spacer(1, 10*mm))
-        story.append(Paragraph(f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M')}", styles['Normal']))
-        story.append(Paragraph(f"Total Modules: {len(productions)}", styles['Normal']))
-        story.append(PageBreak())
-        
-        # Index Page
-        story.append(Paragraph("<b>INDEX - Module Serial Numbers</b>", styles['Heading2']))
-        story.append(Spacer(1, 5*mm))
-        
-        index_data = [['Sr.', 'Serial Number', 'PDI Number', 'Production Date', 'Status', 'FTR', 'Flash']]
-        for idx, prod in enumerate(productions, 1):
-            has_ftr = '✓' if (hasattr(prod, 'ftr_document_path') and prod.ftr_document_path) else '✗'
-            has_flash = '✓' if (hasattr(prod, 'flash_document_path') and prod.flash_document_path) else '✗'
-            status = 'PASS' if not prod.is_rejected else 'FAIL'
-            
-            index_data.append([
-                str(idx),
-                prod.serial_number,
-                prod.pdi_number or 'N/A',
-                prod.production_date.strftime('%Y-%m-%d') if prod.production_date else 'N/A',
-                status,
-                has_ftr,
-                has_flash
-            ])
-        
-        index_table = Table(index_data, colWidths=[12*mm, 40*mm, 35*mm, 30*mm, 20*mm, 15*mm, 15*mm])
-        index_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#667eea')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 8),
-            ('GRID', (0, 0), (-1, -1), 1, colors.grey),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#f3e5f5')])
-        ]))
-        story.append(index_table)
-        
-        doc.build(story)
-        
-        # If include_flash is True, merge with actual FTR and Flash PDFs
-        if include_flash:
-            merger = PdfMerger()
-            
-            # Add main report
-            buffer.seek(0)
-            merger.append(buffer)
-            
-            # Try to fetch and add FTR and Flash PDFs
-            for prod in productions:
-                # Add FTR PDF
-                if hasattr(prod, 'ftr_document_path') and prod.ftr_document_path:
-                    ftr_path = prod.ftr_document_path
-                    # If it's a URL, fetch it
-                    if ftr_path.startswith('http'):
-                        try:
-                            ftr_response = requests.get(ftr_path, timeout=10)
-                            if ftr_response.status_code == 200:
-                                ftr_buffer = BytesIO(ftr_response.content)
-                                merger.append(ftr_buffer)
-                        except Exception as e:
-                            print(f"Failed to fetch FTR PDF for {prod.serial_number}: {e}")
-                    # If it's a local path
-                    else:
-                        try:
-                            import os
-                            if os.path.exists(ftr_path):
-                                merger.append(ftr_path)
-                        except Exception as e:
-                            print(f"Failed to load FTR PDF for {prod.serial_number}: {e}")
-                
-                # Add Flash PDF
-                if hasattr(prod, 'flash_document_path') and prod.flash_document_path:
-                    flash_path = prod.flash_document_path
-                    # If it's a URL, fetch it
-                    if flash_path.startswith('http'):
-                        try:
-                            flash_response = requests.get(flash_path, timeout=10)
-                            if flash_response.status_code == 200:
-                                flash_buffer = BytesIO(flash_response.content)
-                                merger.append(flash_buffer)
-                        except Exception as e:
-                            print(f"Failed to fetch Flash PDF for {prod.serial_number}: {e}")
-                    # If it's a local path
-                    else:
-                        try:
-                            import os
-                            if os.path.exists(flash_path):
-                                merger.append(flash_path)
-                        except Exception as e:
-                            print(f"Failed to load Flash PDF for {prod.serial_number}: {e}")
-            
-            # Write merged PDF
-            final_buffer = BytesIO()
-            merger.write(final_buffer)
-            merger.close()
-            final_buffer.seek(0)
-            
-            return send_file(
-                final_buffer,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=f'FTR_Flash_Report_{datetime.now().strftime("%Y%m%d")}.pdf'
-            )
-        else:
-            buffer.seek(0)
-            return send_file(
-                buffer,
-                mimetype='application/pdf',
-                as_attachment=True,
-                download_name=f'FTR_Flash_Report_{datetime.now().strftime("%Y%m%d")}.pdf'
-            )
         
+        buffer, filename = build_ftr_merged_report(request.get_json() or {})
+        return send_file(
+            buffer,
+            mimetype='application/pdf',
+            as_attachment=True,
+            download_name=filename
+        )
+    
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except LookupError as e:
+        return jsonify({'error': str(e)}), 404
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -983,7 +878,7 @@ def generate_flash_report():
         from reportlab.lib import colors
         from reportlab.lib.units import mm
         from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-        from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+        from app.services.pdf_styles import stylesheet, paragraph_style
         from reportlab.lib.enums import TA_CENTER
         from io import BytesIO
         from datetime import datetime
@@ -1003,12 +898,12 @@ def generate_flash_report():
                                rightMargin=10*mm, leftMargin=10*mm,
                                topMargin=15*mm, bottomMargin=15*mm)
         
-        styles = getSampleStyleSheet()
-        title_style = ParagraphStyle('Title', parent=styles['Heading1'], fontSize=20, 
-                                     textColor=colors.HexColor('#1976d2'), 
-                                     alignment=TA_CENTER, spaceAfter=10)
-        subtitle_style = ParagraphStyle('Subtitle', parent=styles['Normal'], fontSize=12, 
-                                       alignment=TA_CENTER, spaceAfter=15)
+        styles = stylesheet()
+        title_style = paragraph_style('Title', parent='Heading1', fontSize=20, 
+                                      textColor=colors.HexColor('#1976d2'), 
+                                      alignment=TA_CENTER, spaceAfter=10)
+        subtitle_style = paragraph_style('Subtitle', parent='Normal', fontSize=12, 
+                                         alignment=TA_CENTER, spaceAfter=15)
         
         story = []
         
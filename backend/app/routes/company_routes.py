@@ -2,6 +2,12 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from app.models.database import db, Company, ProductionRecord, RejectedModule, BomMaterial
 from app.models.coc_tracking import COCUsageTracking
+from sqlalchemy import func, tuple_
+from sqlalchemy.orm import selectinload
+from app.services.serial_search import encode_cursor, decode_cursor, parse_page_size
+from app.services.serial_registry import record_serials
+# normalize_material_name lives with the local COC catalog mirror
+from app.services.coc_catalog import normalize_material_name, get_coc_catalog
 
 company_bp = Blueprint('company', __name__)
 
@@ -38,176 +44,200 @@ BOM_MATERIALS = [
     "RFID"              # material_id: 8 (added - was missing)
 ]
 
-# MRP API Material Name Mapping (API name -> normalized names for matching)
-MRP_MATERIAL_MAPPING = {
-    'solar cell': ['solar cell'],
-    'eva': ['eva'],
-    'glass': ['glass', 'front glass', 'back glass'],
-    'ribbon': ['ribbon', 'ribbon (0.26 mm)', 'ribbon (4.0x0.4)', 'ribbon (6.0x0.4)', 'ribbon(busbar) 4mm', 'ribbon(busbar) 6mm'],
-    'flux': ['flux'],
-    'epe': ['epe', 'epe front'],
-    'aluminium frame': ['aluminium frame', 'aluminum frame'],
-    'sealent': ['sealent', 'sealant'],
-    'jb potting': ['jb potting', 'jb potting (a and b)'],
-    'junction box': ['junction box'],
-    'rfid': ['rfid']
+# Keyword pairs: filter and material both containing one of these match
+MATERIAL_KEYWORDS = ('cell', 'glass', 'ribbon', 'eva', 'flux', 'bus', 'frame', 'sealent',
+                     'jb', 'potting', 'junction', 'rfid')
+
+
+def record_rejections(company_id, rejections, rejected=True):
+    """Mirror rejections into the serial registry; deleting one takes this table's rejection back"""
+    record_serials('rejected_modules', [{
+        'serial_number': rejection.serial_number,
+        'company_id': company_id,
+        'is_rejected': rejected,
+        'rejection_reason': (rejection.reason or None) if rejected else None
+    } for rejection in rejections])
+
+
+def material_matcher(material_filter):
+    """Predicate on a catalog MaterialGroup for a BOM material filter (lowercase)"""
+    if not material_filter:
+        return lambda group: True
+    normalized_filter = normalize_material_name(material_filter)
+    keywords = [k for k in MATERIAL_KEYWORDS if k in material_filter]
+
+    def match(group):
+        material_name = group.name
+        # Normalized material matching
+        if group.key and normalized_filter and group.key == normalized_filter:
+            return True
+        # Fallback: material_name matches filter directly
+        if material_filter in material_name or material_name in material_filter:
+            return True
+        # Special cases for common materials
+        return any(k in material_name for k in keywords)
+    return match
+
+# Child collections of a company that /api/companies can expand, newest first
+# name -> (model, sort columns, eager-load options)
+COMPANY_CHILDREN = {
+    'productionRecords': (ProductionRecord, lambda: (ProductionRecord.date, ProductionRecord.id),
+                          lambda: (selectinload(ProductionRecord.bom_materials),)),
+    'rejectedModules': (RejectedModule, lambda: (RejectedModule.rejection_date, RejectedModule.id),
+                        lambda: ()),
 }
+CHILD_PAGE_SIZE = 100
+
+
+def company_stats(company_ids):
+    """Per-company counts with two grouped queries -> {company_id: {...}}"""
+    stats = {company_id: {} for company_id in company_ids}
+    if not company_ids:
+        return stats
+    records = db.session.query(
+        ProductionRecord.company_id,
+        func.count(ProductionRecord.id),
+        func.count(func.distinct(func.nullif(ProductionRecord.pdi, ''))),
+        func.sum(ProductionRecord.day_production + ProductionRecord.night_production),
+        func.max(ProductionRecord.date)
+    ).filter(ProductionRecord.company_id.in_(company_ids)).group_by(ProductionRecord.company_id)
+    for company_id, count, pdis, total, last_date in records:
+        stats[company_id].update({
+            'production_records': count,
+            'pdis': pdis,
+            'total_production': int(total or 0),
+            'last_production_date': last_date.strftime('%Y-%m-%d') if last_date else None
+        })
+    rejected = db.session.query(RejectedModule.company_id, func.count(RejectedModule.id)) \
+        .filter(RejectedModule.company_id.in_(company_ids)).group_by(RejectedModule.company_id)
+    for company_id, count in rejected:
+        stats[company_id]['rejected_modules'] = count
+    return stats
+
+
+def _child_cursor(item, sort_columns):
+    return encode_cursor([getattr(item, column.key) for column in sort_columns])
+
+
+def first_child_pages(name, company_ids, limit):
+    """First `limit` children of each company in one windowed query -> {company_id: (items, cursor)}"""
+    model, sort_columns, options = COMPANY_CHILDREN[name]
+    sort_columns = sort_columns()
+    order = [column.desc() for column in sort_columns]
+    position = func.row_number().over(partition_by=model.company_id, order_by=order).label('position')
+    ranked = db.session.query(model.id.label('id'), position) \
+        .filter(model.company_id.in_(company_ids)).subquery()
+    items = model.query.options(*options()) \
+        .join(ranked, ranked.c.id == model.id) \
+        .filter(ranked.c.position <= limit + 1) \
+        .order_by(model.company_id, *order).all()
+
+    pages = {company_id: ([], None) for company_id in company_ids}
+    grouped = {}
+    for item in items:
+        grouped.setdefault(item.company_id, []).append(item)
+    for company_id, children in grouped.items():
+        cursor = _child_cursor(children[limit - 1], sort_columns) if len(children) > limit else None
+        pages[company_id] = (children[:limit], cursor)
+    return pages
+
+
+def child_page(name, company_id, limit, cursor=None):
+    """One keyset page of a company's children (newest first) -> (items, next cursor)"""
+    model, sort_columns, options = COMPANY_CHILDREN[name]
+    sort_columns = sort_columns()
+    query = model.query.options(*options()).filter(model.company_id == company_id)
+    after = decode_cursor(cursor)
+    if after and len(after) == len(sort_columns):
+        # Both collections sort by a date column first
+        after[0] = datetime.strptime(after[0], '%Y-%m-%d').date()
+        query = query.filter(tuple_(*sort_columns) < tuple_(*after))
+    items = query.order_by(*[column.desc() for column in sort_columns]).limit(limit + 1).all()
+    next_cursor = _child_cursor(items[limit - 1], sort_columns) if len(items) > limit else None
+    return items[:limit], next_cursor
 
-def normalize_material_name(material_name):
-    """Normalize material name for matching with MRP API"""
-    if not material_name:
-        return None
-    
-    name_lower = material_name.lower().strip()
-    
-    # Find matching MRP category
-    for mrp_name, variations in MRP_MATERIAL_MAPPING.items():
-        if name_lower in variations or mrp_name in name_lower:
-            return mrp_name
-    
-    return name_lower
 
 # Get all companies
 @company_bp.route('/api/companies', methods=['GET'])
 def get_companies():
+    """
+    Company list as summaries: company fields + productionRecordCount, rejectedModuleCount,
+    pdiCount, totalProduction and lastProductionDate (no child rows).
+    
+    ?expand=productionRecords,rejectedModules,iqcData  add the newest `limit` (default 100)
+        children of each collection with a <collection>Cursor for
+        /api/companies/<id>/production-records / rejected-modules
+    ?view=full  the old payload: every company with all of its children
+    """
     try:
-        companies = Company.query.all()
-        return jsonify([company.to_dict() for company in companies]), 200
+        if request.args.get('view') == 'full':
+            companies = Company.query.options(
+                selectinload(Company.production_records).selectinload(ProductionRecord.bom_materials),
+                selectinload(Company.rejected_modules)
+            ).all()
+            return jsonify([company.to_dict() for company in companies]), 200
+        
+        expand = {name.strip() for name in request.args.get('expand', '').split(',') if name.strip()}
+        limit = parse_page_size(request.args.get('limit'), CHILD_PAGE_SIZE)
+        
+        companies = Company.query.order_by(Company.id).all()
+        company_ids = [company.id for company in companies]
+        stats = company_stats(company_ids)
+        children = {name: first_child_pages(name, company_ids, limit)
+                    for name in COMPANY_CHILDREN if name in expand and company_ids}
+        
+        result = []
+        for company in companies:
+            item = company.to_summary_dict(stats[company.id], iqc_data='iqcData' in expand)
+            for name, pages in children.items():
+                items, cursor = pages[company.id]
+                item[name] = [child.to_dict() for child in items]
+                item[f'{name}Cursor'] = cursor
+            result.append(item)
+        return jsonify(result), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def _company_children(name, company_id):
+    try:
+        Company.query.get_or_404(company_id)
+        limit = parse_page_size(request.args.get('limit'), CHILD_PAGE_SIZE)
+        items, cursor = child_page(name, company_id, limit, request.args.get('cursor'))
+        return jsonify({
+            'success': True,
+            'data': [item.to_dict() for item in items],
+            'nextCursor': cursor
+        }), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+# Page through a company's production records / rejected modules (newest first)
+@company_bp.route('/api/companies/<int:company_id>/production-records', methods=['GET'])
+def get_company_production_records(company_id):
+    return _company_children('productionRecords', company_id)
+
+@company_bp.route('/api/companies/<int:company_id>/rejected-modules', methods=['GET'])
+def get_company_rejected_modules(company_id):
+    return _company_children('rejectedModules', company_id)
+
 # Get unique supplier/company names from BOM materials
 @company_bp.route('/api/bom-suppliers', methods=['GET'])
 def get_bom_suppliers():
     try:
-        import requests
-        from datetime import datetime, timedelta
-        
         # Get material name filter from query params
         material_filter = request.args.get('material', '').lower()
-        print(f"🔍 BOM Suppliers Request - Material Filter: {material_filter}")
         
-        # Fetch COC data from API to get company names
-        COC_API_URL = 'https://umanmrp.in/api/coc_api.php'
-        
-        # Get last 6 months data
-        to_date = datetime.now().strftime('%Y-%m-%d')
-        from_date = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d')
-        
-        post_data = {
-            'from': from_date,
-            'to': to_date
-        }
-        
-        print(f"🌐 Calling COC API: {COC_API_URL}")
-        print(f"📅 Date Range: {from_date} to {to_date}")
-        
-        # Fetch from COC API
-        response = requests.post(COC_API_URL, json=post_data, timeout=10)
-        print(f"✅ COC API Status: {response.status_code}")
+        # COC documents of matching materials from the local catalog mirror, FIFO (oldest invoice first)
+        documents = get_coc_catalog().fifo_documents(material_matcher(material_filter))
         
+        # Extract unique brands while maintaining FIFO order
+        seen_brands = set()
         suppliers = []
-        
-        if response.status_code == 200:
-            coc_data = response.json()
-            print(f"📦 COC API Response Type: {type(coc_data)}")
-            print(f"📋 COC API Keys: {coc_data.keys() if isinstance(coc_data, dict) else 'Not a dict'}")
-            
-            # Extract COC documents with date info for FIFO
-            coc_documents_list = []
-            
-            if isinstance(coc_data, dict) and 'data' in coc_data:
-                coc_documents = coc_data['data']
-                print(f"✅ Using coc_data['data'] - {len(coc_documents)} documents")
-            elif isinstance(coc_data, list):
-                coc_documents = coc_data
-                print(f"✅ Using coc_data directly - {len(coc_documents)} documents")
-            else:
-                coc_documents = []
-                print("❌ COC data format not recognized")
-            
-            # Collect COC documents with brand and date for FIFO sorting
-            matched_count = 0
-            for doc in coc_documents:
-                if isinstance(doc, dict) and doc.get('brand'):
-                    # COC API uses 'material_name' not 'specification'
-                    material_name = doc.get('material_name', '').lower()
-                    brand = doc.get('brand')
-                    invoice_date = doc.get('invoice_date', '')
-                    
-                    # Filter by material type if provided using normalized matching
-                    should_include = False
-                    if material_filter:
-                        # Use normalized material matching
-                        normalized_api_material = normalize_material_name(material_name)
-                        normalized_filter = normalize_material_name(material_filter)
-                        
-                        if normalized_api_material and normalized_filter:
-                            if normalized_api_material == normalized_filter:
-                                should_include = True
-                        
-                        # Fallback: Check if material_name matches filter directly
-                        if not should_include:
-                            if material_filter in material_name or material_name in material_filter:
-                                should_include = True
-                            # Special cases for common materials
-                            elif 'cell' in material_filter and 'cell' in material_name:
-                                should_include = True
-                            elif 'glass' in material_filter and 'glass' in material_name:
-                                should_include = True
-                            elif 'ribbon' in material_filter and 'ribbon' in material_name:
-                                should_include = True
-                            elif 'eva' in material_filter and 'eva' in material_name:
-                                should_include = True
-                            elif 'flux' in material_filter and 'flux' in material_name:
-                                should_include = True
-                            elif 'bus' in material_filter and 'bus' in material_name:
-                                should_include = True
-                            elif 'frame' in material_filter and 'frame' in material_name:
-                                should_include = True
-                            elif 'sealent' in material_filter and 'sealent' in material_name:
-                                should_include = True
-                            elif 'jb' in material_filter and 'jb' in material_name:
-                                should_include = True
-                            elif 'potting' in material_filter and 'potting' in material_name:
-                                should_include = True
-                            elif 'junction' in material_filter and 'junction' in material_name:
-                                should_include = True
-                            elif 'rfid' in material_filter and 'rfid' in material_name:
-                                should_include = True
-                    else:
-                        # No filter - add all
-                        should_include = True
-                    
-                    if should_include:
-                        coc_documents_list.append({
-                            'brand': brand,
-                            'invoice_date': invoice_date
-                        })
-                        matched_count += 1
-            
-            print(f"🎯 Matched {matched_count} companies for filter '{material_filter}'")
-            
-            # FIFO sorting - oldest invoice first
-            try:
-                from datetime import datetime
-                coc_documents_list.sort(key=lambda x: datetime.strptime(x['invoice_date'], '%Y-%m-%d') if x['invoice_date'] else datetime.min)
-                print(f"📅 FIFO Sorted by invoice date (oldest first)")
-            except Exception as e:
-                print(f"⚠️ Could not sort by date: {e}")
-            
-            # Extract unique brands while maintaining FIFO order
-            seen_brands = set()
-            suppliers = []
-            for doc in coc_documents_list:
-                brand = doc['brand']
-                if brand not in seen_brands:
-                    seen_brands.add(brand)
-                    suppliers.append(brand)
-            
-            print(f"✅ Returning {len(suppliers)} suppliers (FIFO ordered): {suppliers[:5]}...")
-        else:
-            print(f"❌ COC API failed with status: {response.status_code}")
+        for doc in documents:
+            brand = doc.get('brand')
+            if brand and brand not in seen_brands:
+                seen_brands.add(brand)
+                suppliers.append(brand)
         
         return jsonify({'suppliers': suppliers}), 200
     except Exception as e:
@@ -219,7 +249,10 @@ def get_bom_suppliers():
 @company_bp.route('/api/companies/<int:company_id>', methods=['GET'])
 def get_company(company_id):
     try:
-        company = Company.query.get_or_404(company_id)
+        company = Company.query.options(
+            selectinload(Company.production_records).selectinload(ProductionRecord.bom_materials),
+            selectinload(Company.rejected_modules)
+        ).get_or_404(company_id)
         return jsonify(company.to_dict()), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 404
@@ -278,6 +311,8 @@ def update_company(company_id):
 def delete_company(company_id):
     try:
         company = Company.query.get_or_404(company_id)
+        # Its rejected_modules rows go with it (cascade)
+        record_rejections(company_id, company.rejected_modules, rejected=False)
         db.session.delete(company)
         db.session.commit()
         
@@ -379,14 +414,12 @@ def add_production_record(company_id):
         # Auto-consume materials only if production > 0
         if total_production > 0:
             from app.services.coc_service import COCService
-            for material_name, quantity in material_requirements.items():
-                COCService.consume_material(
-                    company.company_name,
-                    material_name,
-                    quantity,
-                    record.date,
-                    pdi  # Use PDI number instead of lot number
-                )
+            COCService.allocate_materials(
+                company.company_name,
+                material_requirements,
+                record.date,
+                pdi  # Use PDI number instead of lot number
+            )
         
         # Initialize BOM materials for this record (14 fixed materials for both shifts)
         for material_name in BOM_MATERIALS:
@@ -517,6 +550,7 @@ def add_rejected_module(company_id):
         )
         
         db.session.add(rejection)
+        record_rejections(company_id, [rejection])
         db.session.commit()
         
         return jsonify(rejection.to_dict()), 201
@@ -544,6 +578,7 @@ def bulk_add_rejections(company_id):
             rejections.append(rejection)
         
         db.session.add_all(rejections)
+        record_rejections(company_id, rejections)
         db.session.commit()
         
         return jsonify({'message': f'{len(rejections)} rejections added successfully'}), 201
@@ -556,6 +591,7 @@ def bulk_add_rejections(company_id):
 def delete_rejected_module(company_id, rejection_id):
     try:
         rejection = RejectedModule.query.filter_by(id=rejection_id, company_id=company_id).first_or_404()
+        record_rejections(company_id, [rejection], rejected=False)
         db.session.delete(rejection)
         db.session.commit()
         
@@ -569,6 +605,7 @@ def delete_rejected_module(company_id, rejection_id):
 def delete_all_rejections(company_id):
     try:
         company = Company.query.get_or_404(company_id)
+        record_rejections(company_id, RejectedModule.query.filter_by(company_id=company_id).all(), rejected=False)
         RejectedModule.query.filter_by(company_id=company_id).delete()
         db.session.commit()
         
@@ -4,6 +4,7 @@ from sqlalchemy import text
 from datetime import datetime
 import pymysql
 from config import Config
+from app.services.serial_registry import record_serials, unassign_pdi
 
 ftr_management_bp = Blueprint('ftr_management', __name__)
 
@@ -169,6 +170,7 @@ def upload_master_ftr():
         new_inserted = 0
         updated = 0
         skipped = 0
+        registry_rows = []
         
         for sn in serial_numbers:
             # Handle both simple string and object with details
@@ -230,7 +232,17 @@ def upload_master_ftr():
                     'file_name': file_name
                 })
                 new_inserted += 1
+            
+            registry_rows.append({
+                'serial_number': serial,
+                'company_id': company_id,
+                'pmax': pmax,
+                'binning': binning,
+                'class_status': class_status,
+                'is_rejected': class_status == 'REJECTED'
+            })
         
+        record_serials('ftr_master_serials', registry_rows)
         db.session.commit()
         
         # Get actual total in database now
@@ -280,6 +292,7 @@ def upload_rejection_data():
         updated_count = 0
         not_found_count = 0
         already_rejected = 0
+        registry_rows = []
         
         for sn in serial_numbers:
             # Handle both simple string and object
@@ -321,7 +334,11 @@ def upload_rejection_data():
                 """), {'company_id': company_id, 'serial_number': serial, 'file_name': file_name})
                 not_found_count += 1
                 updated_count += 1
+            
+            registry_rows.append({'serial_number': serial, 'company_id': company_id,
+                                  'class_status': 'REJECTED', 'is_rejected': True})
         
+        record_serials('ftr_master_serials', registry_rows)
         db.session.commit()
         
         return jsonify({
@@ -377,6 +394,9 @@ def assign_serials_to_pdi():
                 WHERE id = :id
             """), {'pdi_number': pdi_number, 'assigned_date': assigned_date, 'id': row[0]})
         
+        record_serials('ftr_master_serials', [
+            {'serial_number': row[1], 'company_id': company_id, 'pdi_number': pdi_number} for row in available
+        ])
         db.session.commit()
         
         return jsonify({
@@ -417,6 +437,7 @@ def assign_serials_excel():
         assigned_count = 0
         already_assigned_count = 0
         assigned_date = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        registry_rows = []
         
         # Deduplicate serials within the batch
         seen = set()
@@ -465,12 +486,16 @@ def assign_serials_excel():
                         "INSERT INTO pdi_serial_numbers (pdi_number, serial_number, company_id, created_at) VALUES (%s, %s, %s, NOW())",
                         (pdi_number, sn, company_id)
                     )
+                
+                registry_rows.append({'serial_number': sn, 'company_id': company_id, 'pdi_number': pdi_number})
                     
             except Exception as row_err:
                 print(f"Error processing serial {sn}: {row_err}")
                 # Don't rollback — just skip this one serial and continue
                 continue
         
+        record_serials('pdi_serial_numbers', registry_rows, cursor=cursor)
+        
         # Single commit at end — all or nothing
         conn.commit()
         cursor.close()
@@ -522,6 +547,9 @@ def upload_packed_modules():
                 'packed_date': packed_date
             })
         
+        record_serials('ftr_packed_modules', [
+            {'serial_number': sn, 'company_id': company_id, 'packed_at': packed_date} for sn in serial_numbers
+        ])
         db.session.commit()
         
         return jsonify({
@@ -537,21 +565,28 @@ def upload_packed_modules():
 
 @ftr_management_bp.route('/ftr/master-serials/<int:company_id>', methods=['GET'])
 def get_master_serials(company_id):
-    """Get all master FTR serial numbers for a company with search"""
+    """Get all master FTR serial numbers for a company with search
+    (see /ftr/serials/<company_id> for cursor paging over large sets)"""
     try:
+        from app.services.serial_search import serial_search_ready, serial_filter, count_rows
+
         search = request.args.get('search', '').strip()
+        match = request.args.get('match', 'contains')
         page = int(request.args.get('page', 1))
         page_size = int(request.args.get('page_size', 100))
 
         base_query = "FROM ftr_master_serials WHERE company_id = :company_id"
         params = {'company_id': company_id}
         if search:
-            base_query += " AND serial_number LIKE :search"
-            params['search'] = f'%{search}%'
+            has_reversed = serial_search_ready('ftr_master_serials')
+            condition, search_params, _ = serial_filter(
+                search, match, reversed_column='serial_reversed' if has_reversed else None
+            )
+            base_query += f" AND {condition}"
+            params.update(search_params)
 
-        # Get total count
-        count_result = db.session.execute(text(f"SELECT COUNT(*) {base_query}"), params)
-        total = count_result.scalar() or 0
+        # Get total count (estimated above EXACT_COUNT_LIMIT rows)
+        total, total_exact = count_rows(base_query, params)
 
         # Get paginated data
         offset = (page - 1) * page_size
@@ -576,6 +611,7 @@ def get_master_serials(company_id):
             'success': True,
             'serials': serials,
             'total': total,
+            'total_exact': total_exact,
             'page': page,
             'page_size': page_size
         })
@@ -585,6 +621,108 @@ def get_master_serials(company_id):
         return jsonify({'success': False, 'message': str(e)}), 500
 
 
+@ftr_management_bp.route('/ftr/serials/<int:company_id>', methods=['GET'])
+def list_serials_keyset(company_id):
+    """
+    Serial listing with keyset (cursor) pagination and indexed search.
+    Query params:
+      search      - serial search term
+      match       - auto | prefix | suffix | exact | contains (default auto)
+      status      - available | assigned | used
+      pdi_number  - only serials assigned to this PDI
+      rejected    - 1 for rejected serials only, 0 for OK only
+      limit       - page size (max 1000)
+      cursor      - next_cursor from the previous page
+    """
+    try:
+        from app.services.serial_search import (
+            serial_search_ready, serial_filter, encode_cursor,
+            decode_cursor, parse_page_size, count_rows
+        )
+
+        search = request.args.get('search', '').strip()
+        match = request.args.get('match', 'auto')
+        status = request.args.get('status', '').strip()
+        pdi_number = request.args.get('pdi_number', '').strip()
+        rejected = request.args.get('rejected', '').strip()
+        limit = parse_page_size(request.args.get('limit'))
+        cursor = decode_cursor(request.args.get('cursor'))
+
+        has_reversed = serial_search_ready('ftr_master_serials')
+
+        where = "FROM ftr_master_serials WHERE company_id = :company_id"
+        params = {'company_id': company_id}
+
+        condition, search_params, mode = serial_filter(
+            search, match, reversed_column='serial_reversed' if has_reversed else None
+        )
+        if condition:
+            where += f" AND {condition}"
+            params.update(search_params)
+        if status:
+            where += " AND status = :status"
+            params['status'] = status
+        if pdi_number:
+            where += " AND pdi_number = :pdi_number"
+            params['pdi_number'] = pdi_number
+        if rejected == '1':
+            where += " AND class_status IN ('REJECTED', 'REJECT', 'REJ', 'NG', 'FAIL')"
+        elif rejected == '0':
+            where += " AND (class_status = 'OK' OR class_status IS NULL)"
+
+        # Total is only needed for the first page
+        total, total_exact = (None, None)
+        if cursor is None:
+            total, total_exact = count_rows(where, params)
+
+        page_where = where
+        page_params = dict(params)
+        if cursor and cursor.get('id'):
+            page_where += " AND id < :after_id"
+            page_params['after_id'] = int(cursor['id'])
+
+        rows = db.session.execute(text(f"""
+            SELECT id, serial_number, pmax, binning, class_status, status, pdi_number,
+                   upload_date, assigned_date, file_name
+            {page_where}
+            ORDER BY id DESC
+            LIMIT :limit
+        """), {**page_params, 'limit': limit + 1}).fetchall()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        serials = []
+        for row in rows:
+            serials.append({
+                'serial_number': row[1],
+                'pmax': float(row[2]) if row[2] else None,
+                'binning': row[3],
+                'class_status': row[4],
+                'status': row[5],
+                'pdi_number': row[6],
+                'upload_date': row[7].strftime('%Y-%m-%d %H:%M:%S') if row[7] else None,
+                'assigned_date': row[8].strftime('%Y-%m-%d %H:%M:%S') if row[8] else None,
+                'file_name': row[9]
+            })
+
+        return jsonify({
+            'success': True,
+            'serials': serials,
+            'count': len(serials),
+            'limit': limit,
+            'match': mode,
+            'has_more': has_more,
+            'next_cursor': encode_cursor({'id': rows[-1][0]}) if has_more and rows else None,
+            'total': total,
+            'total_exact': total_exact
+        })
+
+    except Exception as e:
+        print(f"Error listing serials: {str(e)}")
+        return jsonify({'success': False, 'message': str(e)}), 500
+
+
 @ftr_management_bp.route('/ftr/rejection-serials/<int:company_id>', methods=['GET'])
 def get_rejection_serials(company_id):
     """Get all rejection serial numbers for a company with search"""
@@ -709,6 +847,7 @@ def delete_pdi_assignment(company_id, pdi_number):
             SET status = 'available', pdi_number = NULL, assigned_date = NULL
             WHERE company_id = :company_id AND pdi_number = :pdi_number
         """), {'company_id': company_id, 'pdi_number': pdi_number})
+        unassign_pdi(company_id, pdi_number)
         
         db.session.commit()
         
@@ -750,6 +889,8 @@ def delete_single_serial(company_id, serial_number):
             SET status = 'available', pdi_number = NULL, assigned_date = NULL
             WHERE company_id = :company_id AND serial_number = :serial_number
         """), {'company_id': company_id, 'serial_number': serial_number})
+        if serial[1]:
+            unassign_pdi(company_id, serial[1], serial_number)
         
         db.session.commit()
         
@@ -3,12 +3,19 @@ FTR (Field Test Report) Routes
 """
 
 from flask import Blueprint, request, jsonify, send_file
-from app.services.ftr_pdf_generator import create_ftr_report
+from app.services.ftr_pdf_generator import create_ftr_report, render_ftr_batch
+from app.services.excel_export import send_temp_file
+from app.services.serial_registry import record_serials, DISPATCH_REGISTRY_REPLACE
+from app.services.serial_reconcile import (
+    reconcile, dispatch_serials, normalize_serial, LEFT_ONLY, RIGHT_ONLY, ALL_KINDS
+)
 from config import Config
 import os
+import tempfile
 import pymysql
 import requests as http_requests
 from datetime import datetime
+from operator import itemgetter
 import time
 
 ftr_bp = Blueprint('ftr', __name__, url_prefix='/api/ftr')
@@ -66,27 +73,12 @@ def generate_ftr_report():
         if not data:
             return jsonify({"error": "No data provided"}), 400
         
-        # Get template path
-        backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
-        template_path = os.path.join(backend_dir, '..', 'frontend', 'public', 'IV curve template.pdf')
-        
+        template_path = _ftr_template_path()
         if not os.path.exists(template_path):
             return jsonify({"error": "Template PDF not found"}), 404
         
         # Get graph image path based on module power
-        module_power = data.get('modulePower')
-        graph_image_path = None
-        
-        if module_power:
-            graph_image_path = os.path.join(
-                backend_dir, '..', 'frontend', 'public', 'iv_curves', 
-                f'{module_power}.png'
-            )
-            
-            # Check if graph exists
-            if not os.path.exists(graph_image_path):
-                print(f"Graph image not found: {graph_image_path}")
-                graph_image_path = None
+        graph_image_path = _graph_image_path(data.get('modulePower'))
         
         # Generate PDF
         pdf_output = create_ftr_report(template_path, data, graph_image_path)
@@ -110,6 +102,99 @@ def generate_ftr_report():
         return jsonify({"error": str(e)}), 500
 
 
+@ftr_bp.route('/generate-batch', methods=['POST'])
+def generate_ftr_batch():
+    """
+    Generate FTR PDFs for many serials in one request
+    
+    Expected JSON payload:
+    {
+        "reports": [ {...same fields as /generate-report...}, ... ],
+        "output": "pdf" | "zip",   // one multi-page PDF (default) or a ZIP with one PDF per serial
+        "workers": 4               // optional process pool size, capped at FTR_RENDER_WORKERS
+    }
+    """
+    try:
+        data = request.json or {}
+        reports = data.get('reports') or []
+        output = (data.get('output') or 'pdf').lower()
+        
+        if not reports:
+            return jsonify({"error": "No reports provided"}), 400
+        if output not in ('pdf', 'zip'):
+            return jsonify({"error": "output must be 'pdf' or 'zip'"}), 400
+        
+        template_path = _ftr_template_path()
+        if not os.path.exists(template_path):
+            return jsonify({"error": "Template PDF not found"}), 404
+        
+        output_path = _render_ftr_batch_file(template_path, reports, output, data.get('workers'))
+        
+        filename = f"FTR_Reports_{len(reports)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output}"
+        mimetype = 'application/zip' if output == 'zip' else 'application/pdf'
+        return send_temp_file(output_path, filename, mimetype)
+        
+    except Exception as e:
+        print(f"Error generating FTR batch: {e}")
+        import traceback
+        traceback.print_exc()
+        return jsonify({"error": str(e)}), 500
+
+
+def _ftr_template_path():
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    return os.path.join(backend_dir, '..', 'frontend', 'public', 'IV curve template.pdf')
+
+
+def _graph_image_path(module_power):
+    """IV curve image for a module power, None if there is none"""
+    if not module_power:
+        return None
+    backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    graph_image_path = os.path.join(
+        backend_dir, '..', 'frontend', 'public', 'iv_curves', 
+        f'{module_power}.png'
+    )
+    
+    # Check if graph exists
+    if not os.path.exists(graph_image_path):
+        print(f"Graph image not found: {graph_image_path}")
+        return None
+    return graph_image_path
+
+
+def _render_ftr_batch_file(template_path, reports, output='pdf', workers=None, output_path=None):
+    """Render a list of FTR report payloads into one PDF / ZIP file, returns its path"""
+    from flask import current_app
+    
+    # One existence check per module power, not per serial
+    graph_paths = {}
+    items = []
+    for report in reports:
+        power = report.get('modulePower')
+        if power not in graph_paths:
+            graph_paths[power] = _graph_image_path(power)
+        items.append(dict(report, graphImagePath=graph_paths[power]))
+    
+    if output_path is None:
+        fd, output_path = tempfile.mkstemp(suffix=f'.{output}')
+        os.close(fd)
+    # The client may ask for fewer processes, never more than the server allows
+    limit = current_app.config.get('FTR_RENDER_WORKERS') or 1
+    try:
+        workers = max(1, min(int(workers), limit)) if workers else limit
+    except (TypeError, ValueError):
+        workers = limit
+    try:
+        stats = render_ftr_batch(template_path, items, output_path, output=output, workers=workers)
+    except Exception:
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        raise
+    print(f"FTR batch rendered: {stats}")
+    return output_path
+
+
 @ftr_bp.route('/test', methods=['GET'])
 def test_ftr():
     """Test endpoint to verify FTR routes are working"""
@@ -194,6 +279,7 @@ def upload_master_ftr():
         
         inserted_count = 0
         duplicate_count = 0
+        registry_rows = []
         
         for serial in serial_numbers:
             serial_number = serial.get('serialNumber')
@@ -222,12 +308,14 @@ def upload_master_ftr():
                 """, (serial_number, wattage, company_id))
                 
                 inserted_count += 1
+                registry_rows.append({'serial_number': serial_number, 'company_id': company_id})
                 print(f"Inserted: {serial_number}")
                 
             except Exception as e:
                 print(f"Error inserting serial {serial_number}: {e}")
                 continue
         
+        record_serials('master_ftr', registry_rows, cursor=cursor)
         conn.commit()
         cursor.close()
         conn.close()
@@ -287,6 +375,7 @@ def assign_pdi_serials():
         
         inserted_count = 0
         duplicate_count = 0
+        registry_rows = []
         
         for serial in serial_numbers:
             serial_number = serial.get('serialNumber')
@@ -315,6 +404,8 @@ def assign_pdi_serials():
                 """, (pdi_number, serial_number, company_id))
                 
                 inserted_count += 1
+                registry_rows.append({'serial_number': serial_number, 'company_id': company_id,
+                                      'pdi_number': pdi_number})
                 print(f"Assigned: {serial_number} to {pdi_number}")
                 
             except Exception as e:
@@ -332,6 +423,7 @@ def assign_pdi_serials():
             except Exception as e:
                 print(f"Error updating ftr_uploaded flag: {e}")
         
+        record_serials('pdi_serial_numbers', registry_rows, cursor=cursor)
         conn.commit()
         cursor.close()
         conn.close()
@@ -725,6 +817,18 @@ def normalize_company_name(name):
     return name
 
 
+def _dispatch_registry_rows(barcodes):
+    """Serial registry facts for barcodes parsed from the MRP dispatch history"""
+    synced_at = datetime.now()
+    return [{
+        'serial_number': barcode['serial_number'],
+        'pallet_no': barcode['pallet_no'],
+        'packed_at': barcode['dispatch_date'] or synced_at,
+        'dispatch_party': barcode['dispatch_party'] or None,
+        'dispatched_at': (barcode['dispatch_date'] or synced_at.date()) if barcode['dispatch_party'] else None
+    } for barcode in barcodes]
+
+
 # Party Dispatch History API
 DISPATCH_HISTORY_API = 'https://umanmrp.in/api/party-dispatch-history.php'
 
@@ -846,6 +950,8 @@ def auto_sync_mrp_cache(matched_company, party_id):
                         barcode['company'],
                         barcode['party_id']
                     ))
+                record_serials('mrp_dispatch_cache', _dispatch_registry_rows(all_barcodes),
+                               replace=DISPATCH_REGISTRY_REPLACE, cursor=cursor)
                 conn.commit()
             conn.close()
             print(f"[Auto Sync] Saved {len(all_barcodes)} barcodes to local cache")
@@ -1518,7 +1624,7 @@ def get_pdi_production_status(company_id):
             print(f"[PDI Production] total FTR query error: {e}")
 
         # 6. Get ALL serials per PDI for dispatch cross-reference (no status filter)
-        pdi_serials_map = {}
+        local_serials = []  # (serial, pdi)
         try:
             cursor.execute("""
                 SELECT serial_number, pdi_number
@@ -1529,15 +1635,11 @@ def get_pdi_production_status(company_id):
                 pdi = row['pdi_number']
                 serial = row['serial_number']
                 if pdi and serial and not serial.strip().startswith('20'):
-                    if pdi not in pdi_serials_map:
-                        pdi_serials_map[pdi] = []
-                    pdi_serials_map[pdi].append(serial.strip())
-            print(f"[PDI Production] Total serials from FTR: {sum(len(s) for s in pdi_serials_map.values())} across {len(pdi_serials_map)} PDIs")
+                    local_serials.append((serial.strip(), pdi))
+            print(f"[PDI Production] Total serials from FTR: {len(local_serials)} across {len(set(pdi for _, pdi in local_serials))} PDIs")
             # Print sample serial for debug
-            if pdi_serials_map:
-                first_pdi = list(pdi_serials_map.keys())[0]
-                if pdi_serials_map[first_pdi]:
-                    print(f"[PDI Production] Sample local serial: {pdi_serials_map[first_pdi][0]}")
+            if local_serials:
+                print(f"[PDI Production] Sample local serial: {local_serials[0][0]}")
         except Exception as e:
             print(f"[PDI Production] serial fetch error: {e}")
 
@@ -1622,7 +1724,7 @@ def get_pdi_production_status(company_id):
         # OLD API = real-time with pallet/vehicle/date details (limit=10000)
         # NEW API = historical backup for older data (barcodes_only)
         dispatched_serials_set = set()
-        dispatched_details = {}  # serial -> {pallet_no, dispatch_party, vehicle_no, date}
+        dispatched_details = {}  # serial -> {pallet_no, dispatch_party, vehicle_no, date, status}
         dispatch_api_error = None
         
         if party_id:
@@ -1663,26 +1765,15 @@ def get_pdi_production_status(company_id):
                             total_old_entries += len(dispatch_summary)
                             print(f"[PDI Production] OLD API page {page}: {len(dispatch_summary)} entries")
                             
-                            for dispatch in dispatch_summary:
-                                dispatch_date = dispatch.get('dispatch_date', '')
-                                vehicle_no = dispatch.get('vehicle_no', '')
-                                invoice_no = dispatch.get('invoice_no', '')
-                                pallet_nos = dispatch.get('pallet_nos', {})
-                                
-                                if isinstance(pallet_nos, dict):
-                                    for pallet_no, barcodes_str in pallet_nos.items():
-                                        if isinstance(barcodes_str, str):
-                                            serials = barcodes_str.strip().split()
-                                            for serial in serials:
-                                                serial = serial.strip().upper()
-                                                if serial:
-                                                    dispatched_serials_set.add(serial)
-                                                    dispatched_details[serial] = {
-                                                        'pallet_no': pallet_no,
-                                                        'dispatch_party': invoice_no,
-                                                        'vehicle_no': vehicle_no,
-                                                        'date': dispatch_date
-                                                    }
+                            for serial, dispatch, pallet_no in dispatch_serials(dispatch_summary):
+                                dispatched_serials_set.add(serial)
+                                dispatched_details[serial] = {
+                                    'pallet_no': pallet_no,
+                                    'dispatch_party': dispatch.get('invoice_no', ''),
+                                    'vehicle_no': dispatch.get('vehicle_no', ''),
+                                    'date': dispatch.get('dispatch_date', ''),
+                                    'status': 'Dispatched'
+                                }
                             
                             page += 1
                         else:
@@ -1725,7 +1816,8 @@ def get_pdi_production_status(company_id):
                                                 'pallet_no': '',
                                                 'dispatch_party': '',
                                                 'vehicle_no': '',
-                                                'date': ''
+                                                'date': '',
+                                                'status': 'Dispatched'
                                             }
                                             new_count += 1
                             print(f"[PDI Production] NEW API added {new_count} extra serials (backup)")
@@ -1744,8 +1836,22 @@ def get_pdi_production_status(company_id):
                 import traceback
                 traceback.print_exc()
         
-        # 6d. Now categorize each PDI's serials into 3 categories
-        for pdi, serials in pdi_serials_map.items():
+        # 6d. One pass over local serials vs MRP (dispatched + packed) serials:
+        #     local + dispatched / packed / not in MRP (not packed), MRP only -> extra.
+        #     A dispatch record replaces the packing record, so the matched record's
+        #     status says which of the two the serial reached.
+        mrp_serials = {**packed_lookup, **dispatched_details}
+        
+        def add_to_pallet(groups, pallet_no, status, serial):
+            pallet_key = pallet_no or 'Unknown'
+            if pallet_key not in groups:
+                groups[pallet_key] = {'pallet_no': pallet_key, 'status': status, 'count': 0, 'serials': []}
+            groups[pallet_key]['count'] += 1
+            if len(groups[pallet_key]['serials']) < 50:
+                groups[pallet_key]['serials'].append(serial)
+        
+        # PDIs in the order their first serial was read
+        for pdi in dict.fromkeys(map(itemgetter(1), local_serials)):
             pdi_dispatch_data[pdi] = {
                 'dispatched': 0,
                 'packed': 0,
@@ -1755,64 +1861,57 @@ def get_pdi_production_status(company_id):
                 'not_packed_serials': [],
                 'pallet_groups': {}
             }
+        
+        extra_dispatched_keys = []
+        extra_packed_keys = []
+        # Local serials are already stripped
+        local_pairs = zip(map(str.upper, map(itemgetter(0), local_serials)), local_serials)
+        for kind, key, local, mrp, _ in reconcile(local_pairs, mrp_serials, kinds=ALL_KINDS):
+            if kind is RIGHT_ONLY:
+                # Extra — serial dispatched / packed for the party but NOT in any local PDI
+                (extra_dispatched_keys if mrp['status'] == 'Dispatched' else extra_packed_keys).append(key)
+                continue
             
-            for serial in serials:
-                serial_upper = serial.strip().upper()
-                
-                if serial_upper in dispatched_serials_set:
-                    # DISPATCHED - in live dispatch API
-                    pdi_dispatch_data[pdi]['dispatched'] += 1
-                    dispatch_info = dispatched_details.get(serial_upper, {})
-                    packing_info = packed_lookup.get(serial_upper, {})
-                    pallet_no = dispatch_info.get('pallet_no') or packing_info.get('pallet_no') or ''
-                    pdi_dispatch_data[pdi]['dispatched_serials'].append({
-                        'serial': serial,
-                        'pallet_no': pallet_no,
-                        'dispatch_party': dispatch_info.get('dispatch_party', ''),
-                        'vehicle_no': dispatch_info.get('vehicle_no', ''),
-                        'date': dispatch_info.get('date', ''),
-                        'sub_party': packing_info.get('party_name', ''),
-                        'status': 'Dispatched'
-                    })
-                    # Add to pallet group
-                    pallet_key = pallet_no or 'Unknown'
-                    if pallet_key not in pdi_dispatch_data[pdi]['pallet_groups']:
-                        pdi_dispatch_data[pdi]['pallet_groups'][pallet_key] = {
-                            'pallet_no': pallet_key, 'status': 'Dispatched', 'count': 0, 'serials': []
-                        }
-                    pdi_dispatch_data[pdi]['pallet_groups'][pallet_key]['count'] += 1
-                    if len(pdi_dispatch_data[pdi]['pallet_groups'][pallet_key]['serials']) < 50:
-                        pdi_dispatch_data[pdi]['pallet_groups'][pallet_key]['serials'].append(serial)
-                        
-                elif serial_upper in packed_lookup:
-                    # PACKED (NOT DISPATCHED) - in packing API but not dispatch cache
-                    pdi_dispatch_data[pdi]['packed'] += 1
-                    packing_info = packed_lookup[serial_upper]
-                    pdi_dispatch_data[pdi]['packed_serials'].append({
-                        'serial': serial,
-                        'pallet_no': packing_info.get('pallet_no', ''),
-                        'party_name': packing_info.get('party_name', ''),
-                        'sub_party': packing_info.get('party_name', ''),
-                        'status': 'Packed'
-                    })
-                    # Add to pallet group
-                    pallet_no = packing_info.get('pallet_no') or 'Unknown'
-                    if pallet_no not in pdi_dispatch_data[pdi]['pallet_groups']:
-                        pdi_dispatch_data[pdi]['pallet_groups'][pallet_no] = {
-                            'pallet_no': pallet_no, 'status': 'Packed', 'count': 0, 'serials': []
-                        }
-                    pdi_dispatch_data[pdi]['pallet_groups'][pallet_no]['count'] += 1
-                    if len(pdi_dispatch_data[pdi]['pallet_groups'][pallet_no]['serials']) < 50:
-                        pdi_dispatch_data[pdi]['pallet_groups'][pallet_no]['serials'].append(serial)
-                        
-                else:
-                    # NOT PACKED - not in packing API at all
-                    pdi_dispatch_data[pdi]['not_packed'] += 1
-                    pdi_dispatch_data[pdi]['not_packed_serials'].append({
-                        'serial': serial,
-                        'pallet_no': '',
-                        'status': 'Not Packed'
-                    })
+            serial, pdi = local
+            pdi_data = pdi_dispatch_data[pdi]
+            
+            if kind is LEFT_ONLY:
+                # NOT PACKED - not in packing API at all
+                pdi_data['not_packed'] += 1
+                pdi_data['not_packed_serials'].append({
+                    'serial': serial,
+                    'pallet_no': '',
+                    'status': 'Not Packed'
+                })
+                continue
+            
+            packing_info = packed_lookup.get(key, {})
+            if mrp['status'] == 'Dispatched':
+                dispatch_info = mrp
+                # DISPATCHED - in live dispatch API
+                pdi_data['dispatched'] += 1
+                pallet_no = dispatch_info.get('pallet_no') or packing_info.get('pallet_no') or ''
+                pdi_data['dispatched_serials'].append({
+                    'serial': serial,
+                    'pallet_no': pallet_no,
+                    'dispatch_party': dispatch_info.get('dispatch_party', ''),
+                    'vehicle_no': dispatch_info.get('vehicle_no', ''),
+                    'date': dispatch_info.get('date', ''),
+                    'sub_party': packing_info.get('party_name', ''),
+                    'status': 'Dispatched'
+                })
+                add_to_pallet(pdi_data['pallet_groups'], pallet_no, 'Dispatched', serial)
+            else:
+                # PACKED (NOT DISPATCHED) - in packing API but not dispatch cache
+                pdi_data['packed'] += 1
+                pdi_data['packed_serials'].append({
+                    'serial': serial,
+                    'pallet_no': packing_info.get('pallet_no', ''),
+                    'party_name': packing_info.get('party_name', ''),
+                    'sub_party': packing_info.get('party_name', ''),
+                    'status': 'Packed'
+                })
+                add_to_pallet(pdi_data['pallet_groups'], packing_info.get('pallet_no'), 'Packed', serial)
         
         total_dispatched = sum(d['dispatched'] for d in pdi_dispatch_data.values())
         total_packed = sum(d['packed'] for d in pdi_dispatch_data.values())
@@ -1833,24 +1932,19 @@ def get_pdi_production_status(company_id):
         print(f"[PDI Production] Debug: LIVE mode, last_refresh={last_refresh_time}")
         
         # Collect sample serials for debugging format mismatches
-        all_local_serials = []
-        for pdi, serials in pdi_serials_map.items():
-            all_local_serials.extend([s.strip().upper() for s in serials])
-        
         sample_mrp_barcodes = list(dispatched_serials_set)[:5] if dispatched_serials_set else []
         sample_packed_barcodes = list(packed_lookup.keys())[:5] if packed_lookup else []
-        sample_local_serials = all_local_serials[:5] if all_local_serials else []
+        sample_local_serials = [normalize_serial(serial) for serial, _ in local_serials[:5]]
         
-        # Count exact matches
-        local_set = set(all_local_serials)
-        dispatch_matches = len(local_set.intersection(dispatched_serials_set))
-        packed_matches = len(local_set.intersection(set(packed_lookup.keys())))
+        # Count exact matches - every MRP serial is either matched by a local serial or extra
+        dispatch_matches = len(dispatched_details) - len(extra_dispatched_keys)
+        packed_matches = len(packed_lookup) - sum(1 for key in extra_dispatched_keys + extra_packed_keys
+                                                  if key in packed_lookup)
         
         # 7a. Extra Dispatched — serials dispatched to party but NOT in any local PDI
-        extra_dispatched_set = dispatched_serials_set - local_set
         extra_dispatched_serials = []
         extra_pallet_groups = {}
-        for serial in sorted(extra_dispatched_set):
+        for serial in sorted(extra_dispatched_keys):
             detail = dispatched_details.get(serial, {})
             pallet_no = detail.get('pallet_no', '')
             packing_info = packed_lookup.get(serial, {})
@@ -1865,25 +1959,16 @@ def get_pdi_production_status(company_id):
                 'sub_party': packing_info.get('party_name', ''),
                 'status': 'Extra Dispatched'
             })
-            pallet_key = pallet_no or 'Unknown'
-            if pallet_key not in extra_pallet_groups:
-                extra_pallet_groups[pallet_key] = {
-                    'pallet_no': pallet_key, 'status': 'Extra Dispatched', 'count': 0, 'serials': []
-                }
-            extra_pallet_groups[pallet_key]['count'] += 1
-            if len(extra_pallet_groups[pallet_key]['serials']) < 50:
-                extra_pallet_groups[pallet_key]['serials'].append(serial)
+            add_to_pallet(extra_pallet_groups, pallet_no, 'Extra Dispatched', serial)
         
-        extra_dispatched_count = len(extra_dispatched_set)
+        extra_dispatched_count = len(extra_dispatched_keys)
         extra_pallet_list = sorted(extra_pallet_groups.values(), key=lambda x: str(x['pallet_no']))
         print(f"[PDI Production] Extra Dispatched (not in any PDI): {extra_dispatched_count} serials, {len(extra_pallet_list)} pallets")
         
         # 7b. Extra Packed — serials packed but NOT in any local PDI (and not dispatched)
-        packed_serials_set = set(packed_lookup.keys())
-        extra_packed_set = packed_serials_set - local_set - dispatched_serials_set
         extra_packed_serials = []
         extra_packed_pallet_groups = {}
-        for serial in sorted(extra_packed_set):
+        for serial in sorted(extra_packed_keys):
             packing_info = packed_lookup.get(serial, {})
             pallet_no = packing_info.get('pallet_no', '')
             extra_packed_serials.append({
@@ -1894,16 +1979,9 @@ def get_pdi_production_status(company_id):
                 'running_order': packing_info.get('running_order', ''),
                 'status': 'Extra Packed'
             })
-            pallet_key = pallet_no or 'Unknown'
-            if pallet_key not in extra_packed_pallet_groups:
-                extra_packed_pallet_groups[pallet_key] = {
-                    'pallet_no': pallet_key, 'status': 'Extra Packed', 'count': 0, 'serials': []
-                }
-            extra_packed_pallet_groups[pallet_key]['count'] += 1
-            if len(extra_packed_pallet_groups[pallet_key]['serials']) < 50:
-                extra_packed_pallet_groups[pallet_key]['serials'].append(serial)
+            add_to_pallet(extra_packed_pallet_groups, pallet_no, 'Extra Packed', serial)
         
-        extra_packed_count = len(extra_packed_set)
+        extra_packed_count = len(extra_packed_keys)
         extra_packed_pallet_list = sorted(extra_packed_pallet_groups.values(), key=lambda x: str(x['pallet_no']))
         print(f"[PDI Production] Extra Packed (not in any PDI): {extra_packed_count} serials, {len(extra_packed_pallet_list)} pallets")
         
@@ -1921,7 +1999,7 @@ def get_pdi_production_status(company_id):
             'live_packed_count': len(packed_lookup),
             'mrp_barcodes_total': len(dispatched_serials_set),
             'packed_barcodes_total': len(packed_lookup),
-            'local_serials_total': len(all_local_serials),
+            'local_serials_total': len(local_serials),
             'dispatch_matches': dispatch_matches,
             'packed_matches': packed_matches,
             'sample_mrp_barcodes': sample_mrp_barcodes,
@@ -2074,15 +2152,15 @@ def export_not_packed_serials(company_id):
     """
     Export Not Packed serials to Excel for a company.
     Returns Excel file with serial numbers grouped by PDI.
+    Query param format=csv returns the serial list as CSV instead.
     """
     try:
-        import io
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
-        from flask import send_file
+        from app.services.excel_export import ExcelExport, csv_response
+        
+        export_format = request.args.get('format', 'xlsx').lower()
         
         conn = get_db_connection()
-        cursor = conn.cursor(dictionary=True)
+        cursor = conn.cursor()
         
         # Get company info
         cursor.execute("SELECT * FROM companies WHERE id = %s", (company_id,))
@@ -2163,81 +2241,35 @@ def export_not_packed_serials(company_id):
         
         conn.close()
         
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = "Not Packed Serials"
-        
-        # Styles
-        header_font = Font(bold=True, color="FFFFFF")
-        header_fill = PatternFill(start_color="4472C4", end_color="4472C4", fill_type="solid")
-        thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+        def not_packed_rows():
+            serial_no = 0
+            for pdi in sorted(not_packed_by_pdi.keys()):
+                for serial in not_packed_by_pdi[pdi]:
+                    serial_no += 1
+                    yield (serial_no, pdi, serial, "Not Packed")
         
-        # Headers
         headers = ["S.No", "PDI Number", "Serial Number", "Status"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col, value=header)
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center')
-            cell.border = thin_border
-        
-        # Data
-        row_num = 2
-        serial_no = 1
-        for pdi in sorted(not_packed_by_pdi.keys()):
-            for serial in not_packed_by_pdi[pdi]:
-                ws.cell(row=row_num, column=1, value=serial_no).border = thin_border
-                ws.cell(row=row_num, column=2, value=pdi).border = thin_border
-                ws.cell(row=row_num, column=3, value=serial).border = thin_border
-                ws.cell(row=row_num, column=4, value="Not Packed").border = thin_border
-                row_num += 1
-                serial_no += 1
-        
-        # Adjust column widths
-        ws.column_dimensions['A'].width = 8
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 30
-        ws.column_dimensions['D'].width = 12
+        filename = f"not_packed_serials_{company_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         
-        # Summary sheet
-        ws2 = wb.create_sheet("Summary")
-        ws2.cell(row=1, column=1, value="Company").font = Font(bold=True)
-        ws2.cell(row=1, column=2, value=company_name)
-        ws2.cell(row=2, column=1, value="Total PDIs").font = Font(bold=True)
-        ws2.cell(row=2, column=2, value=len(not_packed_by_pdi))
-        ws2.cell(row=3, column=1, value="Total Not Packed").font = Font(bold=True)
-        ws2.cell(row=3, column=2, value=serial_no - 1)
-        ws2.cell(row=4, column=1, value="Export Date").font = Font(bold=True)
-        ws2.cell(row=4, column=2, value=datetime.now().strftime('%Y-%m-%d %H:%M'))
-        
-        # PDI-wise summary
-        ws2.cell(row=6, column=1, value="PDI Number").font = Font(bold=True)
-        ws2.cell(row=6, column=2, value="Not Packed Count").font = Font(bold=True)
-        row = 7
-        for pdi in sorted(not_packed_by_pdi.keys()):
-            ws2.cell(row=row, column=1, value=pdi)
-            ws2.cell(row=row, column=2, value=len(not_packed_by_pdi[pdi]))
-            row += 1
-        
-        # Save to buffer
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        
-        filename = f"not_packed_serials_{company_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        if export_format == 'csv':
+            return csv_response(f"{filename}.csv", headers, not_packed_rows())
         
-        return send_file(
-            buffer,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
-        )
+        export = ExcelExport(header_font_color='FFFFFF', border=True)
+        total_not_packed = export.add_sheet("Not Packed Serials", headers, not_packed_rows(), widths=[8, 15, 30, 12])
+        
+        # Summary sheet
+        summary = [
+            ("Company", company_name),
+            ("Total PDIs", len(not_packed_by_pdi)),
+            ("Total Not Packed", total_not_packed),
+            ("Export Date", datetime.now().strftime('%Y-%m-%d %H:%M')),
+            (None, None),
+            ("PDI Number", "Not Packed Count"),
+        ]
+        summary.extend((pdi, len(not_packed_by_pdi[pdi])) for pdi in sorted(not_packed_by_pdi.keys()))
+        export.add_key_value_sheet("Summary", summary)
+        
+        return export.send(f"{filename}.xlsx")
         
     except Exception as e:
         print(f"[Export] Error: {e}")
@@ -2254,7 +2286,13 @@ def sync_mrp_dispatch():
     Sync dispatch data from MRP API to local cache table.
     Fetches last 1 year of data for specified company.
     Loops through pages 1-1000 to get ALL data.
+    
+    Progress is recorded in the job registry (job_type 'mrp_dispatch_sync', ref = company).
+    An optional "job_id" (UUID) in the body lets the client poll /api/jobs/<job_id> while this runs
+    (409 if that id is already taken).
     """
+    from app.services.job_registry import JobRegistry, JobIdInUse
+    job_id = None
     try:
         data = request.get_json() or {}
         company_name = data.get('company', '')
@@ -2287,6 +2325,14 @@ def sync_mrp_dispatch():
         to_date = datetime.now().strftime('%Y-%m-%d')
         from_date = (datetime.now() - timedelta(days=365)).strftime('%Y-%m-%d')
         
+        try:
+            job_id = JobRegistry.create('mrp_dispatch_sync', ref=matched_company, job_id=data.get('job_id'),
+                                        message='Fetching dispatch pages...', state='running')
+        except ValueError:
+            return jsonify({"success": False, "error": "job_id must be a UUID"}), 400
+        except JobIdInUse as e:
+            return jsonify({"success": False, "error": str(e)}), 409
+        
         print(f"[MRP Sync] Company: {company_name}, Party ID: {party_id}")
         print(f"[MRP Sync] Date range: {from_date} to {to_date}")
         
@@ -2358,17 +2404,20 @@ def sync_mrp_dispatch():
                                     page_count += 1
             
             print(f"[MRP Sync] Page {page}: {len(dispatch_summary)} dispatches, {page_count} serials (Total: {len(all_barcodes)})")
+            JobRegistry.update(job_id, message=f'Fetched page {page} ({len(all_barcodes):,} serials)',
+                               counters={'pages': page, 'fetched': len(all_barcodes)})
         
         print(f"[MRP Sync] Total barcodes fetched: {len(all_barcodes)}")
         
         # Save to local database
+        JobRegistry.update(job_id, current=0, total=len(all_barcodes), message='Saving to cache...', force=True)
         conn = get_db_connection()
         inserted = 0
         updated = 0
         
         try:
             with conn.cursor() as cursor:
-                for barcode in all_barcodes:
+                for idx, barcode in enumerate(all_barcodes, 1):
                     # Use INSERT ... ON DUPLICATE KEY UPDATE
                     cursor.execute("""
                         INSERT INTO mrp_dispatch_cache 
@@ -2400,7 +2449,13 @@ def sync_mrp_dispatch():
                         inserted += 1
                     elif cursor.rowcount == 2:
                         updated += 1
+                    
+                    if idx % 500 == 0:
+                        JobRegistry.update(job_id, current=idx, total=len(all_barcodes),
+                                           message=f'Saving to cache... {idx:,} / {len(all_barcodes):,}')
                 
+                record_serials('mrp_dispatch_cache', _dispatch_registry_rows(all_barcodes),
+                               replace=DISPATCH_REGISTRY_REPLACE, cursor=cursor)
                 conn.commit()
                 
                 # Get total count
@@ -2410,8 +2465,13 @@ def sync_mrp_dispatch():
         finally:
             conn.close()
         
+        JobRegistry.complete(job_id, counters={
+            'fetched': len(all_barcodes), 'inserted': inserted, 'updated': updated, 'total_in_cache': total_in_db
+        })
+        
         return jsonify({
             "success": True,
+            "job_id": job_id,
             "company": matched_company,
             "party_id": party_id,
             "date_range": {"from": from_date, "to": to_date},
@@ -2423,6 +2483,7 @@ def sync_mrp_dispatch():
         
     except Exception as e:
         print(f"[MRP Sync] Error: {e}")
+        JobRegistry.fail(job_id, e)
         import traceback
         traceback.print_exc()
         return jsonify({"success": False, "error": str(e)}), 500
@@ -2467,38 +2528,85 @@ def mrp_cache_stats():
 
 @ftr_bp.route('/mrp-cache-search', methods=['GET'])
 def mrp_cache_search():
-    """Search serials in MRP cache"""
+    """Search serials in MRP cache
+    
+    match=auto|prefix|suffix|exact|contains (default contains) controls the serial search,
+    company/pallet are substring matches unless another match is requested, then prefix.
+    Pass next_cursor back as cursor to get the following page.
+    """
     try:
+        from app.services.serial_search import (
+            serial_search_ready, resolve_match_mode, escape_like,
+            encode_cursor, decode_cursor, parse_page_size
+        )
+        
         serial = request.args.get('serial', '').strip().upper()
         company = request.args.get('company', '')
         pallet = request.args.get('pallet', '')
-        limit = int(request.args.get('limit', 100))
+        match = request.args.get('match', 'contains')
+        limit = parse_page_size(request.args.get('limit'))
+        cursor = decode_cursor(request.args.get('cursor'))
+        
+        has_reversed = serial_search_ready('mrp_dispatch_cache')
+        mode = resolve_match_mode(serial, match) if serial else None
+        if mode == 'suffix' and not has_reversed:
+            mode = 'contains'
         
         conn = get_db_connection()
-        with conn.cursor() as cursor:
+        with conn.cursor() as cursor_db:
             query = "SELECT * FROM mrp_dispatch_cache WHERE 1=1"
             params = []
             
             if serial:
-                query += " AND serial_number LIKE %s"
-                params.append(f"%{serial}%")
+                if mode == 'exact':
+                    query += " AND serial_number = %s"
+                    params.append(serial)
+                elif mode == 'prefix':
+                    query += " AND serial_number LIKE %s"
+                    params.append(f"{escape_like(serial)}%")
+                elif mode == 'suffix':
+                    query += " AND serial_reversed LIKE %s"
+                    params.append(f"{escape_like(serial[::-1])}%")
+                else:
+                    query += " AND serial_number LIKE %s"
+                    params.append(f"%{escape_like(serial)}%")
             if company:
                 query += " AND company LIKE %s"
-                params.append(f"%{company}%")
+                params.append(f"%{escape_like(company)}%" if match == 'contains' else f"{escape_like(company)}%")
             if pallet:
                 query += " AND pallet_no LIKE %s"
-                params.append(f"%{pallet}%")
-            
-            query += " ORDER BY synced_at DESC LIMIT %s"
-            params.append(limit)
+                params.append(f"%{escape_like(pallet)}%" if match == 'contains' else f"{escape_like(pallet)}%")
+            # Keyset pages over idx_synced_keyset (synced_at, id). NULL synced_at sorts last
+            # in DESC order and a row comparison never matches it, so the NULL rows are
+            # paged separately by id once the dated rows run out.
+            if cursor and cursor.get('id') and cursor.get('synced_at') is None:
+                pages = [(" AND synced_at IS NULL AND id < %s", [int(cursor['id'])], " ORDER BY id DESC")]
+            elif cursor and cursor.get('id'):
+                pages = [(" AND (synced_at, id) < (%s, %s)", [cursor['synced_at'], int(cursor['id'])],
+                          " ORDER BY synced_at DESC, id DESC"),
+                         (" AND synced_at IS NULL", [], " ORDER BY id DESC")]
+            else:
+                pages = [("", [], " ORDER BY synced_at DESC, id DESC")]
             
-            cursor.execute(query, params)
-            results = cursor.fetchall()
+            results = []
+            for where, page_params, order in pages:
+                wanted = limit + 1 - len(results)
+                if wanted <= 0:
+                    break
+                cursor_db.execute(query + where + order + " LIMIT %s", params + page_params + [wanted])
+                results.extend(cursor_db.fetchall())
             
         conn.close()
         
+        has_more = len(results) > limit
+        results = results[:limit]
+        next_cursor = None
+        if has_more and results:
+            next_cursor = encode_cursor({'synced_at': results[-1].get('synced_at'), 'id': results[-1]['id']})
+        
         # Convert dates to strings
         for r in results:
+            r.pop('serial_reversed', None)
             if r.get('dispatch_date'):
                 r['dispatch_date'] = str(r['dispatch_date'])
             if r.get('synced_at'):
@@ -2507,6 +2615,9 @@ def mrp_cache_search():
         return jsonify({
             "success": True,
             "count": len(results),
+            "match": mode,
+            "has_more": has_more,
+            "next_cursor": next_cursor,
             "results": results
         })
         
@@ -4,6 +4,9 @@ import base64
 from datetime import datetime
 from werkzeug.utils import secure_filename
 import json
+import hashlib
+import tempfile
+from app.services.multipart_stream import read_multipart
 
 ftr_upload_bp = Blueprint('ftr_upload', __name__)
 
@@ -150,16 +153,178 @@ def serve_graph_image(filename):
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
+def _ftr_filename(serial_number, digest):
+    """Stored name: serial + content hash, so the same PDF for the same serial is stored once"""
+    serial_number = str(serial_number).replace('/', '_').replace('\\', '_')
+    return secure_filename(f"FTR_{serial_number}_{digest[:12]}.pdf")
+
+
+def _store_pdf(filepath, temp_path=None, pdf_bytes=None):
+    """Move a finished temp file to `filepath`, or write the bytes there"""
+    if temp_path:
+        os.replace(temp_path, filepath)
+    else:
+        with open(filepath, 'wb') as f:
+            f.write(pdf_bytes)
+
+
+class _BulkUploadResults:
+    """
+    Per-file results of a bulk upload. Every serial gets its own file; identical
+    content (same SHA-256) in one batch is hard-linked to the first copy where
+    the filesystem allows it instead of being written again.
+    """
+    
+    def __init__(self):
+        self.results = []
+        self.by_hash = {}  # sha256 -> (serial number, absolute path) of the first copy
+    
+    def add(self, serial_number, digest, size, temp_path=None, pdf_bytes=None, meta=None):
+        """
+        Store one PDF (from a finished temp file or from bytes) and record the result.
+        A temp file that is not moved into place is left for the caller to remove.
+        """
+        meta = meta or {}
+        result = {
+            'serialNumber': serial_number,
+            'moduleType': meta.get('moduleType', ''),
+            'pmax': meta.get('pmax', 0),
+            'sha256': digest,
+            'size': size
+        }
+        
+        filename = _ftr_filename(serial_number, digest)
+        filepath = os.path.join(UPLOAD_FOLDER, filename)
+        first = self.by_hash.get(digest)
+        if first and first[1] != filepath:
+            result.update({'status': 'duplicate', 'duplicateOf': first[0]})
+            if not os.path.exists(filepath):
+                try:
+                    os.link(first[1], filepath)
+                except OSError:
+                    _store_pdf(filepath, temp_path, pdf_bytes)
+        elif os.path.exists(filepath):
+            result['status'] = 'exists'
+        else:
+            result['status'] = 'saved'
+            _store_pdf(filepath, temp_path, pdf_bytes)
+        # Return relative path for database storage
+        result['filePath'] = f"/uploads/ftr_reports/{filename}"
+        self.by_hash.setdefault(digest, (serial_number, filepath))
+        
+        self.results.append(result)
+        return result
+    
+    def error(self, serial_number, message):
+        self.results.append({'serialNumber': serial_number, 'status': 'error', 'error': message})
+    
+    def response(self):
+        # 'files' keeps the original response shape: every report that has a stored file
+        files = [
+            {'serialNumber': r['serialNumber'], 'filePath': r['filePath'],
+             'moduleType': r['moduleType'], 'pmax': r['pmax']}
+            for r in self.results if r['status'] != 'error'
+        ]
+        counts = {}
+        for r in self.results:
+            counts[r['status']] = counts.get(r['status'], 0) + 1
+        return {
+            'success': True,
+            'message': f'{len(files)} FTR reports uploaded successfully',
+            'files': files,
+            'results': self.results,
+            'counts': counts
+        }
+
+
+class _PdfPartSink:
+    """Writes one multipart file part to a temp file in UPLOAD_FOLDER while hashing it"""
+    
+    def __init__(self, upload, serial_number, meta_lookup):
+        self.upload = upload
+        self.serial_number = serial_number
+        self.meta_lookup = meta_lookup
+        self.hash = hashlib.sha256()
+        self.size = 0
+        self.head = b''
+        self.file = tempfile.NamedTemporaryFile(dir=UPLOAD_FOLDER, suffix='.part', delete=False)
+    
+    def write(self, data):
+        if len(self.head) < 5:
+            self.head += data[:5 - len(self.head)]
+        self.hash.update(data)
+        self.size += len(data)
+        self.file.write(data)
+    
+    def close(self, complete=True):
+        try:
+            self.file.close()
+            meta = self.meta_lookup(self.serial_number)
+            serial_number = meta.get('serialNumber') or self.serial_number
+            if not complete:
+                self.upload.error(serial_number, 'Upload interrupted')
+            elif not self.head.startswith(b'%PDF'):
+                self.upload.error(serial_number, 'Not a PDF file' if self.size else 'Empty file')
+            else:
+                self.upload.add(serial_number, self.hash.hexdigest(), self.size, temp_path=self.file.name, meta=meta)
+        finally:
+            # Whatever was not moved into place (rejected, duplicate, failed) is removed
+            if os.path.exists(self.file.name):
+                os.remove(self.file.name)
+
+
+def _upload_bulk_multipart():
+    """
+    multipart/form-data: optional 'meta' field (JSON list of {serialNumber, moduleType, pmax},
+    send it before the files) followed by one 'files' part per PDF. Without meta the
+    serial number is the file name without .pdf.
+    """
+    boundary = request.mimetype_params.get('boundary')
+    if not boundary:
+        return jsonify({'error': 'Missing multipart boundary'}), 400
+    
+    upload = _BulkUploadResults()
+    meta_by_serial = {}
+    
+    def on_field(name, value):
+        if name == 'meta':
+            for item in json.loads(value or '[]'):
+                if item.get('serialNumber'):
+                    meta_by_serial[str(item['serialNumber'])] = item
+    
+    def open_file(name, filename):
+        serial_number = os.path.splitext(os.path.basename(filename or ''))[0] or 'unknown'
+        return _PdfPartSink(upload, serial_number, lambda serial: meta_by_serial.get(serial, {}))
+    
+    read_multipart(request.stream, boundary, on_field, open_file)
+    
+    if not upload.results:
+        return jsonify({'error': 'No files provided'}), 400
+    return jsonify(upload.response()), 200
+
+
 @ftr_upload_bp.route('/api/ftr/upload-bulk', methods=['POST'])
 def upload_bulk_ftr():
-    """Upload multiple FTR PDFs and return their file paths"""
+    """
+    Upload multiple FTR PDFs and return their file paths
+    
+    Preferred: multipart/form-data, streamed to disk part by part (see _upload_bulk_multipart).
+    Legacy: JSON {"reports": [{"pdfData": "<base64>", "serialNumber", "moduleType", "pmax"}]}
+    
+    Every PDF is identified by its SHA-256 and stored under its own serial; identical content
+    in one batch is hard-linked to the first copy.
+    'results' has one entry per file with status saved / exists / duplicate / error.
+    """
     try:
+        if request.mimetype == 'multipart/form-data':
+            return _upload_bulk_multipart()
+        
         data = request.json
         
         if not data or 'reports' not in data:
             return jsonify({'error': 'No reports data provided'}), 400
         
-        uploaded_files = []
+        upload = _BulkUploadResults()
         
         for report in data['reports']:
             if 'pdfData' not in report or 'serialNumber' not in report:
@@ -170,34 +335,19 @@ def upload_bulk_ftr():
             if pdf_data.startswith('data:application/pdf;base64,'):
                 pdf_data = pdf_data.replace('data:application/pdf;base64,', '')
             
-            pdf_bytes = base64.b64decode(pdf_data)
-            
-            # Generate filename
-            serial_number = report['serialNumber'].replace('/', '_').replace('\\', '_')
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            filename = f"FTR_{serial_number}_{timestamp}.pdf"
-            filename = secure_filename(filename)
-            
-            # Save file
-            filepath = os.path.join(UPLOAD_FOLDER, filename)
-            with open(filepath, 'wb') as f:
-                f.write(pdf_bytes)
-            
-            # Return relative path for database storage
-            relative_path = f"/uploads/ftr_reports/{filename}"
+            try:
+                pdf_bytes = base64.b64decode(pdf_data)
+            except Exception:
+                upload.error(report['serialNumber'], 'Invalid base64 data')
+                continue
+            if not pdf_bytes.startswith(b'%PDF'):
+                upload.error(report['serialNumber'], 'Not a PDF file')
+                continue
             
-            uploaded_files.append({
-                'serialNumber': report['serialNumber'],
-                'filePath': relative_path,
-                'moduleType': report.get('moduleType', ''),
-                'pmax': report.get('pmax', 0)
-            })
+            upload.add(report['serialNumber'], hashlib.sha256(pdf_bytes).hexdigest(), len(pdf_bytes),
+                       pdf_bytes=pdf_bytes, meta=report)
         
-        return jsonify({
-            'success': True,
-            'message': f'{len(uploaded_files)} FTR reports uploaded successfully',
-            'files': uploaded_files
-        }), 200
+        return jsonify(upload.response()), 200
         
     except Exception as e:
         print(f"Error uploading FTR reports: {str(e)}")
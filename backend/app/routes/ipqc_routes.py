@@ -1,17 +1,19 @@
 """
 IPQC API Routes
 """
-from flask import Blueprint, request, jsonify, send_file, current_app
+from flask import Blueprint, request, jsonify, current_app, Response, stream_with_context
 from werkzeug.utils import secure_filename
-import os
+import io
 import json
-import zipfile
 from datetime import datetime
 
 from app.services.form_generator import IPQCFormGenerator
 from app.services.pdf_generator import IPQCPDFGenerator, SerialNumberGenerator
 from app.services.excel_generator import generate_ipqc_excel
-from app.services.ipqc_checksheet_generator import generate_ipqc_checksheet
+from app.services.ipqc_checksheet_generator import write_ipqc_checksheet, checksheet_filename
+from app.services.zip_stream import stream_zip
+from app.services.artifact_store import send_artifact
+from app.services.serial_registry import record_serials
 from app.models.ipqc_data import BOMData
 
 ipqc_bp = Blueprint('ipqc', __name__)
@@ -148,6 +150,88 @@ def generate_ipqc():
         }), 500
 
 
+@ipqc_bp.route('/generate-batch', methods=['POST'])
+def generate_ipqc_batch():
+    """
+    Generate many IPQC shift forms in one call (e.g. backfilling a month)
+
+    Expected JSON - either an explicit list of forms:
+    {
+        "customer_id": "GSPL/IPQC/IPC/003",
+        "po_number": "PO12345",
+        "forms": [
+            {"date": "2024-01-15", "shift": "A", "serial_start": 10001, "module_count": 300},
+            ...
+        ]
+    }
+    or a date range expanded into one form per shift per day:
+    {
+        "customer_id": "GSPL/IPQC/IPC/003",
+        "po_number": "PO12345",
+        "from_date": "2024-01-01",
+        "to_date": "2024-01-31",
+        "shifts": ["A", "B"],
+        "modules_per_shift": 300,
+        "serial_start": 1
+    }
+    Other generate-ipqc fields (serial_prefix, cell_manufacturer, ...) apply to
+    every form unless a form overrides them.
+    """
+    try:
+        from app.services.form_generator import shift_plan, MAX_BATCH_FORMS
+        data = request.get_json() or {}
+
+        for field in ('customer_id', 'po_number'):
+            if not data.get(field):
+                return jsonify({"error": f"Missing required field: {field}"}), 400
+
+        forms = data.get('forms')
+        if forms is None:
+            if not data.get('from_date') or not data.get('to_date'):
+                return jsonify({"error": "Provide forms or from_date/to_date"}), 400
+            forms = shift_plan(
+                data['from_date'],
+                data['to_date'],
+                shifts=data.get('shifts') or ['A', 'B'],
+                modules_per_shift=int(data.get('modules_per_shift', 1)),
+                serial_start=int(data.get('serial_start', 1))
+            )
+
+        if not isinstance(forms, list) or not forms:
+            return jsonify({"error": "forms must be a non-empty list"}), 400
+        if len(forms) > MAX_BATCH_FORMS:
+            return jsonify({"error": f"At most {MAX_BATCH_FORMS} forms per batch, got {len(forms)}"}), 400
+
+        defaults = {
+            'customer_id': data['customer_id'],
+            'po_number': data['po_number'],
+            'serial_prefix': data.get('serial_prefix', 'GS04875KG302250'),
+            'cell_manufacturer': data.get('cell_manufacturer', 'Solar Space'),
+            'cell_efficiency': data.get('cell_efficiency', 25.7),
+            'jb_cable_length': data.get('jb_cable_length', 1200),
+            'golden_module_number': data.get('golden_module_number', 'GM-2024-001')
+        }
+        ipqc_forms = form_generator.generate_forms(forms, **defaults)
+
+        return jsonify({
+            "success": True,
+            "message": f"{len(ipqc_forms)} IPQC forms generated successfully",
+            "count": len(ipqc_forms),
+            "data": ipqc_forms
+        }), 200
+
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            "error": str(e),
+            "message": "Invalid batch request"
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "message": "Failed to generate IPQC forms"
+        }), 500
+
+
 @ipqc_bp.route('/generate-pdf', methods=['POST'])
 def generate_pdf():
     """
@@ -172,20 +256,17 @@ def generate_pdf():
         # Initialize PDF generator
         pdf_folder = current_app.config['PDF_FOLDER']
         pdf_generator = IPQCPDFGenerator(pdf_folder)
-        
-        # Generate PDF
-        pdf_path = pdf_generator.generate_ipqc_pdf(
-            ipqc_data=ipqc_data.get('stages', []),
-            bom_data=ipqc_data.get('bom', {}),
-            metadata=ipqc_data.get('metadata', {})
-        )
-        
-        # Return PDF file
-        return send_file(
-            pdf_path,
+        metadata = ipqc_data.get('metadata', {})
+        
+        # Same form data -> same PDF, served from the artifact store
+        return send_artifact(
+            'ipqc_pdf', ipqc_data,
+            lambda path: pdf_generator.write_ipqc_pdf(
+                ipqc_data.get('stages', []), ipqc_data.get('bom', {}), metadata, path
+            ),
+            suffix='.pdf',
             mimetype='application/pdf',
-            as_attachment=True,
-            download_name=os.path.basename(pdf_path)
+            download_name=pdf_generator.pdf_filename(metadata)
         )
         
     except Exception as e:
@@ -195,6 +276,13 @@ def generate_pdf():
         }), 500
 
 
+def _artifact_inputs(data):
+    """Request parameters that determine a generated report (date defaults to today)"""
+    inputs = dict(data)
+    inputs['date'] = data.get('date') or datetime.now().strftime('%Y-%m-%d')
+    return inputs
+
+
 @ipqc_bp.route('/generate-pdf-only', methods=['POST'])
 def generate_pdf_only():
     """
@@ -211,36 +299,36 @@ def generate_pdf_only():
         jb_cable_length = data.get('jb_cable_length', 1200)
         golden_module_number = data.get('golden_module_number', 'GM-2024-001')
         
-        # Generate IPQC form
-        ipqc_form = form_generator.generate_form(
-            date=data.get('date'),
-            shift=data.get('shift'),
-            customer_id=customer,
-            po_number=po_number,
-            serial_prefix=serial_prefix,
-            serial_start=data.get('serial_start', 1),
-            module_count=data.get('module_count', 1),
-            cell_manufacturer=cell_manufacturer,
-            cell_efficiency=cell_efficiency,
-            jb_cable_length=jb_cable_length,
-            golden_module_number=golden_module_number
-        )
-        
-        # Generate PDF only
         pdf_folder = current_app.config['PDF_FOLDER']
         pdf_generator = IPQCPDFGenerator(pdf_folder)
         
-        pdf_path = pdf_generator.generate_ipqc_pdf(
-            ipqc_data=ipqc_form.get('stages', []),
-            bom_data=ipqc_form.get('bom', {}),
-            metadata=ipqc_form.get('metadata', {})
-        )
-        
-        return send_file(
-            pdf_path,
+        def build(path):
+            # Generate IPQC form
+            ipqc_form = form_generator.generate_form(
+                date=data.get('date'),
+                shift=data.get('shift'),
+                customer_id=customer,
+                po_number=po_number,
+                serial_prefix=serial_prefix,
+                serial_start=data.get('serial_start', 1),
+                module_count=data.get('module_count', 1),
+                cell_manufacturer=cell_manufacturer,
+                cell_efficiency=cell_efficiency,
+                jb_cable_length=jb_cable_length,
+                golden_module_number=golden_module_number
+            )
+            pdf_generator.write_ipqc_pdf(
+                ipqc_form.get('stages', []), ipqc_form.get('bom', {}), ipqc_form.get('metadata', {}), path
+            )
+        
+        # Generate PDF only - keyed by the request parameters, so a repeat request
+        # returns the PDF generated the first time without building the form again
+        customer_name = form_generator.customer_bom(customer).get('customer_name', '')
+        return send_artifact(
+            'ipqc_pdf_only', _artifact_inputs(data), build,
+            suffix='.pdf',
             mimetype='application/pdf',
-            as_attachment=True,
-            download_name=os.path.basename(pdf_path)
+            download_name=pdf_generator.pdf_filename({'customer_name': customer_name})
         )
         
     except Exception as e:
@@ -266,10 +354,12 @@ def generate_excel_only():
         jb_cable_length = data.get('jb_cable_length', 1200)
         golden_module_number = data.get('golden_module_number', 'GM-2024-001')
         
-        # Generate IPQC Check Sheet in exact reference format
-        excel_path = generate_ipqc_checksheet(
-            date=data.get('date'),
-            shift=data.get('shift', 'A'),
+        date = data.get('date') or datetime.now().strftime('%Y-%m-%d')
+        shift = data.get('shift', 'A')
+        
+        options = dict(
+            date=date,
+            shift=shift,
             po_number=po_number,
             cell_manufacturer=cell_manufacturer,
             cell_efficiency=cell_efficiency,
@@ -277,15 +367,17 @@ def generate_excel_only():
             golden_module_number=golden_module_number,
             serial_prefix=serial_prefix,
             serial_start=data.get('serial_start', 1),
-            module_count=data.get('module_count', 1),
-            customer_id=customer,
         )
+        # Every request input goes into the key, also those the sheet does not print yet
+        inputs = dict(options, module_count=data.get('module_count', 1), customer_id=customer)
         
-        return send_file(
-            excel_path,
+        # Generate IPQC Check Sheet in exact reference format
+        return send_artifact(
+            'ipqc_checksheet', inputs,
+            lambda path: write_ipqc_checksheet(path, **options),
+            suffix='.xlsx',
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=os.path.basename(excel_path)
+            download_name=checksheet_filename(date, shift)
         )
         
     except Exception as e:
@@ -295,6 +387,74 @@ def generate_excel_only():
         }), 500
 
 
+def _complete_options(data):
+    """Shared generate-complete fields from a request body"""
+    return {
+        'customer_id': data.get('customer_id') or data.get('customer') or 'Boeing',
+        'po_number': data.get('po_number') or f"PO-{data.get('date', '20240115').replace('-', '')}",
+        'serial_prefix': data.get('serial_prefix', 'GS04875KG302250'),
+        'cell_manufacturer': data.get('cell_manufacturer', 'Solar Space'),
+        'cell_efficiency': data.get('cell_efficiency', 25.7),
+        'jb_cable_length': data.get('jb_cable_length', 1200),
+        'golden_module_number': data.get('golden_module_number', 'GM-2024-001')
+    }
+
+
+def _ipqc_bundle_entries(pdf_generator, ipqc_form, folder=''):
+    """ZIP entries (name, bytes) for one form: the IPQC PDF, then the checksheet - rendered in memory"""
+    metadata = ipqc_form.get('metadata', {})
+
+    pdf = io.BytesIO()
+    pdf_generator.write_ipqc_pdf(
+        ipqc_data=ipqc_form.get('stages', []),
+        bom_data=ipqc_form.get('bom', {}),
+        metadata=metadata,
+        output=pdf
+    )
+    yield folder + pdf_generator.pdf_filename(metadata), pdf.getvalue()
+
+    date = metadata.get('date')
+    shift = metadata.get('shift') or 'A'  # the checksheet defaults to shift A
+    xlsx = io.BytesIO()
+    write_ipqc_checksheet(
+        xlsx,
+        date=date,
+        shift=shift,
+        po_number=metadata.get('po_number', ''),
+        cell_manufacturer=metadata.get('cell_manufacturer'),
+        cell_efficiency=metadata.get('cell_efficiency'),
+        jb_cable_length=metadata.get('jb_cable_length'),
+        golden_module_number=metadata.get('golden_module_number'),
+        serial_prefix=metadata.get('serial_prefix'),
+        serial_start=metadata.get('serial_start', 1)
+    )
+    yield folder + checksheet_filename(date, shift), xlsx.getvalue()
+
+
+def _zip_response(entries, zip_filename):
+    """Stream a ZIP built from `entries` while they are generated (nothing is written to disk)"""
+    return Response(
+        stream_with_context(stream_zip(entries)),
+        mimetype='application/zip',
+        headers={'Content-Disposition': f'attachment; filename="{zip_filename}"'}
+    )
+
+
+def build_ipqc_complete(data):
+    """Generate one IPQC form for a generate-complete body, as (ZIP entries, ZIP filename)"""
+    options = _complete_options(data)
+    ipqc_form = form_generator.generate_form(
+        date=data.get('date'),
+        shift=data.get('shift'),
+        serial_start=data.get('serial_start', 1),
+        module_count=data.get('module_count', 1),
+        **options
+    )
+    pdf_generator = IPQCPDFGenerator(current_app.config['PDF_FOLDER'])
+    zip_filename = f"IPQC_Report_{options['customer_id'].replace('/', '_')}_{data.get('date', '').replace('-', '')}.zip"
+    return _ipqc_bundle_entries(pdf_generator, ipqc_form), zip_filename
+
+
 @ipqc_bp.route('/generate-complete', methods=['POST'])
 def generate_complete():
     """
@@ -311,72 +471,9 @@ def generate_complete():
     }
     """
     try:
-        data = request.get_json()
-        
-        # Support both 'customer' and 'customer_id' parameter names
-        customer = data.get('customer_id') or data.get('customer') or 'Boeing'
-        po_number = data.get('po_number') or f"PO-{data.get('date', '20240115').replace('-', '')}"
-        serial_prefix = data.get('serial_prefix', 'GS04875KG302250')
-        cell_manufacturer = data.get('cell_manufacturer', 'Solar Space')
-        cell_efficiency = data.get('cell_efficiency', 25.7)
-        jb_cable_length = data.get('jb_cable_length', 1200)
-        golden_module_number = data.get('golden_module_number', 'GM-2024-001')
-        
-        # Generate IPQC form
-        ipqc_form = form_generator.generate_form(
-            date=data.get('date'),
-            shift=data.get('shift'),
-            customer_id=customer,
-            po_number=po_number,
-            serial_prefix=serial_prefix,
-            serial_start=data.get('serial_start', 1),
-            module_count=data.get('module_count', 1),
-            cell_manufacturer=cell_manufacturer,
-            cell_efficiency=cell_efficiency,
-            jb_cable_length=jb_cable_length,
-            golden_module_number=golden_module_number
-        )
-        
-        # Generate PDF
-        pdf_folder = current_app.config['PDF_FOLDER']
-        pdf_generator = IPQCPDFGenerator(pdf_folder)
-        
-        pdf_path = pdf_generator.generate_ipqc_pdf(
-            ipqc_data=ipqc_form.get('stages', []),
-            bom_data=ipqc_form.get('bom', {}),
-            metadata=ipqc_form.get('metadata', {})
-        )
-        
-        # Generate Excel in exact IPQC Check Sheet format
-        excel_path = generate_ipqc_checksheet(
-            date=data.get('date'),
-            shift=data.get('shift', 'A'),
-            po_number=po_number,
-            cell_manufacturer=cell_manufacturer,
-            cell_efficiency=cell_efficiency,
-            jb_cable_length=jb_cable_length,
-            golden_module_number=golden_module_number,
-            serial_prefix=serial_prefix,
-            serial_start=data.get('serial_start', 1),
-            module_count=data.get('module_count', 1),
-            customer_id=customer,
-        )
-        
-        # Create ZIP file with both PDF and Excel
-        zip_filename = f"IPQC_Report_{customer.replace('/', '_')}_{data.get('date', '').replace('-', '')}.zip"
-        zip_path = os.path.join(pdf_folder, zip_filename)
-        
-        with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            zipf.write(pdf_path, os.path.basename(pdf_path))
-            zipf.write(excel_path, os.path.basename(excel_path))
-        
-        # Return ZIP file
-        return send_file(
-            zip_path,
-            mimetype='application/zip',
-            as_attachment=True,
-            download_name=zip_filename
-        )
+        # ZIP with both PDF and Excel, streamed as each file is produced
+        entries, zip_filename = build_ipqc_complete(request.get_json())
+        return _zip_response(entries, zip_filename)
         
     except Exception as e:
         return jsonify({
@@ -385,6 +482,71 @@ def generate_complete():
         }), 500
 
 
+@ipqc_bp.route('/generate-complete-batch', methods=['POST'])
+def generate_complete_batch():
+    """
+    PDF + checksheet for every shift in a date range, as one streamed ZIP
+    (one folder per form: <date>_Shift<shift>/)
+    
+    Expected JSON: generate-complete fields plus
+    {
+        "from_date": "2024-01-01",
+        "to_date": "2024-01-31",
+        "shifts": ["A", "B"],
+        "modules_per_shift": 300,
+        "serial_start": 1
+    }
+    or an explicit "forms" list as for /generate-batch.
+    """
+    try:
+        from app.services.form_generator import shift_plan, MAX_BATCH_FORMS
+        data = request.get_json() or {}
+        options = _complete_options(data)
+        
+        forms = data.get('forms')
+        if forms is None:
+            if not data.get('from_date') or not data.get('to_date'):
+                return jsonify({"error": "Provide forms or from_date/to_date"}), 400
+            forms = shift_plan(
+                data['from_date'],
+                data['to_date'],
+                shifts=data.get('shifts') or ['A', 'B'],
+                modules_per_shift=int(data.get('modules_per_shift', 1)),
+                serial_start=int(data.get('serial_start', 1))
+            )
+        if not isinstance(forms, list) or not forms:
+            return jsonify({"error": "forms must be a non-empty list"}), 400
+        if len(forms) > MAX_BATCH_FORMS:
+            return jsonify({"error": f"At most {MAX_BATCH_FORMS} forms per batch, got {len(forms)}"}), 400
+        
+        pdf_generator = IPQCPDFGenerator(current_app.config['PDF_FOLDER'])
+        
+        def entries():
+            # One form at a time - the client receives earlier forms while later ones are generated
+            for spec in forms:
+                kwargs = dict(options)
+                kwargs.update(spec)
+                ipqc_form = form_generator.generate_form(**kwargs)
+                metadata = ipqc_form['metadata']
+                folder = f"{str(metadata.get('date') or '').replace('-', '')}_Shift{metadata.get('shift')}/"
+                yield from _ipqc_bundle_entries(pdf_generator, ipqc_form, folder)
+        
+        zip_filename = (f"IPQC_Reports_{options['customer_id'].replace('/', '_')}_"
+                        f"{str(forms[0].get('date', '')).replace('-', '')}_{str(forms[-1].get('date', '')).replace('-', '')}.zip")
+        return _zip_response(entries(), zip_filename)
+        
+    except (ValueError, TypeError) as e:
+        return jsonify({
+            "error": str(e),
+            "message": "Invalid batch request"
+        }), 400
+    except Exception as e:
+        return jsonify({
+            "error": str(e),
+            "message": "Failed to generate IPQC reports"
+        }), 500
+
+
 @ipqc_bp.route('/upload-bom', methods=['POST'])
 def upload_bom():
     """
@@ -548,9 +710,11 @@ def auto_checksheet():
         else:
             data = request.get_json(silent=True) or {}
 
-        excel_path = generate_ipqc_checksheet(
-            date=data.get('date'),
-            shift=data.get('shift', 'A'),
+        date = data.get('date') or datetime.now().strftime('%Y-%m-%d')
+        shift = data.get('shift', 'A')
+        options = dict(
+            date=date,
+            shift=shift,
             po_number=data.get('po_number', ''),
             cell_manufacturer=data.get('cell_manufacturer', 'Solar Space'),
             cell_efficiency=float(data.get('cell_efficiency', 25.7)),
@@ -558,17 +722,18 @@ def auto_checksheet():
             golden_module_number=data.get('golden_module_number', 'GM-2024-001'),
             serial_prefix=data.get('serial_prefix', 'GS04875KG302250'),
             serial_start=int(data.get('serial_start', 1)),
-            module_count=int(data.get('module_count', 1)),
-            customer_id=data.get('customer_id', 'GSPL/IPQC/IPC/003'),
             checked_by=data.get('checked_by', ''),
             reviewed_by=data.get('reviewed_by', ''),
         )
+        inputs = dict(options, module_count=int(data.get('module_count', 1)),
+                      customer_id=data.get('customer_id', 'GSPL/IPQC/IPC/003'))
 
-        response = send_file(
-            excel_path,
+        response = send_artifact(
+            'ipqc_checksheet', inputs,
+            lambda path: write_ipqc_checksheet(path, **options),
+            suffix='.xlsx',
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=os.path.basename(excel_path)
+            download_name=checksheet_filename(date, shift)
         )
         # Allow cross-origin for this endpoint
         response.headers['Access-Control-Allow-Origin'] = '*'
@@ -689,6 +854,12 @@ def add_bulk_rejections():
             ))
             added_count += 1
         
+        record_serials('rejected_modules', [{
+            'serial_number': rejection.get('serial_number'),
+            'company_id': company_id,
+            'is_rejected': True,
+            'rejection_reason': rejection.get('rejection_reason') or None
+        } for rejection in unique_rejections], cursor=cursor)
         conn.commit()
         conn.close()
         
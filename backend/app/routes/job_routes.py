@@ -0,0 +1,116 @@
+"""
+Job Progress Routes - one progress API for every long-running operation
+"""
+from flask import Blueprint, request, jsonify
+from app.services.job_registry import JobRegistry
+
+jobs_bp = Blueprint('jobs', __name__, url_prefix='/api/jobs')
+
+
+@jobs_bp.route('/<job_id>', methods=['GET'])
+def get_job(job_id):
+    """Get state / progress / result of a job"""
+    try:
+        job = JobRegistry.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        return jsonify({'success': True, 'job': job}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@jobs_bp.route('', methods=['GET'])
+def list_jobs():
+    """
+    List recent jobs
+    Query params: type, ref, state, active (1 = queued/running only), limit
+    """
+    try:
+        limit = min(int(request.args.get('limit', 50)), 500)
+        jobs = JobRegistry.list_jobs(
+            job_type=request.args.get('type') or None,
+            ref=request.args.get('ref') or None,
+            state=request.args.get('state') or None,
+            active_only=request.args.get('active') == '1',
+            limit=limit
+        )
+        return jsonify({'success': True, 'jobs': jobs, 'count': len(jobs)}), 200
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@jobs_bp.route('/submit', methods=['POST'])
+def submit_job():
+    """
+    Queue a background job
+    
+    Request body:
+    {
+        "job_type": "pdi_complete_report",   // see GET /api/jobs/types
+        "payload": {"pdi_number": "PDI-1", "company_name": "Rays Power"},
+        "ref": "PDI-1"                       // optional
+    }
+    """
+    try:
+        from app.services.job_queue import JobQueue
+        data = request.get_json() or {}
+        job_type = data.get('job_type')
+        payload = data.get('payload') or {}
+        if not job_type:
+            return jsonify({'success': False, 'error': 'job_type required'}), 400
+        
+        ref = data.get('ref') or payload.get('pdi_number') or payload.get('company_name')
+        job_id = JobQueue.submit(job_type, payload, ref=ref)
+        return jsonify({
+            'success': True,
+            'job_id': job_id,
+            'status_url': f'/api/jobs/{job_id}',
+            'download_url': f'/api/jobs/{job_id}/download'
+        }), 202
+    except ValueError as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@jobs_bp.route('/types', methods=['GET'])
+def list_job_types():
+    """Background job types and their concurrency limits"""
+    from app.services.job_queue import JOB_HANDLERS
+    return jsonify({
+        'success': True,
+        'types': {job_type: {'max_concurrent': spec['max_concurrent']} for job_type, spec in JOB_HANDLERS.items()}
+    }), 200
+
+
+@jobs_bp.route('/<job_id>/download', methods=['GET'])
+def download_job_result(job_id):
+    """Download the file produced by a completed job"""
+    try:
+        import os
+        from flask import send_file
+        job = JobRegistry.get(job_id)
+        if not job:
+            return jsonify({'success': False, 'error': 'Job not found'}), 404
+        if job['state'] != 'completed':
+            return jsonify({'success': False, 'error': f"Job is {job['state']}", 'job': job}), 409
+        
+        path = job.get('result_location')
+        if not path or not os.path.isfile(path):
+            return jsonify({'success': False, 'error': 'Result file not available'}), 404
+        
+        return send_file(path, as_attachment=True, download_name=os.path.basename(path))
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
+
+
+@jobs_bp.route('/<job_id>/cancel', methods=['POST'])
+def cancel_job(job_id):
+    """Cancel a queued job (running jobs finish)"""
+    try:
+        from app.services.job_queue import JobQueue
+        if JobQueue.cancel(job_id):
+            return jsonify({'success': True, 'message': 'Job cancelled'}), 200
+        return jsonify({'success': False, 'error': 'Job is not queued'}), 409
+    except Exception as e:
+        return jsonify({'success': False, 'error': str(e)}), 500
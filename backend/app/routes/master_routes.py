@@ -5,11 +5,25 @@ Master Data Routes - Upload & Manage Pre-generated Production Data
 from flask import Blueprint, request, jsonify
 from app.models.master_data import MasterOrder, MasterModule, DailyProduction
 from app.models.database import db
+from app.services.serial_registry import record_serials, forget_master_modules
 from datetime import datetime
 import random
 
 master_bp = Blueprint('master', __name__, url_prefix='/api/master')
 
+
+def _record_modules(modules):
+    """Mirror master modules into the serial registry (same transaction)"""
+    record_serials('master_modules', [{
+        'serial_number': module.serial_number,
+        'master_order_id': module.order_id,
+        'binning': module.binning,
+        'pmax': module.pmax,
+        'is_rejected': bool(module.is_rejected),
+        'rejection_reason': module.rejection_reason or None
+    } for module in modules])
+
+
 @master_bp.route('/bom', methods=['GET'])
 def get_bom_data():
     """Get BOM (Bill of Materials) data"""
@@ -82,7 +96,10 @@ def upload_excel_data():
     Column A: Date
     Column B: ID (Serial Number)
     Column C-U: Pmax, Isc, Voc, Ipm, Vpm, FF, Rs, Rsh, Eff, T_Object, T_Target, Irr_Target, Class, Sweep_Time, Irr_Monitor, Isc_Monitor, T_Monitor, Cell_Temp, T_Ambient, Binning
+    
+    Progress is recorded in the job registry (job_type 'ftr_upload', ref = order id).
     """
+    job_id = None
     try:
         # Create tables if they don't exist
         try:
@@ -203,24 +220,13 @@ def upload_excel_data():
         db.session.add(order)
         db.session.flush()
         
-        # Store progress in session/cache for polling
-        import json
-        import tempfile
-        import os
-        temp_dir = tempfile.gettempdir()
-        progress_file = os.path.join(temp_dir, f'upload_progress_{order.id}.json')
+        # Progress goes to the job registry so any worker can answer /upload-progress
+        from app.services.job_registry import JobRegistry
+        job_id = JobRegistry.create('ftr_upload', ref=order.id, total=len(df),
+                                    message='Starting processing...', state='running')
         
         def update_progress(current, total, status):
-            try:
-                with open(progress_file, 'w') as f:
-                    json.dump({
-                        'current': current,
-                        'total': total,
-                        'status': status,
-                        'percent': int((current / total) * 100) if total > 0 else 0
-                    }, f)
-            except:
-                pass
+            JobRegistry.update(job_id, current=current, total=total, message=status, force=True)
         
         # Calculate total rows first
         total_rows = len(df)
@@ -296,27 +302,22 @@ def upload_excel_data():
             # Bulk insert
             if len(modules_batch) >= batch_size:
                 db.session.bulk_save_objects(modules_batch)
+                _record_modules(modules_batch)
                 db.session.commit()
                 modules_batch = []
         
         # Insert remaining
         if modules_batch:
             db.session.bulk_save_objects(modules_batch)
+            _record_modules(modules_batch)
         
         db.session.commit()
         
-        update_progress(total_rows, total_rows, 'Complete!')
-        
-        # Cleanup progress file
-        try:
-            import os
-            if os.path.exists(progress_file):
-                os.remove(progress_file)
-        except:
-            pass
+        JobRegistry.complete(job_id, counters={'modules': total_rows})
         
         return jsonify({
             'message': 'FTR Excel data uploaded successfully',
+            'job_id': job_id,
             'order': {
                 'id': order.id,
                 'company_name': order.company_name,
@@ -330,6 +331,8 @@ def upload_excel_data():
         
     except Exception as e:
         db.session.rollback()
+        if job_id:
+            JobRegistry.fail(job_id, e)
         import traceback
         import sys
         error_details = traceback.format_exc()
@@ -342,18 +345,20 @@ def upload_excel_data():
 
 @master_bp.route('/upload-progress/<int:order_id>', methods=['GET'])
 def get_upload_progress(order_id):
-    """Get upload progress for an order"""
+    """Get upload progress for an order (see /api/jobs for all job types)"""
     try:
-        import json
-        import os
-        import tempfile
-        temp_dir = tempfile.gettempdir()
-        progress_file = os.path.join(temp_dir, f'upload_progress_{order_id}.json')
-        
-        if os.path.exists(progress_file):
-            with open(progress_file, 'r') as f:
-                progress = json.load(f)
-            return jsonify(progress), 200
+        from app.services.job_registry import JobRegistry
+        job = JobRegistry.find_latest('ftr_upload', order_id)
+        
+        if job and job['state'] in ('queued', 'running'):
+            return jsonify({
+                'current': job['current'],
+                'total': job['total'],
+                'status': job['status'],
+                'percent': job['percent'],
+                'state': job['state'],
+                'job_id': job['job_id']
+            }), 200
         else:
             return jsonify({'current': 0, 'total': 0, 'status': 'No upload in progress', 'percent': 0}), 200
     except Exception as e:
@@ -614,6 +619,7 @@ def upload_rejections():
         
         rejected_count = 0
         not_found = []
+        rejected_modules = []
         
         for idx, row in df.iterrows():
             serial = str(row[serial_col]).strip() if pd.notna(row[serial_col]) else ''
@@ -633,10 +639,12 @@ def upload_rejections():
                     module.rejection_reason = str(row[reason_col])
                 else:
                     module.rejection_reason = 'Rejected via upload'
+                rejected_modules.append(module)
                 rejected_count += 1
             else:
                 not_found.append(serial)
         
+        _record_modules(rejected_modules)
         db.session.commit()
         
         response_data = {
@@ -752,6 +760,21 @@ def upload_delivered_ftr():
         import traceback
         return jsonify({'error': str(e), 'traceback': traceback.format_exc()}), 500
 
+# FTR export columns: header -> MasterModule column (SN is the running row number)
+FTR_EXPORT_HEADERS = ['SN', 'ID', 'Pmax', 'Isc', 'Voc', 'Ipm', 'Vpm', 'FF', 'Rs', 'Eff', 'Binning']
+
+
+def _ftr_export_rows(query, batch_size=2000):
+    """Stream (SN, ID, Pmax, ...) tuples from a MasterModule query without loading ORM objects"""
+    columns = query.with_entities(
+        MasterModule.serial_number, MasterModule.pmax, MasterModule.isc, MasterModule.voc,
+        MasterModule.ipm, MasterModule.vpm, MasterModule.ff, MasterModule.rs,
+        MasterModule.eff, MasterModule.binning
+    ).yield_per(batch_size)
+    for sn, row in enumerate(columns, 1):
+        yield (sn,) + tuple(row)
+
+
 @master_bp.route('/download-ftr-by-quantity', methods=['POST'])
 def download_ftr_by_quantity():
     """
@@ -761,19 +784,18 @@ def download_ftr_by_quantity():
     {
         "order_id": 1,
         "start_serial": "GS04890TG3002500001",
-        "quantity": 2832
+        "quantity": 2832,
+        "format": "xlsx"  // optional, "csv" for the fast path
     }
     """
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        import tempfile
-        from flask import send_file
+        from app.services.excel_export import export_response
         
         data = request.json
         order_id = data.get('order_id')
         start_serial = data.get('start_serial')
         quantity = data.get('quantity')
+        export_format = data.get('format', 'xlsx')
         
         if not order_id or not start_serial or not quantity:
             return jsonify({'error': 'order_id, start_serial and quantity required'}), 400
@@ -783,81 +805,30 @@ def download_ftr_by_quantity():
         if not order:
             return jsonify({'error': 'Order not found'}), 404
         
-        # Get modules starting from start_serial, only non-rejected and non-delivered, limit by quantity
-        modules = MasterModule.query.filter(
+        # Modules starting from start_serial, only non-rejected and non-delivered, limit by quantity
+        query = MasterModule.query.filter(
             MasterModule.order_id == order_id,
             MasterModule.is_rejected == False,
             MasterModule.is_delivered == False,
             MasterModule.serial_number >= start_serial
-        ).order_by(MasterModule.serial_number).limit(quantity).all()
+        ).order_by(MasterModule.serial_number).limit(quantity)
+        
+        available = query.count()
         
-        if not modules:
+        if not available:
             return jsonify({'error': 'No modules found starting from given serial'}), 404
         
-        if len(modules) < quantity:
+        if available < quantity:
             return jsonify({
-                'error': f'Only {len(modules)} available modules (non-rejected & non-delivered) starting from {start_serial}. Requested: {quantity}'
+                'error': f'Only {available} available modules (non-rejected & non-delivered) starting from {start_serial}. Requested: {quantity}'
             }), 400
         
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'FTR Data'
-        
-        # Header style
-        header_font = Font(bold=True, size=11)
-        header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-        header_alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Headers - Only required columns
-        headers = ['SN', 'ID', 'Pmax', 'Isc', 'Voc', 'Ipm', 'Vpm', 'FF', 'Rs', 'Eff', 'Binning']
-        
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Data rows
-        for row_num, module in enumerate(modules, 2):
-            ws.cell(row=row_num, column=1).value = row_num - 1  # SN
-            ws.cell(row=row_num, column=2).value = module.serial_number  # ID
-            ws.cell(row=row_num, column=3).value = module.pmax
-            ws.cell(row=row_num, column=4).value = module.isc
-            ws.cell(row=row_num, column=5).value = module.voc
-            ws.cell(row=row_num, column=6).value = module.ipm
-            ws.cell(row=row_num, column=7).value = module.vpm
-            ws.cell(row=row_num, column=8).value = module.ff
-            ws.cell(row=row_num, column=9).value = module.rs
-            ws.cell(row=row_num, column=10).value = module.eff
-            ws.cell(row=row_num, column=11).value = module.binning
-        
-        # Auto-adjust column widths
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 20)
-            ws.column_dimensions[column].width = adjusted_width
-        
-        # Save to temp file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-        wb.save(temp_file.name)
-        temp_file.close()
-        
-        filename = f'FTR_Data_{order.order_number}_{quantity}_modules.xlsx'
-        
-        return send_file(
-            temp_file.name,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
+        return export_response(
+            export_format,
+            f'FTR_Data_{order.order_number}_{quantity}_modules',
+            'FTR Data',
+            FTR_EXPORT_HEADERS,
+            _ftr_export_rows(query)
         )
         
     except Exception as e:
@@ -877,19 +848,18 @@ def download_ftr_by_serials():
         "serial_range": {
             "start": "GS04890TG3002500001",
             "end": "GS04890TG3002500100"
-        }
+        },
+        "format": "xlsx"  // optional, "csv" for the fast path
     }
     """
     try:
-        from openpyxl import Workbook
-        from openpyxl.styles import Font, Alignment, PatternFill
-        import tempfile
-        from flask import send_file
+        from app.services.excel_export import export_response
         
         data = request.json
         order_id = data.get('order_id')
         serial_numbers = data.get('serial_numbers', [])
         serial_range = data.get('serial_range')
+        export_format = data.get('format', 'xlsx')
         
         if not order_id:
             return jsonify({'error': 'order_id required'}), 400
@@ -905,86 +875,35 @@ def download_ftr_by_serials():
             start_serial = serial_range.get('start')
             end_serial = serial_range.get('end')
             
-            modules = MasterModule.query.filter(
+            query = MasterModule.query.filter(
                 MasterModule.order_id == order_id,
                 MasterModule.is_rejected == False,
                 MasterModule.is_delivered == False,
                 MasterModule.serial_number >= start_serial,
                 MasterModule.serial_number <= end_serial
-            ).order_by(MasterModule.serial_number).all()
+            ).order_by(MasterModule.serial_number)
         elif serial_numbers:
             # Specific serials - ONLY NON-REJECTED
-            modules = MasterModule.query.filter(
+            query = MasterModule.query.filter(
                 MasterModule.order_id == order_id,
                 MasterModule.is_rejected == False,
                 MasterModule.is_delivered == False,
                 MasterModule.serial_number.in_(serial_numbers)
-            ).order_by(MasterModule.serial_number).all()
+            ).order_by(MasterModule.serial_number)
         else:
             return jsonify({'error': 'serial_numbers or serial_range required'}), 400
         
-        if not modules:
+        module_count = query.count()
+        
+        if not module_count:
             return jsonify({'error': 'No modules found for given serials'}), 404
         
-        # Create Excel workbook
-        wb = Workbook()
-        ws = wb.active
-        ws.title = 'FTR Data'
-        
-        # Header style
-        header_font = Font(bold=True, size=11)
-        header_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-        header_alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Headers - Only required columns
-        headers = ['SN', 'ID', 'Pmax', 'Isc', 'Voc', 'Ipm', 'Vpm', 'FF', 'Rs', 'Eff', 'Binning']
-        
-        for col_num, header in enumerate(headers, 1):
-            cell = ws.cell(row=1, column=col_num)
-            cell.value = header
-            cell.font = header_font
-            cell.fill = header_fill
-            cell.alignment = header_alignment
-        
-        # Data rows - Only required columns
-        for row_num, module in enumerate(modules, 2):
-            ws.cell(row=row_num, column=1).value = row_num - 1  # SN (serial count starting from 1)
-            ws.cell(row=row_num, column=2).value = module.serial_number  # ID
-            ws.cell(row=row_num, column=3).value = module.pmax
-            ws.cell(row=row_num, column=4).value = module.isc
-            ws.cell(row=row_num, column=5).value = module.voc
-            ws.cell(row=row_num, column=6).value = module.ipm
-            ws.cell(row=row_num, column=7).value = module.vpm
-            ws.cell(row=row_num, column=8).value = module.ff
-            ws.cell(row=row_num, column=9).value = module.rs
-            ws.cell(row=row_num, column=10).value = module.eff
-            ws.cell(row=row_num, column=11).value = module.binning
-        
-        # Auto-adjust column widths
-        for col in ws.columns:
-            max_length = 0
-            column = col[0].column_letter
-            for cell in col:
-                try:
-                    if len(str(cell.value)) > max_length:
-                        max_length = len(str(cell.value))
-                except:
-                    pass
-            adjusted_width = min(max_length + 2, 20)
-            ws.column_dimensions[column].width = adjusted_width
-        
-        # Save to temp file
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
-        wb.save(temp_file.name)
-        temp_file.close()
-        
-        filename = f'FTR_Data_{order.order_number}_{len(modules)}_modules.xlsx'
-        
-        return send_file(
-            temp_file.name,
-            mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=filename
+        return export_response(
+            export_format,
+            f'FTR_Data_{order.order_number}_{module_count}_modules',
+            'FTR Data',
+            FTR_EXPORT_HEADERS,
+            _ftr_export_rows(query)
         )
         
     except Exception as e:
@@ -993,19 +912,49 @@ def download_ftr_by_serials():
 
 @master_bp.route('/modules/<int:order_id>', methods=['GET'])
 def get_modules(order_id):
-    """Get modules for an order with pagination and search"""
+    """Get modules for an order with pagination and search
+    
+    Query params: limit, offset, search, match (contains|prefix|suffix|exact|auto),
+    cursor (next_cursor of the previous page - keyset paging on sequence_number,
+    use instead of offset for deep pages)
+    """
     try:
-        limit = int(request.args.get('limit', 50))
+        from app.services.serial_search import (
+            resolve_match_mode, escape_like, encode_cursor, decode_cursor, parse_page_size
+        )
+        
+        limit = parse_page_size(request.args.get('limit'), default=50)
         offset = int(request.args.get('offset', 0))
-        search = request.args.get('search', '')
+        search = request.args.get('search', '').strip()
+        match = request.args.get('match', 'contains')
+        cursor = decode_cursor(request.args.get('cursor'))
         
         query = MasterModule.query.filter_by(order_id=order_id)
         
         if search:
-            query = query.filter(MasterModule.serial_number.like(f'%{search}%'))
+            mode = resolve_match_mode(search, match)
+            escaped = escape_like(search)
+            if mode == 'exact':
+                query = query.filter(MasterModule.serial_number == search)
+            elif mode == 'prefix':
+                query = query.filter(MasterModule.serial_number.like(f'{escaped}%'))
+            elif mode == 'suffix':
+                query = query.filter(MasterModule.serial_number.like(f'%{escaped}'))
+            else:
+                query = query.filter(MasterModule.serial_number.like(f'%{escaped}%'))
+        
+        # Count only for the first page, cursor pages reuse the client's total
+        total = query.count() if cursor is None else None
+        
+        query = query.order_by(MasterModule.sequence_number)
+        if cursor is not None and cursor.get('seq') is not None:
+            modules = query.filter(MasterModule.sequence_number > int(cursor['seq'])).limit(limit + 1).all()
+        else:
+            modules = query.offset(offset).limit(limit + 1).all()
         
-        total = query.count()
-        modules = query.order_by(MasterModule.sequence_number).offset(offset).limit(limit).all()
+        has_more = len(modules) > limit
+        modules = modules[:limit]
+        next_cursor = encode_cursor({'seq': modules[-1].sequence_number}) if has_more and modules else None
         
         modules_list = []
         for m in modules:
@@ -1035,7 +984,7 @@ def get_modules(order_id):
                 'binning': m.binning
             })
         
-        return jsonify({'modules': modules_list, 'total': total}), 200
+        return jsonify({'modules': modules_list, 'total': total, 'has_more': has_more, 'next_cursor': next_cursor}), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -1081,6 +1030,7 @@ def delete_module(module_id):
         if not module:
             return jsonify({'error': 'Module not found'}), 404
         
+        forget_master_modules(module.order_id, module.serial_number)
         db.session.delete(module)
         db.session.commit()
         
@@ -1101,6 +1051,7 @@ def delete_order(order_id):
         
         # Delete all modules first (cascade should handle this, but explicit is better)
         MasterModule.query.filter_by(order_id=order_id).delete()
+        forget_master_modules(order_id)
         
         # Delete order
         db.session.delete(order)
@@ -5,30 +5,40 @@ from flask import Blueprint, request, jsonify
 from datetime import datetime
 from app.models.database import db
 from app.models.pdi_models import MasterOrder
+from app.services.pdi_views import ORDER_VIEWS, parse_view, serialize_orders, order_stats
+from app.services.serial_registry import forget_pdi_batches
 
 orders_bp = Blueprint('orders', __name__)
 
+def _order_detail(order):
+    return serialize_orders([order], 'detail')[0]
+
 # Get all orders
 @orders_bp.route('/api/orders', methods=['GET'])
 def get_orders():
+    """
+    Order list as summaries (batch/serial/COC counts, no child rows).
+    ?view=detail adds batch summaries + COC documents.
+    """
     try:
         company_id = request.args.get('company_id')
+        view = parse_view(request.args.get('view'), ORDER_VIEWS, 'summary')
         
-        query = MasterOrder.query
+        query = MasterOrder.query.options(*ORDER_VIEWS[view]())
         if company_id:
             query = query.filter_by(company_id=company_id)
         
         orders = query.order_by(MasterOrder.created_at.desc()).all()
-        return jsonify([order.to_dict() for order in orders]), 200
+        return jsonify(serialize_orders(orders, view)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# Get single order
+# Get single order (detail view)
 @orders_bp.route('/api/orders/<int:order_id>', methods=['GET'])
 def get_order(order_id):
     try:
-        order = MasterOrder.query.get_or_404(order_id)
-        return jsonify(order.to_dict()), 200
+        order = MasterOrder.query.options(*ORDER_VIEWS['detail']()).filter_by(id=order_id).first_or_404()
+        return jsonify(_order_detail(order)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -59,7 +69,7 @@ def create_order():
         db.session.add(order)
         db.session.commit()
         
-        return jsonify(order.to_dict()), 201
+        return jsonify(_order_detail(order)), 201
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -93,7 +103,7 @@ def update_order(order_id):
         order.updated_at = datetime.utcnow()
         db.session.commit()
         
-        return jsonify(order.to_dict()), 200
+        return jsonify(_order_detail(order)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -103,6 +113,8 @@ def update_order(order_id):
 def delete_order(order_id):
     try:
         order = MasterOrder.query.get_or_404(order_id)
+        # Its batches and their serial rows go with it (cascade)
+        forget_pdi_batches(order.pdi_batches)
         db.session.delete(order)
         db.session.commit()
         
@@ -117,10 +129,11 @@ def get_order_stats(order_id):
     try:
         order = MasterOrder.query.get_or_404(order_id)
         
-        # Calculate stats from PDI batches
-        total_planned = sum([batch.planned_modules for batch in order.pdi_batches])
-        total_produced = sum([batch.actual_modules for batch in order.pdi_batches])
-        completed_batches = len([b for b in order.pdi_batches if b.status == 'completed'])
+        # Calculate stats from PDI batches (aggregated in SQL)
+        batch_stats = order_stats([order.id])[order.id]
+        total_planned = batch_stats.get('planned_modules', 0)
+        total_produced = batch_stats.get('actual_modules', 0)
+        completed_batches = batch_stats.get('completed_batches', 0)
         
         # COC stats
         total_cells_available = sum([coc.total_cells_qty for coc in order.coc_documents])
@@ -134,7 +147,7 @@ def get_order_stats(order_id):
             'totalProduced': total_produced,
             'remaining': order.total_modules - total_produced,
             'progressPercent': round((total_produced / order.total_modules) * 100, 2) if order.total_modules > 0 else 0,
-            'totalBatches': len(order.pdi_batches),
+            'totalBatches': batch_stats.get('batches', 0),
             'completedBatches': completed_batches,
             'totalCellsAvailable': total_cells_available,
             'totalCellsUsed': total_cells_used,
@@ -10,15 +10,17 @@ from sqlalchemy import text
 from datetime import datetime, timedelta
 import os
 import io
-import random
 import traceback
 import json
 import math
 
+from app.services.pdi_values import aql_lookup, synthesize_pdi_values
+from app.services.serial_ranges import batch_serial_numbers
+
 # Excel
 try:
     import openpyxl
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from app.services import excel_styles as xs
     from openpyxl.utils import get_column_letter
     EXCEL_AVAILABLE = True
 except ImportError:
@@ -30,7 +32,7 @@ try:
     from reportlab.lib import colors
     from reportlab.lib.units import inch, mm
     from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+    from app.services.pdf_styles import paragraph_style
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
     PDF_AVAILABLE = True
 except ImportError:
@@ -40,19 +42,23 @@ pdi_doc_bp = Blueprint('pdi_doc', __name__)
 
 # ============ Excel Styles ============
 if EXCEL_AVAILABLE:
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
-    header_fill = PatternFill(start_color="1565C0", end_color="1565C0", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    title_fill = PatternFill(start_color="0D47A1", end_color="0D47A1", fill_type="solid")
-    title_font = Font(bold=True, color="FFFFFF", size=14)
-    green_fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-    light_fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-    center_align = Alignment(horizontal='center', vertical='center')
-    wrap_align = Alignment(horizontal='center', vertical='center', wrap_text=True)
-    left_wrap = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    thin_border = xs.border('thin')
+    header_fill = xs.solid_fill("1565C0")
+    header_font = xs.font(bold=True, color="FFFFFF", size=11)
+    title_fill = xs.solid_fill("0D47A1")
+    title_font = xs.font(bold=True, color="FFFFFF", size=14)
+    green_fill = xs.solid_fill("4CAF50")
+    light_fill = xs.solid_fill("E3F2FD")
+    center_align = xs.alignment(horizontal='center', vertical='center')
+    wrap_align = xs.alignment(horizontal='center', vertical='center', wrap_text=True)
+    left_wrap = xs.alignment(horizontal='left', vertical='center', wrap_text=True)
+
+    # Named styles for the per-serial rows (one assignment per cell)
+    xs.register_style('doc_cell', border=thin_border, alignment=center_align)
+    xs.register_style('doc_cell_sampled', font=xs.font(color="008000", bold=True), fill=xs.solid_fill("E8F5E9"),
+                      border=thin_border, alignment=center_align)
+    xs.register_style('doc_cell_ok', font=xs.font(color="008000"), border=thin_border, alignment=center_align)
+    xs.register_style('doc_cell_pass', font=xs.font(color="008000", bold=True), border=thin_border, alignment=center_align)
 
 
 # ============ DB Helpers ============
@@ -91,10 +97,7 @@ def get_pdis_for_company(company_id):
 
 def get_serials_for_pdi(pdi_id):
     try:
-        result = db.session.execute(text(
-            "SELECT serial_number FROM module_serial_numbers WHERE pdi_batch_id = :pid ORDER BY serial_number"
-        ), {'pid': pdi_id})
-        return [row[0] for row in result.fetchall()]
+        return batch_serial_numbers(pdi_id)
     except Exception as e:
         print(f"Error getting serials: {e}")
         return []
@@ -155,17 +158,26 @@ def get_calibration_instruments():
         return []
 
 
+AQL_TABLE = [
+    (8, 5), (15, 5), (25, 8), (50, 13), (90, 20),
+    (150, 32), (280, 50), (500, 80), (1200, 125),
+    (3200, 200), (10000, 315), (35000, 500),
+    (150000, 800), (500000, 1250), (float('inf'), 2000)
+]
+
+# Witness report readings, one per module
+WITNESS_COLUMNS = {
+    'ir': (500, 2000, 0),
+    'gd': (0.01, 0.1, 3),
+    'length': (2277, 2279, 1),
+    'width': (1133, 1135, 1),
+    'thickness': (29.5, 30.5, 1),
+    'weight': (32, 33, 1),
+}
+
+
 def aql_sample_size(lot_size):
-    aql_table = [
-        (8, 5), (15, 5), (25, 8), (50, 13), (90, 20),
-        (150, 32), (280, 50), (500, 80), (1200, 125),
-        (3200, 200), (10000, 315), (35000, 500),
-        (150000, 800), (500000, 1250), (float('inf'), 2000)
-    ]
-    for max_lot, sample in aql_table:
-        if lot_size <= max_lot:
-            return sample
-    return 2000
+    return aql_lookup(AQL_TABLE, lot_size)[0]
 
 
 def safe_filename(name):
@@ -186,19 +198,22 @@ def parse_request_data():
 
     total_qty = len(serial_numbers)
     sample_size = min(aql_sample_size(total_qty), total_qty)
-    sampled = random.sample(serial_numbers, sample_size) if sample_size < total_qty else serial_numbers
+    pdi_number = data.get('pdi_number', 'PDI-001')
+    values = synthesize_pdi_values(serial_numbers, sample_size, seed=data.get('seed'), pdi_number=pdi_number,
+                                   module_columns=WITNESS_COLUMNS)
 
     parsed = {
         'company_id': data.get('company_id', ''),
         'company_name': data.get('company_name', data.get('company_id', '')),
-        'pdi_number': data.get('pdi_number', 'PDI-001'),
+        'pdi_number': pdi_number,
         'serial_numbers': serial_numbers,
         'production_days': data.get('production_days', 3),
         'report_date': data.get('report_date', datetime.now().strftime('%d/%m/%Y')),
         'module_type': data.get('module_type', 'G2G580'),
         'total_qty': total_qty,
         'sample_size': sample_size,
-        'sampled_serials': sampled,
+        'sampled_serials': values.sampled_serials,
+        'values': values,
         'ftr_data': get_ftr_data(serial_numbers),
     }
     return parsed, None
@@ -397,7 +412,7 @@ def build_ipqc_excel(d):
     ws['A1'] = f"IPQC INSPECTION REPORT - {company}"
     ws['A1'].font = title_font
     ws['A1'].fill = title_fill
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
 
     # Info rows 2-4
@@ -411,10 +426,10 @@ def build_ipqc_excel(d):
             cell = ws.cell(row=r_idx, column=col, value='')
             cell.border = thin_border
             cell.alignment = center_align
-        ws.cell(row=r_idx, column=1, value=l1).font = Font(bold=True)
+        ws.cell(row=r_idx, column=1, value=l1).font = xs.font(bold=True)
         ws.cell(row=r_idx, column=1).fill = light_fill
         ws.cell(row=r_idx, column=2, value=v1)
-        ws.cell(row=r_idx, column=5, value=l2).font = Font(bold=True)
+        ws.cell(row=r_idx, column=5, value=l2).font = xs.font(bold=True)
         ws.cell(row=r_idx, column=5).fill = light_fill
         ws.cell(row=r_idx, column=6, value=v2)
 
@@ -462,7 +477,7 @@ def build_ipqc_excel(d):
                     cell.border = thin_border
                     cell.alignment = center_align if col not in (3, 4) else left_wrap
                 if vals[6] == 'OK':
-                    ws.cell(row=row, column=7).font = Font(color="008000", bold=True)
+                    ws.cell(row=row, column=7).font = xs.font(color="008000", bold=True)
                 row += 1
     else:
         basic = [
@@ -482,7 +497,7 @@ def build_ipqc_excel(d):
                 cell = ws.cell(row=row, column=col, value=val)
                 cell.border = thin_border
                 cell.alignment = center_align
-            ws.cell(row=row, column=7).font = Font(color="008000", bold=True)
+            ws.cell(row=row, column=7).font = xs.font(color="008000", bold=True)
             row += 1
 
     widths = [8, 20, 35, 30, 12, 12, 10, 20]
@@ -498,17 +513,12 @@ def build_ipqc_excel(d):
         cell.alignment = center_align
         cell.border = thin_border
 
-    for idx, s in enumerate(serials, 1):
-        ws2.cell(row=idx+1, column=1, value=idx).border = thin_border
-        ws2.cell(row=idx+1, column=2, value=s).border = thin_border
-        is_sampled = 'YES' if s in sampled else ''
-        cell = ws2.cell(row=idx+1, column=3, value=is_sampled)
-        cell.border = thin_border
-        if is_sampled:
-            cell.font = Font(color="008000", bold=True)
-            cell.fill = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
-        for c in range(1, 4):
-            ws2.cell(row=idx+1, column=c).alignment = center_align
+    for idx, (s, in_sample) in enumerate(zip(serials, d['values'].sampled.tolist()), 1):
+        xs.apply_style(ws2.cell(row=idx+1, column=1, value=idx), 'doc_cell')
+        xs.apply_style(ws2.cell(row=idx+1, column=2, value=s), 'doc_cell')
+        is_sampled = 'YES' if in_sample else ''
+        xs.apply_style(ws2.cell(row=idx+1, column=3, value=is_sampled),
+                       'doc_cell_sampled' if is_sampled else 'doc_cell')
 
     ws2.column_dimensions['A'].width = 8
     ws2.column_dimensions['B'].width = 28
@@ -539,26 +549,26 @@ def build_witness_excel(d):
         ws['A1'] = company
         ws['A1'].font = title_font
         ws['A1'].fill = title_fill
-        ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+        ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
         ws.row_dimensions[1].height = 25
 
         merge_range2 = f'A2:{max_col_letter}2'
         ws.merge_cells(merge_range2)
         ws['A2'] = title
-        ws['A2'].font = Font(bold=True, size=12)
-        ws['A2'].alignment = Alignment(horizontal='center')
+        ws['A2'].font = xs.font(bold=True, size=12)
+        ws['A2'].alignment = xs.alignment(horizontal='center')
 
         merge_range3 = f'A3:{max_col_letter}3'
         ws.merge_cells(merge_range3)
         ws['A3'] = f"Total Qty:- {total_qty} Pcs"
-        ws['A3'].font = Font(bold=True, size=11)
-        ws['A3'].alignment = Alignment(horizontal='center')
+        ws['A3'].font = xs.font(bold=True, size=11)
+        ws['A3'].alignment = xs.alignment(horizontal='center')
 
         merge_range4 = f'A4:{max_col_letter}4'
         ws.merge_cells(merge_range4)
         ws['A4'] = f"Date :- {report_date}"
-        ws['A4'].font = Font(bold=True, size=11)
-        ws['A4'].alignment = Alignment(horizontal='center')
+        ws['A4'].font = xs.font(bold=True, size=11)
+        ws['A4'].alignment = xs.alignment(horizontal='center')
 
     # ========== SHEET 1: FTR ==========
     ws = wb.create_sheet("FTR(Inspection)")
@@ -575,17 +585,15 @@ def build_witness_excel(d):
     for idx, serial in enumerate(serials, 1):
         row = idx + 5
         ftr = ftr_data.get(serial, {})
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        ws.cell(row=row, column=3, value=ftr.get('pmax', '')).border = thin_border
-        ws.cell(row=row, column=4, value=ftr.get('isc', '')).border = thin_border
-        ws.cell(row=row, column=5, value=ftr.get('voc', '')).border = thin_border
-        ws.cell(row=row, column=6, value=ftr.get('ipm', '')).border = thin_border
-        ws.cell(row=row, column=7, value=ftr.get('vpm', '')).border = thin_border
-        ws.cell(row=row, column=8, value=ftr.get('ff', '')).border = thin_border
-        ws.cell(row=row, column=9, value=ftr.get('efficiency', '')).border = thin_border
-        for c in range(1, 10):
-            ws.cell(row=row, column=c).alignment = center_align
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value=ftr.get('pmax', '')), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=4, value=ftr.get('isc', '')), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=5, value=ftr.get('voc', '')), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=6, value=ftr.get('ipm', '')), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=7, value=ftr.get('vpm', '')), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=8, value=ftr.get('ff', '')), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=9, value=ftr.get('efficiency', '')), 'doc_cell')
 
     ws.column_dimensions['A'].width = 8
     ws.column_dimensions['B'].width = 25
@@ -606,14 +614,10 @@ def build_witness_excel(d):
 
     for idx, serial in enumerate(serials, 1):
         row = idx + 5
-        ws2.cell(row=row, column=1, value=idx).border = thin_border
-        ws2.cell(row=row, column=2, value=serial).border = thin_border
+        xs.apply_style(ws2.cell(row=row, column=1, value=idx), 'doc_cell')
+        xs.apply_style(ws2.cell(row=row, column=2, value=serial), 'doc_cell')
         for c in range(3, 8):
-            cell = ws2.cell(row=row, column=c, value='OK')
-            cell.border = thin_border
-            cell.font = Font(color="008000")
-        for c in range(1, 8):
-            ws2.cell(row=row, column=c).alignment = center_align
+            xs.apply_style(ws2.cell(row=row, column=c, value='OK'), 'doc_cell_ok')
 
     ws2.column_dimensions['A'].width = 8
     ws2.column_dimensions['B'].width = 25
@@ -634,15 +638,11 @@ def build_witness_excel(d):
 
     for idx, serial in enumerate(serials, 1):
         row = idx + 5
-        ws3.cell(row=row, column=1, value=idx).border = thin_border
-        ws3.cell(row=row, column=2, value=serial).border = thin_border
-        cell = ws3.cell(row=row, column=3, value='PASS')
-        cell.border = thin_border
-        cell.font = Font(color="008000", bold=True)
-        ws3.cell(row=row, column=4, value='NIL').border = thin_border
-        ws3.cell(row=row, column=5, value='').border = thin_border
-        for c in range(1, 6):
-            ws3.cell(row=row, column=c).alignment = center_align
+        xs.apply_style(ws3.cell(row=row, column=1, value=idx), 'doc_cell')
+        xs.apply_style(ws3.cell(row=row, column=2, value=serial), 'doc_cell')
+        xs.apply_style(ws3.cell(row=row, column=3, value='PASS'), 'doc_cell_pass')
+        xs.apply_style(ws3.cell(row=row, column=4, value='NIL'), 'doc_cell')
+        xs.apply_style(ws3.cell(row=row, column=5, value=''), 'doc_cell')
 
     ws3.column_dimensions['A'].width = 8
     ws3.column_dimensions['B'].width = 25
@@ -661,22 +661,16 @@ def build_witness_excel(d):
         cell.alignment = center_align
         cell.border = thin_border
 
-    for idx, serial in enumerate(serials, 1):
+    for idx, (serial, ir, gd) in enumerate(d['values'].module_rows('ir', 'gd'), 1):
         row = idx + 5
-        ws4.cell(row=row, column=1, value=idx).border = thin_border
-        ws4.cell(row=row, column=2, value=serial).border = thin_border
-        ws4.cell(row=row, column=3, value=round(random.uniform(500, 2000), 0)).border = thin_border
-        ws4.cell(row=row, column=4, value=3800).border = thin_border
-        ws4.cell(row=row, column=5, value=3).border = thin_border
-        ws4.cell(row=row, column=6, value=round(random.uniform(0.01, 0.1), 3)).border = thin_border
-        cell = ws4.cell(row=row, column=7, value='PASS')
-        cell.border = thin_border
-        cell.font = Font(color="008000")
-        cell = ws4.cell(row=row, column=8, value='OK')
-        cell.border = thin_border
-        cell.font = Font(color="008000")
-        for c in range(1, 9):
-            ws4.cell(row=row, column=c).alignment = center_align
+        xs.apply_style(ws4.cell(row=row, column=1, value=idx), 'doc_cell')
+        xs.apply_style(ws4.cell(row=row, column=2, value=serial), 'doc_cell')
+        xs.apply_style(ws4.cell(row=row, column=3, value=ir), 'doc_cell')
+        xs.apply_style(ws4.cell(row=row, column=4, value=3800), 'doc_cell')
+        xs.apply_style(ws4.cell(row=row, column=5, value=3), 'doc_cell')
+        xs.apply_style(ws4.cell(row=row, column=6, value=gd), 'doc_cell')
+        xs.apply_style(ws4.cell(row=row, column=7, value='PASS'), 'doc_cell_ok')
+        xs.apply_style(ws4.cell(row=row, column=8, value='OK'), 'doc_cell_ok')
 
     ws4.column_dimensions['A'].width = 8
     ws4.column_dimensions['B'].width = 25
@@ -695,19 +689,16 @@ def build_witness_excel(d):
         cell.alignment = center_align
         cell.border = thin_border
 
-    for idx, serial in enumerate(serials, 1):
+    dims = d['values'].module_rows('length', 'width', 'thickness', 'weight')
+    for idx, (serial, length, width, thickness, weight) in enumerate(dims, 1):
         row = idx + 5
-        ws5.cell(row=row, column=1, value=idx).border = thin_border
-        ws5.cell(row=row, column=2, value=serial).border = thin_border
-        ws5.cell(row=row, column=3, value=round(2278 + random.uniform(-1, 1), 1)).border = thin_border
-        ws5.cell(row=row, column=4, value=round(1134 + random.uniform(-1, 1), 1)).border = thin_border
-        ws5.cell(row=row, column=5, value=round(30 + random.uniform(-0.5, 0.5), 1)).border = thin_border
-        ws5.cell(row=row, column=6, value=round(32.5 + random.uniform(-0.5, 0.5), 1)).border = thin_border
-        cell = ws5.cell(row=row, column=7, value='OK')
-        cell.border = thin_border
-        cell.font = Font(color="008000")
-        for c in range(1, 8):
-            ws5.cell(row=row, column=c).alignment = center_align
+        xs.apply_style(ws5.cell(row=row, column=1, value=idx), 'doc_cell')
+        xs.apply_style(ws5.cell(row=row, column=2, value=serial), 'doc_cell')
+        xs.apply_style(ws5.cell(row=row, column=3, value=length), 'doc_cell')
+        xs.apply_style(ws5.cell(row=row, column=4, value=width), 'doc_cell')
+        xs.apply_style(ws5.cell(row=row, column=5, value=thickness), 'doc_cell')
+        xs.apply_style(ws5.cell(row=row, column=6, value=weight), 'doc_cell')
+        xs.apply_style(ws5.cell(row=row, column=7, value='OK'), 'doc_cell_ok')
 
     ws5.column_dimensions['A'].width = 8
     ws5.column_dimensions['B'].width = 25
@@ -739,13 +730,13 @@ def build_sampling_excel(d):
     ws['A1'] = f"SAMPLING PLAN - {company}"
     ws['A1'].font = title_font
     ws['A1'].fill = title_fill
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
 
     ws.merge_cells('A2:F2')
     ws['A2'] = f"PDI: {pdi} | Date: {report_date}"
-    ws['A2'].font = Font(bold=True, size=11)
-    ws['A2'].alignment = Alignment(horizontal='center')
+    ws['A2'].font = xs.font(bold=True, size=11)
+    ws['A2'].alignment = xs.alignment(horizontal='center')
 
     # Plan details
     row = 4
@@ -759,7 +750,7 @@ def build_sampling_excel(d):
     ]
     for label, value in plan_info:
         cell = ws.cell(row=row, column=1, value=label)
-        cell.font = Font(bold=True)
+        cell.font = xs.font(bold=True)
         cell.fill = light_fill
         cell.border = thin_border
         cell.alignment = center_align
@@ -829,15 +820,11 @@ def build_sampling_excel(d):
     row += 1
 
     for idx, serial in enumerate(sampled, 1):
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        cell = ws.cell(row=row, column=3, value='PASS')
-        cell.border = thin_border
-        cell.font = Font(color="008000", bold=True)
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'doc_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value='PASS'), 'doc_cell_pass')
         for c in range(4, 7):
-            ws.cell(row=row, column=c, value='').border = thin_border
-        for c in range(1, 7):
-            ws.cell(row=row, column=c).alignment = center_align
+            xs.apply_style(ws.cell(row=row, column=c, value=''), 'doc_cell')
         row += 1
 
     widths = [8, 25, 22, 28, 12, 10]
@@ -865,13 +852,13 @@ def build_calibration_excel(d, instruments):
     ws['A1'] = f"CALIBRATION INSTRUMENT LIST - {company}"
     ws['A1'].font = title_font
     ws['A1'].fill = title_fill
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
 
     ws.merge_cells('A2:O2')
     ws['A2'] = f"PDI: {pdi} | Date: {report_date}"
-    ws['A2'].font = Font(bold=True, size=11)
-    ws['A2'].alignment = Alignment(horizontal='center')
+    ws['A2'].font = xs.font(bold=True, size=11)
+    ws['A2'].alignment = xs.alignment(horizontal='center')
 
     cal_headers = ['Sr.No', 'Instrument ID', 'Machine/Equipment', 'Make', 'Model',
                    'Item Sr.No', 'Range/Capacity', 'Least Count', 'Location',
@@ -900,7 +887,7 @@ def build_calibration_excel(d, instruments):
                 cell.border = thin_border
                 cell.alignment = center_align
             if inst.get('status') == 'overdue':
-                red = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
+                red = xs.solid_fill("FFCDD2")
                 for c in range(1, 16):
                     ws.cell(row=row, column=c).fill = red
     else:
@@ -933,20 +920,16 @@ def build_mom_pdf(d):
                             topMargin=20*mm, bottomMargin=20*mm,
                             leftMargin=15*mm, rightMargin=15*mm)
 
-    styles = getSampleStyleSheet()
-    title_style = ParagraphStyle('MOMTitle', parent=styles['Title'],
+    title_style = paragraph_style('MOMTitle', parent='Title',
                                   fontSize=18, textColor=colors.white,
                                   alignment=TA_CENTER, spaceAfter=6)
-    subtitle_style = ParagraphStyle('MOMSub', parent=styles['Heading2'],
+    subtitle_style = paragraph_style('MOMSub', parent='Heading2',
                                      fontSize=13, alignment=TA_CENTER, spaceAfter=10)
-    section_style = ParagraphStyle('MOMSection', parent=styles['Heading3'],
+    section_style = paragraph_style('MOMSection', parent='Heading3',
                                     fontSize=12, textColor=colors.white,
                                     alignment=TA_LEFT, spaceAfter=4)
-    normal_style = ParagraphStyle('MOMNormal', parent=styles['Normal'],
+    normal_style = paragraph_style('MOMNormal', parent='Normal',
                                    fontSize=10, leading=14)
-    bold_style = ParagraphStyle('MOMBold', parent=styles['Normal'],
-                                 fontSize=10, leading=14)
-    bold_style.fontName = 'Helvetica-Bold'
 
     elements = []
 
@@ -1138,9 +1121,9 @@ def build_mom_pdf(d):
         f"IS 2500 / IEC 61215 standards. All quality parameters are within acceptable limits. "
         f"The lot is <b>APPROVED</b> for dispatch."
     )
-    conc_para = Paragraph(conclusion, ParagraphStyle('Conclusion', parent=normal_style,
-                                                       fontSize=11, leading=16,
-                                                       spaceBefore=8, spaceAfter=8))
+    conc_para = Paragraph(conclusion, paragraph_style('Conclusion', parent=normal_style,
+                                                        fontSize=11, leading=16,
+                                                        spaceBefore=8, spaceAfter=8))
     conc_box = Table([[conc_para]], colWidths=[doc.width])
     conc_box.setStyle(TableStyle([
         ('BACKGROUND', (0, 0), (-1, -1), colors.HexColor('#E8F5E9')),
@@ -8,13 +8,16 @@ Auto-generates combined PDI documentation package:
 - Sampling Plan
 All in one combined Excel workbook — ZERO manual work required.
 """
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify, send_file, current_app
 from app.models.database import db
 from sqlalchemy import text
 import io
+import os
 import random
 import math
 from datetime import datetime, timedelta
+import numpy as np
+from app.services.pdi_values import aql_lookup, synthesize_pdi_values
 
 # Import CalibrationInstrument safely
 try:
@@ -25,7 +28,9 @@ except Exception:
 
 try:
     import openpyxl
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side, numbers
+    from openpyxl.styles import numbers
+    from app.services import excel_styles as xs
+    from app.services.excel_stream import StreamingWorkbook
     from openpyxl.utils import get_column_letter
     EXCEL_AVAILABLE = True
 except ImportError:
@@ -36,19 +41,16 @@ print(f"[PDI Docs] Blueprint created. EXCEL_AVAILABLE={EXCEL_AVAILABLE}, CALIBRA
 
 # ==================== STYLES (only if openpyxl available) ====================
 if EXCEL_AVAILABLE:
-    thin_border = Border(
-        left=Side(style='thin'), right=Side(style='thin'),
-        top=Side(style='thin'), bottom=Side(style='thin')
-    )
-    header_fill = PatternFill(start_color="1565C0", end_color="1565C0", fill_type="solid")
-    header_font = Font(bold=True, color="FFFFFF", size=11)
-    title_fill = PatternFill(start_color="0D47A1", end_color="0D47A1", fill_type="solid")
-    title_font = Font(bold=True, color="FFFFFF", size=14)
-    sub_header_fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-    green_fill = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
-    yellow_fill = PatternFill(start_color="FFF8E1", end_color="FFF8E1", fill_type="solid")
-    red_fill = PatternFill(start_color="FFEBEE", end_color="FFEBEE", fill_type="solid")
-    mom_header_fill = PatternFill(start_color="1B5E20", end_color="1B5E20", fill_type="solid")
+    thin_border = xs.border('thin')
+    header_fill = xs.solid_fill("1565C0")
+    header_font = xs.font(bold=True, color="FFFFFF", size=11)
+    title_fill = xs.solid_fill("0D47A1")
+    title_font = xs.font(bold=True, color="FFFFFF", size=14)
+    sub_header_fill = xs.solid_fill("E3F2FD")
+    green_fill = xs.solid_fill("E8F5E9")
+    yellow_fill = xs.solid_fill("FFF8E1")
+    red_fill = xs.solid_fill("FFEBEE")
+    mom_header_fill = xs.solid_fill("1B5E20")
 
 # ==================== MODULE DATABASE ====================
 MODULE_SPECS = {
@@ -85,39 +87,52 @@ MODULE_SPECS = {
 }
 
 
+# General Inspection Level II — (max lot size, sample size, accept, reject)
+AQL_TABLE = [
+    (15, 5, 0, 1), (25, 8, 0, 1), (50, 8, 0, 1), (90, 13, 0, 1), (150, 20, 0, 1),
+    (280, 32, 1, 2), (500, 50, 1, 2), (1200, 80, 2, 3), (3200, 125, 3, 4),
+    (10000, 200, 5, 6), (35000, 315, 7, 8), (150000, 500, 10, 11), (float('inf'), 800, 14, 15),
+]
+
+
 def get_aql_sample_size(lot_size, inspection_level='II'):
     """
     AQL Sampling Plan based on MIL-STD-105E / IS 2500 (Part 1)
     Returns (sample_size, accept_number, reject_number)
     """
-    # General Inspection Level II — Sample Size Code Letters
-    if lot_size <= 8: return (lot_size, 0, 1)  # 100% inspection
-    elif lot_size <= 15: return (5, 0, 1)
-    elif lot_size <= 25: return (8, 0, 1)
-    elif lot_size <= 50: return (8, 0, 1)
-    elif lot_size <= 90: return (13, 0, 1)
-    elif lot_size <= 150: return (20, 0, 1)
-    elif lot_size <= 280: return (32, 1, 2)
-    elif lot_size <= 500: return (50, 1, 2)
-    elif lot_size <= 1200: return (80, 2, 3)
-    elif lot_size <= 3200: return (125, 3, 4)
-    elif lot_size <= 10000: return (200, 5, 6)
-    elif lot_size <= 35000: return (315, 7, 8)
-    elif lot_size <= 150000: return (500, 10, 11)
-    else: return (800, 14, 15)
+    if lot_size <= 8:
+        return (lot_size, 0, 1)  # 100% inspection
+    return aql_lookup(AQL_TABLE, lot_size)
+
+
+# Per-sampled-module measurement columns (see app.services.pdi_values)
+SAFETY_COLUMNS = {
+    'ir': (200, 999, None),
+    'dcw': (5, 35, 1),
+    'gc': (10, 80, 1),
+    'wet': (1, 8, 1),
+}
 
 
-def generate_ftr_value(base, variation_pct=0.5):
-    """Generate FTR value with small random variation"""
-    variation = base * (variation_pct / 100)
-    return round(base + random.uniform(-variation, variation), 2)
+def dimension_columns(specs):
+    """Dimension sheet columns around the module size"""
+    length, width, thickness = (float(v) for v in specs['size'].split('x'))
+    diagonal = math.sqrt(length**2 + width**2)
+    return {
+        'length': (length - 0.8, length + 0.8, 1),
+        'width': (width - 0.8, width + 0.8, 1),
+        'thickness': (thickness - 0.3, thickness + 0.3, 1),
+        'diag1': (diagonal - 1, diagonal + 1, 1),
+        'diag2': lambda rng, n, cols: np.round(cols['diag1'] + rng.uniform(-2, 2, size=n), 1),
+        'diag_diff': lambda rng, n, cols: np.round(np.abs(cols['diag1'] - cols['diag2']), 1),
+    }
 
 
 # ==================== IPQC CHECKSHEET STAGES (Compact) ====================
 IPQC_STAGES = [
     {"sr": 1, "stage": "Shop Floor", "checks": [
-        {"name": "Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "Temp. ≤53°C", "gen": lambda: f"{round(random.uniform(23,28),1)}°C"},
-        {"name": "Humidity", "sample": "Once", "freq": "Per Shift", "criteria": "RH ≤60%", "gen": lambda: f"{random.randint(40,58)}%"},
+        {"name": "Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "Temp. ≤53°C", "gen": lambda rng=random: f"{round(rng.uniform(23,28),1)}°C"},
+        {"name": "Humidity", "sample": "Once", "freq": "Per Shift", "criteria": "RH ≤60%", "gen": lambda rng=random: f"{rng.randint(40,58)}%"},
     ]},
     {"sr": 2, "stage": "Glass Loader", "checks": [
         {"name": "Glass dimension(L×W×T)", "sample": "Once", "freq": "Per Shift", "criteria": "As Per PO (±1mm)", "gen": lambda size='2278x1134': f"{size.split('x')[0]}×{size.split('x')[1]}×3.2mm"},
@@ -129,7 +144,7 @@ IPQC_STAGES = [
         {"name": "EVA/EPE Status", "sample": "Once", "freq": "Per Shift", "criteria": "Visual", "gen": lambda: "OK - No contamination"},
     ]},
     {"sr": 4, "stage": "EVA/EPE Soldering at Edge", "checks": [
-        {"name": "Soldering Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "400±20°C", "gen": lambda: f"{random.randint(385,415)}°C"},
+        {"name": "Soldering Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "400±20°C", "gen": lambda rng=random: f"{rng.randint(385,415)}°C"},
     ]},
     {"sr": 5, "stage": "Cell Loading", "checks": [
         {"name": "Cell Manufacturer & Efficiency", "sample": "Once", "freq": "Per Shift", "criteria": "As Per BOM", "gen": lambda mfr='Solar Space', eff='25.7': f"{mfr}, {eff}%"},
@@ -140,10 +155,10 @@ IPQC_STAGES = [
     {"sr": 6, "stage": "Tabber & Stringer", "checks": [
         {"name": "Visual Check", "sample": "5 pcs", "freq": "Per Shift", "criteria": "No Misalignment/Bridging", "gen": lambda: "OK"},
         {"name": "EL Image", "sample": "5 pcs", "freq": "Per Shift", "criteria": "No Defect", "gen": lambda: "OK - No micro cracks"},
-        {"name": "String Length", "sample": "1 pc", "freq": "Per Shift", "criteria": "1163±2mm", "gen": lambda: f"{round(random.uniform(1161.5,1164.5),1)}mm"},
-        {"name": "Cell-to-Cell Gap", "sample": "5 pcs", "freq": "Per Shift", "criteria": "0.6-0.9mm", "gen": lambda: f"{round(random.uniform(0.65,0.85),2)}mm"},
-        {"name": "Peel Strength (Cell-Ribbon)", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥1N", "gen": lambda: f"{round(random.uniform(1.2,2.5),1)}N"},
-        {"name": "Ribbon-to-Busbar Peel", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥2N", "gen": lambda: f"{round(random.uniform(2.2,3.5),1)}N"},
+        {"name": "String Length", "sample": "1 pc", "freq": "Per Shift", "criteria": "1163±2mm", "gen": lambda rng=random: f"{round(rng.uniform(1161.5,1164.5),1)}mm"},
+        {"name": "Cell-to-Cell Gap", "sample": "5 pcs", "freq": "Per Shift", "criteria": "0.6-0.9mm", "gen": lambda rng=random: f"{round(rng.uniform(0.65,0.85),2)}mm"},
+        {"name": "Peel Strength (Cell-Ribbon)", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥1N", "gen": lambda rng=random: f"{round(rng.uniform(1.2,2.5),1)}N"},
+        {"name": "Ribbon-to-Busbar Peel", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥2N", "gen": lambda rng=random: f"{round(rng.uniform(2.2,3.5),1)}N"},
     ]},
     {"sr": 7, "stage": "Auto Bussing, Layup & Tapping", "checks": [
         {"name": "Terminal Busbar to Cell Edge", "sample": "5 pcs", "freq": "Per Shift", "criteria": "As per drawing", "gen": lambda: "OK"},
@@ -169,7 +184,7 @@ IPQC_STAGES = [
     ]},
     {"sr": 13, "stage": "String Rework Station", "checks": [
         {"name": "Cleanliness", "sample": "Once", "freq": "Per Shift", "criteria": "Clean station", "gen": lambda: "OK"},
-        {"name": "Soldering Iron Temp", "sample": "Once", "freq": "Per Shift", "criteria": "400±30°C", "gen": lambda: f"{random.randint(375,425)}°C"},
+        {"name": "Soldering Iron Temp", "sample": "Once", "freq": "Per Shift", "criteria": "400±30°C", "gen": lambda rng=random: f"{rng.randint(375,425)}°C"},
     ]},
     {"sr": 14, "stage": "Module Rework Station", "checks": [
         {"name": "Method of Rework", "sample": "Once", "freq": "Per Shift", "criteria": "As per WI", "gen": lambda: "As per WI"},
@@ -180,8 +195,8 @@ IPQC_STAGES = [
         {"name": "Diaphragm Cleaning", "sample": "Once", "freq": "Per Shift", "criteria": "Clean", "gen": lambda: "OK"},
     ]},
     {"sr": 16, "stage": "Auto Tape Removing", "checks": [
-        {"name": "Peel Test", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥60 N/cm", "gen": lambda: f"{round(random.uniform(62,75),1)} N/cm"},
-        {"name": "Gel Content", "sample": "1 pc", "freq": "Per Shift", "criteria": "75-95%", "gen": lambda: f"{round(random.uniform(80,92),1)}%"},
+        {"name": "Peel Test", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥60 N/cm", "gen": lambda rng=random: f"{round(rng.uniform(62,75),1)} N/cm"},
+        {"name": "Gel Content", "sample": "1 pc", "freq": "Per Shift", "criteria": "75-95%", "gen": lambda rng=random: f"{round(rng.uniform(80,92),1)}%"},
         {"name": "Visual Check", "sample": "5 pcs", "freq": "Per Shift", "criteria": "No tape residue", "gen": lambda: "OK"},
     ]},
     {"sr": 17, "stage": "Auto Edge Trimming", "checks": [
@@ -192,28 +207,28 @@ IPQC_STAGES = [
     ]},
     {"sr": 19, "stage": "Framing", "checks": [
         {"name": "Glue Uniformity", "sample": "5 pcs", "freq": "Per Shift", "criteria": "Uniform distribution", "gen": lambda: "OK"},
-        {"name": "Short Side Glue Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "As per spec", "gen": lambda: f"{round(random.uniform(35,45),1)}g"},
-        {"name": "Long Side Glue Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "As per spec", "gen": lambda: f"{round(random.uniform(55,65),1)}g"},
-        {"name": "Anodizing Thickness", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥15 micron", "gen": lambda: f"{round(random.uniform(16,22),1)} micron"},
+        {"name": "Short Side Glue Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "As per spec", "gen": lambda rng=random: f"{round(rng.uniform(35,45),1)}g"},
+        {"name": "Long Side Glue Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "As per spec", "gen": lambda rng=random: f"{round(rng.uniform(55,65),1)}g"},
+        {"name": "Anodizing Thickness", "sample": "1 pc", "freq": "Per Shift", "criteria": "≥15 micron", "gen": lambda rng=random: f"{round(rng.uniform(16,22),1)} micron"},
     ]},
     {"sr": 20, "stage": "Junction Box Assembly", "checks": [
         {"name": "JB Connector/Cable", "sample": "5 pcs", "freq": "Per Shift", "criteria": "As per BOM", "gen": lambda: "OK"},
-        {"name": "Silicon Glue Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "21±6g", "gen": lambda: f"{round(random.uniform(16,26),1)}g"},
+        {"name": "Silicon Glue Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "21±6g", "gen": lambda rng=random: f"{round(rng.uniform(16,26),1)}g"},
     ]},
     {"sr": 21, "stage": "Auto JB Soldering", "checks": [
         {"name": "Soldering Quality", "sample": "5 pcs", "freq": "Per Shift", "criteria": "Good wetting", "gen": lambda: "OK - Good wetting"},
     ]},
     {"sr": 22, "stage": "JB Potting", "checks": [
-        {"name": "Potting Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "21±6g", "gen": lambda: f"{round(random.uniform(16,26),1)}g"},
+        {"name": "Potting Weight", "sample": "1 pc", "freq": "Per Shift", "criteria": "21±6g", "gen": lambda rng=random: f"{round(rng.uniform(16,26),1)}g"},
         {"name": "Nozzle Change", "sample": "Once", "freq": "Every 6h", "criteria": "6h interval", "gen": lambda: "Changed on time"},
     ]},
     {"sr": 23, "stage": "OLE Potting Inspection", "checks": [
         {"name": "Visual Check", "sample": "5 pcs", "freq": "Per Shift", "criteria": "No overflow/gap", "gen": lambda: "OK"},
     ]},
     {"sr": 24, "stage": "Curing", "checks": [
-        {"name": "Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "25±3°C", "gen": lambda: f"{round(random.uniform(23,27),1)}°C"},
-        {"name": "Humidity", "sample": "Once", "freq": "Per Shift", "criteria": "≤50%", "gen": lambda: f"{random.randint(35,48)}%"},
-        {"name": "Curing Time", "sample": "Once", "freq": "Per Shift", "criteria": "≥4 hours", "gen": lambda: f"{round(random.uniform(4.5,6),1)} hours"},
+        {"name": "Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "25±3°C", "gen": lambda rng=random: f"{round(rng.uniform(23,27),1)}°C"},
+        {"name": "Humidity", "sample": "Once", "freq": "Per Shift", "criteria": "≤50%", "gen": lambda rng=random: f"{rng.randint(35,48)}%"},
+        {"name": "Curing Time", "sample": "Once", "freq": "Per Shift", "criteria": "≥4 hours", "gen": lambda rng=random: f"{round(rng.uniform(4.5,6),1)} hours"},
     ]},
     {"sr": 25, "stage": "Buffing", "checks": [
         {"name": "Corner Edge", "sample": "5 pcs", "freq": "Per Shift", "criteria": "Smooth edges", "gen": lambda: "OK"},
@@ -222,14 +237,14 @@ IPQC_STAGES = [
         {"name": "Module Cleanliness", "sample": "5 pcs", "freq": "Per Shift", "criteria": "No tape/dust/residue", "gen": lambda: "OK - Clean"},
     ]},
     {"sr": 27, "stage": "Flash Tester", "checks": [
-        {"name": "Ambient Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "25±3°C", "gen": lambda: f"{round(random.uniform(24,27),1)}°C"},
-        {"name": "Module Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "25±2°C", "gen": lambda: f"{round(random.uniform(24,27),1)}°C"},
+        {"name": "Ambient Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "25±3°C", "gen": lambda rng=random: f"{round(rng.uniform(24,27),1)}°C"},
+        {"name": "Module Temperature", "sample": "Once", "freq": "Per Shift", "criteria": "25±2°C", "gen": lambda rng=random: f"{round(rng.uniform(24,27),1)}°C"},
         {"name": "Isc Calibration", "sample": "Once", "freq": "Every 12h", "criteria": "Calibrated", "gen": lambda: "Calibrated"},
     ]},
     {"sr": 28, "stage": "Hipot Test", "checks": [
-        {"name": "DCW Test", "sample": "100%", "freq": "Each module", "criteria": "Leakage <50µA", "gen": lambda: f"{round(random.uniform(5,35),1)}µA"},
-        {"name": "IR Test", "sample": "100%", "freq": "Each module", "criteria": ">40MΩ", "gen": lambda: f"{random.randint(200,999)}MΩ"},
-        {"name": "Ground Continuity", "sample": "100%", "freq": "Each module", "criteria": "<100mΩ", "gen": lambda: f"{round(random.uniform(10,80),1)}mΩ"},
+        {"name": "DCW Test", "sample": "100%", "freq": "Each module", "criteria": "Leakage <50µA", "gen": lambda rng=random: f"{round(rng.uniform(5,35),1)}µA"},
+        {"name": "IR Test", "sample": "100%", "freq": "Each module", "criteria": ">40MΩ", "gen": lambda rng=random: f"{rng.randint(200,999)}MΩ"},
+        {"name": "Ground Continuity", "sample": "100%", "freq": "Each module", "criteria": "<100mΩ", "gen": lambda rng=random: f"{round(rng.uniform(10,80),1)}mΩ"},
     ]},
     {"sr": 29, "stage": "Post EL Test", "checks": [
         {"name": "EL + Visual", "sample": "5 pcs", "freq": "Per Shift", "criteria": "No Defect", "gen": lambda: "OK - No cracks"},
@@ -243,7 +258,7 @@ IPQC_STAGES = [
     ]},
     {"sr": 32, "stage": "Dimension Measurement", "checks": [
         {"name": "Length × Width", "sample": "1 pc", "freq": "Per Shift", "criteria": "As per drawing ±1mm", "gen": lambda size='2278x1134': f"{size.split('x')[0]}×{size.split('x')[1]}mm"},
-        {"name": "Diagonal Difference", "sample": "1 pc", "freq": "Per Shift", "criteria": "≤3mm", "gen": lambda: f"{round(random.uniform(0.5,2.5),1)}mm"},
+        {"name": "Diagonal Difference", "sample": "1 pc", "freq": "Per Shift", "criteria": "≤3mm", "gen": lambda rng=random: f"{round(rng.uniform(0.5,2.5),1)}mm"},
         {"name": "JB Cable Length", "sample": "1 pc", "freq": "Per Shift", "criteria": "As per spec", "gen": lambda cable='1200': f"{cable}mm"},
     ]},
     {"sr": 33, "stage": "Packaging", "checks": [
@@ -255,13 +270,32 @@ IPQC_STAGES = [
 
 
 # ==================== HELPER FUNCTIONS ====================
+# (id(font), id(fill)) -> (named style, font, fill); the objects are kept so ids stay unique
+_cell_styles = {}
+
+
+def _cell_style_name(font, fill):
+    """Named style for a default (centered, wrapped, thin border) cell with this font/fill"""
+    key = (id(font), id(fill))
+    entry = _cell_styles.get(key)
+    if entry is None:
+        name = xs.register_style(f'pdi_cell_{len(_cell_styles)}', font=font, fill=fill,
+                                 border=thin_border, alignment=xs.CENTER_WRAP)
+        entry = _cell_styles[key] = (name, font, fill)
+    return entry[0]
+
+
 def style_cell(ws, row, col, value, font=None, fill=None, alignment=None, border='_default_'):
     """Style a cell with given properties"""
     cell = ws.cell(row=row, column=col, value=value)
+    if alignment is None and border == '_default_' and EXCEL_AVAILABLE:
+        # Common case: one named-style assignment instead of four style attributes
+        xs.apply_style(cell, _cell_style_name(font, fill))
+        return cell
     if font: cell.font = font
     if fill: cell.fill = fill
     if alignment: cell.alignment = alignment
-    else: cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    else: cell.alignment = xs.CENTER_WRAP
     if border == '_default_':
         border = thin_border if EXCEL_AVAILABLE else None
     if border: cell.border = border
@@ -279,12 +313,12 @@ def add_title_block(ws, title, company_name, party_name, pdi_number, total_qty,
     
     # Row 2: Title
     ws.merge_cells(f'A2:{col_letter}2')
-    style_cell(ws, 2, 1, title, font=Font(bold=True, size=12))
+    style_cell(ws, 2, 1, title, font=xs.font(bold=True, size=12))
     
     # Row 3: Info
     ws.merge_cells(f'A3:{col_letter}3')
     style_cell(ws, 3, 1, f"Party: {party_name}  |  PDI: {pdi_number}  |  Total Qty: {total_qty} Pcs  |  Date: {report_date}",
-               font=Font(size=10))
+               font=xs.font(size=10))
 
 
 # ==================== API ROUTES ====================
@@ -306,181 +340,38 @@ def generate_pdi_documentation():
     Generate complete PDI documentation package in one Excel workbook.
     Sheets: IPQC Checksheet, FTR Report, Bifaciality, Visual, EL, Hipot/Safety, 
             Dimension, RFID, Calibration Index, Sampling Plan, MOM
+    
+    Progress is recorded in the job registry (job_type 'pdi_documentation', ref = PDI number);
+    pass "job_id" (UUID) in the body to poll /api/jobs/<job_id> while the workbook is built
+    (409 if that id is already taken). The workbook is also kept for /api/jobs/<job_id>/download.
     """
     if not EXCEL_AVAILABLE:
         return jsonify({'success': False, 'error': 'openpyxl not installed'}), 500
     
+    from app.services.job_registry import JobRegistry, JobIdInUse
+    job_id = None
     try:
         data = request.json
         if not data:
             return jsonify({'success': False, 'error': 'No JSON data received'}), 400
         
-        company_id = data.get('company_id')
-        company_name = data.get('company_name', 'Gautam Solar Private Limited')
-        party_name = data.get('party_name', '')
-        pdi_number = data.get('pdi_number', '')
-        module_type = data.get('module_type', 'G2G580')
-        serial_numbers = data.get('serial_numbers', [])
-        report_date = data.get('report_date', datetime.now().strftime('%d/%m/%Y'))
-        
-        # Inspector/Manufacturer details for MOM
-        inspector_name = data.get('inspector_name', '')
-        inspector_designation = data.get('inspector_designation', 'QC Engineer')
-        manufacturer_rep = data.get('manufacturer_rep', '')
-        manufacturer_designation = data.get('manufacturer_designation', 'QA Manager')
-        cell_manufacturer = data.get('cell_manufacturer', 'Solar Space')
-        cell_efficiency = data.get('cell_efficiency', '25.7')
-        
-        # Production days data — for IPQC per-day generation
-        production_days = data.get('production_days', [])
-        # Each: {date: '2026-01-15', day_production: 300, night_production: 200, shift: 'Day'}
-        
-        # If serial_numbers not provided, fetch from DB using company_id + pdi_number
-        fetch_from_db = data.get('fetch_serials_from_db', False)
-        if fetch_from_db and company_id and pdi_number and not serial_numbers:
-            try:
-                result = db.session.execute(text("""
-                    SELECT serial_number FROM ftr_master_serials
-                    WHERE company_id = :cid AND pdi_number = :pdi
-                    ORDER BY serial_number
-                """), {'cid': company_id, 'pdi': pdi_number})
-                serial_numbers = [row[0] for row in result.fetchall()]
-                print(f"[PDI Docs] Fetched {len(serial_numbers)} serials from DB for {pdi_number}")
-            except Exception as e:
-                print(f"[PDI Docs] DB serial fetch error: {e}")
-                return jsonify({'success': False, 'error': f'Failed to fetch serials from DB: {str(e)}'}), 500
-        
-        if not serial_numbers:
-            return jsonify({'success': False, 'error': 'No serial numbers provided or found in DB'}), 400
-        
-        total_qty = len(serial_numbers)
-        specs = MODULE_SPECS.get(module_type, MODULE_SPECS['G2G580'])
-        module_size = specs['size']
-        
-        # Get FTR data from database
-        ftr_data = {}
-        if company_id:
-            try:
-                # Fetch in batches to avoid parameter limit issues
-                batch_size = 500
-                for i in range(0, len(serial_numbers), batch_size):
-                    batch = serial_numbers[i:i+batch_size]
-                    placeholders = ','.join([f':s{j}' for j in range(len(batch))])
-                    params = {f's{j}': s for j, s in enumerate(batch)}
-                    params['cid'] = company_id
-                    result = db.session.execute(text(f"""
-                        SELECT serial_number, pmax, isc, voc, ipm, vpm, ff, efficiency, binning
-                        FROM ftr_master_serials
-                        WHERE company_id = :cid AND serial_number IN ({placeholders})
-                    """), params)
-                    for row in result.fetchall():
-                        ftr_data[row[0]] = {
-                            'pmax': float(row[1]) if row[1] else None,
-                            'isc': float(row[2]) if row[2] else None,
-                            'voc': float(row[3]) if row[3] else None,
-                            'ipm': float(row[4]) if row[4] else None,
-                            'vpm': float(row[5]) if row[5] else None,
-                            'ff': float(row[6]) if row[6] else None,
-                            'efficiency': float(row[7]) if row[7] else None,
-                            'binning': row[8]
-                        }
-            except Exception as e:
-                print(f"[PDI Docs] FTR data fetch error: {e}")
-        
-        # Generate FTR data for serials not in DB
-        for serial in serial_numbers:
-            if serial not in ftr_data:
-                ftr_data[serial] = {
-                    'pmax': generate_ftr_value(specs['pmax'], 0.5),
-                    'isc': generate_ftr_value(specs['isc'], 0.3),
-                    'voc': generate_ftr_value(specs['voc'], 0.2),
-                    'ipm': generate_ftr_value(specs['ipm'], 0.3),
-                    'vpm': generate_ftr_value(specs['vpm'], 0.2),
-                    'ff': generate_ftr_value(specs['ff'], 0.3),
-                    'efficiency': generate_ftr_value(specs['eff'], 0.3),
-                    'binning': 'A'
-                }
-        
-        # Calculate AQL sampling
-        sample_size, accept_num, reject_num = get_aql_sample_size(total_qty)
-        sampled_serials = random.sample(serial_numbers, min(sample_size, len(serial_numbers)))
-        sampled_serials.sort()
-        
-        # Get calibration instruments
-        calibration_instruments = []
+        # Steps: data loading + 11 sheets + save
         try:
-            instruments = CalibrationInstrument.query.filter(
-                CalibrationInstrument.status.in_(['valid', 'due_soon'])
-            ).order_by(CalibrationInstrument.sr_no).all()
-            calibration_instruments = [inst.to_dict() for inst in instruments]
-        except Exception as e:
-            print(f"[PDI Docs] Calibration fetch error: {e}")
-        
-        # ==================== CREATE WORKBOOK ====================
-        wb = openpyxl.Workbook()
-        wb.remove(wb.active)
-        
-        # --- SHEET 1: IPQC Checksheet(s) ---
-        create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, report_date,
-                          serial_numbers, production_days, cell_manufacturer, cell_efficiency, module_size, specs)
-        
-        # --- SHEET 2: FTR (Flasher Test Report) ---
-        ws = wb.create_sheet("FTR Report")
-        create_ftr_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                        sampled_serials, ftr_data, specs, module_type)
-        
-        # --- SHEET 3: Bifaciality ---
-        ws = wb.create_sheet("Bifaciality")
-        create_bifaciality_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                                sampled_serials, ftr_data)
-        
-        # --- SHEET 4: Visual Inspection ---
-        ws = wb.create_sheet("Visual Inspection")
-        create_visual_inspection_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                                      sampled_serials)
-        
-        # --- SHEET 5: EL Inspection ---
-        ws = wb.create_sheet("EL Inspection")
-        create_el_inspection_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                                  sampled_serials)
-        
-        # --- SHEET 6: Safety Tests (IR, HV, GD, Wet Leakage) ---
-        ws = wb.create_sheet("Safety Tests")
-        create_safety_tests_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                                 sampled_serials, specs)
-        
-        # --- SHEET 7: Dimension ---
-        ws = wb.create_sheet("Dimension")
-        create_dimension_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                              sampled_serials, specs)
-        
-        # --- SHEET 8: RFID ---
-        ws = wb.create_sheet("RFID")
-        create_rfid_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                         sampled_serials, ftr_data, module_type, cell_manufacturer)
-        
-        # --- SHEET 9: Sampling Plan ---
-        ws = wb.create_sheet("Sampling Plan")
-        create_sampling_plan_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                                  sample_size, accept_num, reject_num)
+            job_id = JobRegistry.create('pdi_documentation', ref=data.get('pdi_number') or data.get('company_id'),
+                                        job_id=data.get('job_id'), total=13, message='Loading FTR data...',
+                                        state='running')
+        except ValueError:
+            return jsonify({'success': False, 'error': 'job_id must be a UUID'}), 400
+        except JobIdInUse as e:
+            return jsonify({'success': False, 'error': str(e)}), 409
         
-        # --- SHEET 10: Calibration Index ---
-        ws = wb.create_sheet("Calibration")
-        create_calibration_sheet(ws, company_name, party_name, pdi_number, report_date,
-                                calibration_instruments)
-        
-        # --- SHEET 11: MOM (Minutes of Meeting) ---
-        ws = wb.create_sheet("MOM")
-        create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
-                        inspector_name, inspector_designation, manufacturer_rep, manufacturer_designation,
-                        production_days, serial_numbers, sample_size, specs)
-        
-        # Save to buffer
-        buffer = io.BytesIO()
-        wb.save(buffer)
-        buffer.seek(0)
-        
-        filename = f"PDI_Documentation_{pdi_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+        buffer, filename, counters = build_pdi_documentation(data, job_id)
+        output_dir = os.path.abspath(os.path.join(current_app.config['PDF_FOLDER'], 'jobs', job_id))
+        os.makedirs(output_dir, exist_ok=True)
+        path = os.path.join(output_dir, os.path.basename(filename))
+        with open(path, 'wb') as f:
+            f.write(buffer.getvalue())
+        JobRegistry.complete(job_id, result_location=path, counters=counters)
         
         try:
             return send_file(
@@ -498,18 +389,216 @@ def generate_pdi_documentation():
                 attachment_filename=filename
             )
         
+    except ValueError as e:
+        JobRegistry.fail(job_id, e)
+        return jsonify({'success': False, 'error': str(e)}), 400
     except Exception as e:
         print(f"[PDI Docs] Error: {e}")
+        JobRegistry.fail(job_id, e)
         import traceback
         traceback.print_exc()
         return jsonify({'success': False, 'error': str(e)}), 500
 
 
+def build_pdi_documentation(data, job_id=None, streaming=True):
+    """
+    Build the PDI documentation workbook from a /pdi-docs/generate request body.
+    Returns (BytesIO, filename, counters); raises ValueError for unusable input.
+    Used by the route and by the 'pdi_documentation' background job.
+    
+    streaming=True writes each sheet row by row through a write-only workbook
+    (constant memory); streaming=False builds the same workbook in memory.
+    """
+    from app.services.job_registry import JobRegistry
+    
+    company_id = data.get('company_id')
+    company_name = data.get('company_name', 'Gautam Solar Private Limited')
+    party_name = data.get('party_name', '')
+    pdi_number = data.get('pdi_number', '')
+    module_type = data.get('module_type', 'G2G580')
+    serial_numbers = data.get('serial_numbers', [])
+    report_date = data.get('report_date', datetime.now().strftime('%d/%m/%Y'))
+    
+    # Inspector/Manufacturer details for MOM
+    inspector_name = data.get('inspector_name', '')
+    inspector_designation = data.get('inspector_designation', 'QC Engineer')
+    manufacturer_rep = data.get('manufacturer_rep', '')
+    manufacturer_designation = data.get('manufacturer_designation', 'QA Manager')
+    cell_manufacturer = data.get('cell_manufacturer', 'Solar Space')
+    cell_efficiency = data.get('cell_efficiency', '25.7')
+    
+    # Production days data — for IPQC per-day generation
+    production_days = data.get('production_days', [])
+    # Each: {date: '2026-01-15', day_production: 300, night_production: 200, shift: 'Day'}
+    
+    # If serial_numbers not provided, fetch from DB using company_id + pdi_number
+    fetch_from_db = data.get('fetch_serials_from_db', False)
+    if fetch_from_db and company_id and pdi_number and not serial_numbers:
+        try:
+            result = db.session.execute(text("""
+                SELECT serial_number FROM ftr_master_serials
+                WHERE company_id = :cid AND pdi_number = :pdi
+                ORDER BY serial_number
+            """), {'cid': company_id, 'pdi': pdi_number})
+            serial_numbers = [row[0] for row in result.fetchall()]
+            print(f"[PDI Docs] Fetched {len(serial_numbers)} serials from DB for {pdi_number}")
+        except Exception as e:
+            print(f"[PDI Docs] DB serial fetch error: {e}")
+            raise RuntimeError(f'Failed to fetch serials from DB: {str(e)}')
+    
+    if not serial_numbers:
+        raise ValueError('No serial numbers provided or found in DB')
+    
+    total_qty = len(serial_numbers)
+    specs = MODULE_SPECS.get(module_type, MODULE_SPECS['G2G580'])
+    module_size = specs['size']
+    
+    # FTR data from database - only needed for the AQL-sampled modules
+    def fetch_ftr_data(serials):
+        ftr_data = {}
+        if not company_id:
+            return ftr_data
+        try:
+            # Fetch in batches to avoid parameter limit issues
+            batch_size = 500
+            for i in range(0, len(serials), batch_size):
+                batch = serials[i:i+batch_size]
+                placeholders = ','.join([f':s{j}' for j in range(len(batch))])
+                params = {f's{j}': s for j, s in enumerate(batch)}
+                params['cid'] = company_id
+                result = db.session.execute(text(f"""
+                    SELECT serial_number, pmax, isc, voc, ipm, vpm, ff, efficiency, binning
+                    FROM ftr_master_serials
+                    WHERE company_id = :cid AND serial_number IN ({placeholders})
+                """), params)
+                for row in result.fetchall():
+                    ftr_data[row[0]] = {
+                        'pmax': float(row[1]) if row[1] else None,
+                        'isc': float(row[2]) if row[2] else None,
+                        'voc': float(row[3]) if row[3] else None,
+                        'ipm': float(row[4]) if row[4] else None,
+                        'vpm': float(row[5]) if row[5] else None,
+                        'ff': float(row[6]) if row[6] else None,
+                        'efficiency': float(row[7]) if row[7] else None,
+                        'binning': row[8]
+                    }
+        except Exception as e:
+            print(f"[PDI Docs] FTR data fetch error: {e}")
+        return ftr_data
+    
+    # AQL sample, generated FTR values for sampled serials not in DB, safety + dimension readings
+    sample_size, accept_num, reject_num = get_aql_sample_size(total_qty)
+    values = synthesize_pdi_values(serial_numbers, sample_size, specs=specs,
+                                   seed=data.get('seed'), pdi_number=pdi_number, measured=fetch_ftr_data,
+                                   sample_columns={**SAFETY_COLUMNS, **dimension_columns(specs)})
+    sampled_serials = values.sampled_serials
+    ftr_data = values.ftr_rows()
+    
+    # Get calibration instruments
+    calibration_instruments = []
+    try:
+        instruments = CalibrationInstrument.query.filter(
+            CalibrationInstrument.status.in_(['valid', 'due_soon'])
+        ).order_by(CalibrationInstrument.sr_no).all()
+        calibration_instruments = [inst.to_dict() for inst in instruments]
+    except Exception as e:
+        print(f"[PDI Docs] Calibration fetch error: {e}")
+    
+    # ==================== CREATE WORKBOOK ====================
+    if streaming:
+        wb = StreamingWorkbook()
+    else:
+        wb = openpyxl.Workbook()
+        wb.remove(wb.active)
+    
+    def step_done(step, name):
+        JobRegistry.update(job_id, current=step, message=f'{name} done', force=True)
+    
+    step_done(1, 'Data loading')
+    
+    # --- SHEET 1: IPQC Checksheet(s) ---
+    create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, report_date,
+                      serial_numbers, production_days, cell_manufacturer, cell_efficiency, module_size, specs,
+                      seed=values.seed)
+    step_done(2, 'IPQC Checksheet')
+    
+    # --- SHEET 2: FTR (Flasher Test Report) ---
+    ws = wb.create_sheet("FTR Report")
+    create_ftr_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                    sampled_serials, ftr_data, specs, module_type)
+    step_done(3, 'FTR Report')
+    
+    # --- SHEET 3: Bifaciality ---
+    ws = wb.create_sheet("Bifaciality")
+    create_bifaciality_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                            sampled_serials, ftr_data)
+    step_done(4, 'Bifaciality')
+    
+    # --- SHEET 4: Visual Inspection ---
+    ws = wb.create_sheet("Visual Inspection")
+    create_visual_inspection_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                                  sampled_serials)
+    step_done(5, 'Visual Inspection')
+    
+    # --- SHEET 5: EL Inspection ---
+    ws = wb.create_sheet("EL Inspection")
+    create_el_inspection_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                              sampled_serials)
+    step_done(6, 'EL Inspection')
+    
+    # --- SHEET 6: Safety Tests (IR, HV, GD, Wet Leakage) ---
+    ws = wb.create_sheet("Safety Tests")
+    create_safety_tests_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                             values.sample_rows('ir', 'dcw', 'gc', 'wet'))
+    step_done(7, 'Safety Tests')
+    
+    # --- SHEET 7: Dimension ---
+    ws = wb.create_sheet("Dimension")
+    create_dimension_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                          values.sample_rows('length', 'width', 'thickness', 'diag1', 'diag2', 'diag_diff'), specs)
+    step_done(8, 'Dimension')
+    
+    # --- SHEET 8: RFID ---
+    ws = wb.create_sheet("RFID")
+    create_rfid_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                     sampled_serials, ftr_data, module_type, cell_manufacturer)
+    step_done(9, 'RFID')
+    
+    # --- SHEET 9: Sampling Plan ---
+    ws = wb.create_sheet("Sampling Plan")
+    create_sampling_plan_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                              sample_size, accept_num, reject_num)
+    step_done(10, 'Sampling Plan')
+    
+    # --- SHEET 10: Calibration Index ---
+    ws = wb.create_sheet("Calibration")
+    create_calibration_sheet(ws, company_name, party_name, pdi_number, report_date,
+                            calibration_instruments)
+    step_done(11, 'Calibration')
+    
+    # --- SHEET 11: MOM (Minutes of Meeting) ---
+    ws = wb.create_sheet("MOM")
+    create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
+                    inspector_name, inspector_designation, manufacturer_rep, manufacturer_designation,
+                    production_days, serial_numbers, sample_size, specs)
+    step_done(12, 'MOM')
+    
+    # Save to buffer
+    buffer = io.BytesIO()
+    wb.save(buffer)
+    buffer.seek(0)
+    
+    filename = f"PDI_Documentation_{pdi_number}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx"
+    return buffer, filename, {'modules': total_qty, 'sampled': len(sampled_serials), 'seed': values.seed}
+
+
 # ==================== SHEET GENERATORS ====================
 
 def create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, report_date,
-                       serial_numbers, production_days, cell_manufacturer, cell_efficiency, module_size, specs):
+                       serial_numbers, production_days, cell_manufacturer, cell_efficiency, module_size, specs,
+                       seed=None):
     """Create IPQC checksheet(s) — one per production day, or one combined"""
+    rng = random.Random(seed)
     
     if not production_days:
         # Single sheet with all serials
@@ -531,7 +620,7 @@ def create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, repo
         
         # Random sample 5 serials for IPQC checkpoints
         sample_count = min(5, len(day_serials))
-        ipqc_sample = random.sample(day_serials, sample_count) if day_serials else []
+        ipqc_sample = rng.sample(day_serials, sample_count) if day_serials else []
         ipqc_sample.sort()
         
         sheet_name = f"IPQC Day{day_idx+1}" if len(production_days) > 1 else "IPQC Checksheet"
@@ -545,7 +634,7 @@ def create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, repo
         ws.merge_cells('A4:G4')
         shift_info = f"Shift: Day ({day_prod} pcs)" if night_prod == 0 else f"Day: {day_prod} pcs  |  Night: {night_prod} pcs"
         style_cell(ws, 4, 1, f"{shift_info}  |  Sample Serials: {', '.join(ipqc_sample[:3])}{'...' if len(ipqc_sample) > 3 else ''}",
-                  font=Font(size=9, italic=True))
+                  font=xs.font(size=9, italic=True))
         
         # Headers — Row 5
         headers = ['Sr.No.', 'Stage', 'Checkpoint', 'Sample Size / Freq', 'Acceptance Criteria', 'Monitoring Result', 'Remarks']
@@ -565,9 +654,9 @@ def create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, repo
             for ci, check in enumerate(checks):
                 style_cell(ws, row, 1, stage['sr'] if ci == 0 else '')
                 style_cell(ws, row, 2, stage['stage'] if ci == 0 else '')
-                style_cell(ws, row, 3, check['name'], alignment=Alignment(horizontal='left', vertical='center', wrap_text=True))
+                style_cell(ws, row, 3, check['name'], alignment=xs.alignment(horizontal='left', vertical='center', wrap_text=True))
                 style_cell(ws, row, 4, f"{check['sample']} / {check['freq']}")
-                style_cell(ws, row, 5, check['criteria'], alignment=Alignment(horizontal='left', vertical='center', wrap_text=True))
+                style_cell(ws, row, 5, check['criteria'], alignment=xs.alignment(horizontal='left', vertical='center', wrap_text=True))
                 
                 # Generate monitoring result
                 gen_func = check['gen']
@@ -579,12 +668,14 @@ def create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, repo
                         result = gen_func(mfr=cell_manufacturer, eff=cell_efficiency)
                     elif 'cable' in gen_func.__code__.co_varnames:
                         result = gen_func(cable='1200')
+                    elif 'rng' in gen_func.__code__.co_varnames:
+                        result = gen_func(rng=rng)
                     else:
                         result = gen_func()
                 except:
                     result = gen_func()
                 
-                style_cell(ws, row, 6, result, alignment=Alignment(horizontal='left', vertical='center', wrap_text=True))
+                style_cell(ws, row, 6, result, alignment=xs.alignment(horizontal='left', vertical='center', wrap_text=True))
                 style_cell(ws, row, 7, "OK", fill=green_fill)
                 
                 row += 1
@@ -597,11 +688,11 @@ def create_ipqc_sheets(wb, company_name, party_name, pdi_number, total_qty, repo
         # Signature row
         row += 1
         ws.merge_cells(f'A{row}:C{row}')
-        style_cell(ws, row, 1, "Inspector Signature: _______________", font=Font(bold=True, size=10),
-                  alignment=Alignment(horizontal='left'))
+        style_cell(ws, row, 1, "Inspector Signature: _______________", font=xs.font(bold=True, size=10),
+                  alignment=xs.alignment(horizontal='left'))
         ws.merge_cells(f'D{row}:G{row}')
-        style_cell(ws, row, 4, "Manufacturer QA: _______________", font=Font(bold=True, size=10),
-                  alignment=Alignment(horizontal='left'))
+        style_cell(ws, row, 4, "Manufacturer QA: _______________", font=xs.font(bold=True, size=10),
+                  alignment=xs.alignment(horizontal='left'))
 
 
 def create_ftr_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
@@ -610,6 +701,12 @@ def create_ftr_sheet(ws, company_name, party_name, pdi_number, total_qty, report
     add_title_block(ws, "Flasher Test (Power Measurement) Report", company_name, party_name,
                    pdi_number, total_qty, report_date)
     
+    # Column widths (before the rows - the sheet may be streamed)
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 24
+    for c in 'CDEFGHI':
+        ws.column_dimensions[c].width = 12
+    
     # Headers Row 5
     headers = ['Sr.No.', 'Module Sr.No.', 'Pmax(W)', 'Isc(A)', 'Voc(V)', 'Ipm(A)', 'Vpm(V)', 'FF(%)', 'Eff.(%)']
     for col, header in enumerate(headers, 1):
@@ -634,12 +731,6 @@ def create_ftr_sheet(ws, company_name, party_name, pdi_number, total_qty, report
         style_cell(ws, row, 7, ftr.get('vpm', ''))
         style_cell(ws, row, 8, ftr.get('ff', ''))
         style_cell(ws, row, 9, ftr.get('efficiency', ''))
-    
-    # Column widths
-    ws.column_dimensions['A'].width = 8
-    ws.column_dimensions['B'].width = 24
-    for c in 'CDEFGHI':
-        ws.column_dimensions[c].width = 12
 
 
 def create_bifaciality_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
@@ -648,20 +739,25 @@ def create_bifaciality_sheet(ws, company_name, party_name, pdi_number, total_qty
     add_title_block(ws, "Bi-Faciality Test Report", company_name, party_name,
                    pdi_number, total_qty, report_date, max_col=17)
     
+    ws.column_dimensions['A'].width = 6
+    ws.column_dimensions['B'].width = 22
+    for c in range(3, 18):
+        ws.column_dimensions[get_column_letter(c)].width = 10
+    
     # Super-headers Row 5
     ws.merge_cells('C5:I5')
     style_cell(ws, 5, 3, 'Front Side Electrical Data', font=header_font, fill=header_fill)
     ws.merge_cells('J5:P5')
     style_cell(ws, 5, 10, 'Rear Side Electrical Data', font=header_font,
-              fill=PatternFill(start_color="FF5722", end_color="FF5722", fill_type="solid"))
+              fill=xs.solid_fill("FF5722"))
     style_cell(ws, 5, 17, 'Bi-faciality', font=header_font,
-              fill=PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid"))
+              fill=xs.solid_fill("4CAF50"))
     
     # Sub-headers Row 6
     sub_headers = ['Sr.No.', 'Module Sr.No.', 'Pmax', 'Isc', 'Voc', 'Ipm', 'Vpm', 'FF', 'Eff',
                    'Pmax', 'Isc', 'Voc', 'Ipm', 'Vpm', 'FF', 'Eff', 'Factor(%)']
     for col, h in enumerate(sub_headers, 1):
-        style_cell(ws, 6, col, h, font=Font(bold=True, size=10))
+        style_cell(ws, 6, col, h, font=xs.font(bold=True, size=10))
     
     # Data
     for idx, serial in enumerate(serials, 1):
@@ -685,11 +781,6 @@ def create_bifaciality_sheet(ws, company_name, party_name, pdi_number, total_qty
         else:
             for ci in range(10, 18):
                 style_cell(ws, row, ci, '')
-    
-    ws.column_dimensions['A'].width = 6
-    ws.column_dimensions['B'].width = 22
-    for c in range(3, 18):
-        ws.column_dimensions[get_column_letter(c)].width = 10
 
 
 def create_visual_inspection_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date, serials):
@@ -697,6 +788,11 @@ def create_visual_inspection_sheet(ws, company_name, party_name, pdi_number, tot
     add_title_block(ws, "Visual Inspection Report", company_name, party_name,
                    pdi_number, total_qty, report_date, max_col=4)
     
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 24
+    ws.column_dimensions['C'].width = 16
+    ws.column_dimensions['D'].width = 10
+    
     headers = ['Sr.No.', 'Module Serial No.', 'Defects Found', 'Remark']
     for col, h in enumerate(headers, 1):
         style_cell(ws, 5, col, h, font=header_font, fill=header_fill)
@@ -707,11 +803,6 @@ def create_visual_inspection_sheet(ws, company_name, party_name, pdi_number, tot
         style_cell(ws, row, 2, serial)
         style_cell(ws, row, 3, 'Nil')
         style_cell(ws, row, 4, 'OK', fill=green_fill)
-    
-    ws.column_dimensions['A'].width = 8
-    ws.column_dimensions['B'].width = 24
-    ws.column_dimensions['C'].width = 16
-    ws.column_dimensions['D'].width = 10
 
 
 def create_el_inspection_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date, serials):
@@ -719,6 +810,11 @@ def create_el_inspection_sheet(ws, company_name, party_name, pdi_number, total_q
     add_title_block(ws, "EL Test Inspection Report", company_name, party_name,
                    pdi_number, total_qty, report_date, max_col=4)
     
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 24
+    ws.column_dimensions['C'].width = 30
+    ws.column_dimensions['D'].width = 10
+    
     headers = ['Sr.No.', 'Module Serial No.', 'Defects Found', 'Remark']
     for col, h in enumerate(headers, 1):
         style_cell(ws, 5, col, h, font=header_font, fill=header_fill)
@@ -729,71 +825,62 @@ def create_el_inspection_sheet(ws, company_name, party_name, pdi_number, total_q
         style_cell(ws, row, 2, serial)
         style_cell(ws, row, 3, 'Nil - No Micro Crack / Inactive Cell')
         style_cell(ws, row, 4, 'OK', fill=green_fill)
-    
-    ws.column_dimensions['A'].width = 8
-    ws.column_dimensions['B'].width = 24
-    ws.column_dimensions['C'].width = 30
-    ws.column_dimensions['D'].width = 10
 
 
-def create_safety_tests_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date, serials, specs):
-    """Safety Tests — IR, HV, Ground Continuity, Wet Leakage"""
+def create_safety_tests_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date, readings):
+    """Safety Tests — IR, HV, Ground Continuity, Wet Leakage
+    readings: rows of (serial, ir, dcw, gc, wet)"""
     add_title_block(ws, "Insulation Resistance, Hi-Pot, Ground Continuity & Wet Leakage Test", company_name, party_name,
                    pdi_number, total_qty, report_date, max_col=7)
     
+    ws.column_dimensions['A'].width = 8
+    ws.column_dimensions['B'].width = 24
+    for c in 'CDEFG':
+        ws.column_dimensions[c].width = 16
+    
     # Criteria row
     ws.merge_cells('A4:G4')
     style_cell(ws, 4, 1, "IR: ≥40MΩ @1000VDC  |  DCW: <50µA @3800VDC/3s  |  GC: <100mΩ  |  Wet Leakage: <10µA",
-              font=Font(size=9, italic=True, color="666666"))
+              font=xs.font(size=9, italic=True, color="666666"))
     
     headers = ['Sr.No.', 'Module Sr.No.', 'IR Test (MΩ)', 'DCW (µA)', 'Ground Cont. (mΩ)', 'Wet Leakage (µA)', 'Result']
     for col, h in enumerate(headers, 1):
         style_cell(ws, 5, col, h, font=header_font, fill=header_fill)
     
-    for idx, serial in enumerate(serials, 1):
+    for idx, (serial, ir_val, dcw_val, gc_val, wet_val) in enumerate(readings, 1):
         row = idx + 5
-        ir_val = random.randint(200, 999)
-        dcw_val = round(random.uniform(5, 35), 1)
-        gc_val = round(random.uniform(10, 80), 1)
-        wet_val = round(random.uniform(1, 8), 1)
-        
         style_cell(ws, row, 1, idx)
         style_cell(ws, row, 2, serial)
         style_cell(ws, row, 3, ir_val)
         style_cell(ws, row, 4, dcw_val)
         style_cell(ws, row, 5, gc_val)
         style_cell(ws, row, 6, wet_val)
-        style_cell(ws, row, 7, 'PASS', fill=green_fill, font=Font(bold=True, color="2E7D32"))
-    
-    ws.column_dimensions['A'].width = 8
-    ws.column_dimensions['B'].width = 24
-    for c in 'CDEFG':
-        ws.column_dimensions[c].width = 16
+        style_cell(ws, row, 7, 'PASS', fill=green_fill, font=xs.font(bold=True, color="2E7D32"))
 
 
-def create_dimension_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date, serials, specs):
-    """Dimension Measurement sheet"""
+def create_dimension_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date, readings, specs):
+    """Dimension Measurement sheet
+    readings: rows of (serial, length, width, thickness, diag1, diag2, diag_diff)"""
     size_parts = specs['size'].split('x')
     length, width, thickness = size_parts[0], size_parts[1], size_parts[2]
     
     add_title_block(ws, "Physical Dimension Measurement Report", company_name, party_name,
                    pdi_number, total_qty, report_date, max_col=10)
     
+    ws.column_dimensions['A'].width = 6
+    ws.column_dimensions['B'].width = 22
+    for c in range(3, 11):
+        ws.column_dimensions[get_column_letter(c)].width = 14
+    
     headers = ['Sr.No.', 'Module Sr.No.', f'Length(mm)\n{length}±1', f'Width(mm)\n{width}±1',
                f'Thickness(mm)\n{thickness}±0.5', 'Diag 1(mm)', 'Diag 2(mm)', 'Diag Diff(mm)\n≤3',
                'Cable Length(mm)', 'Result']
     for col, h in enumerate(headers, 1):
         style_cell(ws, 5, col, h, font=header_font, fill=header_fill)
     
-    for idx, serial in enumerate(serials, 1):
+    cable = 1200
+    for idx, (serial, l, w, t, diag1, diag2, diag_diff) in enumerate(readings, 1):
         row = idx + 5
-        l = round(float(length) + random.uniform(-0.8, 0.8), 1)
-        w = round(float(width) + random.uniform(-0.8, 0.8), 1)
-        t = round(float(thickness) + random.uniform(-0.3, 0.3), 1)
-        diag1 = round(math.sqrt(float(length)**2 + float(width)**2) + random.uniform(-1, 1), 1)
-        diag2 = round(diag1 + random.uniform(-2, 2), 1)
-        diag_diff = round(abs(diag1 - diag2), 1)
-        cable = 1200
         
         style_cell(ws, row, 1, idx)
         style_cell(ws, row, 2, serial)
@@ -804,12 +891,7 @@ def create_dimension_sheet(ws, company_name, party_name, pdi_number, total_qty,
         style_cell(ws, row, 7, diag2)
         style_cell(ws, row, 8, diag_diff)
         style_cell(ws, row, 9, cable)
-        style_cell(ws, row, 10, 'PASS', fill=green_fill, font=Font(bold=True, color="2E7D32"))
-    
-    ws.column_dimensions['A'].width = 6
-    ws.column_dimensions['B'].width = 22
-    for c in range(3, 11):
-        ws.column_dimensions[get_column_letter(c)].width = 14
+        style_cell(ws, row, 10, 'PASS', fill=green_fill, font=xs.font(bold=True, color="2E7D32"))
 
 
 def create_rfid_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
@@ -818,6 +900,11 @@ def create_rfid_sheet(ws, company_name, party_name, pdi_number, total_qty, repor
     add_title_block(ws, "RFID Verification Report", company_name, party_name,
                    pdi_number, total_qty, report_date, max_col=14)
     
+    ws.column_dimensions['A'].width = 6
+    ws.column_dimensions['B'].width = 22
+    for c in range(3, 15):
+        ws.column_dimensions[get_column_letter(c)].width = 12
+    
     headers = ['Sr.No.', 'Module Sr.No.', 'Module Type', 'Cell Mfr', 'Module Mfr', 'Cell Month',
                'Module Month', 'Pmax', 'Vpm', 'Ipm', 'FF', 'Voc', 'Isc', 'Lab IEC']
     for col, h in enumerate(headers, 1):
@@ -845,11 +932,6 @@ def create_rfid_sheet(ws, company_name, party_name, pdi_number, total_qty, repor
         style_cell(ws, row, 12, ftr.get('voc', ''))
         style_cell(ws, row, 13, ftr.get('isc', ''))
         style_cell(ws, row, 14, 'DTH')
-    
-    ws.column_dimensions['A'].width = 6
-    ws.column_dimensions['B'].width = 22
-    for c in range(3, 15):
-        ws.column_dimensions[get_column_letter(c)].width = 12
 
 
 def create_sampling_plan_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
@@ -870,8 +952,8 @@ def create_sampling_plan_sheet(ws, company_name, party_name, pdi_number, total_q
         row = ri + 5
         for ci in range(0, len(row_data), 2):
             col = ci + 1
-            style_cell(ws, row, col, row_data[ci], font=Font(bold=True), fill=sub_header_fill,
-                      alignment=Alignment(horizontal='right', vertical='center'))
+            style_cell(ws, row, col, row_data[ci], font=xs.font(bold=True), fill=sub_header_fill,
+                      alignment=xs.alignment(horizontal='right', vertical='center'))
             style_cell(ws, row, col + 1, row_data[ci + 1], fill=green_fill if 'ACCEPTED' in str(row_data[ci + 1]) else None)
     
     # Test Categories
@@ -901,7 +983,7 @@ def create_sampling_plan_sheet(ws, company_name, party_name, pdi_number, total_q
         row = ri + 11
         for ci, val in enumerate(test_row):
             fill = green_fill if val == 'PASS' else None
-            font = Font(bold=True, color="2E7D32") if val == 'PASS' else None
+            font = xs.font(bold=True, color="2E7D32") if val == 'PASS' else None
             style_cell(ws, row, ci + 1, val, fill=fill, font=font)
     
     for c in range(1, 7):
@@ -913,6 +995,10 @@ def create_calibration_sheet(ws, company_name, party_name, pdi_number, report_da
     add_title_block(ws, "Calibration Instrument Index", company_name, party_name,
                    pdi_number, len(instruments), report_date, max_col=11)
     
+    widths = [6, 14, 20, 12, 16, 10, 20, 12, 12, 16, 10]
+    for ci, w in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(ci)].width = w
+    
     headers = ['Sr.No.', 'Instrument ID', 'Equipment Name', 'Make', 'Range/Capacity',
                'Least Count', 'Cal. Agency', 'Cal. Date', 'Due Date', 'Certificate No.', 'Status']
     for col, h in enumerate(headers, 1):
@@ -949,16 +1035,12 @@ def create_calibration_sheet(ws, company_name, party_name, pdi_number, report_da
         
         style_cell(ws, row, 10, inst.get('certificate_no', ''))
         style_cell(ws, row, 11, status.upper(), fill=status_fill,
-                  font=Font(bold=True, color="2E7D32" if status == 'valid' else "F57F17" if status == 'due_soon' else "C62828"))
+                  font=xs.font(bold=True, color="2E7D32" if status == 'valid' else "F57F17" if status == 'due_soon' else "C62828"))
     
     if not instruments:
         ws.merge_cells('A6:K6')
         style_cell(ws, 6, 1, 'No calibration instruments found. Add instruments in Calibration Dashboard.',
-                  font=Font(italic=True, color="999999"))
-    
-    widths = [6, 14, 20, 12, 16, 10, 20, 12, 12, 16, 10]
-    for ci, w in enumerate(widths, 1):
-        ws.column_dimensions[get_column_letter(ci)].width = w
+                  font=xs.font(italic=True, color="999999"))
 
 
 def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report_date,
@@ -968,21 +1050,26 @@ def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report
     max_col = 6
     col_letter = get_column_letter(max_col)
     
+    # Column widths
+    widths = [18, 18, 14, 18, 18, 14]
+    for ci, w in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(ci)].width = w
+    
     # Title
     ws.merge_cells(f'A1:{col_letter}1')
     style_cell(ws, 1, 1, company_name, font=title_font, fill=mom_header_fill)
     ws.row_dimensions[1].height = 30
     
     ws.merge_cells(f'A2:{col_letter}2')
-    style_cell(ws, 2, 1, "MINUTES OF MEETING — PRE-DISPATCH INSPECTION (PDI)", font=Font(bold=True, size=13))
+    style_cell(ws, 2, 1, "MINUTES OF MEETING — PRE-DISPATCH INSPECTION (PDI)", font=xs.font(bold=True, size=13))
     
     ws.merge_cells(f'A3:{col_letter}3')
-    style_cell(ws, 3, 1, f"Date: {report_date}", font=Font(size=11))
+    style_cell(ws, 3, 1, f"Date: {report_date}", font=xs.font(size=11))
     
     # Section 1: General Information
     row = 5
     ws.merge_cells(f'A{row}:{col_letter}{row}')
-    style_cell(ws, row, 1, "1. GENERAL INFORMATION", font=Font(bold=True, size=12, color="1565C0"),
+    style_cell(ws, row, 1, "1. GENERAL INFORMATION", font=xs.font(bold=True, size=12, color="1565C0"),
               fill=sub_header_fill)
     
     info_rows = [
@@ -995,17 +1082,17 @@ def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report
     
     for ri, info in enumerate(info_rows):
         row = ri + 6
-        style_cell(ws, row, 1, info[0], font=Font(bold=True), fill=sub_header_fill, alignment=Alignment(horizontal='right', vertical='center'))
+        style_cell(ws, row, 1, info[0], font=xs.font(bold=True), fill=sub_header_fill, alignment=xs.alignment(horizontal='right', vertical='center'))
         ws.merge_cells(f'B{row}:C{row}')
         style_cell(ws, row, 2, info[1])
-        style_cell(ws, row, 4, info[2], font=Font(bold=True), fill=sub_header_fill, alignment=Alignment(horizontal='right', vertical='center'))
+        style_cell(ws, row, 4, info[2], font=xs.font(bold=True), fill=sub_header_fill, alignment=xs.alignment(horizontal='right', vertical='center'))
         ws.merge_cells(f'E{row}:F{row}')
         style_cell(ws, row, 5, info[3])
     
     # Section 2: Production Summary
     row = 12
     ws.merge_cells(f'A{row}:{col_letter}{row}')
-    style_cell(ws, row, 1, "2. PRODUCTION SUMMARY", font=Font(bold=True, size=12, color="1565C0"),
+    style_cell(ws, row, 1, "2. PRODUCTION SUMMARY", font=xs.font(bold=True, size=12, color="1565C0"),
               fill=sub_header_fill)
     
     row = 13
@@ -1026,7 +1113,7 @@ def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report
             style_cell(ws, row, 2, day_data.get('date', ''))
             style_cell(ws, row, 3, day_prod)
             style_cell(ws, row, 4, night_prod)
-            style_cell(ws, row, 5, total_day, font=Font(bold=True))
+            style_cell(ws, row, 5, total_day, font=xs.font(bold=True))
             style_cell(ws, row, 6, cumulative)
         row += 1
     else:
@@ -1035,24 +1122,24 @@ def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report
         style_cell(ws, row, 2, report_date)
         style_cell(ws, row, 3, total_qty)
         style_cell(ws, row, 4, 0)
-        style_cell(ws, row, 5, total_qty, font=Font(bold=True))
+        style_cell(ws, row, 5, total_qty, font=xs.font(bold=True))
         style_cell(ws, row, 6, total_qty)
         row = 15
     
     # Total row
     ws.merge_cells(f'A{row}:B{row}')
-    style_cell(ws, row, 1, 'TOTAL', font=Font(bold=True), fill=green_fill)
+    style_cell(ws, row, 1, 'TOTAL', font=xs.font(bold=True), fill=green_fill)
     total_day_sum = sum(d.get('day_production', 0) for d in production_days) if production_days else total_qty
     total_night_sum = sum(d.get('night_production', 0) for d in production_days) if production_days else 0
-    style_cell(ws, row, 3, total_day_sum, font=Font(bold=True), fill=green_fill)
-    style_cell(ws, row, 4, total_night_sum, font=Font(bold=True), fill=green_fill)
-    style_cell(ws, row, 5, total_qty, font=Font(bold=True, size=12, color="1B5E20"), fill=green_fill)
-    style_cell(ws, row, 6, total_qty, font=Font(bold=True), fill=green_fill)
+    style_cell(ws, row, 3, total_day_sum, font=xs.font(bold=True), fill=green_fill)
+    style_cell(ws, row, 4, total_night_sum, font=xs.font(bold=True), fill=green_fill)
+    style_cell(ws, row, 5, total_qty, font=xs.font(bold=True, size=12, color="1B5E20"), fill=green_fill)
+    style_cell(ws, row, 6, total_qty, font=xs.font(bold=True), fill=green_fill)
     
     # Section 3: Inspection Summary
     row += 2
     ws.merge_cells(f'A{row}:{col_letter}{row}')
-    style_cell(ws, row, 1, "3. INSPECTION SUMMARY", font=Font(bold=True, size=12, color="1565C0"),
+    style_cell(ws, row, 1, "3. INSPECTION SUMMARY", font=xs.font(bold=True, size=12, color="1565C0"),
               fill=sub_header_fill)
     
     row += 1
@@ -1077,13 +1164,13 @@ def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report
         row += 1
         for ci, val in enumerate(item):
             fill = green_fill if '✓' in str(val) else None
-            font_style = Font(bold=True, color="2E7D32") if '✓' in str(val) else None
+            font_style = xs.font(bold=True, color="2E7D32") if '✓' in str(val) else None
             style_cell(ws, row, ci + 1, val, fill=fill, font=font_style)
     
     # Section 4: Serial Number Range
     row += 2
     ws.merge_cells(f'A{row}:{col_letter}{row}')
-    style_cell(ws, row, 1, "4. SERIAL NUMBER INFORMATION", font=Font(bold=True, size=12, color="1565C0"),
+    style_cell(ws, row, 1, "4. SERIAL NUMBER INFORMATION", font=xs.font(bold=True, size=12, color="1565C0"),
               fill=sub_header_fill)
     
     row += 1
@@ -1095,19 +1182,19 @@ def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report
         ['Lot Status', 'ACCEPTED ✓'],
     ]
     for item in serial_info:
-        style_cell(ws, row, 1, item[0], font=Font(bold=True), fill=sub_header_fill,
-                  alignment=Alignment(horizontal='right', vertical='center'))
+        style_cell(ws, row, 1, item[0], font=xs.font(bold=True), fill=sub_header_fill,
+                  alignment=xs.alignment(horizontal='right', vertical='center'))
         ws.merge_cells(f'B{row}:{col_letter}{row}')
         fill = green_fill if '✓' in str(item[1]) else None
-        font_style = Font(bold=True, size=12, color="1B5E20") if '✓' in str(item[1]) else Font(size=11)
+        font_style = xs.font(bold=True, size=12, color="1B5E20") if '✓' in str(item[1]) else xs.font(size=11)
         style_cell(ws, row, 2, item[1], fill=fill, font=font_style,
-                  alignment=Alignment(horizontal='left', vertical='center'))
+                  alignment=xs.alignment(horizontal='left', vertical='center'))
         row += 1
     
     # Section 5: Conclusion
     row += 1
     ws.merge_cells(f'A{row}:{col_letter}{row}')
-    style_cell(ws, row, 1, "5. CONCLUSION", font=Font(bold=True, size=12, color="1565C0"),
+    style_cell(ws, row, 1, "5. CONCLUSION", font=xs.font(bold=True, size=12, color="1565C0"),
               fill=sub_header_fill)
     
     row += 1
@@ -1118,59 +1205,54 @@ def create_mom_sheet(ws, company_name, party_name, pdi_number, total_qty, report
               f"({specs.get('power', '')}W) Solar PV Modules has been successfully completed. "
               f"All modules have passed the required quality checks as per applicable IEC/BIS standards. "
               f"The lot is APPROVED for dispatch.",
-              font=Font(size=11),
-              alignment=Alignment(horizontal='left', vertical='center', wrap_text=True))
+              font=xs.font(size=11),
+              alignment=xs.alignment(horizontal='left', vertical='center', wrap_text=True))
     
     # Section 6: Signatures
     row += 2
     ws.merge_cells(f'A{row}:{col_letter}{row}')
-    style_cell(ws, row, 1, "6. SIGNATURES", font=Font(bold=True, size=12, color="1565C0"),
+    style_cell(ws, row, 1, "6. SIGNATURES", font=xs.font(bold=True, size=12, color="1565C0"),
               fill=sub_header_fill)
     
     row += 2
-    style_cell(ws, row, 1, "For Inspector / Customer:", font=Font(bold=True),
-              alignment=Alignment(horizontal='left'), border=None)
-    style_cell(ws, row, 4, "For Manufacturer:", font=Font(bold=True),
-              alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 1, "For Inspector / Customer:", font=xs.font(bold=True),
+              alignment=xs.alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 4, "For Manufacturer:", font=xs.font(bold=True),
+              alignment=xs.alignment(horizontal='left'), border=None)
     
     row += 2
-    style_cell(ws, row, 1, "Name:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 1, "Name:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'B{row}:C{row}')
     style_cell(ws, row, 2, inspector_name or '________________________', border=None,
-              alignment=Alignment(horizontal='left'))
-    style_cell(ws, row, 4, "Name:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+              alignment=xs.alignment(horizontal='left'))
+    style_cell(ws, row, 4, "Name:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'E{row}:F{row}')
     style_cell(ws, row, 5, manufacturer_rep or '________________________', border=None,
-              alignment=Alignment(horizontal='left'))
+              alignment=xs.alignment(horizontal='left'))
     
     row += 1
-    style_cell(ws, row, 1, "Designation:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 1, "Designation:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'B{row}:C{row}')
-    style_cell(ws, row, 2, inspector_designation, border=None, alignment=Alignment(horizontal='left'))
-    style_cell(ws, row, 4, "Designation:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 2, inspector_designation, border=None, alignment=xs.alignment(horizontal='left'))
+    style_cell(ws, row, 4, "Designation:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'E{row}:F{row}')
-    style_cell(ws, row, 5, manufacturer_designation, border=None, alignment=Alignment(horizontal='left'))
+    style_cell(ws, row, 5, manufacturer_designation, border=None, alignment=xs.alignment(horizontal='left'))
     
     row += 1
-    style_cell(ws, row, 1, "Signature:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 1, "Signature:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'B{row}:C{row}')
-    style_cell(ws, row, 2, '________________________', border=None, alignment=Alignment(horizontal='left'))
-    style_cell(ws, row, 4, "Signature:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 2, '________________________', border=None, alignment=xs.alignment(horizontal='left'))
+    style_cell(ws, row, 4, "Signature:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'E{row}:F{row}')
-    style_cell(ws, row, 5, '________________________', border=None, alignment=Alignment(horizontal='left'))
+    style_cell(ws, row, 5, '________________________', border=None, alignment=xs.alignment(horizontal='left'))
     
     row += 1
-    style_cell(ws, row, 1, "Date:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 1, "Date:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'B{row}:C{row}')
-    style_cell(ws, row, 2, report_date, border=None, alignment=Alignment(horizontal='left'))
-    style_cell(ws, row, 4, "Date:", font=Font(bold=True), alignment=Alignment(horizontal='left'), border=None)
+    style_cell(ws, row, 2, report_date, border=None, alignment=xs.alignment(horizontal='left'))
+    style_cell(ws, row, 4, "Date:", font=xs.font(bold=True), alignment=xs.alignment(horizontal='left'), border=None)
     ws.merge_cells(f'E{row}:F{row}')
-    style_cell(ws, row, 5, report_date, border=None, alignment=Alignment(horizontal='left'))
-    
-    # Column widths
-    widths = [18, 18, 14, 18, 18, 14]
-    for ci, w in enumerate(widths, 1):
-        ws.column_dimensions[get_column_letter(ci)].width = w
+    style_cell(ws, row, 5, report_date, border=None, alignment=xs.alignment(horizontal='left'))
 
 
 @pdi_doc_bp.route('/pdi-docs/companies', methods=['GET'])
@@ -1,12 +1,19 @@
 """
 PDI Batch Management API Routes
 """
-from flask import Blueprint, request, jsonify, send_file
+from flask import Blueprint, request, jsonify
 from datetime import datetime
 from app.models.database import db, ProductionRecord, BomMaterial, Company
 from app.models.pdi_models import PDIBatch, ModuleSerialNumber, MasterOrder, COCDocument, PDICOCUsage
+from app.services.pdi_views import (
+    BATCH_VIEWS, SERIAL_PAGE_SIZE, parse_view, serialize_batches, batch_serial_counts, serial_page
+)
+from app.services.serial_search import parse_page_size
+from app.services.serial_ranges import create_range, materialize_serial, reassign_serial
+from app.services.serial_registry import record_serials
 from io import BytesIO
 import os
+import tempfile
 import requests
 
 pdi_bp = Blueprint('pdi', __name__)
@@ -73,27 +80,36 @@ def send_pdi_whatsapp_alert(caution, party_name, module_no, pallet_no, rejection
         print(f"❌ PDI WhatsApp error: {str(e)}")
         return []
 
+def _batch_detail(batch):
+    return batch.to_dict(batch_serial_counts([batch.id])[batch.id])
+
 # Get all PDI batches
 @pdi_bp.route('/api/pdi-batches', methods=['GET'])
 def get_pdi_batches():
+    """
+    Batch list as summaries (serial counts, no child rows).
+    ?view=detail adds raw materials + COC usage, ?view=full also every serial row.
+    """
     try:
         order_id = request.args.get('order_id')
+        view = parse_view(request.args.get('view'), BATCH_VIEWS, 'summary')
         
-        query = PDIBatch.query
+        query = PDIBatch.query.options(*BATCH_VIEWS[view]())
         if order_id:
             query = query.filter_by(order_id=order_id)
         
         batches = query.order_by(PDIBatch.batch_sequence).all()
-        return jsonify([batch.to_dict() for batch in batches]), 200
+        return jsonify(serialize_batches(batches, view)), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# Get single PDI batch
+# Get single PDI batch (detail view; ?view=full embeds every serial row)
 @pdi_bp.route('/api/pdi-batches/<int:batch_id>', methods=['GET'])
 def get_pdi_batch(batch_id):
     try:
-        batch = PDIBatch.query.get_or_404(batch_id)
-        return jsonify(batch.to_dict()), 200
+        view = parse_view(request.args.get('view'), BATCH_VIEWS, 'detail')
+        batch = PDIBatch.query.options(*BATCH_VIEWS[view]()).filter_by(id=batch_id).first_or_404()
+        return jsonify(serialize_batches([batch], view)[0]), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 404
 
@@ -141,36 +157,24 @@ def create_pdi_batch():
         )
         
         db.session.add(batch)
-        db.session.commit()
+        db.session.flush()
         
         # Auto-generate serial numbers
         generate_serial_numbers(batch.id, serial_prefix, serial_start, serial_end)
+        db.session.commit()
         
-        return jsonify(batch.to_dict()), 201
+        return jsonify(_batch_detail(batch)), 201
+    except ValueError as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-# Generate serial numbers for batch
+# Generate serial numbers for batch: stored as one range, rows appear per serial once it has state.
+# Caller commits; raises ValueError when the serials overlap another batch's.
 def generate_serial_numbers(batch_id, prefix, start, end):
-    try:
-        serials = []
-        for i in range(start, end + 1):
-            serial_number = f"{prefix}-{i:06d}"
-            serial = ModuleSerialNumber(
-                pdi_batch_id=batch_id,
-                serial_number=serial_number,
-                qc_status='pending'
-            )
-            serials.append(serial)
-        
-        db.session.bulk_save_objects(serials)
-        db.session.commit()
-        return True
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error generating serials: {e}")
-        return False
+    return create_range(batch_id, prefix, start, end)
 
 # Update PDI batch
 @pdi_bp.route('/api/pdi-batches/<int:batch_id>', methods=['PUT'])
@@ -193,7 +197,7 @@ def update_pdi_batch(batch_id):
         batch.updated_at = datetime.utcnow()
         db.session.commit()
         
-        return jsonify(batch.to_dict()), 200
+        return jsonify(_batch_detail(batch)), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
@@ -266,24 +270,26 @@ def close_pdi_batch(batch_id):
         
         return jsonify({
             'message': 'PDI batch closed successfully',
-            'batch': batch.to_dict()
+            'batch': _batch_detail(batch)
         }), 200
     except Exception as e:
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
-# Get batch serial numbers
+# Get batch serial numbers, one page at a time (?limit=, ?cursor=, ?status=)
 @pdi_bp.route('/api/pdi-batches/<int:batch_id>/serials', methods=['GET'])
 def get_batch_serials(batch_id):
     try:
         batch = PDIBatch.query.get_or_404(batch_id)
-        serials = ModuleSerialNumber.query.filter_by(pdi_batch_id=batch_id).all()
+        limit = parse_page_size(request.args.get('limit'), SERIAL_PAGE_SIZE)
+        serials, cursor = serial_page(batch_id, limit, request.args.get('cursor'), request.args.get('status'))
         
         return jsonify({
             'batchId': batch_id,
             'pdiNumber': batch.pdi_number,
-            'totalSerials': len(serials),
-            'serials': [s.to_dict() for s in serials]
+            'totalSerials': batch_serial_counts([batch_id])[batch_id]['total'],
+            'serials': serials,
+            'nextCursor': cursor
         }), 200
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -291,10 +297,52 @@ def get_batch_serials(batch_id):
 # Update serial number status
 @pdi_bp.route('/api/serials/<int:serial_id>', methods=['PUT'])
 def update_serial(serial_id):
+    serial = ModuleSerialNumber.query.get_or_404(serial_id)
+    return _update_serial(serial, request.get_json())
+
+# Update a serial by number (range serials without a row get one first)
+@pdi_bp.route('/api/serials/number/<path:serial_number>', methods=['PUT'])
+def update_serial_by_number(serial_number):
+    try:
+        serial = materialize_serial(serial_number)
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+    if not serial:
+        return jsonify({'error': f'Serial {serial_number} not found'}), 404
+    return _update_serial(serial, request.get_json())
+
+# Move a serial to another PDI batch
+@pdi_bp.route('/api/serials/number/<path:serial_number>/reassign', methods=['POST'])
+def reassign_serial_to_batch(serial_number):
     try:
-        serial = ModuleSerialNumber.query.get_or_404(serial_id)
         data = request.get_json()
-        
+        batch = PDIBatch.query.get_or_404(int(data.get('batchId')))
+        serial = reassign_serial(serial_number, batch.id)
+        if not serial:
+            return jsonify({'error': f'Serial {serial_number} not found'}), 404
+        _record_serial(serial, batch, replace=('pdi_batch_id', 'pdi_number'))
+        db.session.commit()
+        return jsonify(serial.to_dict()), 200
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
+def _record_serial(serial, batch, replace=()):
+    """Mirror a module_serial_numbers row into the serial registry (same transaction)"""
+    order = MasterOrder.query.get(batch.order_id) if batch else None
+    record_serials('module_serial_numbers', [{
+        'serial_number': serial.serial_number,
+        'company_id': order.company_id if order else None,
+        'pdi_batch_id': serial.pdi_batch_id,
+        'pdi_number': batch.pdi_number if batch else None,
+        'is_rejected': bool(serial.rejection_reason),
+        'rejection_reason': serial.rejection_reason or None,
+        'dispatched_at': serial.dispatch_date if serial.dispatched else None
+    }], replace=replace)
+
+def _update_serial(serial, data):
+    try:
         # Get PDI batch and party info for WhatsApp alerts
         pdi_batch = PDIBatch.query.get(serial.pdi_batch_id)
         party_name = "Unknown"
@@ -305,7 +353,7 @@ def update_serial(serial_id):
             if order:
                 company = Company.query.get(order.company_id)
                 if company:
-                    party_name = company.name
+                    party_name = company.company_name
         
         # Check if rejection is being uploaded
         if 'rejectionReason' in data and data['rejectionReason']:
@@ -342,6 +390,7 @@ def update_serial(serial_id):
                         rejection_reason=f"REJECTED: {serial.rejection_reason} - BUT BEING DISPATCHED!"
                     )
         
+        _record_serial(serial, pdi_batch, replace=('dispatched_at',) if 'dispatched' in data else ())
         db.session.commit()
         return jsonify(serial.to_dict()), 200
     except Exception as e:
@@ -369,28 +418,30 @@ def download_complete_report():
         # Import here to avoid circular imports
         from app.services.pdi_report_generator import PDIReportGenerator
         
+        from app.services.excel_export import send_temp_file
+        
         print("Generating complete report...")
-        # Generate complete report
+        # Generate complete report into a temp file (streamed to the client, then removed)
         generator = PDIReportGenerator()
-        pdf_buffer = generator.generate_complete_report(pdi_number, company_name)
-        
-        if not pdf_buffer:
-            print("ERROR: generate_complete_report returned None")
+        fd, tmp_path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        built = False
+        try:
+            built = generator.build_complete_report(pdi_number, company_name, tmp_path)
+        finally:
+            if not built:
+                os.remove(tmp_path)
+        if not built:
+            print("ERROR: build_complete_report failed")
             return jsonify({'error': 'Failed to generate report - no data found'}), 500
         
         # Send file
-        pdf_buffer.seek(0)
         filename = f"Complete_Report_{pdi_number}_{datetime.now().strftime('%Y%m%d')}.pdf"
         
         print(f"Sending file: {filename}")
         print("=== REPORT GENERATION COMPLETE ===\n")
         
-        return send_file(
-            pdf_buffer,
-            mimetype='application/pdf',
-            as_attachment=True,
-            download_name=filename
-        )
+        return send_temp_file(tmp_path, filename, 'application/pdf')
         
     except Exception as e:
         print(f"ERROR generating complete report: {str(e)}")
@@ -8,6 +8,7 @@ from app.models.database import db
 from app.models.peel_test_data import PeelTestReport, PeelTestResult
 from app.services.peel_test_pdf_generator import generate_peel_test_pdf
 from app.services.peel_test_excel_generator import generate_peel_test_excel
+from app.services.artifact_store import send_artifact
 from datetime import datetime
 import os
 import zipfile
@@ -202,13 +203,18 @@ def download_peel_test_pdf(report_id):
     try:
         report = PeelTestReport.query.get_or_404(report_id)
         
-        # Generate PDF
-        pdf_path = generate_peel_test_pdf(report)
-        
-        return send_file(
-            pdf_path,
+        # Generate PDF (repeat downloads are served from the artifact store)
+        pdf_data = {
+            'stringer': 'Stringer 1',
+            'shift': report.shift,
+            'date': (report.report_date or datetime.now()).strftime('%Y-%m-%d')
+        }
+        
+        return send_artifact(
+            'peel_test_pdf', pdf_data,
+            lambda path: generate_peel_test_pdf(pdf_data, filepath=path),
+            suffix='.pdf',
             mimetype='application/pdf',
-            as_attachment=True,
             download_name=f'peel_test_report_{report_id}.pdf'
         )
         
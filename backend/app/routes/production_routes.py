@@ -1,6 +1,7 @@
 from flask import Blueprint, request, send_file, jsonify
 from app.services.production_pdf_generator import ProductionPDFGenerator
-from app.services.excel_generator import generate_production_excel
+from app.services.excel_generator import generate_production_excel, production_excel_filename
+from app.services.artifact_store import send_artifact
 from datetime import datetime
 import os
 
@@ -53,29 +54,22 @@ def generate_production_report():
         if not data:
             return jsonify({'error': 'No data provided'}), 400
         
-        # Generate PDF
-        pdf_generator = ProductionPDFGenerator()
-        pdf_buffer = pdf_generator.generate_production_report(data, 'production_report.pdf')
+        def build(path):
+            pdf_generator = ProductionPDFGenerator()
+            pdf_buffer = pdf_generator.generate_production_report(data, 'production_report.pdf')
+            with open(path, 'wb') as f:
+                f.write(pdf_buffer.getvalue())
         
-        # Save to generated_pdfs folder
-        output_dir = os.path.join(os.path.dirname(__file__), '../../generated_pdfs')
-        os.makedirs(output_dir, exist_ok=True)
-        
-        # Generate unique filename with company name and timestamp to prevent overwrite
+        # Download name with company name and timestamp
         company_name = data.get('company_name', 'Unknown').replace(' ', '_').replace('/', '_')
         timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
         filename = f"{company_name}_Production_Report_{data.get('start_date')}_{data.get('end_date')}_{timestamp}.pdf"
-        filepath = os.path.join(output_dir, filename)
         
-        with open(filepath, 'wb') as f:
-            f.write(pdf_buffer.getvalue())
-        
-        # Return the PDF
-        pdf_buffer.seek(0)
-        return send_file(
-            pdf_buffer,
+        # The PDF is built only from the request data - repeat requests come from the artifact store
+        return send_artifact(
+            'production_report_pdf', data, build,
+            suffix='.pdf',
             mimetype='application/pdf',
-            as_attachment=True,
             download_name=filename
         )
         
@@ -105,24 +99,23 @@ def generate_production_excel_report():
         cells_received_mw = data.get('cells_received_mw', 0)
         report_options = data.get('report_options', {})
         
-        # Generate Excel
-        filepath = generate_production_excel(
-            company, 
-            production_data, 
-            rejections, 
-            start_date, 
-            end_date,
-            cells_received_qty,
-            cells_received_mw,
-            report_options
-        )
-        
-        # Return the Excel file
-        return send_file(
-            filepath,
+        # Generate Excel (or serve the stored copy for identical request data)
+        return send_artifact(
+            'production_report_excel', data,
+            lambda path: generate_production_excel(
+                company, 
+                production_data, 
+                rejections, 
+                start_date, 
+                end_date,
+                cells_received_qty,
+                cells_received_mw,
+                report_options,
+                filepath=path
+            ),
+            suffix='.xlsx',
             mimetype='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-            as_attachment=True,
-            download_name=os.path.basename(filepath)
+            download_name=production_excel_filename(company)
         )
         
     except Exception as e:
@@ -49,25 +49,13 @@ def validate_materials_for_production():
         warnings = []
         has_insufficient = False
         
+        stock = COCService.material_availability(list(material_requirements))
+        
         for material_name, required_qty in material_requirements.items():
-            query = text("""
-                SELECT 
-                    SUM(available_qty) as available,
-                    SUM(coc_qty) as total_received,
-                    SUM(consumed_qty) as total_consumed,
-                    COUNT(*) as coc_count
-                FROM coc_documents
-                WHERE material_name = :material
-                AND is_active = 1
-                AND available_qty > 0
-            """)
-            
-            result = db.session.execute(query, {'material': material_name}).fetchone()
-            
-            available = float(result[0]) if result[0] else 0
-            total_received = float(result[1]) if result[1] else 0
-            total_consumed = float(result[2]) if result[2] else 0
-            coc_count = int(result[3]) if result[3] else 0
+            available = stock[material_name]['available']
+            total_received = stock[material_name]['total_received']
+            total_consumed = stock[material_name]['total_consumed']
+            coc_count = stock[material_name]['coc_count']
             
             is_sufficient = available >= required_qty
             
@@ -125,20 +113,23 @@ def get_material_consumption_summary():
         if not record_id:
             return jsonify({'error': 'record_id required'}), 400
         
+        # Consumption booked in the stock ledger for the record's production date
         query = text("""
             SELECT 
-                mc.material_type,
-                mc.consumed_quantity,
-                mc.lot_number,
+                l.material_name,
+                l.consumed_qty,
+                l.reference,
                 cd.invoice_no,
                 cd.brand,
-                mc.production_date
-            FROM material_consumption mc
-            LEFT JOIN coc_documents cd ON mc.coc_id = cd.id
-            WHERE mc.production_date = (
+                l.movement_date,
+                l.balance_available
+            FROM material_stock_ledger l
+            LEFT JOIN coc_documents cd ON l.coc_id = cd.id
+            WHERE l.entry_type = 'consumption'
+            AND l.movement_date = (
                 SELECT date FROM production_records WHERE id = :record_id
             )
-            ORDER BY mc.material_type, mc.id
+            ORDER BY l.material_name, l.id
         """)
         
         result = db.session.execute(query, {'record_id': record_id}).fetchall()
@@ -151,7 +142,8 @@ def get_material_consumption_summary():
                 'lot': row[2],
                 'invoice': row[3],
                 'brand': row[4],
-                'date': str(row[5])
+                'date': str(row[5]),
+                'balance': float(row[6])
             })
         
         return jsonify({
@@ -7,7 +7,7 @@ from datetime import datetime
 
 try:
     import openpyxl
-    from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+    from app.services import excel_styles as xs
     from openpyxl.utils import get_column_letter
     EXCEL_AVAILABLE = True
 except ImportError:
@@ -16,20 +16,18 @@ except ImportError:
 witness_report_bp = Blueprint('witness_report', __name__)
 
 # Thin border style
-thin_border = Border(
-    left=Side(style='thin'),
-    right=Side(style='thin'),
-    top=Side(style='thin'),
-    bottom=Side(style='thin')
-)
+thin_border = xs.border('thin')
 
 # Header style
-header_fill = PatternFill(start_color="1565C0", end_color="1565C0", fill_type="solid")
-header_font = Font(bold=True, color="FFFFFF", size=11)
+header_fill = xs.solid_fill("1565C0")
+header_font = xs.font(bold=True, color="FFFFFF", size=11)
 
 # Title style
-title_fill = PatternFill(start_color="0D47A1", end_color="0D47A1", fill_type="solid")
-title_font = Font(bold=True, color="FFFFFF", size=14)
+title_fill = xs.solid_fill("0D47A1")
+title_font = xs.font(bold=True, color="FFFFFF", size=14)
+
+# Per-serial data cells
+xs.register_style('witness_cell', border=thin_border, alignment=xs.alignment(horizontal='center'))
 
 
 def get_ftr_data_for_serials(company_id, serial_numbers):
@@ -164,27 +162,27 @@ def create_header_rows(ws, title, company_name, total_qty, report_date):
     ws['A1'] = company_name
     ws['A1'].font = title_font
     ws['A1'].fill = title_fill
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 25
     
     # Row 2: Report Title
     ws.merge_cells('A2:I2')
     ws['A2'] = title
-    ws['A2'].font = Font(bold=True, size=12)
-    ws['A2'].alignment = Alignment(horizontal='center')
+    ws['A2'].font = xs.font(bold=True, size=12)
+    ws['A2'].alignment = xs.alignment(horizontal='center')
     ws.row_dimensions[2].height = 20
     
     # Row 3: Total Qty
     ws.merge_cells('A3:I3')
     ws['A3'] = f"Total Qty:- {total_qty} Pcs"
-    ws['A3'].font = Font(bold=True, size=11)
-    ws['A3'].alignment = Alignment(horizontal='center')
+    ws['A3'].font = xs.font(bold=True, size=11)
+    ws['A3'].alignment = xs.alignment(horizontal='center')
     
     # Row 4: Date
     ws.merge_cells('A4:I4')
     ws['A4'] = f"Date :- {report_date}"
-    ws['A4'].font = Font(bold=True, size=11)
-    ws['A4'].alignment = Alignment(horizontal='center')
+    ws['A4'].font = xs.font(bold=True, size=11)
+    ws['A4'].alignment = xs.alignment(horizontal='center')
 
 
 def create_ftr_sheet(ws, company_name, party_name, total_qty, report_date, serial_numbers, ftr_data, module_name='625W'):
@@ -197,34 +195,31 @@ def create_ftr_sheet(ws, company_name, party_name, total_qty, report_date, seria
         cell = ws.cell(row=5, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.alignment = xs.alignment(horizontal='center', vertical='center')
         cell.border = thin_border
     
     # Reference Row 6
     ref_data = ['Ref', 'GS04800KG2552500001', '608.06', '15.34', '48.91', '14.36', '42.33', '81.03', '22.51']
     for col, val in enumerate(ref_data, 1):
         cell = ws.cell(row=6, column=col, value=val)
-        cell.alignment = Alignment(horizontal='center')
+        cell.alignment = xs.alignment(horizontal='center')
         cell.border = thin_border
-        cell.fill = PatternFill(start_color="FFF3E0", end_color="FFF3E0", fill_type="solid")
+        cell.fill = xs.solid_fill("FFF3E0")
     
     # Data rows
     for idx, serial in enumerate(serial_numbers, 1):
         row = idx + 6
         ftr = ftr_data.get(serial, {})
         
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        ws.cell(row=row, column=3, value=ftr.get('pmax', '')).border = thin_border
-        ws.cell(row=row, column=4, value=ftr.get('isc', '')).border = thin_border
-        ws.cell(row=row, column=5, value=ftr.get('voc', '')).border = thin_border
-        ws.cell(row=row, column=6, value=ftr.get('ipm', '')).border = thin_border
-        ws.cell(row=row, column=7, value=ftr.get('vpm', '')).border = thin_border
-        ws.cell(row=row, column=8, value=ftr.get('ff', '')).border = thin_border
-        ws.cell(row=row, column=9, value=ftr.get('efficiency', '')).border = thin_border
-        
-        for col in range(1, 10):
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value=ftr.get('pmax', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=4, value=ftr.get('isc', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=5, value=ftr.get('voc', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=6, value=ftr.get('ipm', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=7, value=ftr.get('vpm', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=8, value=ftr.get('ff', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=9, value=ftr.get('efficiency', '')), 'witness_cell')
     
     # Set column widths
     ws.column_dimensions['A'].width = 8
@@ -242,25 +237,25 @@ def create_bifaciality_sheet(ws, company_name, party_name, total_qty, report_dat
     ws['C5'] = 'Front Side Electrical Data'
     ws['C5'].font = header_font
     ws['C5'].fill = header_fill
-    ws['C5'].alignment = Alignment(horizontal='center')
+    ws['C5'].alignment = xs.alignment(horizontal='center')
     
     ws.merge_cells('J5:P5')
     ws['J5'] = 'Rear Side Electrical Data'
     ws['J5'].font = header_font
-    ws['J5'].fill = PatternFill(start_color="FF5722", end_color="FF5722", fill_type="solid")
-    ws['J5'].alignment = Alignment(horizontal='center')
+    ws['J5'].fill = xs.solid_fill("FF5722")
+    ws['J5'].alignment = xs.alignment(horizontal='center')
     
     ws['Q5'] = 'Bi-faciality'
     ws['Q5'].font = header_font
-    ws['Q5'].fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
+    ws['Q5'].fill = xs.solid_fill("4CAF50")
     
     # Sub-headers Row 6
     headers = ['Sr. No.', 'Module Serial No.', 'Pmax', 'Isc', 'Voc', 'Ipm', 'Vpm', 'FF', 'eff',
                'Pmax', 'Isc', 'Voc', 'Ipm', 'Vpm', 'FF', 'eff', 'Factor(%)']
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=6, column=col, value=header)
-        cell.font = Font(bold=True, size=10)
-        cell.alignment = Alignment(horizontal='center')
+        cell.font = xs.font(bold=True, size=10)
+        cell.alignment = xs.alignment(horizontal='center')
         cell.border = thin_border
     
     # Data rows
@@ -268,38 +263,35 @@ def create_bifaciality_sheet(ws, company_name, party_name, total_qty, report_dat
         row = idx + 6
         ftr = ftr_data.get(serial, {})
         
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'witness_cell')
         
         # Front side data
         pmax_front = ftr.get('pmax', 0) or 0
-        ws.cell(row=row, column=3, value=pmax_front).border = thin_border
-        ws.cell(row=row, column=4, value=ftr.get('isc', '')).border = thin_border
-        ws.cell(row=row, column=5, value=ftr.get('voc', '')).border = thin_border
-        ws.cell(row=row, column=6, value=ftr.get('ipm', '')).border = thin_border
-        ws.cell(row=row, column=7, value=ftr.get('vpm', '')).border = thin_border
-        ws.cell(row=row, column=8, value=ftr.get('ff', '')).border = thin_border
-        ws.cell(row=row, column=9, value=ftr.get('efficiency', '')).border = thin_border
+        xs.apply_style(ws.cell(row=row, column=3, value=pmax_front), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=4, value=ftr.get('isc', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=5, value=ftr.get('voc', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=6, value=ftr.get('ipm', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=7, value=ftr.get('vpm', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=8, value=ftr.get('ff', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=9, value=ftr.get('efficiency', '')), 'witness_cell')
         
         # Rear side data (approximately 78% of front)
         pmax_rear = round(float(pmax_front) * 0.78, 2) if pmax_front else ''
-        ws.cell(row=row, column=10, value=pmax_rear).border = thin_border
-        ws.cell(row=row, column=11, value='').border = thin_border
-        ws.cell(row=row, column=12, value='').border = thin_border
-        ws.cell(row=row, column=13, value='').border = thin_border
-        ws.cell(row=row, column=14, value='').border = thin_border
-        ws.cell(row=row, column=15, value='').border = thin_border
-        ws.cell(row=row, column=16, value='').border = thin_border
+        xs.apply_style(ws.cell(row=row, column=10, value=pmax_rear), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=11, value=''), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=12, value=''), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=13, value=''), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=14, value=''), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=15, value=''), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=16, value=''), 'witness_cell')
         
         # Bifaciality factor
         if pmax_front and pmax_rear:
             bifaciality = round((float(pmax_rear) / float(pmax_front)) * 100, 2)
-            ws.cell(row=row, column=17, value=bifaciality).border = thin_border
+            xs.apply_style(ws.cell(row=row, column=17, value=bifaciality), 'witness_cell')
         else:
-            ws.cell(row=row, column=17, value='').border = thin_border
-        
-        for col in range(1, 18):
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+            xs.apply_style(ws.cell(row=row, column=17, value=''), 'witness_cell')
     
     ws.column_dimensions['A'].width = 8
     ws.column_dimensions['B'].width = 22
@@ -317,19 +309,16 @@ def create_visual_inspection_sheet(ws, company_name, party_name, total_qty, repo
         cell = ws.cell(row=5, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
+        cell.alignment = xs.alignment(horizontal='center')
         cell.border = thin_border
     
     # Data rows
     for idx, serial in enumerate(serial_numbers, 1):
         row = idx + 5
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        ws.cell(row=row, column=3, value='Nil').border = thin_border
-        ws.cell(row=row, column=4, value='OK').border = thin_border
-        
-        for col in range(1, 5):
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value='Nil'), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=4, value='OK'), 'witness_cell')
     
     ws.column_dimensions['A'].width = 8
     ws.column_dimensions['B'].width = 22
@@ -347,7 +336,7 @@ def create_el_inspection_sheet(ws, company_name, party_name, total_qty, report_d
         cell = ws.cell(row=5, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
+        cell.alignment = xs.alignment(horizontal='center')
         cell.border = thin_border
     
     # EL Result from config
@@ -356,13 +345,10 @@ def create_el_inspection_sheet(ws, company_name, party_name, total_qty, report_d
     # Data rows (all modules for EL)
     for idx, serial in enumerate(serial_numbers, 1):
         row = idx + 5
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        ws.cell(row=row, column=3, value='Nil').border = thin_border
-        ws.cell(row=row, column=4, value=el_result).border = thin_border
-        
-        for col in range(1, 5):
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value='Nil'), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=4, value=el_result), 'witness_cell')
     
     ws.column_dimensions['A'].width = 8
     ws.column_dimensions['B'].width = 22
@@ -384,23 +370,20 @@ def create_safety_tests_sheet(ws, company_name, party_name, total_qty, report_da
         cell = ws.cell(row=5, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', wrap_text=True)
+        cell.alignment = xs.alignment(horizontal='center', wrap_text=True)
         cell.border = thin_border
     
     # Data rows for all serials
     import random
     for idx, serial in enumerate(serial_numbers, 1):
         row = idx + 5
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        ws.cell(row=row, column=3, value=round(random.uniform(3, 5.5), 2)).border = thin_border  # IR Test
-        ws.cell(row=row, column=4, value=round(random.uniform(1, 1.6), 1)).border = thin_border  # DCW
-        ws.cell(row=row, column=5, value=round(random.uniform(3, 5), 2)).border = thin_border    # Ground
-        ws.cell(row=row, column=6, value=round(random.uniform(2, 4.5), 2)).border = thin_border  # Wet Leakage
-        ws.cell(row=row, column=7, value='OK').border = thin_border
-        
-        for col in range(1, 8):
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value=round(random.uniform(3, 5.5), 2)), 'witness_cell')  # IR Test
+        xs.apply_style(ws.cell(row=row, column=4, value=round(random.uniform(1, 1.6), 1)), 'witness_cell')  # DCW
+        xs.apply_style(ws.cell(row=row, column=5, value=round(random.uniform(3, 5), 2)), 'witness_cell')    # Ground
+        xs.apply_style(ws.cell(row=row, column=6, value=round(random.uniform(2, 4.5), 2)), 'witness_cell')  # Wet Leakage
+        xs.apply_style(ws.cell(row=row, column=7, value='OK'), 'witness_cell')
     
     ws.column_dimensions['A'].width = 8
     ws.column_dimensions['B'].width = 22
@@ -427,35 +410,32 @@ def create_dimension_sheet(ws, company_name, party_name, total_qty, report_date,
                'Hole Size', 'Cable(mm)', 'Connector', 'Ground Holes', 'Drain Hole', 'Anodizing(µm)']
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=5, column=col, value=header)
-        cell.font = Font(bold=True, size=9, color="FFFFFF")
+        cell.font = xs.font(bold=True, size=9, color="FFFFFF")
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', wrap_text=True)
+        cell.alignment = xs.alignment(horizontal='center', wrap_text=True)
         cell.border = thin_border
     
     # Data rows for all serials
     import random
     for idx, serial in enumerate(serial_numbers, 1):
         row = idx + 5
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        ws.cell(row=row, column=3, value=length).border = thin_border       # Length from config
-        ws.cell(row=row, column=4, value=width).border = thin_border        # Width from config
-        ws.cell(row=row, column=5, value=thickness).border = thin_border    # Thickness from config
-        ws.cell(row=row, column=6, value=int(diagonal)).border = thin_border       # Diagonal 1
-        ws.cell(row=row, column=7, value=int(diagonal)).border = thin_border       # Diagonal 2
-        ws.cell(row=row, column=8, value=0).border = thin_border            # Diff
-        ws.cell(row=row, column=9, value=1400).border = thin_border         # Hole1
-        ws.cell(row=row, column=10, value=790).border = thin_border         # Hole2
-        ws.cell(row=row, column=11, value=400).border = thin_border         # Hole3
-        ws.cell(row=row, column=12, value='14*9').border = thin_border      # Hole Size
-        ws.cell(row=row, column=13, value=1200).border = thin_border        # Cable
-        ws.cell(row=row, column=14, value='MC4').border = thin_border       # Connector
-        ws.cell(row=row, column=15, value=2).border = thin_border           # Ground Holes
-        ws.cell(row=row, column=16, value='OK').border = thin_border        # Drain Hole
-        ws.cell(row=row, column=17, value=round(random.uniform(16, 20), 1)).border = thin_border  # Anodizing
-        
-        for col in range(1, 18):
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value=length), 'witness_cell')       # Length from config
+        xs.apply_style(ws.cell(row=row, column=4, value=width), 'witness_cell')        # Width from config
+        xs.apply_style(ws.cell(row=row, column=5, value=thickness), 'witness_cell')    # Thickness from config
+        xs.apply_style(ws.cell(row=row, column=6, value=int(diagonal)), 'witness_cell')       # Diagonal 1
+        xs.apply_style(ws.cell(row=row, column=7, value=int(diagonal)), 'witness_cell')       # Diagonal 2
+        xs.apply_style(ws.cell(row=row, column=8, value=0), 'witness_cell')            # Diff
+        xs.apply_style(ws.cell(row=row, column=9, value=1400), 'witness_cell')         # Hole1
+        xs.apply_style(ws.cell(row=row, column=10, value=790), 'witness_cell')         # Hole2
+        xs.apply_style(ws.cell(row=row, column=11, value=400), 'witness_cell')         # Hole3
+        xs.apply_style(ws.cell(row=row, column=12, value='14*9'), 'witness_cell')      # Hole Size
+        xs.apply_style(ws.cell(row=row, column=13, value=1200), 'witness_cell')        # Cable
+        xs.apply_style(ws.cell(row=row, column=14, value='MC4'), 'witness_cell')       # Connector
+        xs.apply_style(ws.cell(row=row, column=15, value=2), 'witness_cell')           # Ground Holes
+        xs.apply_style(ws.cell(row=row, column=16, value='OK'), 'witness_cell')        # Drain Hole
+        xs.apply_style(ws.cell(row=row, column=17, value=round(random.uniform(16, 20), 1)), 'witness_cell')  # Anodizing
     
     ws.column_dimensions['A'].width = 6
     ws.column_dimensions['B'].width = 22
@@ -474,7 +454,7 @@ def create_rfid_sheet(ws, company_name, party_name, total_qty, report_date, seri
         cell = ws.cell(row=5, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center')
+        cell.alignment = xs.alignment(horizontal='center')
         cell.border = thin_border
     
     # Data rows - only for RFID serials
@@ -482,23 +462,20 @@ def create_rfid_sheet(ws, company_name, party_name, total_qty, report_date, seri
         row = idx + 5
         ftr = ftr_data.get(serial, {})
         
-        ws.cell(row=row, column=1, value=idx).border = thin_border
-        ws.cell(row=row, column=2, value=serial).border = thin_border
-        ws.cell(row=row, column=3, value=module_name).border = thin_border
-        ws.cell(row=row, column=4, value='GSPL').border = thin_border
-        ws.cell(row=row, column=5, value='SOLARSPACE').border = thin_border
-        ws.cell(row=row, column=6, value='Aug, 25').border = thin_border
-        ws.cell(row=row, column=7, value='Nov, 25').border = thin_border
-        ws.cell(row=row, column=8, value=ftr.get('pmax', '')).border = thin_border
-        ws.cell(row=row, column=9, value=ftr.get('vpm', '')).border = thin_border
-        ws.cell(row=row, column=10, value=ftr.get('ipm', '')).border = thin_border
-        ws.cell(row=row, column=11, value=ftr.get('ff', '')).border = thin_border
-        ws.cell(row=row, column=12, value=ftr.get('voc', '')).border = thin_border
-        ws.cell(row=row, column=13, value=ftr.get('isc', '')).border = thin_border
-        ws.cell(row=row, column=14, value='DTH').border = thin_border
-        
-        for col in range(1, 15):
-            ws.cell(row=row, column=col).alignment = Alignment(horizontal='center')
+        xs.apply_style(ws.cell(row=row, column=1, value=idx), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=2, value=serial), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=3, value=module_name), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=4, value='GSPL'), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=5, value='SOLARSPACE'), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=6, value='Aug, 25'), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=7, value='Nov, 25'), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=8, value=ftr.get('pmax', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=9, value=ftr.get('vpm', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=10, value=ftr.get('ipm', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=11, value=ftr.get('ff', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=12, value=ftr.get('voc', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=13, value=ftr.get('isc', '')), 'witness_cell')
+        xs.apply_style(ws.cell(row=row, column=14, value='DTH'), 'witness_cell')
     
     ws.column_dimensions['A'].width = 6
     ws.column_dimensions['B'].width = 22
@@ -0,0 +1,230 @@
+"""
+Artifact Store - content-addressed cache for generated reports
+
+Generated PDFs / Excels are stored under a hash of everything that determines
+their content (report kind + inputs), so a repeat request for the same report is
+served from disk instead of being rendered again.
+
+- fetch(kind, inputs, build, suffix) returns the stored file, building it on a miss.
+  build(path) must write the artifact to `path`.
+- Entries not used for ARTIFACT_STORE_MAX_AGE_DAYS are removed, and when the
+  store grows past ARTIFACT_STORE_MAX_MB the least recently used entries go first.
+- stats() reports hit rate (since process start) and disk usage.
+
+Only cache what is fully determined by its inputs - reports that read live
+database state must put that state (or a version of it) into `inputs`.
+"""
+import os
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from datetime import date, datetime
+from decimal import Decimal
+
+# Defaults when no Flask app config is available
+DEFAULT_MAX_MB = 2048
+DEFAULT_MAX_AGE_DAYS = 14
+# Minimum seconds between two full eviction scans
+EVICT_INTERVAL = 600
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value)
+    return str(value)
+
+
+def artifact_key(kind, inputs, version=1):
+    """Stable hash of a report kind and its inputs (dict keys are sorted)"""
+    payload = json.dumps([kind, version, inputs], sort_keys=True, separators=(',', ':'), default=_json_default)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ArtifactStore:
+    """Generated files on disk keyed by input hash, with size/age eviction"""
+
+    def __init__(self, root, max_bytes, max_age):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        os.makedirs(root, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evicted = 0
+        self._usage = None  # bytes on disk, None until first scan
+        self._last_evict = 0
+
+    # ---------- paths ----------
+
+    def path_for(self, key, suffix=''):
+        return os.path.join(self.root, key[:2], key + suffix)
+
+    # ---------- lookup / store ----------
+
+    def get(self, key, suffix=''):
+        """Stored path for `key` (and mark it recently used), else None"""
+        path = self.path_for(key, suffix)
+        try:
+            os.utime(path)
+        except OSError:
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return path
+
+    def put(self, key, build, suffix=''):
+        """Build an artifact into a temp file and move it into place; returns its path"""
+        path = self.path_for(key, suffix)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(suffix=suffix, dir=os.path.dirname(path))
+        os.close(fd)
+        try:
+            build(tmp_path)
+            size = os.path.getsize(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        with self._lock:
+            if self._usage is not None:
+                self._usage += size
+            over_quota = self._usage is not None and self._usage > self.max_bytes
+        if over_quota or time.time() - self._last_evict > EVICT_INTERVAL:
+            self.evict()
+        return path
+
+    def put_bytes(self, key, data, suffix=''):
+        """Store an artifact that was already rendered in memory"""
+        def write(path):
+            with open(path, 'wb') as f:
+                f.write(data)
+        return self.put(key, write, suffix)
+
+    def fetch(self, kind, inputs, build, suffix='', version=1):
+        """
+        Path of the artifact for (kind, inputs), built with build(path) on a miss.
+        Returns (path, hit).
+        """
+        key = artifact_key(kind, inputs, version)
+        path = self.get(key, suffix)
+        if path:
+            return path, True
+        return self.put(key, build, suffix), False
+
+    # ---------- eviction ----------
+
+    def _scan(self):
+        """[(mtime, size, path)] for every stored file"""
+        entries = []
+        try:
+            shards = list(os.scandir(self.root))
+        except OSError:
+            return entries
+        for shard in shards:
+            if not shard.is_dir():
+                continue
+            try:
+                with os.scandir(shard.path) as files:
+                    for entry in files:
+                        try:
+                            if entry.is_file():
+                                st = entry.stat()
+                                entries.append((st.st_mtime, st.st_size, entry.path))
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return entries
+
+    def evict(self):
+        """Remove expired entries, then least recently used ones until under quota. Returns files removed."""
+        now = time.time()
+        self._last_evict = now
+        entries = self._scan()
+        usage = sum(size for _, size, _ in entries)
+        removed = 0
+
+        entries.sort()  # oldest use first
+        for mtime, size, path in entries:
+            if now - mtime <= self.max_age and usage <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                usage -= size
+                removed += 1
+            except OSError:
+                continue
+
+        with self._lock:
+            self._usage = usage
+            self._evicted += removed
+        return removed
+
+    # ---------- stats ----------
+
+    def stats(self):
+        entries = self._scan()
+        usage = sum(size for _, size, _ in entries)
+        with self._lock:
+            self._usage = usage
+            lookups = self._hits + self._misses
+            return {
+                'entries': len(entries),
+                'bytes': usage,
+                'max_bytes': self.max_bytes,
+                'usage_pct': round(usage * 100.0 / self.max_bytes, 1) if self.max_bytes else None,
+                'max_age_days': round(self.max_age / 86400, 2),
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': round(self._hits / lookups, 4) if lookups else None,
+                'evicted': self._evicted
+            }
+
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+
+def get_artifact_store():
+    """Process-wide store configured from the Flask app (ARTIFACT_STORE_* settings)"""
+    from flask import current_app, has_app_context
+
+    if has_app_context():
+        config = current_app.config
+        default_root = os.path.join(config.get('PDF_FOLDER', 'generated_pdfs'), 'artifacts')
+    else:
+        config = {}
+        default_root = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'generated_pdfs', 'artifacts')
+
+    root = os.path.abspath(config.get('ARTIFACT_STORE_FOLDER') or default_root)
+    with _stores_lock:
+        store = _stores.get(root)
+        if store is None:
+            store = _stores[root] = ArtifactStore(
+                root,
+                max_bytes=int(config.get('ARTIFACT_STORE_MAX_MB', DEFAULT_MAX_MB)) * 1024 * 1024,
+                max_age=float(config.get('ARTIFACT_STORE_MAX_AGE_DAYS', DEFAULT_MAX_AGE_DAYS)) * 86400
+            )
+        return store
+
+
+def send_artifact(kind, inputs, build, suffix, mimetype, download_name, version=1):
+    """send_file() response for a stored artifact, building it on a miss (X-Artifact-Cache: HIT/MISS)"""
+    from flask import send_file
+
+    path, hit = get_artifact_store().fetch(kind, inputs, build, suffix=suffix, version=version)
+    response = send_file(path, mimetype=mimetype, as_attachment=True, download_name=download_name)
+    response.headers['X-Artifact-Cache'] = 'HIT' if hit else 'MISS'
+    return response
@@ -0,0 +1,424 @@
+"""
+COC Catalog - local mirror of the MRP COC APIs
+
+The supplier pickers, COC lists and FIFO suggestions used to call the MRP API
+(a 180-day coc_api.php query or get_assigned_coc_records.php) on every request.
+COCCatalog keeps the last response of each in memory, refreshes it from a
+background thread, and indexes it once per refresh. The two APIs are separate
+feeds - fetched, cached and snapshotted independently, so an outage of one
+leaves the other (and its stale-but-served mirror) untouched:
+
+- documents are grouped per distinct material name (lowercased, with its
+  normalize_material_name key computed once), FIFO-ordered (oldest invoice
+  first), and within a material per company (assigned_to)
+- assigned records are transformed (company names, PDI numbers, remaining qty)
+  once per refresh instead of once per request
+
+Requests only match against the few dozen distinct material names and merge
+their pre-sorted lists, so they no longer wait on the remote API.
+
+    catalog = get_coc_catalog()
+    catalog.documents()                 -> list of COC documents (coc_api.php)
+    catalog.fifo_documents(pred)        -> documents of matching materials, FIFO order
+    catalog.assigned()                  -> transformed assigned records
+    catalog.snapshot(DOCUMENTS | ASSIGNED, force=False) -> snapshot of one feed
+
+COC_CATALOG_REFRESH_SECONDS sets the refresh interval; 0 disables the mirror
+(every read fetches live, as before).
+"""
+import heapq
+import re
+import threading
+import time
+from datetime import datetime, timedelta
+from functools import lru_cache
+
+import requests
+
+COC_API_URL = 'https://umanmrp.in/api/coc_api.php'
+ASSIGNED_COC_API_URL = 'https://umanmrp.in/a/get_assigned_coc_records.php'
+
+COC_WINDOW_DAYS = 180
+DEFAULT_REFRESH_SECONDS = 300
+
+# Feed names
+DOCUMENTS = 'documents'
+ASSIGNED = 'assigned'
+
+# MRP API Material Name Mapping (API name -> normalized names for matching)
+MRP_MATERIAL_MAPPING = {
+    'solar cell': ['solar cell'],
+    'eva': ['eva'],
+    'glass': ['glass', 'front glass', 'back glass'],
+    'ribbon': ['ribbon', 'ribbon (0.26 mm)', 'ribbon (4.0x0.4)', 'ribbon (6.0x0.4)', 'ribbon(busbar) 4mm', 'ribbon(busbar) 6mm'],
+    'flux': ['flux'],
+    'epe': ['epe', 'epe front'],
+    'aluminium frame': ['aluminium frame', 'aluminum frame'],
+    'sealent': ['sealent', 'sealant'],
+    'jb potting': ['jb potting', 'jb potting (a and b)'],
+    'junction box': ['junction box'],
+    'rfid': ['rfid']
+}
+
+# Company name mapping for the assigned records (API -> Full name)
+ASSIGNED_COMPANY_MAP = {
+    's&w': 'Sterlin and Wilson',
+    'l&t': 'Larsen & Toubro',
+    'rays power': 'Rays Power',
+    'rays': 'Rays Power'
+}
+
+
+@lru_cache(maxsize=4096)
+def normalize_material_name(material_name):
+    """Normalize material name for matching with MRP API"""
+    if not material_name:
+        return None
+
+    name_lower = material_name.lower().strip()
+
+    # Find matching MRP category
+    for mrp_name, variations in MRP_MATERIAL_MAPPING.items():
+        if name_lower in variations or mrp_name in name_lower:
+            return mrp_name
+
+    return name_lower
+
+
+def normalize_pdi(pdi_str):
+    """PDI number of an assigned record (Lot 1 -> PDI-1, PDI1 -> PDI-1)"""
+    if not pdi_str:
+        return None
+    pdi_lower = pdi_str.lower().strip()
+    # Handle "Lot 1", "Lot 2", etc.
+    if 'lot' in pdi_lower:
+        match = re.search(r'lot\s*(\d+)', pdi_lower)
+        if match:
+            return f"PDI-{match.group(1)}"
+    # Handle "PDI-1", "PDI1", etc.
+    if 'pdi' in pdi_lower:
+        match = re.search(r'pdi[- ]?(\d+)', pdi_lower)
+        if match:
+            return f"PDI-{match.group(1)}"
+    return pdi_str
+
+
+def _to_float(value):
+    try:
+        return float(value) if value else 0
+    except (TypeError, ValueError):
+        return 0
+
+
+def _invoice_date(value):
+    try:
+        return datetime.strptime(value, '%Y-%m-%d') if value else datetime.min
+    except (TypeError, ValueError):
+        return datetime.min
+
+
+def _extract_documents(coc_data):
+    """COC documents from any of the coc_api.php response shapes"""
+    if isinstance(coc_data, dict):
+        if 'data' in coc_data:
+            return coc_data['data']
+        if 'documents' in coc_data:
+            return coc_data['documents']
+        if 'coc_data' in coc_data:
+            return coc_data['coc_data']
+        return [coc_data]
+    if isinstance(coc_data, list):
+        return coc_data
+    return []
+
+
+def _transform_assigned(record):
+    assigned_to = (record.get('assigned_to') or '').lower().strip()
+    pdi_no = record.get('pdi_no', '')
+    remaining_qty = _to_float(record.get('remaining_qty'))
+    return {
+        'id': record.get('id'),
+        'material_name': record.get('material_name', ''),
+        'material_id': record.get('material_id'),
+        'company': ASSIGNED_COMPANY_MAP.get(assigned_to, record.get('assigned_to', '')),
+        'company_short': record.get('assigned_to'),
+        'pdi_no': normalize_pdi(pdi_no),
+        'pdi_original': pdi_no,
+        'lot_batch_no': record.get('lot_batch_no'),
+        'invoice_no': record.get('invoice_no'),
+        'invoice_date': record.get('invoice_date') or record.get('entry_date') or '',
+        'invoice_qty': record.get('invoice_qty') or record.get('coc_qty') or 0,
+        'brand': record.get('brand') or record.get('store_name') or '',
+        'coc_qty': record.get('coc_qty') or 0,
+        'consumed_qty': record.get('consumed_qty') or 0,
+        'remaining_qty': remaining_qty,
+        'product_type': record.get('product_type') or '',
+        'coc_document_url': record.get('coc_document_url') or '',
+        'iqc_document_url': record.get('iqc_document_url') or '',
+        'is_exhausted': remaining_qty <= 0
+    }
+
+
+class MaterialGroup:
+    """Documents of one distinct material name, FIFO-ordered"""
+    __slots__ = ('name', 'key', 'docs', 'by_company')
+
+    def __init__(self, name):
+        self.name = name                          # lowercase material name
+        self.key = normalize_material_name(name)  # normalized material key
+        self.docs = []                            # (sort key, doc) oldest invoice first
+        self.by_company = {}                      # assigned_to -> [(sort key, doc)]
+
+
+class COCSnapshot:
+    """One fetched + indexed state of coc_api.php"""
+
+    def __init__(self, documents, from_date, to_date):
+        self.fetched_at = time.time()
+        self.from_date = from_date
+        self.to_date = to_date
+        self.documents = documents
+        self.materials = {}
+        for pos, doc in enumerate(documents):
+            if not isinstance(doc, dict):
+                continue
+            name = (doc.get('material_name') or '').lower()
+            group = self.materials.get(name)
+            if group is None:
+                group = self.materials[name] = MaterialGroup(name)
+            # Position breaks ties, so merged lists keep the API order for equal dates
+            entry = ((_invoice_date(doc.get('invoice_date')), pos), doc)
+            group.docs.append(entry)
+            company = (doc.get('assigned_to') or '').strip()
+            group.by_company.setdefault(company, []).append(entry)
+        for group in self.materials.values():
+            group.docs.sort(key=lambda e: e[0])
+            for entries in group.by_company.values():
+                entries.sort(key=lambda e: e[0])
+
+    def size(self):
+        return {'documents': len(self.documents), 'materials': len(self.materials),
+                'date_range': {'from': self.from_date, 'to': self.to_date}}
+
+
+class AssignedSnapshot:
+    """One fetched + transformed state of get_assigned_coc_records.php"""
+
+    def __init__(self, assigned):
+        self.fetched_at = time.time()
+        self.assigned = assigned
+
+    def size(self):
+        return {'assigned': len(self.assigned)}
+
+
+def _fetch_documents(window_days):
+    to_date = datetime.now().strftime('%Y-%m-%d')
+    from_date = (datetime.now() - timedelta(days=window_days)).strftime('%Y-%m-%d')
+    response = requests.post(COC_API_URL, json={'from': from_date, 'to': to_date}, timeout=10)
+    if response.status_code != 200:
+        raise RuntimeError(f'COC API returned status {response.status_code}')
+    return COCSnapshot(_extract_documents(response.json()), from_date, to_date)
+
+
+def _fetch_assigned():
+    response = requests.get(ASSIGNED_COC_API_URL, timeout=15)
+    if response.status_code != 200:
+        raise RuntimeError(f'Assigned COC API returned status {response.status_code}')
+    api_data = response.json()
+    if api_data.get('status') != 'success':
+        raise RuntimeError('Assigned COC API returned unsuccessful status')
+    return AssignedSnapshot([_transform_assigned(r) for r in api_data.get('data', [])])
+
+
+class COCFeed:
+    """
+    Latest snapshot of one API. The lock only guards the snapshot swap and the
+    in-flight marker - the HTTP call runs outside it, and concurrent refreshes
+    wait for the one already in flight instead of fetching again.
+    """
+
+    def __init__(self, name, fetch, refresh_seconds):
+        self.name = name
+        self.fetch = fetch
+        self.refresh_seconds = refresh_seconds
+        self.snapshot = None
+        self.last_error = None
+        self.refresh_count = 0
+        self._lock = threading.Lock()
+        self._inflight = None  # Event set when the running fetch finishes
+
+    def stale(self, snapshot):
+        # Twice the interval: the background refresh has missed a beat (or is disabled)
+        return snapshot is None or time.time() - snapshot.fetched_at >= self.refresh_seconds * 2
+
+    def refresh(self, seen=None):
+        """
+        Fetch the API and swap in the new snapshot (raises if the fetch fails).
+        With seen=<snapshot the caller found stale>, a fresh snapshot another
+        thread fetched meanwhile is returned instead of fetching again.
+        """
+        with self._lock:
+            current = self.snapshot
+            if seen is not None and current is not seen and not self.stale(current):
+                return current
+            inflight = self._inflight
+            fetching = inflight is None
+            if fetching:
+                inflight = self._inflight = threading.Event()
+
+        if not fetching:
+            inflight.wait()
+            with self._lock:
+                if self.snapshot is not current and self.snapshot is not None:
+                    return self.snapshot
+                raise RuntimeError(self.last_error or f'{self.name} refresh failed')
+
+        try:
+            snapshot = self.fetch()
+        except Exception as e:
+            with self._lock:
+                self.last_error = str(e)
+                self._inflight = None
+            inflight.set()
+            raise
+        with self._lock:
+            self.snapshot = snapshot
+            self.last_error = None
+            self.refresh_count += 1
+            self._inflight = None
+        inflight.set()
+        print(f"[COC Catalog] Refreshed {self.name}: {snapshot.size()}")
+        return snapshot
+
+    def get(self, force=False):
+        """Current snapshot; fetched in the request when missing, stale or mirroring is off"""
+        snapshot = self.snapshot
+        if force or self.stale(snapshot):
+            try:
+                return self.refresh(seen=None if force else snapshot)
+            except Exception:
+                # A stale mirror beats an error while the API is down
+                if snapshot is None or force:
+                    raise
+        return snapshot
+
+    def stats(self):
+        snapshot = self.snapshot
+        stats = {
+            'loaded': snapshot is not None,
+            'fetched_at': datetime.fromtimestamp(snapshot.fetched_at).isoformat() if snapshot else None,
+            'age_seconds': round(time.time() - snapshot.fetched_at, 1) if snapshot else None,
+            'refresh_count': self.refresh_count,
+            'last_error': self.last_error,
+        }
+        if snapshot is not None:
+            stats.update(snapshot.size())
+        return stats
+
+
+class COCCatalog:
+    """Process-wide mirror of coc_api.php + get_assigned_coc_records.php"""
+
+    def __init__(self, refresh_seconds=DEFAULT_REFRESH_SECONDS, window_days=COC_WINDOW_DAYS):
+        self.refresh_seconds = refresh_seconds
+        self.window_days = window_days
+        self.feeds = {
+            DOCUMENTS: COCFeed(DOCUMENTS, lambda: _fetch_documents(self.window_days), refresh_seconds),
+            ASSIGNED: COCFeed(ASSIGNED, _fetch_assigned, refresh_seconds),
+        }
+        self._thread = None
+
+    def refresh(self, feed=None):
+        """
+        Refresh one feed, or every feed independently (one failing does not stop
+        the others; the first error is raised once all were tried)
+        """
+        if feed is not None:
+            return self.feeds[feed].refresh()
+        error = None
+        for name in self.feeds:
+            try:
+                self.feeds[name].refresh()
+            except Exception as e:
+                print(f"[COC Catalog] Refresh of {name} failed: {e}")
+                error = error or e
+        if error is not None:
+            raise error
+
+    def snapshot(self, feed=DOCUMENTS, force=False):
+        """Current snapshot of one feed (see COCFeed.get)"""
+        return self.feeds[feed].get(force)
+
+    def start(self):
+        """Refresh in a daemon thread every refresh_seconds (once per process)"""
+        if self._thread is not None or self.refresh_seconds <= 0:
+            return
+
+        def refresh_loop():
+            while True:
+                try:
+                    self.refresh()
+                except Exception:
+                    pass  # already logged per feed
+                time.sleep(self.refresh_seconds)
+
+        self._thread = threading.Thread(target=refresh_loop, daemon=True, name='coc-catalog')
+        self._thread.start()
+
+    def stats(self):
+        stats = {name: feed.stats() for name, feed in self.feeds.items()}
+        stats['refresh_seconds'] = self.refresh_seconds
+        return stats
+
+    # ---------- reads ----------
+
+    def documents(self):
+        """All COC documents of the mirrored window (coc_api.php order)"""
+        return self.snapshot(DOCUMENTS).documents
+
+    def assigned(self):
+        """Transformed assigned COC records"""
+        return self.snapshot(ASSIGNED).assigned
+
+    def fifo_documents(self, material_match, company=None):
+        """
+        Documents whose material matches, oldest invoice first.
+        material_match(group) is called once per distinct material (MaterialGroup);
+        company limits the result to one assigned_to value.
+        """
+        lists = []
+        for group in self.snapshot(DOCUMENTS).materials.values():
+            if not material_match(group):
+                continue
+            entries = group.docs if company is None else group.by_company.get(company)
+            if entries:
+                lists.append(entries)
+        return [doc for _, doc in heapq.merge(*lists, key=lambda e: e[0])]
+
+
+_catalog = None
+_catalog_lock = threading.Lock()
+
+
+def get_coc_catalog():
+    """The process-wide catalog, configured from the current app"""
+    global _catalog
+    if _catalog is None:
+        with _catalog_lock:
+            if _catalog is None:
+                refresh_seconds, window_days = DEFAULT_REFRESH_SECONDS, COC_WINDOW_DAYS
+                try:
+                    from flask import current_app
+                    refresh_seconds = current_app.config.get('COC_CATALOG_REFRESH_SECONDS', refresh_seconds)
+                    window_days = current_app.config.get('COC_CATALOG_WINDOW_DAYS', window_days)
+                except RuntimeError:
+                    pass
+                _catalog = COCCatalog(refresh_seconds, window_days)
+    return _catalog
+
+
+def start_coc_catalog(app):
+    """Start the background refresh (called from create_app)"""
+    with app.app_context():
+        get_coc_catalog().start()
@@ -1,14 +1,194 @@
 """
 COC Service - Fetch and sync COC data from external API
 """
+import time
 import requests
 from datetime import datetime, timedelta
-from sqlalchemy import text
+from decimal import Decimal
+from sqlalchemy import text, bindparam
 from app.models.database import db
+from app.services.stock_ledger import post_stock_entries, current_balances, pool_by_material
 
 class COCService:
     EXTERNAL_API_URL = "https://umanmrp.in/api/coc_api.php"
     
+    # Rows per multi-row upsert statement (and per transaction) during a sync
+    SYNC_CHUNK_SIZE = 500
+    
+    # coc_documents columns refreshed from the API (besides the unique key)
+    SYNC_COLUMNS = (
+        'external_id', 'brand', 'product_type', 'coc_qty', 'invoice_qty', 'invoice_date',
+        'entry_date', 'username', 'coc_document_url', 'iqc_document_url'
+    )
+    
+    @staticmethod
+    def _sync_row(record):
+        """coc_documents row for one API record (raises on missing keys / bad quantities)"""
+        return {
+            'company_name': record['store_name'],
+            'material_name': record['material_name'],
+            'lot_batch_no': record['lot_batch_no'],
+            'invoice_no': record['invoice_no'],
+            'external_id': record['id'],
+            'brand': record.get('brand'),
+            'product_type': record.get('product_type'),
+            'coc_qty': float(record['coc_qty']),
+            'invoice_qty': float(record['invoice_qty']),
+            'invoice_date': record['invoice_date'],
+            'entry_date': record.get('entry_date'),
+            'username': record.get('username'),
+            'coc_document_url': record.get('coc_document_url'),
+            'iqc_document_url': record.get('iqc_document_url')
+        }
+    
+    @staticmethod
+    def _sync_key(company, material, lot, invoice):
+        # MySQL compares the key columns case-insensitively, ignoring trailing spaces
+        return tuple(str(v).rstrip().lower() for v in (company, material, lot, invoice))
+    
+    @staticmethod
+    def _sync_values(row):
+        """Comparable form of the synced columns (API strings vs DB Decimal/date values)"""
+        values = []
+        for column in COCService.SYNC_COLUMNS:
+            value = row[column]
+            if value is None:
+                pass
+            elif column in ('coc_qty', 'invoice_qty'):
+                value = round(float(value), 2)
+            elif column in ('invoice_date', 'entry_date'):
+                value = str(value)[:10]
+            else:
+                value = str(value)
+            values.append(value)
+        return tuple(values)
+    
+    @staticmethod
+    def _stock_entries(chunk, existing):
+        """Stock ledger receipts / adjustments for a just-written sync chunk"""
+        ids = {}
+        query = text("""
+            SELECT id, company_name, material_name, lot_batch_no, invoice_no
+            FROM coc_documents
+            WHERE invoice_no IN :invoices
+        """).bindparams(bindparam('invoices', expanding=True))
+        for row in db.session.execute(query, {'invoices': sorted({r['invoice_no'] for r in chunk})}).fetchall():
+            ids[COCService._sync_key(row[1], row[2], row[3], row[4])] = row[0]
+        
+        entries = []
+        for row in chunk:
+            key = COCService._sync_key(row['company_name'], row['material_name'],
+                                       row['lot_batch_no'], row['invoice_no'])
+            current = existing.get(key)
+            if current is None:
+                entry_type, received = 'receipt', Decimal(str(row['coc_qty']))
+            elif current[2]:
+                entry_type, received = 'adjustment', Decimal(str(row['coc_qty'])) - Decimal(current[1] or 0)
+                if not received:
+                    continue
+            else:
+                continue
+            entries.append({
+                'material': row['material_name'],
+                'company': row['company_name'],
+                'entry_type': entry_type,
+                'received': received,
+                'movement_date': row['invoice_date'],
+                'coc_id': ids.get(key),
+                'reference': f"{row['lot_batch_no']} (Invoice: {row['invoice_no']})"
+            })
+        return entries
+    
+    @staticmethod
+    def sync_coc_records(records):
+        """Diff API records against coc_documents and apply the changes in bulk
+        
+        One query loads the existing rows for every invoice in the batch; records
+        are then classified as inserted / updated / unchanged by their unique key
+        (company_name, material_name, lot_batch_no, invoice_no). New and changed rows
+        are written with multi-row INSERT ... ON DUPLICATE KEY UPDATE statements of
+        SYNC_CHUNK_SIZE rows, each committed on its own. Unchanged rows are not
+        written, so last_synced_at marks the last sync that changed a row.
+        
+        New COCs are booked as receipts in the stock ledger, changed coc_qty of an
+        active COC as an adjustment - in the same transaction as their chunk.
+        """
+        started = time.perf_counter()
+        errors = 0
+        
+        # Last record wins when the API repeats a key
+        rows = {}
+        for record in records:
+            try:
+                row = COCService._sync_row(record)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Error syncing record {record.get('id')}: {str(e)}")
+                errors += 1
+                continue
+            key = COCService._sync_key(row['company_name'], row['material_name'],
+                                       row['lot_batch_no'], row['invoice_no'])
+            rows[key] = row
+        
+        existing = {}
+        invoices = sorted({row['invoice_no'] for row in rows.values()})
+        if invoices:
+            query = text(f"""
+                SELECT company_name, material_name, lot_batch_no, invoice_no, is_active,
+                       {', '.join(COCService.SYNC_COLUMNS)}
+                FROM coc_documents
+                WHERE invoice_no IN :invoices
+            """).bindparams(bindparam('invoices', expanding=True))
+            for db_row in db.session.execute(query, {'invoices': invoices}).mappings():
+                key = COCService._sync_key(db_row['company_name'], db_row['material_name'],
+                                           db_row['lot_batch_no'], db_row['invoice_no'])
+                existing[key] = (COCService._sync_values(db_row), db_row['coc_qty'], db_row['is_active'])
+            # Do not hold the read transaction open across the writes
+            db.session.commit()
+        
+        inserts, updates, unchanged = [], [], 0
+        for key, row in rows.items():
+            current = existing.get(key)
+            if current is None:
+                inserts.append(row)
+            elif current[0] != COCService._sync_values(row):
+                updates.append(row)
+            else:
+                unchanged += 1
+        
+        # pymysql's executemany() sends each chunk as one multi-row INSERT
+        columns = ('company_name', 'material_name', 'lot_batch_no', 'invoice_no') + COCService.SYNC_COLUMNS
+        upsert_query = text(f"""
+            INSERT INTO coc_documents ({', '.join(columns)})
+            VALUES ({', '.join(':' + c for c in columns)})
+            ON DUPLICATE KEY UPDATE
+                {', '.join(f'{c} = VALUES({c})' for c in COCService.SYNC_COLUMNS)},
+                last_synced_at = NOW()
+        """)
+        
+        written = {'inserted': 0, 'updated': 0}
+        chunk_size = COCService.SYNC_CHUNK_SIZE
+        for label, batch in (('inserted', inserts), ('updated', updates)):
+            for i in range(0, len(batch), chunk_size):
+                chunk = batch[i:i + chunk_size]
+                try:
+                    db.session.execute(upsert_query, chunk)
+                    post_stock_entries(COCService._stock_entries(chunk, existing))
+                    db.session.commit()
+                    written[label] += len(chunk)
+                except Exception as e:
+                    db.session.rollback()
+                    print(f"Error syncing {len(chunk)} COC records: {str(e)}")
+                    errors += len(chunk)
+        
+        return {
+            "inserted": written['inserted'],
+            "updated": written['updated'],
+            "unchanged": unchanged,
+            "errors": errors,
+            "total": len(records),
+            "duration_ms": round((time.perf_counter() - started) * 1000, 1)
+        }
+    
     @staticmethod
     def fetch_and_sync_coc_data(from_date=None, to_date=None):
         """Fetch COC data from external API and sync to database"""
@@ -29,107 +209,13 @@ class COCService:
             if not data.get('status'):
                 return {"success": False, "message": "API returned status false", "synced": 0}
             
-            records = data.get('data', [])
-            synced_count = 0
-            duplicate_count = 0
-            error_count = 0
-            
-            for record in records:
-                try:
-                    # Check if already exists
-                    check_query = text("""
-                        SELECT id FROM coc_documents 
-                        WHERE company_name = :company 
-                        AND material_name = :material 
-                        AND lot_batch_no = :lot 
-                        AND invoice_no = :invoice
-                    """)
-                    
-                    existing = db.session.execute(check_query, {
-                        'company': record['store_name'],
-                        'material': record['material_name'],
-                        'lot': record['lot_batch_no'],
-                        'invoice': record['invoice_no']
-                    }).fetchone()
-                    
-                    if existing:
-                        # Update existing record
-                        update_query = text("""
-                            UPDATE coc_documents SET
-                                external_id = :ext_id,
-                                brand = :brand,
-                                product_type = :product_type,
-                                coc_qty = :coc_qty,
-                                invoice_qty = :invoice_qty,
-                                invoice_date = :invoice_date,
-                                entry_date = :entry_date,
-                                username = :username,
-                                coc_document_url = :coc_url,
-                                iqc_document_url = :iqc_url,
-                                last_synced_at = NOW()
-                            WHERE id = :id
-                        """)
-                        
-                        db.session.execute(update_query, {
-                            'id': existing[0],
-                            'ext_id': record['id'],
-                            'brand': record.get('brand'),
-                            'product_type': record.get('product_type'),
-                            'coc_qty': float(record['coc_qty']),
-                            'invoice_qty': float(record['invoice_qty']),
-                            'invoice_date': record['invoice_date'],
-                            'entry_date': record.get('entry_date'),
-                            'username': record.get('username'),
-                            'coc_url': record.get('coc_document_url'),
-                            'iqc_url': record.get('iqc_document_url')
-                        })
-                        duplicate_count += 1
-                    else:
-                        # Insert new record
-                        insert_query = text("""
-                            INSERT INTO coc_documents (
-                                external_id, company_name, material_name, brand, product_type,
-                                lot_batch_no, coc_qty, invoice_no, invoice_qty, invoice_date,
-                                entry_date, username, coc_document_url, iqc_document_url
-                            ) VALUES (
-                                :ext_id, :company, :material, :brand, :product_type,
-                                :lot, :coc_qty, :invoice, :invoice_qty, :invoice_date,
-                                :entry_date, :username, :coc_url, :iqc_url
-                            )
-                        """)
-                        
-                        db.session.execute(insert_query, {
-                            'ext_id': record['id'],
-                            'company': record['store_name'],
-                            'material': record['material_name'],
-                            'brand': record.get('brand'),
-                            'product_type': record.get('product_type'),
-                            'lot': record['lot_batch_no'],
-                            'coc_qty': float(record['coc_qty']),
-                            'invoice': record['invoice_no'],
-                            'invoice_qty': float(record['invoice_qty']),
-                            'invoice_date': record['invoice_date'],
-                            'entry_date': record.get('entry_date'),
-                            'username': record.get('username'),
-                            'coc_url': record.get('coc_document_url'),
-                            'iqc_url': record.get('iqc_document_url')
-                        })
-                        synced_count += 1
-                    
-                except Exception as e:
-                    print(f"Error syncing record {record.get('id')}: {str(e)}")
-                    error_count += 1
-                    continue
-            
-            db.session.commit()
+            result = COCService.sync_coc_records(data.get('data', []))
             
             return {
                 "success": True,
                 "message": "COC data synced successfully",
-                "synced": synced_count,
-                "updated": duplicate_count,
-                "errors": error_count,
-                "total": len(records)
+                "synced": result['inserted'],
+                **result
             }
             
         except Exception as e:
@@ -150,37 +236,29 @@ class COCService:
                 'EVA', 'Back Sheet', 'EPE', 'Junction Box', 'MC4 Connector'
             ]
             
-            # Query to get TOTAL stock (shared across all companies)
-            query = """
-                SELECT 
-                    material_name,
-                    GROUP_CONCAT(DISTINCT brand SEPARATOR ', ') as brands,
-                    SUM(coc_qty) as total_received,
-                    SUM(consumed_qty) as total_consumed,
-                    SUM(available_qty) as available
-                FROM coc_documents
-                WHERE is_active = 1
-            """
+            # TOTAL stock (shared across all companies) from the stock ledger balance rows
+            pool = pool_by_material(current_balances(material_name=material_name))
+            
+            query = "SELECT DISTINCT material_name, brand FROM coc_documents WHERE is_active = 1 AND brand IS NOT NULL"
             params = {}
             
             if material_name:
                 query += " AND material_name = :material"
                 params['material'] = material_name
             
-            query += " GROUP BY material_name"
-            
-            result = db.session.execute(text(query), params).fetchall()
+            brands = {}
+            for row in db.session.execute(text(query), params).fetchall():
+                brands.setdefault(row[0], []).append(row[1])
             
             # Create a dict to track existing materials
             stock_dict = {}
-            for row in result:
-                material = row[0]
+            for material, totals in pool.items():
                 stock_dict[material] = {
                     'material': material,
-                    'make': row[1] if row[1] else 'N/A',
-                    'total_received': float(row[2]) if row[2] else 0,
-                    'total_consumed': float(row[3]) if row[3] else 0,
-                    'available': float(row[4]) if row[4] else 0
+                    'make': ', '.join(brands.get(material, [])) or 'N/A',
+                    'total_received': totals['received'],
+                    'total_consumed': totals['consumed'],
+                    'available': totals['available']
                 }
             
             # Add missing standard materials with 0 stock
@@ -204,6 +282,45 @@ class COCService:
         except Exception as e:
             return {"success": False, "message": str(e)}
     
+    @staticmethod
+    def material_availability(material_names):
+        """Open COC stock of several materials in one query (shared pool)
+        
+        Returns {material: {available, total_received, total_consumed, coc_count}} over
+        the active COCs that still have stock, with zeros for materials that have none.
+        """
+        stock = {name: {'available': 0, 'total_received': 0, 'total_consumed': 0, 'coc_count': 0}
+                 for name in material_names}
+        if not stock:
+            return stock
+        query = text("""
+            SELECT 
+                material_name,
+                SUM(available_qty) as available,
+                SUM(coc_qty) as total_received,
+                SUM(consumed_qty) as total_consumed,
+                COUNT(*) as coc_count
+            FROM coc_documents
+            WHERE material_name IN :materials
+            AND is_active = 1
+            AND available_qty > 0
+            GROUP BY material_name
+        """).bindparams(bindparam('materials', expanding=True))
+        
+        # material_name compares case-insensitively - map rows back to the requested names
+        names = {name.rstrip().lower(): name for name in stock}
+        for row in db.session.execute(query, {'materials': list(stock)}).fetchall():
+            name = names.get(row[0].rstrip().lower())
+            if name is None:
+                continue
+            stock[name] = {
+                'available': float(row[1]) if row[1] else 0,
+                'total_received': float(row[2]) if row[2] else 0,
+                'total_consumed': float(row[3]) if row[3] else 0,
+                'coc_count': int(row[4]) if row[4] else 0
+            }
+        return stock
+    
     @staticmethod
     def validate_production(company_name, material_requirements):
         """Validate if sufficient raw material available for production
@@ -213,22 +330,10 @@ class COCService:
         """
         try:
             insufficient = []
+            stock = COCService.material_availability(list(material_requirements))
             
             for material_name, required_qty in material_requirements.items():
-                # Check TOTAL available across ALL COCs (not per company)
-                query = text("""
-                    SELECT SUM(available_qty) as available
-                    FROM coc_documents
-                    WHERE material_name = :material
-                    AND is_active = 1
-                    AND available_qty > 0
-                """)
-                
-                result = db.session.execute(query, {
-                    'material': material_name
-                }).fetchone()
-                
-                available = float(result[0]) if result[0] else 0
+                available = stock[material_name]['available']
                 
                 if available < required_qty:
                     insufficient.append({
@@ -252,84 +357,141 @@ class COCService:
             return {"success": False, "message": str(e)}
     
     @staticmethod
-    def consume_material(company_name, material_name, quantity, production_date, lot_number=None):
-        """Update consumed quantity for materials
+    def allocate_materials(company_name, material_requirements, production_date, lot_number=None):
+        """Consume the materials of one production entry from the shared pool (FIFO)
         
-        Consumes from shared pool using FIFO (oldest COC first)
-        Material is consumed from ANY available COC, not company-specific
+        One windowed query reads and row-locks (FOR UPDATE) the open COCs of every
+        material, oldest invoice first, with the stock ahead of each COC. Each COC
+        gives min(its available, what is still needed), so a concurrent save waits
+        for these locks and then allocates from what is left - stock is never
+        consumed twice. consumed_qty is updated with one statement; the
+        material_consumption rows and stock ledger entries are inserted in batches,
+        all in the same transaction.
+        
+        A material short of stock consumes what is available; the rest is
+        reported under shortages.
         """
         try:
-            # Find COC records with available material (FIFO - oldest first)
+            required = {name: Decimal(str(qty)).quantize(Decimal('0.01'))
+                        for name, qty in material_requirements.items() if qty and qty > 0}
+            allocations = {name: [] for name in material_requirements}
+            shortages = []
+            if not required:
+                return {"success": True, "message": "Nothing to consume",
+                        "consumed_from": allocations, "shortages": shortages}
+            
             query = text("""
-                SELECT id, available_qty, lot_batch_no, invoice_no
+                SELECT 
+                    id, material_name, available_qty, lot_batch_no, invoice_no,
+                    SUM(available_qty) OVER (
+                        PARTITION BY material_name ORDER BY invoice_date ASC, id ASC
+                    ) - available_qty as stock_before,
+                    company_name
                 FROM coc_documents
-                WHERE material_name = :material
+                WHERE material_name IN :materials
                 AND available_qty > 0
                 AND is_active = 1
-                ORDER BY invoice_date ASC, id ASC
-            """)
-            
-            coc_records = db.session.execute(query, {
-                'material': material_name
-            }).fetchall()
+                ORDER BY material_name, invoice_date ASC, id ASC
+                FOR UPDATE
+            """).bindparams(bindparam('materials', expanding=True))
             
-            remaining = quantity
-            consumed_from_cocs = []
-            
-            for row in coc_records:
-                if remaining <= 0:
-                    break
-                
-                coc_id = row[0]
-                available = row[1]
-                coc_lot = row[2]
-                coc_invoice = row[3]
-                
-                consume_qty = min(remaining, available)
-                
-                # Update consumed quantity
-                update_query = text("""
-                    UPDATE coc_documents 
-                    SET consumed_qty = consumed_qty + :consume
-                    WHERE id = :id
-                """)
-                
-                db.session.execute(update_query, {'consume': consume_qty, 'id': coc_id})
-                
-                # Log consumption
-                log_query = text("""
-                    INSERT INTO material_consumption (
-                        production_date, company_name, material_type, 
-                        coc_id, lot_number, consumed_quantity
-                    ) VALUES (:date, :company, :material, :coc_id, :lot, :qty)
-                """)
-                
-                db.session.execute(log_query, {
+            names = {name.rstrip().lower(): name for name in required}
+            consumed = {}
+            ledger = []
+            stock_entries = []
+            for row in db.session.execute(query, {'materials': list(required)}).fetchall():
+                name = names.get(row[1].rstrip().lower())
+                if name is None:
+                    continue
+                coc_id, available, stock_before = row[0], Decimal(row[2]), Decimal(row[5])
+                if stock_before >= required[name]:
+                    continue
+                consume_qty = min(available, required[name] - stock_before)
+                consumed[coc_id] = consume_qty
+                ledger.append({
                     'date': production_date,
                     'company': company_name,
-                    'material': material_name,
+                    'material': name,
                     'coc_id': coc_id,
-                    'lot': f"{coc_lot} (Invoice: {coc_invoice})",
+                    'lot': f"{row[3]} (Invoice: {row[4]})",
                     'qty': consume_qty
                 })
-                
-                consumed_from_cocs.append({
+                stock_entries.append({
+                    'material': row[1],
+                    'company': row[6],
+                    'entry_type': 'consumption',
+                    'consumed': consume_qty,
+                    'movement_date': production_date,
+                    'coc_id': coc_id,
+                    'consumer': company_name,
+                    'reference': ledger[-1]['lot']
+                })
+                allocations[name].append({
                     'coc_id': coc_id,
-                    'lot': coc_lot,
-                    'invoice': coc_invoice,
-                    'consumed': consume_qty
+                    'lot': row[3],
+                    'invoice': row[4],
+                    'consumed': float(consume_qty)
                 })
+            
+            if consumed:
+                ids = list(consumed)
+                cases = ' '.join(f'WHEN :id{i} THEN :qty{i}' for i in range(len(ids)))
+                params = {'ids': ids}
+                for i, coc_id in enumerate(ids):
+                    params[f'id{i}'] = coc_id
+                    params[f'qty{i}'] = consumed[coc_id]
+                db.session.execute(text(f"""
+                    UPDATE coc_documents 
+                    SET consumed_qty = consumed_qty + CASE id {cases} END
+                    WHERE id IN :ids
+                """).bindparams(bindparam('ids', expanding=True)), params)
+                
+                db.session.execute(text("""
+                    INSERT INTO material_consumption (
+                        production_date, company_name, material_type, 
+                        coc_id, lot_number, consumed_quantity
+                    ) VALUES (:date, :company, :material, :coc_id, :lot, :qty)
+                """), ledger)
                 
-                remaining -= consume_qty
+                post_stock_entries(stock_entries)
             
             db.session.commit()
             
+            for name, qty in required.items():
+                allocated = sum(entry['consumed'] for entry in allocations[name])
+                if allocated < float(qty):
+                    shortages.append({
+                        'material': name,
+                        'required': float(qty),
+                        'consumed': allocated,
+                        'shortage': round(float(qty) - allocated, 2)
+                    })
+            
             return {
-                "success": True, 
-                "message": f"Consumed {quantity} from {len(consumed_from_cocs)} COC(s)",
-                "consumed_from": consumed_from_cocs
+                "success": True,
+                "message": f"Consumed {len(required)} material(s) from {len(consumed)} COC(s)",
+                "consumed_from": allocations,
+                "shortages": shortages
             }
             
         except Exception as e:
             db.session.rollback()
             return {"success": False, "message": str(e)}
+    
+    @staticmethod
+    def consume_material(company_name, material_name, quantity, production_date, lot_number=None):
+        """Update consumed quantity for materials
+        
+        Consumes from shared pool using FIFO (oldest COC first)
+        Material is consumed from ANY available COC, not company-specific
+        """
+        result = COCService.allocate_materials(company_name, {material_name: quantity},
+                                               production_date, lot_number)
+        if not result['success']:
+            return result
+        consumed_from = result['consumed_from'][material_name]
+        return {
+            "success": True, 
+            "message": f"Consumed {quantity} from {len(consumed_from)} COC(s)",
+            "consumed_from": consumed_from
+        }
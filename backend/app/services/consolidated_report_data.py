@@ -0,0 +1,173 @@
+"""
+Consolidated Report Data - loads every section of a consolidated report in one pass
+
+ConsolidatedReportGenerator used to run five queries one after the other, three of
+them over the same production_records rows. The loader runs one bounded query per
+source instead, concurrently, each on its own pooled connection:
+
+- production   production_records of the company in the window
+                 -> summary, daily rows and IPQC reports
+- cocs         coc_documents invoiced in the window
+- materials    stock ledger balances at the window end + movements booked in it
+                 -> opening / received / consumed / closing per material
+
+load_report_data() returns a ReportData of typed section frames; each frame keeps
+the rows and derives what the PDF layout needs.
+"""
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app
+from sqlalchemy import text
+from app.models.database import db
+from app.services.stock_ledger import balances_as_of, movements_between
+
+# Assuming 625W modules, 1000 modules = 0.625 MW
+MODULE_WATTS = 625
+
+
+class ProductionFrame:
+    """production_records rows of the window: (date, lot, day, night, cell_rej, mod_rej, ipqc_pdf)"""
+    __slots__ = ('rows',)
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    @property
+    def summary(self):
+        # Same as SUM(day_production + night_production): rows with a NULL shift do not count
+        totals = [row[2] + row[3] for row in self.rows if row[2] is not None and row[3] is not None]
+        if not totals or not sum(totals):
+            return None
+        total_modules = sum(totals)
+        days = len(self.rows)
+        return {
+            'days': days,
+            'total_modules': total_modules,
+            'total_mw': (total_modules * MODULE_WATTS) / 1000000,
+            'avg_daily': total_modules / days if days > 0 else 0
+        }
+
+    @property
+    def daily(self):
+        return [{
+            'date': str(row[0]),
+            'lot': row[1],
+            'day': row[2] or 0,
+            'night': row[3] or 0,
+            'total': (row[2] or 0) + (row[3] or 0),
+            'cell_rej': float(row[4]) if row[4] else 0,
+            'mod_rej': float(row[5]) if row[5] else 0
+        } for row in self.rows]
+
+    @property
+    def ipqc_reports(self):
+        return [{
+            'lot': row[1],
+            'date': str(row[0]),
+            'ipqc_pdf': row[6]
+        } for row in self.rows if row[6] is not None]
+
+
+class COCFrame:
+    """coc_documents invoiced in the window, by material then invoice date"""
+    __slots__ = ('documents',)
+
+    def __init__(self, documents):
+        self.documents = documents
+
+
+class MaterialFrame:
+    """Per-material stock of the company over the window"""
+    __slots__ = ('rows',)
+
+    def __init__(self, closing, movements):
+        self.rows = []
+        for balance in closing:
+            moved = movements.get(balance['material'], {'received': 0, 'consumed': 0})
+            self.rows.append({
+                'material': balance['material'],
+                'opening': balance['available'] - moved['received'] + moved['consumed'],
+                'received': moved['received'],
+                'consumed': moved['consumed'],
+                'available': balance['available']
+            })
+
+
+class ReportData:
+    """All sections of one consolidated report"""
+    __slots__ = ('company_name', 'from_date', 'to_date', 'production', 'cocs', 'materials')
+
+    def __init__(self, company_name, from_date, to_date, production, cocs, materials):
+        self.company_name = company_name
+        self.from_date = from_date
+        self.to_date = to_date
+        self.production = production
+        self.cocs = cocs
+        self.materials = materials
+
+
+def _load_production(conn, company_name, from_date, to_date):
+    rows = conn.execute(text("""
+        SELECT
+            date, lot_number, day_production, night_production,
+            cell_rejection_percent, module_rejection_percent, ipqc_pdf
+        FROM production_records
+        WHERE company_name = :company
+        AND date BETWEEN :from_date AND :to_date
+        ORDER BY date
+    """), {'company': company_name, 'from_date': from_date, 'to_date': to_date}).fetchall()
+    return ProductionFrame([tuple(row) for row in rows])
+
+
+def _load_cocs(conn, company_name, from_date, to_date):
+    rows = conn.execute(text("""
+        SELECT
+            material_name, brand, lot_batch_no, invoice_no,
+            coc_qty, coc_document_url, iqc_document_url
+        FROM coc_documents
+        WHERE company_name = :company
+        AND invoice_date BETWEEN :from_date AND :to_date
+        AND is_active = 1
+        ORDER BY material_name, invoice_date
+    """), {'company': company_name, 'from_date': from_date, 'to_date': to_date}).fetchall()
+    return COCFrame([{
+        'material': row[0],
+        'brand': row[1],
+        'lot_batch': row[2],
+        'invoice': row[3],
+        'qty': row[4],
+        'coc_url': row[5],
+        'iqc_url': row[6]
+    } for row in rows])
+
+
+def _load_materials(conn, company_name, from_date, to_date):
+    closing = balances_as_of(to_date, company_name=company_name, conn=conn)
+    movements = movements_between(from_date, to_date, company_name=company_name, conn=conn)
+    return MaterialFrame(closing, movements)
+
+
+SECTIONS = (
+    ('production', _load_production, lambda: ProductionFrame([])),
+    ('cocs', _load_cocs, lambda: COCFrame([])),
+    ('materials', _load_materials, lambda: MaterialFrame([], {})),
+)
+
+
+def load_report_data(company_name, from_date, to_date):
+    """Load every section concurrently; a section whose query fails comes back empty"""
+    app = current_app._get_current_object()
+
+    def run(name, loader, empty):
+        try:
+            with app.app_context():
+                with db.engine.connect() as conn:
+                    return loader(conn, company_name, from_date, to_date)
+        except Exception as e:
+            print(f"Error loading {name} for consolidated report: {e}")
+            return empty()
+
+    with ThreadPoolExecutor(max_workers=len(SECTIONS)) as pool:
+        futures = {name: pool.submit(run, name, loader, empty) for name, loader, empty in SECTIONS}
+        sections = {name: future.result() for name, future in futures.items()}
+
+    return ReportData(company_name, from_date, to_date, **sections)
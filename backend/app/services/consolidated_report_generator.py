@@ -6,16 +6,15 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from io import BytesIO
 from datetime import datetime
-from sqlalchemy import text
-from app.models.database import db
+from app.services.pdf_styles import stylesheet, paragraph_style
+from app.services.consolidated_report_data import load_report_data
 import requests
 
 class ConsolidatedReportGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
+        self.styles = stylesheet()
         
     def generate_consolidated_report(self, company_name, from_date, to_date):
         """Generate consolidated report for date range"""
@@ -26,10 +25,13 @@ class ConsolidatedReportGenerator:
             
             story = []
             
+            # All section data, loaded up front in one concurrent pass
+            data = load_report_data(company_name, from_date, to_date)
+            
             # Title Page
-            title_style = ParagraphStyle(
+            title_style = paragraph_style(
                 'CustomTitle',
-                parent=self.styles['Heading1'],
+                parent='Heading1',
                 fontSize=20,
                 textColor=colors.HexColor('#1976d2'),
                 spaceAfter=20,
@@ -40,7 +42,7 @@ class ConsolidatedReportGenerator:
             story.append(Paragraph(f"<b>CONSOLIDATED PRODUCTION REPORT</b>", title_style))
             story.append(Spacer(1, 10*mm))
             
-            info_style = ParagraphStyle('Info', parent=self.styles['Normal'], fontSize=12, alignment=1)
+            info_style = paragraph_style('Info', fontSize=12, alignment=1)
             story.append(Paragraph(f"<b>Company:</b> {company_name}", info_style))
             story.append(Paragraph(f"<b>Period:</b> {from_date} to {to_date}", info_style))
             story.append(Paragraph(f"<b>Generated:</b> {datetime.now().strftime('%Y-%m-%d %H:%M')}", info_style))
@@ -51,7 +53,7 @@ class ConsolidatedReportGenerator:
             story.append(Paragraph("<b>📊 PRODUCTION SUMMARY</b>", self.styles['Heading2']))
             story.append(Spacer(1, 5*mm))
             
-            production_summary = self._get_production_summary(company_name, from_date, to_date)
+            production_summary = data.production.summary
             if production_summary:
                 summary_data = [
                     ['Metric', 'Value'],
@@ -79,7 +81,7 @@ class ConsolidatedReportGenerator:
             story.append(Paragraph("<b>📑 COC DOCUMENTS (RAW MATERIALS USED)</b>", self.styles['Heading2']))
             story.append(Spacer(1, 5*mm))
             
-            coc_data = self._get_coc_documents(company_name, from_date, to_date)
+            coc_data = data.cocs.documents
             if coc_data:
                 coc_table_data = [['Material', 'Brand', 'Lot/Batch', 'Invoice', 'Qty', 'COC Link']]
                 
@@ -115,19 +117,20 @@ class ConsolidatedReportGenerator:
             story.append(Paragraph("<b>📦 MATERIAL CONSUMPTION</b>", self.styles['Heading2']))
             story.append(Spacer(1, 5*mm))
             
-            consumption_data = self._get_material_consumption(company_name, from_date, to_date)
+            consumption_data = data.materials.rows
             if consumption_data:
-                cons_table_data = [['Material', 'Total Received', 'Consumed', 'Available']]
+                cons_table_data = [['Material', 'Opening', 'Received', 'Consumed', 'Available']]
                 
                 for item in consumption_data:
                     cons_table_data.append([
                         item['material'],
+                        f"{item['opening']:.0f}",
                         f"{item['received']:.0f}",
                         f"{item['consumed']:.0f}",
                         f"{item['available']:.0f}"
                     ])
                 
-                cons_table = Table(cons_table_data, colWidths=[60*mm, 35*mm, 35*mm, 35*mm])
+                cons_table = Table(cons_table_data, colWidths=[55*mm, 27.5*mm, 27.5*mm, 27.5*mm, 27.5*mm])
                 cons_table.setStyle(TableStyle([
                     ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FF9800')),
                     ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
@@ -156,7 +159,7 @@ class ConsolidatedReportGenerator:
             story.append(Spacer(1, 5*mm))
             
             # IPQC Reports from production records
-            ipqc_data = self._get_ipqc_reports(company_name, from_date, to_date)
+            ipqc_data = data.production.ipqc_reports
             if ipqc_data:
                 story.append(Paragraph("<b>IPQC Reports (from Production):</b>", self.styles['Normal']))
                 for i, ipqc in enumerate(ipqc_data, 1):
@@ -171,7 +174,7 @@ class ConsolidatedReportGenerator:
             story.append(Paragraph("<b>📅 DAILY PRODUCTION DETAILS</b>", self.styles['Heading2']))
             story.append(Spacer(1, 5*mm))
             
-            daily_data = self._get_daily_production(company_name, from_date, to_date)
+            daily_data = data.production.daily
             if daily_data:
                 daily_table_data = [['Date', 'Lot#', 'Day Prod', 'Night Prod', 'Total', 'Cell Rej%', 'Module Rej%']]
                 
@@ -209,159 +212,3 @@ class ConsolidatedReportGenerator:
             import traceback
             traceback.print_exc()
             raise
-    
-    def _get_production_summary(self, company_name, from_date, to_date):
-        """Get production summary statistics"""
-        try:
-            query = text("""
-                SELECT 
-                    COUNT(*) as days,
-                    SUM(day_production + night_production) as total_modules
-                FROM production_records
-                WHERE company_name = :company
-                AND date BETWEEN :from_date AND :to_date
-            """)
-            
-            result = db.session.execute(query, {
-                'company': company_name,
-                'from_date': from_date,
-                'to_date': to_date
-            }).fetchone()
-            
-            if result and result[1]:
-                total_modules = result[1]
-                days = result[0]
-                # Assuming 625W modules, 1000 modules = 0.625 MW
-                total_mw = (total_modules * 625) / 1000000
-                avg_daily = total_modules / days if days > 0 else 0
-                
-                return {
-                    'days': days,
-                    'total_modules': total_modules,
-                    'total_mw': total_mw,
-                    'avg_daily': avg_daily
-                }
-            return None
-        except Exception as e:
-            print(f"Error getting production summary: {e}")
-            return None
-    
-    def _get_coc_documents(self, company_name, from_date, to_date):
-        """Get COC documents for period"""
-        try:
-            query = text("""
-                SELECT 
-                    material_name, brand, lot_batch_no, invoice_no, 
-                    coc_qty, coc_document_url, iqc_document_url
-                FROM coc_documents
-                WHERE company_name = :company
-                AND invoice_date BETWEEN :from_date AND :to_date
-                AND is_active = 1
-                ORDER BY material_name, invoice_date
-            """)
-            
-            result = db.session.execute(query, {
-                'company': company_name,
-                'from_date': from_date,
-                'to_date': to_date
-            }).fetchall()
-            
-            return [{
-                'material': row[0],
-                'brand': row[1],
-                'lot_batch': row[2],
-                'invoice': row[3],
-                'qty': row[4],
-                'coc_url': row[5],
-                'iqc_url': row[6]
-            } for row in result]
-        except Exception as e:
-            print(f"Error getting COC documents: {e}")
-            return []
-    
-    def _get_material_consumption(self, company_name, from_date, to_date):
-        """Get material consumption summary"""
-        try:
-            query = text("""
-                SELECT 
-                    material_name,
-                    SUM(coc_qty) as total_received,
-                    SUM(consumed_qty) as total_consumed,
-                    SUM(available_qty) as available
-                FROM coc_documents
-                WHERE company_name = :company
-                AND is_active = 1
-                GROUP BY material_name
-                ORDER BY material_name
-            """)
-            
-            result = db.session.execute(query, {'company': company_name}).fetchall()
-            
-            return [{
-                'material': row[0],
-                'received': float(row[1]) if row[1] else 0,
-                'consumed': float(row[2]) if row[2] else 0,
-                'available': float(row[3]) if row[3] else 0
-            } for row in result]
-        except Exception as e:
-            print(f"Error getting material consumption: {e}")
-            return []
-    
-    def _get_ipqc_reports(self, company_name, from_date, to_date):
-        """Get IPQC reports from production records"""
-        try:
-            query = text("""
-                SELECT lot_number, date, ipqc_pdf
-                FROM production_records
-                WHERE company_name = :company
-                AND date BETWEEN :from_date AND :to_date
-                AND ipqc_pdf IS NOT NULL
-                ORDER BY date
-            """)
-            
-            result = db.session.execute(query, {
-                'company': company_name,
-                'from_date': from_date,
-                'to_date': to_date
-            }).fetchall()
-            
-            return [{
-                'lot': row[0],
-                'date': str(row[1]),
-                'ipqc_pdf': row[2]
-            } for row in result]
-        except Exception as e:
-            print(f"Error getting IPQC reports: {e}")
-            return []
-    
-    def _get_daily_production(self, company_name, from_date, to_date):
-        """Get daily production records"""
-        try:
-            query = text("""
-                SELECT 
-                    date, lot_number, day_production, night_production,
-                    cell_rejection_percent, module_rejection_percent
-                FROM production_records
-                WHERE company_name = :company
-                AND date BETWEEN :from_date AND :to_date
-                ORDER BY date
-            """)
-            
-            result = db.session.execute(query, {
-                'company': company_name,
-                'from_date': from_date,
-                'to_date': to_date
-            }).fetchall()
-            
-            return [{
-                'date': str(row[0]),
-                'lot': row[1],
-                'day': row[2],
-                'night': row[3],
-                'total': row[2] + row[3],
-                'cell_rej': float(row[4]) if row[4] else 0,
-                'mod_rej': float(row[5]) if row[5] else 0
-            } for row in result]
-        except Exception as e:
-            print(f"Error getting daily production: {e}")
-            return []
@@ -1,15 +1,23 @@
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
 from openpyxl.utils import get_column_letter
 from openpyxl.drawing.image import Image as XLImage
+from app.services import excel_styles as xs
 from datetime import datetime
 import os
 import json
 
+def production_excel_filename(company):
+    """File name for a production report workbook"""
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    return f"Production_Report_{company['name']}_{timestamp}.xlsx"
+
+
 def generate_production_excel(company, production_data, rejections, start_date, end_date, 
-                              cells_received_qty=0, cells_received_mw=0, report_options=None):
+                              cells_received_qty=0, cells_received_mw=0, report_options=None,
+                              filepath=None):
     """
     Generate colorful Excel report with multiple sheets based on selected options
+    (saved to generated_pdfs unless filepath is given)
     """
     if report_options is None:
         report_options = {
@@ -56,14 +64,12 @@ def generate_production_excel(company, production_data, rejections, start_date,
         create_bom_materials_sheet(wb, production_data)
     
     # Save file
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    filename = f"Production_Report_{company['name']}_{timestamp}.xlsx"
+    if filepath is None:
+        # Create absolute path to generated_pdfs folder
+        output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'generated_pdfs')
+        os.makedirs(output_dir, exist_ok=True)
+        filepath = os.path.join(output_dir, production_excel_filename(company))
     
-    # Create absolute path to generated_pdfs folder
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'generated_pdfs')
-    os.makedirs(output_dir, exist_ok=True)
-    
-    filepath = os.path.join(output_dir, filename)
     wb.save(filepath)
     return filepath
 
@@ -73,15 +79,15 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
     ws = wb.create_sheet("Summary", 0)
     
     # Header styling
-    header_fill = PatternFill(start_color="1976D2", end_color="1976D2", fill_type="solid")
-    header_font = Font(name='Calibri', size=14, bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("1976D2")
+    header_font = xs.font(name='Calibri', size=14, bold=True, color="FFFFFF")
     
     # Title
     ws.merge_cells('A1:F1')
     ws['A1'] = "PRODUCTION REPORT"
-    ws['A1'].font = Font(name='Calibri', size=18, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="0D47A1", end_color="0D47A1", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=18, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("0D47A1")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     # Company Info Header
@@ -89,7 +95,7 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
     ws['A3'] = "COMPANY INFORMATION"
     ws['A3'].font = header_font
     ws['A3'].fill = header_fill
-    ws['A3'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A3'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[3].height = 25
     
     # Company Details
@@ -99,9 +105,9 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
         ['Contact:', company.get('contact', 'N/A'), 'Module Type:', company.get('module_type', 'N/A')],
     ]
     
-    label_fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-    label_font = Font(name='Calibri', size=11, bold=True)
-    value_font = Font(name='Calibri', size=11)
+    label_fill = xs.solid_fill("E3F2FD")
+    label_font = xs.font(name='Calibri', size=11, bold=True)
+    value_font = xs.font(name='Calibri', size=11)
     
     row = 4
     for info_row in info_data:
@@ -128,7 +134,7 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
     ws[f'A{row+1}'] = "PRODUCTION SUMMARY"
     ws[f'A{row+1}'].font = header_font
     ws[f'A{row+1}'].fill = header_fill
-    ws[f'A{row+1}'].alignment = Alignment(horizontal='center', vertical='center')
+    ws[f'A{row+1}'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[row+1].height = 25
     
     # Calculate totals
@@ -144,7 +150,7 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
         ['Production Days:', f"{len(production_data)} Days", 'Avg Daily:', f"{total_prod//len(production_data) if production_data else 0:,} Modules"],
     ]
     
-    green_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+    green_fill = xs.solid_fill("C8E6C9")
     
     for summary_row in summary_data:
         ws[f'A{row}'] = summary_row[0]
@@ -153,8 +159,8 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
         
         ws.merge_cells(f'B{row}:C{row}')
         ws[f'B{row}'] = summary_row[1]
-        ws[f'B{row}'].font = Font(name='Calibri', size=12, bold=True)
-        ws[f'B{row}'].alignment = Alignment(horizontal='center')
+        ws[f'B{row}'].font = xs.font(name='Calibri', size=12, bold=True)
+        ws[f'B{row}'].alignment = xs.alignment(horizontal='center')
         
         ws[f'D{row}'] = summary_row[2]
         ws[f'D{row}'].font = label_font
@@ -162,8 +168,8 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
         
         ws.merge_cells(f'E{row}:F{row}')
         ws[f'E{row}'] = summary_row[3]
-        ws[f'E{row}'].font = Font(name='Calibri', size=12, bold=True)
-        ws[f'E{row}'].alignment = Alignment(horizontal='center')
+        ws[f'E{row}'].font = xs.font(name='Calibri', size=12, bold=True)
+        ws[f'E{row}'].alignment = xs.alignment(horizontal='center')
         
         row += 1
     
@@ -176,12 +182,7 @@ def create_summary_sheet(wb, company, production_data, start_date, end_date,
     ws.column_dimensions['F'].width = 18
     
     # Add borders
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    thin_border = xs.border('thin')
     
     for row_cells in ws.iter_rows(min_row=1, max_row=row, min_col=1, max_col=6):
         for cell in row_cells:
@@ -195,20 +196,20 @@ def create_production_sheet(wb, production_data):
     headers = ['Date', 'Day of Week', 'Day Shift', 'Night Shift', 'Total Production', 
                'Cells Used', 'Cell Rej %', 'Cells Rejected', 'Module Rej %', 'Modules Rejected']
     
-    header_fill = PatternFill(start_color="FF6F00", end_color="FF6F00", fill_type="solid")
-    header_font = Font(name='Calibri', size=11, bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("FF6F00")
+    header_font = xs.font(name='Calibri', size=11, bold=True, color="FFFFFF")
     
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=1, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.alignment = xs.alignment(horizontal='center', vertical='center')
     
     ws.row_dimensions[1].height = 25
     
     # Data rows
-    data_font = Font(name='Calibri', size=10)
-    light_fill = PatternFill(start_color="FFF3E0", end_color="FFF3E0", fill_type="solid")
+    data_font = xs.font(name='Calibri', size=10)
+    light_fill = xs.solid_fill("FFF3E0")
     
     for idx, prod in enumerate(production_data, 2):
         day_prod = prod.get('day_production', 0)
@@ -232,7 +233,7 @@ def create_production_sheet(wb, production_data):
         for col, value in enumerate(row_data, 1):
             cell = ws.cell(row=idx, column=col, value=value)
             cell.font = data_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.alignment = xs.alignment(horizontal='center', vertical='center')
             
             if idx % 2 == 0:
                 cell.fill = light_fill
@@ -249,12 +250,7 @@ def create_production_sheet(wb, production_data):
         ws.column_dimensions[get_column_letter(col)].width = width
     
     # Add borders
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    thin_border = xs.border('thin')
     
     for row in ws.iter_rows(min_row=1, max_row=len(production_data)+1, min_col=1, max_col=10):
         for cell in row:
@@ -277,21 +273,21 @@ def create_inventory_sheet(wb, production_data, cells_received_qty):
     # Title
     ws.merge_cells('A1:D1')
     ws['A1'] = "CELL INVENTORY TRACKING"
-    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=16, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("4CAF50")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     # Headers
-    header_fill = PatternFill(start_color="81C784", end_color="81C784", fill_type="solid")
-    header_font = Font(name='Calibri', size=12, bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("81C784")
+    header_font = xs.font(name='Calibri', size=12, bold=True, color="FFFFFF")
     
     headers = ['Category', 'Quantity (Cells)', 'Percentage', 'Status']
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=3, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.alignment = xs.alignment(horizontal='center', vertical='center')
     
     ws.row_dimensions[3].height = 25
     
@@ -304,28 +300,23 @@ def create_inventory_sheet(wb, production_data, cells_received_qty):
     ]
     
     fills = [
-        PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid"),
-        PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid"),
-        PatternFill(start_color="FFCCBC", end_color="FFCCBC", fill_type="solid"),
-        PatternFill(start_color="C5E1A5", end_color="C5E1A5", fill_type="solid"),
+        xs.solid_fill("E8F5E9"),
+        xs.solid_fill("FFF9C4"),
+        xs.solid_fill("FFCCBC"),
+        xs.solid_fill("C5E1A5"),
     ]
     
     for idx, (data, fill) in enumerate(zip(inventory_data, fills), 4):
-        ws.cell(row=idx, column=1, value=data[0]).font = Font(name='Calibri', size=11, bold=True)
+        ws.cell(row=idx, column=1, value=data[0]).font = xs.font(name='Calibri', size=11, bold=True)
         ws.cell(row=idx, column=2, value=data[1]).number_format = '#,##0'
         ws.cell(row=idx, column=3, value=data[2]/100).number_format = '0.00%'
-        ws.cell(row=idx, column=4, value=data[3]).font = Font(name='Calibri', size=10)
+        ws.cell(row=idx, column=4, value=data[3]).font = xs.font(name='Calibri', size=10)
         
         for col in range(1, 5):
             cell = ws.cell(row=idx, column=col)
             cell.fill = fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
-            cell.border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
+            cell.alignment = xs.alignment(horizontal='center', vertical='center')
+            cell.border = xs.border('thin')
     
     # Set column widths
     ws.column_dimensions['A'].width = 20
@@ -350,9 +341,9 @@ def create_kpi_sheet(wb, production_data, cells_received_qty):
     # Title
     ws.merge_cells('A1:E1')
     ws['A1'] = "KEY PERFORMANCE INDICATORS (KPI)"
-    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="9C27B0", end_color="9C27B0", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=16, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("9C27B0")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     # KPI Data
@@ -370,14 +361,14 @@ def create_kpi_sheet(wb, production_data, cells_received_qty):
         ws.merge_cells(f'A{row}:B{row}')
         cell = ws[f'A{row}']
         cell.value = kpi[0]
-        cell.font = Font(name='Calibri', size=13, bold=True)
-        cell.fill = PatternFill(start_color=kpi[3][1:], end_color=kpi[3][1:], fill_type="solid")
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.font = xs.font(name='Calibri', size=13, bold=True)
+        cell.fill = xs.solid_fill(kpi[3][1:])
+        cell.alignment = xs.alignment(horizontal='center', vertical='center')
         
         # Value
         ws[f'C{row}'] = kpi[1]
-        ws[f'C{row}'].font = Font(name='Calibri', size=14, bold=True)
-        ws[f'C{row}'].alignment = Alignment(horizontal='center', vertical='center')
+        ws[f'C{row}'].font = xs.font(name='Calibri', size=14, bold=True)
+        ws[f'C{row}'].alignment = xs.alignment(horizontal='center', vertical='center')
         if kpi[2] == '%':
             ws[f'C{row}'].number_format = '0.00"%"'
         else:
@@ -385,13 +376,13 @@ def create_kpi_sheet(wb, production_data, cells_received_qty):
         
         # Unit
         ws[f'D{row}'] = kpi[2]
-        ws[f'D{row}'].font = Font(name='Calibri', size=11)
-        ws[f'D{row}'].alignment = Alignment(horizontal='center', vertical='center')
+        ws[f'D{row}'].font = xs.font(name='Calibri', size=11)
+        ws[f'D{row}'].alignment = xs.alignment(horizontal='center', vertical='center')
         
         # Status
         ws[f'E{row}'] = kpi[4]
-        ws[f'E{row}'].font = Font(name='Calibri', size=11)
-        ws[f'E{row}'].alignment = Alignment(horizontal='center', vertical='center')
+        ws[f'E{row}'].font = xs.font(name='Calibri', size=11)
+        ws[f'E{row}'].alignment = xs.alignment(horizontal='center', vertical='center')
         
         ws.row_dimensions[row].height = 30
         row += 2
@@ -404,12 +395,7 @@ def create_kpi_sheet(wb, production_data, cells_received_qty):
     ws.column_dimensions['E'].width = 18
     
     # Add borders
-    thin_border = Border(
-        left=Side(style='medium'),
-        right=Side(style='medium'),
-        top=Side(style='medium'),
-        bottom=Side(style='medium')
-    )
+    thin_border = xs.border('medium')
     
     for r in range(3, row, 2):
         for c in range(1, 6):
@@ -422,21 +408,21 @@ def create_rejection_summary_sheet(wb, production_data):
     # Header
     ws.merge_cells('A1:E1')
     ws['A1'] = "DAY-WISE REJECTION SUMMARY"
-    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="E91E63", end_color="E91E63", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=16, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("E91E63")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     # Column headers
     headers = ['Date', 'Day', 'Modules Rejected', 'Rejection %', 'Status']
-    header_fill = PatternFill(start_color="F48FB1", end_color="F48FB1", fill_type="solid")
-    header_font = Font(name='Calibri', size=11, bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("F48FB1")
+    header_font = xs.font(name='Calibri', size=11, bold=True, color="FFFFFF")
     
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=3, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.alignment = xs.alignment(horizontal='center', vertical='center')
     
     ws.row_dimensions[3].height = 25
     
@@ -449,26 +435,26 @@ def create_rejection_summary_sheet(wb, production_data):
         # Status indicator
         if rej_pct < 0.5:
             status = '✓ Low'
-            status_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+            status_fill = xs.solid_fill("C8E6C9")
         elif rej_pct < 1:
             status = '⚠ Medium'
-            status_fill = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
+            status_fill = xs.solid_fill("FFF9C4")
         elif rej_pct < 2:
             status = '⚠ High'
-            status_fill = PatternFill(start_color="FFCCBC", end_color="FFCCBC", fill_type="solid")
+            status_fill = xs.solid_fill("FFCCBC")
         else:
             status = '✗ Critical'
-            status_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
+            status_fill = xs.solid_fill("FFCDD2")
         
-        ws.cell(row=idx, column=1, value=prod.get('date', '')).alignment = Alignment(horizontal='center')
-        ws.cell(row=idx, column=2, value=prod.get('day_of_week', '')).alignment = Alignment(horizontal='center')
+        ws.cell(row=idx, column=1, value=prod.get('date', '')).alignment = xs.alignment(horizontal='center')
+        ws.cell(row=idx, column=2, value=prod.get('day_of_week', '')).alignment = xs.alignment(horizontal='center')
         ws.cell(row=idx, column=3, value=rejected).number_format = '#,##0'
-        ws.cell(row=idx, column=3).alignment = Alignment(horizontal='center')
+        ws.cell(row=idx, column=3).alignment = xs.alignment(horizontal='center')
         ws.cell(row=idx, column=4, value=rej_pct/100).number_format = '0.00%'
-        ws.cell(row=idx, column=4).alignment = Alignment(horizontal='center')
+        ws.cell(row=idx, column=4).alignment = xs.alignment(horizontal='center')
         ws.cell(row=idx, column=5, value=status).fill = status_fill
-        ws.cell(row=idx, column=5).alignment = Alignment(horizontal='center')
-        ws.cell(row=idx, column=5).font = Font(name='Calibri', size=10, bold=True)
+        ws.cell(row=idx, column=5).alignment = xs.alignment(horizontal='center')
+        ws.cell(row=idx, column=5).font = xs.font(name='Calibri', size=10, bold=True)
     
     # Set column widths
     ws.column_dimensions['A'].width = 12
@@ -478,12 +464,7 @@ def create_rejection_summary_sheet(wb, production_data):
     ws.column_dimensions['E'].width = 15
     
     # Add borders
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    thin_border = xs.border('thin')
     
     for row in ws.iter_rows(min_row=3, max_row=len(production_data)+3, min_col=1, max_col=5):
         for cell in row:
@@ -496,40 +477,40 @@ def create_rejection_details_sheet(wb, rejections):
     # Header
     ws.merge_cells('A1:G1')
     ws['A1'] = "DETAILED REJECTION RECORDS"
-    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="D32F2F", end_color="D32F2F", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=16, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("D32F2F")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     # Column headers
     headers = ['No', 'Date', 'Serial Number', 'Defect Reason', 'Stage', 'Defect Type', 'Remarks']
-    header_fill = PatternFill(start_color="EF5350", end_color="EF5350", fill_type="solid")
-    header_font = Font(name='Calibri', size=11, bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("EF5350")
+    header_font = xs.font(name='Calibri', size=11, bold=True, color="FFFFFF")
     
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=3, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.alignment = xs.alignment(horizontal='center', vertical='center')
     
     ws.row_dimensions[3].height = 25
     
     # Data
-    light_fill = PatternFill(start_color="FFEBEE", end_color="FFEBEE", fill_type="solid")
+    light_fill = xs.solid_fill("FFEBEE")
     
     for idx, rej in enumerate(rejections, 4):
         defect_type = rej.get('defect_type', 'Minor')
-        type_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid") if defect_type == 'Major' else PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
+        type_fill = xs.solid_fill("FFCDD2") if defect_type == 'Major' else xs.solid_fill("FFF9C4")
         
-        ws.cell(row=idx, column=1, value=idx-3).alignment = Alignment(horizontal='center')
-        ws.cell(row=idx, column=2, value=rej.get('date', '')).alignment = Alignment(horizontal='center')
-        ws.cell(row=idx, column=3, value=rej.get('serial', '')).alignment = Alignment(horizontal='left')
-        ws.cell(row=idx, column=4, value=rej.get('reason', '')).alignment = Alignment(horizontal='left')
-        ws.cell(row=idx, column=5, value=rej.get('stage', '')).alignment = Alignment(horizontal='center')
+        ws.cell(row=idx, column=1, value=idx-3).alignment = xs.alignment(horizontal='center')
+        ws.cell(row=idx, column=2, value=rej.get('date', '')).alignment = xs.alignment(horizontal='center')
+        ws.cell(row=idx, column=3, value=rej.get('serial', '')).alignment = xs.alignment(horizontal='left')
+        ws.cell(row=idx, column=4, value=rej.get('reason', '')).alignment = xs.alignment(horizontal='left')
+        ws.cell(row=idx, column=5, value=rej.get('stage', '')).alignment = xs.alignment(horizontal='center')
         ws.cell(row=idx, column=6, value=defect_type).fill = type_fill
-        ws.cell(row=idx, column=6).alignment = Alignment(horizontal='center')
-        ws.cell(row=idx, column=6).font = Font(name='Calibri', size=10, bold=True)
-        ws.cell(row=idx, column=7, value=rej.get('remarks', '')).alignment = Alignment(horizontal='left')
+        ws.cell(row=idx, column=6).alignment = xs.alignment(horizontal='center')
+        ws.cell(row=idx, column=6).font = xs.font(name='Calibri', size=10, bold=True)
+        ws.cell(row=idx, column=7, value=rej.get('remarks', '')).alignment = xs.alignment(horizontal='left')
         
         if idx % 2 == 0:
             for col in [1, 2, 3, 4, 5, 7]:
@@ -545,12 +526,7 @@ def create_rejection_details_sheet(wb, rejections):
     ws.column_dimensions['G'].width = 25
     
     # Add borders
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    thin_border = xs.border('thin')
     
     for row in ws.iter_rows(min_row=3, max_row=len(rejections)+3, min_col=1, max_col=7):
         for cell in row:
@@ -563,9 +539,9 @@ def create_bom_materials_sheet(wb, production_data):
     # Title
     ws.merge_cells('A1:F1')
     ws['A1'] = "📦 BOM MATERIALS & DOCUMENTS SUMMARY"
-    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="1976D2", end_color="1976D2", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=16, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("1976D2")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     row = 3
@@ -581,37 +557,37 @@ def create_bom_materials_sheet(wb, production_data):
         # Date and Lot Number Header
         ws.merge_cells(f'A{row}:F{row}')
         ws[f'A{row}'] = f"📅 Date: {date} | 🏷️ Lot Number: {lot_number}"
-        ws[f'A{row}'].font = Font(name='Calibri', size=12, bold=True, color="FFFFFF")
-        ws[f'A{row}'].fill = PatternFill(start_color="0D47A1", end_color="0D47A1", fill_type="solid")
-        ws[f'A{row}'].alignment = Alignment(horizontal='left', vertical='center')
+        ws[f'A{row}'].font = xs.font(name='Calibri', size=12, bold=True, color="FFFFFF")
+        ws[f'A{row}'].fill = xs.solid_fill("0D47A1")
+        ws[f'A{row}'].alignment = xs.alignment(horizontal='left', vertical='center')
         ws.row_dimensions[row].height = 25
         row += 1
         
         # BOM Materials Table Header
         headers = ['Sr.', 'Material Name', 'Lot Number', 'Image']
-        header_fill = PatternFill(start_color="64B5F6", end_color="64B5F6", fill_type="solid")
-        header_font = Font(name='Calibri', size=10, bold=True, color="FFFFFF")
+        header_fill = xs.solid_fill("64B5F6")
+        header_font = xs.font(name='Calibri', size=10, bold=True, color="FFFFFF")
         
         for col, header in enumerate(headers, 1):
             cell = ws.cell(row=row, column=col, value=header)
             cell.font = header_font
             cell.fill = header_fill
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.alignment = xs.alignment(horizontal='center', vertical='center')
         ws.row_dimensions[row].height = 20
         row += 1
         
         # BOM Materials Data
-        light_fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-        green_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
-        red_fill = PatternFill(start_color="FFCDD2", end_color="FFCDD2", fill_type="solid")
+        light_fill = xs.solid_fill("E3F2FD")
+        green_fill = xs.solid_fill("C8E6C9")
+        red_fill = xs.solid_fill("FFCDD2")
         
         if not bom_materials or len(bom_materials) == 0:
             # No BOM materials - show message
             ws.merge_cells(f'A{row}:F{row}')
             ws[f'A{row}'] = "No BOM materials uploaded yet for this date"
-            ws[f'A{row}'].font = Font(name='Calibri', size=10, italic=True)
-            ws[f'A{row}'].alignment = Alignment(horizontal='center', vertical='center')
-            ws[f'A{row}'].fill = PatternFill(start_color="FFF9C4", end_color="FFF9C4", fill_type="solid")
+            ws[f'A{row}'].font = xs.font(name='Calibri', size=10, italic=True)
+            ws[f'A{row}'].alignment = xs.alignment(horizontal='center', vertical='center')
+            ws[f'A{row}'].fill = xs.solid_fill("FFF9C4")
             row += 1
         
         for idx, material in enumerate(bom_materials, 1):
@@ -622,9 +598,9 @@ def create_bom_materials_sheet(wb, production_data):
             # Set row height for images (80 pixels = ~60 points)
             ws.row_dimensions[row].height = 80
             
-            ws.cell(row=row, column=1, value=idx).alignment = Alignment(horizontal='center', vertical='center')
-            ws.cell(row=row, column=2, value=material_name).alignment = Alignment(horizontal='left', vertical='center')
-            ws.cell(row=row, column=3, value=material_lot).alignment = Alignment(horizontal='left', vertical='center')
+            ws.cell(row=row, column=1, value=idx).alignment = xs.alignment(horizontal='center', vertical='center')
+            ws.cell(row=row, column=2, value=material_name).alignment = xs.alignment(horizontal='left', vertical='center')
+            ws.cell(row=row, column=3, value=material_lot).alignment = xs.alignment(horizontal='left', vertical='center')
             
             # Try to embed actual image in column D (4)
             if image_path:
@@ -647,14 +623,14 @@ def create_bom_materials_sheet(wb, production_data):
                         ws.add_image(img)
                         ws.cell(row=row, column=4, value='').fill = green_fill
                     else:
-                        ws.cell(row=row, column=4, value='✗ Not Found').alignment = Alignment(horizontal='center', vertical='center')
+                        ws.cell(row=row, column=4, value='✗ Not Found').alignment = xs.alignment(horizontal='center', vertical='center')
                         ws.cell(row=row, column=4).fill = red_fill
                 except Exception as e:
                     print(f"ERROR embedding image in Excel for {material_name}: {str(e)}")
-                    ws.cell(row=row, column=4, value='✗ Error').alignment = Alignment(horizontal='center', vertical='center')
+                    ws.cell(row=row, column=4, value='✗ Error').alignment = xs.alignment(horizontal='center', vertical='center')
                     ws.cell(row=row, column=4).fill = red_fill
             else:
-                ws.cell(row=row, column=4, value='✗ No Image').alignment = Alignment(horizontal='center', vertical='center')
+                ws.cell(row=row, column=4, value='✗ No Image').alignment = xs.alignment(horizontal='center', vertical='center')
                 ws.cell(row=row, column=4).fill = red_fill
             
             # Alternate row colors for other columns
@@ -664,32 +640,32 @@ def create_bom_materials_sheet(wb, production_data):
             
             # Font styling
             for col in range(1, 5):
-                ws.cell(row=row, column=col).font = Font(name='Calibri', size=9)
+                ws.cell(row=row, column=col).font = xs.font(name='Calibri', size=9)
             
             row += 1
         
         # Documents Section with file info
         ws.merge_cells(f'A{row}:D{row}')
         ws[f'A{row}'] = "📄 SUPPORTING DOCUMENTS"
-        ws[f'A{row}'].font = Font(name='Calibri', size=11, bold=True, color="FFFFFF")
-        ws[f'A{row}'].fill = PatternFill(start_color="7B1FA2", end_color="7B1FA2", fill_type="solid")
-        ws[f'A{row}'].alignment = Alignment(horizontal='left', vertical='center')
+        ws[f'A{row}'].font = xs.font(name='Calibri', size=11, bold=True, color="FFFFFF")
+        ws[f'A{row}'].fill = xs.solid_fill("7B1FA2")
+        ws[f'A{row}'].alignment = xs.alignment(horizontal='left', vertical='center')
         ws.row_dimensions[row].height = 20
         row += 1
         
         # Document headers
-        ws.cell(row=row, column=1, value='Document Type').font = Font(name='Calibri', size=10, bold=True)
-        ws.cell(row=row, column=1).fill = PatternFill(start_color="E1BEE7", end_color="E1BEE7", fill_type="solid")
-        ws.cell(row=row, column=2, value='Status').font = Font(name='Calibri', size=10, bold=True)
-        ws.cell(row=row, column=2).fill = PatternFill(start_color="E1BEE7", end_color="E1BEE7", fill_type="solid")
+        ws.cell(row=row, column=1, value='Document Type').font = xs.font(name='Calibri', size=10, bold=True)
+        ws.cell(row=row, column=1).fill = xs.solid_fill("E1BEE7")
+        ws.cell(row=row, column=2, value='Status').font = xs.font(name='Calibri', size=10, bold=True)
+        ws.cell(row=row, column=2).fill = xs.solid_fill("E1BEE7")
         ws.merge_cells(f'C{row}:D{row}')
-        ws.cell(row=row, column=3, value='File Name').font = Font(name='Calibri', size=10, bold=True)
-        ws.cell(row=row, column=3).fill = PatternFill(start_color="E1BEE7", end_color="E1BEE7", fill_type="solid")
+        ws.cell(row=row, column=3, value='File Name').font = xs.font(name='Calibri', size=10, bold=True)
+        ws.cell(row=row, column=3).fill = xs.solid_fill("E1BEE7")
         row += 1
         
         # IPQC PDF row
-        ws.cell(row=row, column=1, value='📋 IPQC PDF').font = Font(name='Calibri', size=10)
-        ws.cell(row=row, column=1).alignment = Alignment(horizontal='left', vertical='center')
+        ws.cell(row=row, column=1, value='📋 IPQC PDF').font = xs.font(name='Calibri', size=10)
+        ws.cell(row=row, column=1).alignment = xs.alignment(horizontal='left', vertical='center')
         
         if ipqc_pdf:
             ipqc_filename = os.path.basename(ipqc_pdf)
@@ -701,13 +677,13 @@ def create_bom_materials_sheet(wb, production_data):
             ws.merge_cells(f'C{row}:D{row}')
             ws.cell(row=row, column=3, value='-')
         
-        ws.cell(row=row, column=2).alignment = Alignment(horizontal='center', vertical='center')
-        ws.cell(row=row, column=3).alignment = Alignment(horizontal='left', vertical='center')
+        ws.cell(row=row, column=2).alignment = xs.alignment(horizontal='center', vertical='center')
+        ws.cell(row=row, column=3).alignment = xs.alignment(horizontal='left', vertical='center')
         row += 1
         
         # FTR Document row
-        ws.cell(row=row, column=1, value='� FTR Document').font = Font(name='Calibri', size=10)
-        ws.cell(row=row, column=1).alignment = Alignment(horizontal='left', vertical='center')
+        ws.cell(row=row, column=1, value='� FTR Document').font = xs.font(name='Calibri', size=10)
+        ws.cell(row=row, column=1).alignment = xs.alignment(horizontal='left', vertical='center')
         
         if ftr_document:
             ftr_filename = os.path.basename(ftr_document)
@@ -719,8 +695,8 @@ def create_bom_materials_sheet(wb, production_data):
             ws.merge_cells(f'C{row}:D{row}')
             ws.cell(row=row, column=3, value='-')
         
-        ws.cell(row=row, column=2).alignment = Alignment(horizontal='center', vertical='center')
-        ws.cell(row=row, column=3).alignment = Alignment(horizontal='left', vertical='center')
+        ws.cell(row=row, column=2).alignment = xs.alignment(horizontal='center', vertical='center')
+        ws.cell(row=row, column=3).alignment = xs.alignment(horizontal='left', vertical='center')
         row += 1
         
         # Spacing between records
@@ -733,12 +709,7 @@ def create_bom_materials_sheet(wb, production_data):
     ws.column_dimensions['D'].width = 18   # Image (wider for embedded images)
     
     # Add borders to all cells
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    thin_border = xs.border('thin')
     
     for row_cells in ws.iter_rows(min_row=1, max_row=row-1, min_col=1, max_col=4):
         for cell in row_cells:
@@ -761,46 +732,41 @@ def generate_ipqc_excel(ipqc_data, bom_data, metadata):
     ws.title = "IPQC Report"
     
     # Define styles
-    title_font = Font(name='Calibri', size=14, bold=True)
-    header_font = Font(name='Calibri', size=10, bold=True)
-    header_fill = PatternFill(start_color="D3D3D3", end_color="D3D3D3", fill_type="solid")
+    title_font = xs.font(name='Calibri', size=14, bold=True)
+    header_font = xs.font(name='Calibri', size=10, bold=True)
+    header_fill = xs.solid_fill("D3D3D3")
     
-    label_font = Font(name='Calibri', size=9, bold=True)
-    value_font = Font(name='Calibri', size=9)
+    label_font = xs.font(name='Calibri', size=9, bold=True)
+    value_font = xs.font(name='Calibri', size=9)
     
-    stage_font = Font(name='Calibri', size=9, bold=True)
-    stage_fill = PatternFill(start_color="E8E8E8", end_color="E8E8E8", fill_type="solid")
+    stage_font = xs.font(name='Calibri', size=9, bold=True)
+    stage_fill = xs.solid_fill("E8E8E8")
     
-    checkpoint_font = Font(name='Calibri', size=8)
+    checkpoint_font = xs.font(name='Calibri', size=8)
     
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    thin_border = xs.border('thin')
     
     # Row 1: Company Header (3 columns like PDF)
     ws.merge_cells('A1:B1')
     ws['A1'] = "GAUTAM\nSOLAR"
-    ws['A1'].font = Font(name='Calibri', size=12, bold=True)
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    ws['A1'].font = xs.font(name='Calibri', size=12, bold=True)
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center', wrap_text=True)
     ws['A1'].border = thin_border
     
     ws.merge_cells('C1:E1')
     ws['C1'] = "Gautam Solar Private Limited\nIPQC Check Sheet"
-    ws['C1'].font = Font(name='Calibri', size=12, bold=True)
-    ws['C1'].alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+    ws['C1'].font = xs.font(name='Calibri', size=12, bold=True)
+    ws['C1'].alignment = xs.alignment(horizontal='center', vertical='center', wrap_text=True)
     ws['C1'].border = thin_border
     
     ws['F1'] = "Document No."
     ws['F1'].font = label_font
-    ws['F1'].alignment = Alignment(horizontal='left', vertical='top')
+    ws['F1'].alignment = xs.alignment(horizontal='left', vertical='top')
     ws['F1'].border = thin_border
     
     ws['G1'] = metadata.get('customer_id', 'GSPL/IPQC/IPC/003')
     ws['G1'].font = value_font
-    ws['G1'].alignment = Alignment(horizontal='left', vertical='top')
+    ws['G1'].alignment = xs.alignment(horizontal='left', vertical='top')
     ws['G1'].border = thin_border
     
     ws.row_dimensions[1].height = 30
@@ -832,7 +798,7 @@ def generate_ipqc_excel(ipqc_data, bom_data, metadata):
         cell = ws.cell(row=row, column=col_idx, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+        cell.alignment = xs.alignment(horizontal='center', vertical='center', wrap_text=True)
         cell.border = thin_border
     ws.row_dimensions[row].height = 30
     
@@ -883,7 +849,7 @@ def generate_ipqc_excel(ipqc_data, bom_data, metadata):
                 cell = ws.cell(row=row, column=col)
                 cell.font = checkpoint_font
                 cell.border = thin_border
-                cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
+                cell.alignment = xs.alignment(horizontal='left', vertical='top', wrap_text=True)
             
             row += 1
         
@@ -894,7 +860,7 @@ def generate_ipqc_excel(ipqc_data, bom_data, metadata):
         # Apply stage styling to merged cell
         ws[f'B{start_row}'].font = stage_font
         ws[f'B{start_row}'].fill = stage_fill
-        ws[f'B{start_row}'].alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+        ws[f'B{start_row}'].alignment = xs.alignment(horizontal='left', vertical='center', wrap_text=True)
     
     # Set column widths (matching PDF proportions)
     ws.column_dimensions['A'].width = 8      # Sr.No
@@ -924,23 +890,23 @@ def create_ipqc_metadata_sheet(wb, metadata, bom_data):
     # Title
     ws.merge_cells('A1:F1')
     ws['A1'] = "IPQC INSPECTION REPORT"
-    ws['A1'].font = Font(name='Calibri', size=18, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="1976D2", end_color="1976D2", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=18, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("1976D2")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 35
     
     # Report Metadata Header
     ws.merge_cells('A3:F3')
     ws['A3'] = "REPORT METADATA"
-    ws['A3'].font = Font(name='Calibri', size=14, bold=True, color="FFFFFF")
-    ws['A3'].fill = PatternFill(start_color="0D47A1", end_color="0D47A1", fill_type="solid")
-    ws['A3'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A3'].font = xs.font(name='Calibri', size=14, bold=True, color="FFFFFF")
+    ws['A3'].fill = xs.solid_fill("0D47A1")
+    ws['A3'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[3].height = 25
     
     # Metadata
-    label_fill = PatternFill(start_color="E3F2FD", end_color="E3F2FD", fill_type="solid")
-    label_font = Font(name='Calibri', size=11, bold=True)
-    value_font = Font(name='Calibri', size=11)
+    label_fill = xs.solid_fill("E3F2FD")
+    label_font = xs.font(name='Calibri', size=11, bold=True)
+    value_font = xs.font(name='Calibri', size=11)
     
     metadata_info = [
         ['Date:', metadata.get('date', 'N/A'), 'Shift:', metadata.get('shift', 'N/A')],
@@ -974,15 +940,15 @@ def create_ipqc_metadata_sheet(wb, metadata, bom_data):
     # BOM Header
     ws.merge_cells(f'A{row+1}:F{row+1}')
     ws[f'A{row+1}'] = "BILL OF MATERIALS (BOM)"
-    ws[f'A{row+1}'].font = Font(name='Calibri', size=14, bold=True, color="FFFFFF")
-    ws[f'A{row+1}'].fill = PatternFill(start_color="0D47A1", end_color="0D47A1", fill_type="solid")
-    ws[f'A{row+1}'].alignment = Alignment(horizontal='center', vertical='center')
+    ws[f'A{row+1}'].font = xs.font(name='Calibri', size=14, bold=True, color="FFFFFF")
+    ws[f'A{row+1}'].fill = xs.solid_fill("0D47A1")
+    ws[f'A{row+1}'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[row+1].height = 25
     
     row += 2
     
     # BOM Data
-    green_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+    green_fill = xs.solid_fill("C8E6C9")
     
     bom_items = [
         ['Customer Name:', bom_data.get('customer_name', 'N/A'), 'Module Type:', bom_data.get('module_type', 'N/A')],
@@ -1020,12 +986,7 @@ def create_ipqc_metadata_sheet(wb, metadata, bom_data):
     ws.column_dimensions['F'].width = 18
     
     # Add borders
-    thin_border = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    thin_border = xs.border('thin')
     
     for row_cells in ws.iter_rows(min_row=1, max_row=row, min_col=1, max_col=6):
         for cell in row_cells:
@@ -1038,28 +999,28 @@ def create_ipqc_checkpoints_sheet(wb, ipqc_data):
     # Title
     ws.merge_cells('A1:H1')
     ws['A1'] = "IPQC INSPECTION CHECKPOINTS"
-    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="FF6F00", end_color="FF6F00", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=16, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("FF6F00")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     # Headers
     headers = ['Stage No', 'Stage Name', 'Checkpoint', 'Specification', 'Method', 'Acceptance', 'Sample', 'Monitoring Result']
-    header_fill = PatternFill(start_color="FFA726", end_color="FFA726", fill_type="solid")
-    header_font = Font(name='Calibri', size=11, bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("FFA726")
+    header_font = xs.font(name='Calibri', size=11, bold=True, color="FFFFFF")
     
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=3, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+        cell.alignment = xs.alignment(horizontal='center', vertical='center', wrap_text=True)
     
     ws.row_dimensions[3].height = 30
     
     # Data
-    data_font = Font(name='Calibri', size=10)
-    light_fill = PatternFill(start_color="FFF3E0", end_color="FFF3E0", fill_type="solid")
-    stage_fill = PatternFill(start_color="FFE0B2", end_color="FFE0B2", fill_type="solid")
+    data_font = xs.font(name='Calibri', size=10)
+    light_fill = xs.solid_fill("FFF3E0")
+    stage_fill = xs.solid_fill("FFE0B2")
     
     row = 4
     for stage in ipqc_data:
@@ -1073,8 +1034,8 @@ def create_ipqc_checkpoints_sheet(wb, ipqc_data):
                 ws.cell(row=row, column=1, value=stage_no).fill = stage_fill
                 ws.cell(row=row, column=2, value=stage_name).fill = stage_fill
             else:
-                ws.cell(row=row, column=1, value='').fill = light_fill if row % 2 == 0 else PatternFill()
-                ws.cell(row=row, column=2, value='').fill = light_fill if row % 2 == 0 else PatternFill()
+                ws.cell(row=row, column=1, value='').fill = light_fill if row % 2 == 0 else xs.NO_FILL
+                ws.cell(row=row, column=2, value='').fill = light_fill if row % 2 == 0 else xs.NO_FILL
             
             # Checkpoint data
             ws.cell(row=row, column=3, value=checkpoint.get('checkpoint', ''))
@@ -1088,15 +1049,10 @@ def create_ipqc_checkpoints_sheet(wb, ipqc_data):
             for col in range(1, 9):
                 cell = ws.cell(row=row, column=col)
                 cell.font = data_font
-                cell.alignment = Alignment(horizontal='left', vertical='top', wrap_text=True)
+                cell.alignment = xs.alignment(horizontal='left', vertical='top', wrap_text=True)
                 if row % 2 == 0 and col > 2:
                     cell.fill = light_fill
-                cell.border = Border(
-                    left=Side(style='thin'),
-                    right=Side(style='thin'),
-                    top=Side(style='thin'),
-                    bottom=Side(style='thin')
-                )
+                cell.border = xs.border('thin')
             
             row += 1
     
@@ -1117,27 +1073,27 @@ def create_ipqc_summary_sheet(wb, ipqc_data):
     # Title
     ws.merge_cells('A1:E1')
     ws['A1'] = "STAGE-WISE SUMMARY"
-    ws['A1'].font = Font(name='Calibri', size=16, bold=True, color="FFFFFF")
-    ws['A1'].fill = PatternFill(start_color="4CAF50", end_color="4CAF50", fill_type="solid")
-    ws['A1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A1'].font = xs.font(name='Calibri', size=16, bold=True, color="FFFFFF")
+    ws['A1'].fill = xs.solid_fill("4CAF50")
+    ws['A1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws.row_dimensions[1].height = 30
     
     # Headers
     headers = ['Stage No', 'Stage Name', 'Total Checkpoints', 'Critical Points', 'Status']
-    header_fill = PatternFill(start_color="81C784", end_color="81C784", fill_type="solid")
-    header_font = Font(name='Calibri', size=11, bold=True, color="FFFFFF")
+    header_fill = xs.solid_fill("81C784")
+    header_font = xs.font(name='Calibri', size=11, bold=True, color="FFFFFF")
     
     for col, header in enumerate(headers, 1):
         cell = ws.cell(row=3, column=col, value=header)
         cell.font = header_font
         cell.fill = header_fill
-        cell.alignment = Alignment(horizontal='center', vertical='center')
+        cell.alignment = xs.alignment(horizontal='center', vertical='center')
     
     ws.row_dimensions[3].height = 25
     
     # Data
-    light_fill = PatternFill(start_color="E8F5E9", end_color="E8F5E9", fill_type="solid")
-    ok_fill = PatternFill(start_color="C8E6C9", end_color="C8E6C9", fill_type="solid")
+    light_fill = xs.solid_fill("E8F5E9")
+    ok_fill = xs.solid_fill("C8E6C9")
     
     for idx, stage in enumerate(ipqc_data, 4):
         checkpoints = stage.get('checkpoints', [])
@@ -1151,16 +1107,11 @@ def create_ipqc_summary_sheet(wb, ipqc_data):
         
         for col in range(1, 6):
             cell = ws.cell(row=idx, column=col)
-            cell.font = Font(name='Calibri', size=10)
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.font = xs.font(name='Calibri', size=10)
+            cell.alignment = xs.alignment(horizontal='center', vertical='center')
             if idx % 2 == 0 and col < 5:
                 cell.fill = light_fill
-            cell.border = Border(
-                left=Side(style='thin'),
-                right=Side(style='thin'),
-                top=Side(style='thin'),
-                bottom=Side(style='thin')
-            )
+            cell.border = xs.border('thin')
     
     # Set column widths
     ws.column_dimensions['A'].width = 12
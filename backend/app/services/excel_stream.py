@@ -0,0 +1,164 @@
+"""
+Streaming Excel writer
+
+StreamingWorkbook wraps an openpyxl write-only workbook behind the small part of
+the normal worksheet API the report generators use:
+
+    ws = wb.create_sheet('FTR Report')
+    ws.column_dimensions['B'].width = 24      # before the rows (see below)
+    ws.cell(row=5, column=2, value='Serial')  # styles, named styles, merges as usual
+    ws.merge_cells('A1:I1')
+    ws.row_dimensions[1].height = 28
+    wb.save(buffer)
+
+Cells are WriteOnlyCell objects kept per coordinate until their row is streamed,
+and merges follow the in-memory rules (cells under a merge take no value, the
+merge borders are copied to its edges). Rows more than ROW_WINDOW behind the
+highest row written are appended to the write-only sheet and dropped from memory,
+so a sheet costs the same memory whether it has 50 or 50,000 rows. Only the public
+write-only API is used (append(), WriteOnlyCell, row/column dimensions, merged_cells).
+
+Constraints of the streamed format:
+- rows within ROW_WINDOW of the newest row can still be changed / merged,
+  older rows raise ValueError
+- column widths must be set before the first row is streamed
+- only one sheet is open at a time - create_sheet() / save() finish the previous one
+"""
+
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Border
+from openpyxl.worksheet.cell_range import CellRange
+
+# Rows kept editable behind the highest row written
+ROW_WINDOW = 64
+
+
+class StreamingWorksheet:
+    """Worksheet facade that streams finished rows into a write-only sheet"""
+
+    def __init__(self, workbook, title, window=ROW_WINDOW):
+        self.title = title
+        self._ws = workbook.create_sheet(title)
+        self._cells = {}        # (row, column) -> cell of the rows not streamed yet
+        self._merged = set()    # (row, column) under a merge, except its top-left cell
+        self._window = window
+        self._next_row = 1      # next row to stream
+        self._max_row = 0
+        self._max_col = 0
+        self._cols = None       # column widths as streamed
+        self.closed = False
+
+    # ---------- worksheet API ----------
+
+    @property
+    def column_dimensions(self):
+        return self._ws.column_dimensions
+
+    @property
+    def row_dimensions(self):
+        return self._ws.row_dimensions
+
+    def cell(self, row, column, value=None):
+        if row < self._next_row:
+            raise ValueError(f"{self.title}: row {row} has already been streamed")
+        cell = self._cells.get((row, column))
+        if cell is None:
+            cell = self._cells[row, column] = WriteOnlyCell(self._ws)
+        if value is not None:
+            if (row, column) in self._merged:
+                raise AttributeError(f"{self.title}: cell {row},{column} is merged and read-only")
+            cell.value = value
+        if column > self._max_col:
+            self._max_col = column
+        if row > self._max_row:
+            self._max_row = row
+            if row - self._window > self._next_row:
+                self._flush(row - self._window)
+        return cell
+
+    def merge_cells(self, range_string):
+        cr = CellRange(range_string)
+        if cr.min_row < self._next_row:
+            raise ValueError(f"{self.title}: cannot merge {range_string}, rows already streamed")
+        self._ws.merged_cells.add(cr)
+        self._max_col = max(self._max_col, cr.max_col)
+        self._max_row = max(self._max_row, cr.max_row)
+
+        # Same as Worksheet.merge_cells: the top-left cell takes the bottom/right border
+        # of the bottom-right cell, the other cells are emptied and the edges get the
+        # top-left cell's borders
+        start = self.cell(cr.min_row, cr.min_col)
+        end = self._cells.get((cr.max_row, cr.max_col))
+        if end is not None and end is not start:
+            start.border += Border(right=end.border.right, bottom=end.border.bottom)
+        for row, col in cr.cells:
+            if (row, col) != (cr.min_row, cr.min_col):
+                self._cells[row, col] = WriteOnlyCell(self._ws)
+                self._merged.add((row, col))
+        for name in ('top', 'left', 'right', 'bottom'):
+            side = getattr(start.border, name)
+            if side and side.style is None:
+                continue
+            border = Border(**{name: side})
+            for coord in getattr(cr, name):
+                self._cells[coord].border += border
+
+    # ---------- streaming ----------
+
+    def _flush(self, upto):
+        """Stream rows [next_row, upto) to the write-only sheet"""
+        if self._cols is None:
+            # First streamed row writes the <cols> element
+            self._cols = {key: dim.width for key, dim in self._ws.column_dimensions.items()}
+
+        cells = self._cells
+        merged = self._merged
+        for row in range(self._next_row, upto):
+            values = []
+            for col in range(1, self._max_col + 1):
+                cell = cells.pop((row, col), None)
+                if cell is not None and not cell.has_style and cell.hyperlink is None:
+                    # append() takes plain values without the Cell fallback it needs for objects
+                    cell = cell.value
+                values.append(cell)
+                if merged:
+                    merged.discard((row, col))
+            while values and values[-1] is None:
+                values.pop()
+            self._ws.append(values)
+        self._next_row = max(self._next_row, upto)
+
+    def close(self):
+        """Stream the remaining rows"""
+        if self.closed:
+            return
+        self._flush(self._max_row + 1)
+        widths = {key: dim.width for key, dim in self._ws.column_dimensions.items()}
+        if widths != self._cols:
+            raise ValueError(f"{self.title}: column widths must be set before rows are streamed")
+        self.closed = True
+
+
+class StreamingWorkbook:
+    """Write-only workbook handing out StreamingWorksheet sheets"""
+
+    def __init__(self, window=ROW_WINDOW):
+        self.workbook = Workbook(write_only=True)
+        self._window = window
+        self._current = None
+
+    def create_sheet(self, title):
+        self._close_current()
+        self._current = StreamingWorksheet(self.workbook, title, self._window)
+        return self._current
+
+    def _close_current(self):
+        if self._current is not None:
+            self._current.close()
+            self._current = None
+
+    def save(self, output):
+        """Finish the open sheet and write the workbook to a path or binary file object"""
+        self._close_current()
+        self.workbook.save(output)
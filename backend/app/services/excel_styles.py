@@ -0,0 +1,115 @@
+"""
+Excel Style Registry - shared openpyxl styles for all report generators
+
+Building Font / PatternFill / Border / Alignment objects inside per-cell loops is
+the main CPU cost of the large sheets: every object is validated field by field
+and then hashed again when the workbook interns it.
+
+- font(), solid_fill(), border(), alignment() return one cached instance per
+  distinct set of arguments, so one-off cells can keep their inline styling
+  without constructing anything new.
+- register_style() declares a named style (font + fill + border + alignment +
+  number format) once at import time; apply_style() adds it to a workbook the
+  first time it is used there and afterwards styles a cell with a single
+  assignment.
+
+    register_style('ftr_cell', border=border('thin'), alignment=alignment('center', 'center', True))
+    ...
+    apply_style(ws.cell(row=r, column=c, value=v), 'ftr_cell')
+
+Benchmark: backend/benchmarks/excel_style_bench.py
+"""
+import weakref
+from functools import lru_cache
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment, NamedStyle
+from openpyxl.styles.fonts import DEFAULT_FONT
+
+
+# ==================== CACHED STYLE PARTS ====================
+
+@lru_cache(maxsize=None)
+def font(bold=None, size=None, color=None, italic=None, name=None, underline=None):
+    """Shared Font instance"""
+    return Font(name=name, size=size, bold=bold, italic=italic, color=color, underline=underline)
+
+
+@lru_cache(maxsize=None)
+def solid_fill(color):
+    """Shared solid PatternFill instance"""
+    return PatternFill(start_color=color, end_color=color, fill_type='solid')
+
+
+@lru_cache(maxsize=None)
+def side(style='thin', color=None):
+    return Side(style=style, color=color)
+
+
+@lru_cache(maxsize=None)
+def border(style='thin', color=None):
+    """Shared Border with the same side on all four edges"""
+    s = side(style, color)
+    return Border(left=s, right=s, top=s, bottom=s)
+
+
+@lru_cache(maxsize=None)
+def alignment(horizontal=None, vertical=None, wrap_text=None):
+    """Shared Alignment instance"""
+    return Alignment(horizontal=horizontal, vertical=vertical, wrap_text=wrap_text)
+
+
+NO_FILL = PatternFill()
+THIN_BORDER = border('thin')
+CENTER = alignment('center', 'center')
+CENTER_WRAP = alignment('center', 'center', True)
+LEFT_WRAP = alignment('left', 'center', True)
+
+
+# ==================== NAMED STYLES ====================
+
+# name -> dict(font=, fill=, border=, alignment=, number_format=)
+_STYLE_SPECS = {}
+
+# workbook -> names already added to it
+_registered = weakref.WeakKeyDictionary()
+
+
+def register_style(name, font=None, fill=None, border=None, alignment=None, number_format=None):
+    """Declare a named style (call at import time). Re-registering the same name replaces it."""
+    _STYLE_SPECS[name] = {
+        'font': font,
+        'fill': fill,
+        'border': border,
+        'alignment': alignment,
+        'number_format': number_format
+    }
+    return name
+
+
+def _named_style(name):
+    spec = _STYLE_SPECS[name]
+    # Unset parts fall back to what an unstyled cell has (NamedStyle's own default font is empty)
+    style = NamedStyle(name=name, font=DEFAULT_FONT)
+    for key, value in spec.items():
+        if value is not None:
+            setattr(style, key, value)
+    return style
+
+
+def ensure_style(wb, name):
+    """Add a registered named style to `wb` once"""
+    names = _registered.get(wb)
+    if names is None:
+        names = _registered[wb] = set(wb.named_styles)
+    if name not in names:
+        if name not in _STYLE_SPECS:
+            raise KeyError(f"Unknown Excel style: {name}")
+        wb.add_named_style(_named_style(name))
+        names.add(name)
+    return name
+
+
+def apply_style(cell, name):
+    """Style `cell` with a registered named style"""
+    ensure_style(cell.parent.parent, name)
+    cell.style = name
+    return cell
@@ -1,6 +1,11 @@
 """
 FTR (Field Test Report) PDF Generator
 Uses template PDF and fills it with exact coordinate positioning
+
+Batch rendering (render_ftr_batch) draws all overlays of a chunk on one reportlab
+canvas, so the IV curve image is embedded once per chunk, and stamps the template
+page onto every page as one shared Form XObject. The template is parsed once per
+process and its content stream is never re-parsed per page.
 """
 
 from io import BytesIO
@@ -8,7 +13,35 @@ from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.utils import ImageReader
 from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import ArrayObject, DecodedStreamObject, NameObject, DictionaryObject
 import os
+import time
+import zipfile
+import tempfile
+
+# Pages rendered per worker task
+BATCH_CHUNK_SIZE = 200
+TEMPLATE_XOBJECT = '/FTRTemplate'
+
+# (template path, mtime) -> (content bytes, mediabox, resources) - parsed once per process
+_TEMPLATE_CACHE = {}
+
+
+def _load_template(template_path):
+    """First page of the template PDF: decoded content, mediabox and resources"""
+    key = (os.path.abspath(template_path), os.path.getmtime(template_path))
+    cached = _TEMPLATE_CACHE.get(key)
+    if cached is None:
+        page = PdfReader(template_path).pages[0]
+        contents = page['/Contents'].get_object()
+        if isinstance(contents, ArrayObject):
+            data = b'\n'.join(part.get_object().get_data() for part in contents)
+        else:
+            data = contents.get_data()
+        cached = (data, page.mediabox, page['/Resources'].get_object())
+        _TEMPLATE_CACHE.clear()
+        _TEMPLATE_CACHE[key] = cached
+    return cached
 
 
 class FTRPDFGenerator:
@@ -17,13 +50,10 @@ class FTRPDFGenerator:
     def __init__(self, template_path):
         """Initialize with template PDF path"""
         self.template_path = template_path
-        
-    def create_overlay(self, data):
-        """Create overlay PDF with all the text values at exact positions"""
-        packet = BytesIO()
-        
-        # Create canvas - A4 size (595.27 x 841.89 points)
-        c = canvas.Canvas(packet, pagesize=A4)
+    
+    @staticmethod
+    def draw_overlay_page(c, data):
+        """Draw all the text values (and graph) of one report at exact positions on canvas `c`"""
         width, height = A4
         
         # Set font
@@ -82,10 +112,70 @@ class FTRPDFGenerator:
             except Exception as e:
                 print(f"Error adding graph image: {e}")
         
+    def create_overlay(self, data):
+        """Create overlay PDF with all the text values at exact positions"""
+        packet = BytesIO()
+        
+        # Create canvas - A4 size (595.27 x 841.89 points)
+        c = canvas.Canvas(packet, pagesize=A4)
+        self.draw_overlay_page(c, data)
         c.save()
         packet.seek(0)
         return packet
     
+    def render_pages(self, items, output):
+        """
+        Render one FTR page per data dict in `items` into `output` (path or file object).
+        Overlays share one canvas and the template is stamped as a shared Form XObject.
+        Returns number of pages written.
+        """
+        packet = BytesIO()
+        c = canvas.Canvas(packet, pagesize=A4)
+        for data in items:
+            self.draw_overlay_page(c, data)
+            c.showPage()
+        c.save()
+        packet.seek(0)
+        
+        template_data, mediabox, resources = _load_template(self.template_path)
+        writer = PdfWriter()
+        
+        # Template page as a Form XObject, added once and drawn underneath every overlay
+        form = DecodedStreamObject()
+        form.set_data(template_data)
+        form.update({
+            NameObject('/Type'): NameObject('/XObject'),
+            NameObject('/Subtype'): NameObject('/Form'),
+            NameObject('/BBox'): mediabox,
+            NameObject('/Resources'): resources.clone(writer),
+        })
+        form_ref = writer._add_object(form)
+        
+        stamp = DecodedStreamObject()
+        stamp.set_data(f'q {TEMPLATE_XOBJECT} Do Q\n'.encode('ascii'))
+        stamp_ref = writer._add_object(stamp)
+        
+        count = 0
+        for overlay_page in PdfReader(packet).pages:
+            page = writer.add_page(overlay_page)
+            page_resources = page['/Resources'].get_object()
+            if '/XObject' not in page_resources:
+                page_resources[NameObject('/XObject')] = DictionaryObject()
+            page_resources['/XObject'].get_object()[NameObject(TEMPLATE_XOBJECT)] = form_ref
+            
+            contents = page.raw_get('/Contents')
+            parts = list(contents.get_object()) if isinstance(contents.get_object(), ArrayObject) else [contents]
+            page[NameObject('/Contents')] = ArrayObject([stamp_ref] + parts)
+            page[NameObject('/MediaBox')] = mediabox
+            count += 1
+        
+        if isinstance(output, str):
+            with open(output, 'wb') as f:
+                writer.write(f)
+        else:
+            writer.write(output)
+        return count
+    
     def generate_pdf(self, data):
         """
         Generate final PDF by overlaying data on template
@@ -96,33 +186,92 @@ class FTRPDFGenerator:
         Returns:
             BytesIO object containing the PDF
         """
-        # Create overlay with text and graph
-        overlay_pdf = self.create_overlay(data)
-        
-        # Read template PDF
-        template_reader = PdfReader(self.template_path)
-        overlay_reader = PdfReader(overlay_pdf)
-        
-        # Create writer
-        writer = PdfWriter()
-        
-        # Get first page of template
-        template_page = template_reader.pages[0]
-        
-        # Merge overlay onto template
-        template_page.merge_page(overlay_reader.pages[0])
-        
-        # Add merged page to writer
-        writer.add_page(template_page)
-        
-        # Write to BytesIO
         output = BytesIO()
-        writer.write(output)
+        self.render_pages([data], output)
         output.seek(0)
-        
         return output
 
 
+def _render_chunk(task):
+    """Process pool worker: render one chunk, as one multi-page PDF or one PDF per report"""
+    template_path, items, output_dir, chunk_index, split = task
+    generator = FTRPDFGenerator(template_path)
+    if not split:
+        path = os.path.join(output_dir, f'chunk_{chunk_index:05d}.pdf')
+        generator.render_pages(items, path)
+        return [path]
+    
+    paths = []
+    for offset, data in enumerate(items):
+        path = os.path.join(output_dir, f'{chunk_index:05d}_{offset:05d}.pdf')
+        generator.render_pages([data], path)
+        paths.append(path)
+    return paths
+
+
+def render_ftr_batch(template_path, items, output_path, output='pdf', workers=None, chunk_size=BATCH_CHUNK_SIZE):
+    """
+    Render FTR reports for many serials
+    
+    Args:
+        template_path: Path to template PDF
+        items: List of test data dicts (same shape as generate_pdf), graphImagePath resolved
+        output_path: File to write - a multi-page PDF, or a ZIP with one PDF per serial
+        output: 'pdf' or 'zip'
+        workers: Process pool size (default 1 = render in this process)
+        
+    Returns:
+        Dict with pages, chunks, workers and seconds
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    import multiprocessing
+    from app.services.pdf_merge import merge_pdf_files
+    
+    started = time.time()
+    split = output == 'zip'
+    chunks = [items[i:i + chunk_size] for i in range(0, len(items), chunk_size)]
+    workers = max(1, min(workers or 1, len(chunks)))
+    
+    work_dir = tempfile.mkdtemp(prefix='ftr_batch_')
+    try:
+        tasks = [(template_path, chunk, work_dir, index, split) for index, chunk in enumerate(chunks)]
+        if workers == 1:
+            results = [_render_chunk(task) for task in tasks]
+        else:
+            # spawn: workers must not inherit the server's DB connections / threads
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn')) as pool:
+                results = list(pool.map(_render_chunk, tasks))
+        
+        paths = [path for chunk_paths in results for path in chunk_paths]
+        if split:
+            used_names = set()
+            with zipfile.ZipFile(output_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
+                for data, path in zip(items, paths):
+                    name = f"FTR_Report_{data.get('serialNumber') or 'unknown'}.pdf"
+                    if name in used_names:
+                        name = f"FTR_Report_{data.get('serialNumber') or 'unknown'}_{len(used_names)}.pdf"
+                    used_names.add(name)
+                    zipf.write(path, name)
+        elif len(paths) == 1:
+            os.replace(paths[0], output_path)
+        else:
+            merge_pdf_files(paths, output_path, label='FTR chunk')
+    finally:
+        for name in os.listdir(work_dir):
+            try:
+                os.remove(os.path.join(work_dir, name))
+            except OSError:
+                pass
+        os.rmdir(work_dir)
+    
+    return {
+        'pages': len(items),
+        'chunks': len(chunks),
+        'workers': workers,
+        'seconds': round(time.time() - started, 2)
+    }
+
+
 def create_ftr_report(template_path, test_data, graph_image_path=None):
     """
     Convenience function to create FTR report
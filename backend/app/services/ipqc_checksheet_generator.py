@@ -6,6 +6,7 @@ Generates a filled IPQC checksheet in the original Gautam Solar format.
 
 import os
 import random
+import threading
 from datetime import datetime
 from openpyxl import Workbook
 from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
@@ -118,18 +119,72 @@ def generate_ipqc_checksheet(
     customer_id='GSPL/IPQC/IPC/003',
     checked_by='',
     reviewed_by='',
+    use_template=True,
 ):
     """
     Generate a filled IPQC Check Sheet in the exact reference format.
     Returns the file path of the generated .xlsx file.
+    use_template=False rebuilds the whole sheet instead of patching the cached base workbook.
     """
     if date is None:
         date = datetime.now().strftime('%Y-%m-%d')
 
-    wb = Workbook()
-    ws = wb.active
-    ws.title = 'IPQC'
+    # ── Save ──
+    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'generated_pdfs')
+    os.makedirs(output_dir, exist_ok=True)
+    filepath = os.path.join(output_dir, checksheet_filename(date, shift))
+
+    write_ipqc_checksheet(
+        filepath, date=date, shift=shift, po_number=po_number, cell_manufacturer=cell_manufacturer,
+        cell_efficiency=cell_efficiency, jb_cable_length=jb_cable_length,
+        golden_module_number=golden_module_number, serial_prefix=serial_prefix,
+        serial_start=serial_start, checked_by=checked_by, reviewed_by=reviewed_by,
+        use_template=use_template
+    )
+    return filepath
+
+
+def checksheet_filename(date, shift):
+    """File name for a generated checksheet"""
+    safe_date = date.replace('-', '') if date else datetime.now().strftime('%Y%m%d')
+    return f"IPQC_CheckSheet_{safe_date}_Shift{shift}_{datetime.now().strftime('%H%M%S')}.xlsx"
+
+
+def write_ipqc_checksheet(
+    output,
+    date=None,
+    shift='A',
+    po_number='',
+    cell_manufacturer='Solar Space',
+    cell_efficiency=25.7,
+    jb_cable_length=1200,
+    golden_module_number='GM-2024-001',
+    serial_prefix='GS04875KG302250',
+    serial_start=1,
+    checked_by='',
+    reviewed_by='',
+    use_template=True,
+):
+    """Write a filled checksheet to `output` (file path or writable binary file object)."""
+    if date is None:
+        date = datetime.now().strftime('%Y-%m-%d')
+
+    args = (date, shift, po_number, cell_manufacturer, cell_efficiency, jb_cable_length,
+            golden_module_number, serial_prefix, serial_start, checked_by, reviewed_by)
+
+    if use_template:
+        _TEMPLATE.render(output, args)
+    else:
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'IPQC'
+        _build_sheet(ws, *args)
+        wb.save(output)
+
 
+def _build_sheet(ws, date, shift, po_number, cell_manufacturer, cell_efficiency, jb_cable_length,
+                 golden_module_number, serial_prefix, serial_start, checked_by, reviewed_by):
+    """Write the complete checksheet (layout, styles and values) onto `ws`."""
     # ── Column widths ──
     for col_letter, width in COL_WIDTHS.items():
         ws.column_dimensions[col_letter].width = width
@@ -209,14 +264,90 @@ def generate_ipqc_checksheet(
         for cell in row:
             cell.border = THIN_BORDER
 
-    # ── Save ──
-    output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'generated_pdfs')
-    os.makedirs(output_dir, exist_ok=True)
-    safe_date = date.replace('-', '') if date else datetime.now().strftime('%Y%m%d')
-    filename = f"IPQC_CheckSheet_{safe_date}_Shift{shift}_{datetime.now().strftime('%H%M%S')}.xlsx"
-    filepath = os.path.join(output_dir, filename)
-    wb.save(filepath)
-    return filepath
+
+# ──────────────────────────────────────────────
+# Template mode
+# ──────────────────────────────────────────────
+class _NullCell:
+    """Accepts and ignores style assignments."""
+    __slots__ = ()
+
+    def __setattr__(self, name, value):
+        pass
+
+
+class _NullDimensions(dict):
+    def __missing__(self, key):
+        return _NullCell()
+
+
+class _ValueRecorder:
+    """
+    Stand-in worksheet for _build_sheet that only records cell values.
+    Replaying the layout against it costs a few dict writes per cell instead of
+    creating merges, styles and borders.
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.column_dimensions = _NullDimensions()
+        self.row_dimensions = _NullDimensions()
+
+    def cell(self, row, column, value=None):
+        self.values[(row, column)] = value
+        return _NullCell()
+
+    def merge_cells(self, *args, **kwargs):
+        pass
+
+    def add_image(self, *args, **kwargs):
+        pass
+
+    def iter_rows(self, *args, **kwargs):
+        return iter(())
+
+
+class _ChecksheetTemplate:
+    """
+    Base workbook with the static layout (merges, styles, borders, labels, logo),
+    built once per process. A request records its cell values with _ValueRecorder,
+    patches only the cells that differ from the base, saves and restores them.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wb = None
+
+    def _ensure_base(self):
+        if self.wb is None:
+            wb = Workbook()
+            ws = wb.active
+            ws.title = 'IPQC'
+            _build_sheet(ws, '', 'A', '', '', 0, 0, '', '', 1, '', '')
+            self.wb = wb
+
+    def render(self, output, args):
+        recorder = _ValueRecorder()
+        _build_sheet(recorder, *args)
+
+        with self.lock:
+            self._ensure_base()
+            ws = self.wb['IPQC']
+            patched = []
+            try:
+                for (row, col), value in recorder.values.items():
+                    cell = ws.cell(row=row, column=col)
+                    if cell.value != value:
+                        patched.append((cell, cell.value))
+                        cell.value = value
+                self.wb.save(output)
+            finally:
+                for cell, original in patched:
+                    cell.value = original
+        return len(patched)
+
+
+_TEMPLATE = _ChecksheetTemplate()
 
 
 # ──────────────────────────────────────────────
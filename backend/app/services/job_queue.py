@@ -0,0 +1,343 @@
+"""
+Background Job Queue - heavy report builds run on a local worker pool instead of
+inside the request thread.
+
+Jobs are rows in job_registry (state 'queued' + JSON payload), so no external broker
+is needed and any Waitress process can submit, run or report on them. Workers claim
+a job with a conditional UPDATE, which keeps two processes from running the same job,
+and respect a per-job-type concurrency limit counted across all workers. A running
+job's worker touches updated_at every HEARTBEAT_INTERVAL, so only jobs whose worker
+died stop beating and get re-queued. Jobs that ran inline in a request (no payload)
+cannot be re-run and are marked failed instead. Finished jobs and their output directories are
+removed after JOB_RETENTION_DAYS.
+
+Usage:
+    job_id = JobQueue.submit('pdi_complete_report', {'pdi_number': 'PDI-1', 'company_name': 'Rays Power'})
+    GET /api/jobs/<job_id>            -> state / percent
+    GET /api/jobs/<job_id>/download   -> finished file
+"""
+import os
+import json
+import time
+import shutil
+import threading
+from datetime import datetime, timedelta
+from sqlalchemy import select, update, func, text
+from app.models.database import db
+from app.models.job_record import JobRecord
+from app.services.job_registry import JobRegistry, _worker_name
+
+_table = JobRecord.__table__
+
+POLL_INTERVAL = 2  # seconds between queue polls when idle
+STALE_AFTER = timedelta(minutes=5)  # running job without a heartbeat for this long is re-queued
+MAX_ATTEMPTS = 2
+PRUNE_INTERVAL = 3600  # seconds between two prune runs
+
+# job_type -> {'handler': fn(app, job_id, payload, output_dir) -> file path, 'max_concurrent': n}
+JOB_HANDLERS = {}
+
+_wakeup = threading.Event()
+_workers_started = False
+_last_prune = 0
+
+
+def register_job(job_type, max_concurrent=1):
+    """Decorator registering a background job handler"""
+    def decorator(fn):
+        JOB_HANDLERS[job_type] = {'handler': fn, 'max_concurrent': max_concurrent}
+        return fn
+    return decorator
+
+
+def ensure_job_queue_columns():
+    """Add queue columns to a job_registry table created before the queue existed"""
+    try:
+        with db.engine.connect() as conn:
+            existing = {row[0] for row in conn.execute(text("SHOW COLUMNS FROM job_registry"))}
+            if 'payload' not in existing:
+                conn.execute(text("ALTER TABLE job_registry ADD COLUMN payload TEXT NULL"))
+            if 'attempts' not in existing:
+                conn.execute(text("ALTER TABLE job_registry ADD COLUMN attempts INT DEFAULT 0"))
+            conn.commit()
+    except Exception as e:
+        print(f"[JobQueue] Could not check job_registry columns: {e}")
+
+
+class JobQueue:
+
+    @staticmethod
+    def submit(job_type, payload, ref=None):
+        """Queue a job, returns job_id"""
+        if job_type not in JOB_HANDLERS:
+            raise ValueError(f"Unknown job type: {job_type}")
+        job_id = JobRegistry.create(job_type, ref=ref, payload=payload, message='Queued')
+        _wakeup.set()
+        return job_id
+
+    @staticmethod
+    def cancel(job_id):
+        """Cancel a job that has not started yet"""
+        with db.engine.begin() as conn:
+            result = conn.execute(
+                update(_table)
+                .where(_table.c.job_id == job_id, _table.c.state == 'queued')
+                .values(state='cancelled', message='Cancelled', finished_at=datetime.utcnow(),
+                        updated_at=datetime.utcnow())
+            )
+        return result.rowcount == 1
+
+    @staticmethod
+    def claim_next():
+        """
+        Claim the oldest queued job whose type is below its concurrency limit.
+        Returns (job_id, job_type, payload) or None.
+        """
+        with db.engine.connect() as conn:
+            running = dict(conn.execute(
+                select(_table.c.job_type, func.count())
+                .where(_table.c.state == 'running', _table.c.job_type.in_(list(JOB_HANDLERS)))
+                .group_by(_table.c.job_type)
+            ).fetchall())
+
+            open_types = [
+                job_type for job_type, spec in JOB_HANDLERS.items()
+                if running.get(job_type, 0) < spec['max_concurrent']
+            ]
+            if not open_types:
+                return None
+
+            candidates = conn.execute(
+                select(_table.c.id, _table.c.job_id, _table.c.job_type, _table.c.payload)
+                .where(_table.c.state == 'queued', _table.c.job_type.in_(open_types))
+                .order_by(_table.c.id)
+                .limit(10)
+            ).fetchall()
+
+        for row in candidates:
+            now = datetime.utcnow()
+            with db.engine.begin() as conn:
+                result = conn.execute(
+                    update(_table)
+                    .where(_table.c.id == row.id, _table.c.state == 'queued')
+                    .values(state='running', worker=_worker_name(), started_at=now, updated_at=now,
+                            message='Running', attempts=func.coalesce(_table.c.attempts, 0) + 1)
+                )
+            if result.rowcount != 1:
+                continue
+
+            # Another worker may have claimed the same type at the same moment - back off if over the limit
+            with db.engine.begin() as conn:
+                running_now = conn.execute(
+                    select(func.count()).select_from(_table)
+                    .where(_table.c.state == 'running', _table.c.job_type == row.job_type)
+                ).scalar() or 0
+                if running_now > JOB_HANDLERS[row.job_type]['max_concurrent']:
+                    conn.execute(
+                        update(_table)
+                        .where(_table.c.id == row.id, _table.c.state == 'running')
+                        .values(state='queued', worker=None, started_at=None, message='Queued',
+                                attempts=_table.c.attempts - 1)
+                    )
+                    return None
+
+            payload = json.loads(row.payload) if row.payload else {}
+            return row.job_id, row.job_type, payload
+        return None
+
+    @staticmethod
+    def requeue_stale():
+        """
+        Put jobs back in the queue whose worker died (no heartbeat for STALE_AFTER);
+        inline jobs without a payload are failed, there is nothing to re-run
+        """
+        cutoff = datetime.utcnow() - STALE_AFTER
+        with db.engine.begin() as conn:
+            conn.execute(
+                update(_table)
+                .where(_table.c.state == 'running', _table.c.payload.isnot(None),
+                       _table.c.updated_at < cutoff, func.coalesce(_table.c.attempts, 0) < MAX_ATTEMPTS)
+                .values(state='queued', message='Re-queued after worker timeout', updated_at=datetime.utcnow())
+            )
+            conn.execute(
+                update(_table)
+                .where(_table.c.state == 'running', _table.c.payload.isnot(None),
+                       _table.c.updated_at < cutoff, func.coalesce(_table.c.attempts, 0) >= MAX_ATTEMPTS)
+                .values(state='failed', message='Failed', error='Worker timed out',
+                        finished_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            )
+            conn.execute(
+                update(_table)
+                .where(_table.c.state == 'running', _table.c.payload.is_(None), _table.c.updated_at < cutoff)
+                .values(state='failed', message='Failed', error='Process stopped before the job finished',
+                        finished_at=datetime.utcnow(), updated_at=datetime.utcnow())
+            )
+
+    @staticmethod
+    def prune_expired(app):
+        """Delete finished jobs older than JOB_RETENTION_DAYS together with their output directories"""
+        global _last_prune
+        now = time.monotonic()
+        if _last_prune and now - _last_prune < PRUNE_INTERVAL:
+            return
+        _last_prune = now
+
+        cutoff = datetime.utcnow() - timedelta(days=app.config.get('JOB_RETENTION_DAYS', 7))
+        expired = (_table.c.state.notin_(JobRecord.ACTIVE_STATES), _table.c.finished_at < cutoff)
+        with db.engine.begin() as conn:
+            job_ids = [row.job_id for row in conn.execute(select(_table.c.job_id).where(*expired))]
+            if not job_ids:
+                return
+            conn.execute(_table.delete().where(_table.c.job_id.in_(job_ids)))
+
+        jobs_dir = os.path.join(app.config['PDF_FOLDER'], 'jobs')
+        for job_id in job_ids:
+            shutil.rmtree(os.path.join(jobs_dir, job_id), ignore_errors=True)
+        print(f"[JobQueue] Pruned {len(job_ids)} expired job(s)")
+
+    @staticmethod
+    def run_job(app, job_id, job_type, payload):
+        """Execute a claimed job and record the result"""
+        spec = JOB_HANDLERS[job_type]
+        output_dir = os.path.join(app.config['PDF_FOLDER'], 'jobs', job_id)
+        os.makedirs(output_dir, exist_ok=True)
+        stop = threading.Event()
+        threading.Thread(target=JobRegistry.heartbeat, args=(app, job_id, stop), daemon=True,
+                         name=f'job-heartbeat-{job_id}').start()
+        try:
+            with app.app_context():
+                result_path = spec['handler'](app, job_id, payload, output_dir)
+                db.session.remove()
+            JobRegistry.complete(job_id, result_location=result_path)
+            print(f"[JobQueue] {job_type} {job_id} completed")
+        except Exception as e:
+            print(f"[JobQueue] {job_type} {job_id} failed: {e}")
+            import traceback
+            traceback.print_exc()
+            JobRegistry.fail(job_id, e)
+        finally:
+            stop.set()
+
+
+def _set_job_limits(app):
+    """Apply JOB_CONCURRENCY overrides from config"""
+    for job_type, limit in (app.config.get('JOB_CONCURRENCY') or {}).items():
+        if job_type in JOB_HANDLERS:
+            JOB_HANDLERS[job_type]['max_concurrent'] = int(limit)
+
+
+def start_workers(app, num_workers=2):
+    """Start the local worker threads (once per process)"""
+    global _workers_started
+    if _workers_started or num_workers <= 0:
+        return
+    _workers_started = True
+    _set_job_limits(app)
+
+    def worker_loop(index):
+        # Stagger workers so they don't poll in lockstep
+        time.sleep(5 + index)
+        while True:
+            try:
+                with app.app_context():
+                    if index == 0:
+                        JobQueue.requeue_stale()
+                        JobQueue.prune_expired(app)
+                    claimed = JobQueue.claim_next()
+                if claimed:
+                    JobQueue.run_job(app, *claimed)
+                    continue
+            except Exception as e:
+                print(f"[JobQueue] Worker {index} error: {e}")
+            _wakeup.wait(POLL_INTERVAL)
+            _wakeup.clear()
+
+    for index in range(num_workers):
+        threading.Thread(target=worker_loop, args=(index,), daemon=True, name=f'job-worker-{index}').start()
+    print(f"[JobQueue] Started {num_workers} worker(s): " +
+          ', '.join(f"{t}={s['max_concurrent']}" for t, s in JOB_HANDLERS.items()))
+
+
+# ==================== JOB HANDLERS ====================
+
+@register_job('pdi_complete_report', max_concurrent=1)
+def _pdi_complete_report(app, job_id, payload, output_dir):
+    from app.services.pdi_report_generator import PDIReportGenerator
+    pdi_number = payload.get('pdi_number')
+    company_name = payload.get('company_name')
+    if not pdi_number or not company_name:
+        raise ValueError('pdi_number and company_name are required')
+
+    JobRegistry.update(job_id, message='Merging COC / IPQC / FTR documents...', force=True)
+    path = os.path.join(output_dir, f"Complete_Report_{pdi_number}_{datetime.now().strftime('%Y%m%d')}.pdf")
+    if not PDIReportGenerator().build_complete_report(pdi_number, company_name, path):
+        raise RuntimeError('Failed to generate report - no data found')
+    return path
+
+
+@register_job('consolidated_report', max_concurrent=1)
+def _consolidated_report(app, job_id, payload, output_dir):
+    from app.services.consolidated_report_generator import ConsolidatedReportGenerator
+    company_name = payload.get('company_name')
+    from_date = payload.get('from_date')
+    to_date = payload.get('to_date')
+    if not all([company_name, from_date, to_date]):
+        raise ValueError('company_name, from_date, and to_date are required')
+
+    JobRegistry.update(job_id, message='Building consolidated report...', force=True)
+    pdf_buffer = ConsolidatedReportGenerator().generate_consolidated_report(company_name, from_date, to_date)
+    path = os.path.join(output_dir, f"Consolidated_Report_{company_name}_{from_date}_{to_date}.pdf")
+    with open(path, 'wb') as f:
+        f.write(pdf_buffer.getvalue())
+    return path
+
+
+@register_job('pdi_documentation', max_concurrent=1)
+def _pdi_documentation(app, job_id, payload, output_dir):
+    from app.routes.pdi_documentation_routes import build_pdi_documentation
+    # Reports per-sheet progress on this job itself
+    buffer, filename, counters = build_pdi_documentation(payload, job_id)
+    JobRegistry.update(job_id, counters=counters, force=True)
+    path = os.path.join(output_dir, filename)
+    with open(path, 'wb') as f:
+        f.write(buffer.getvalue())
+    return path
+
+
+@register_job('ipqc_complete', max_concurrent=2)
+def _ipqc_complete(app, job_id, payload, output_dir):
+    from app.routes.ipqc_routes import build_ipqc_complete
+    from app.services.zip_stream import stream_zip
+    JobRegistry.update(job_id, message='Generating IPQC PDF and checksheet...', force=True)
+    entries, filename = build_ipqc_complete(payload)
+    path = os.path.join(output_dir, filename)
+    with open(path, 'wb') as f:
+        for chunk in stream_zip(entries):
+            f.write(chunk)
+    return path
+
+
+@register_job('ftr_merged_report', max_concurrent=1)
+def _ftr_merged_report(app, job_id, payload, output_dir):
+    from app.routes.coc_routes import build_ftr_merged_report
+    JobRegistry.update(job_id, message='Merging FTR reports...', force=True)
+    buffer, filename = build_ftr_merged_report(payload)
+    path = os.path.join(output_dir, filename)
+    with open(path, 'wb') as f:
+        f.write(buffer.getvalue())
+    return path
+
+
+@register_job('ftr_batch_render', max_concurrent=1)
+def _ftr_batch_render(app, job_id, payload, output_dir):
+    from app.routes.ftr_routes import _ftr_template_path, _render_ftr_batch_file
+    reports = payload.get('reports') or []
+    output = (payload.get('output') or 'pdf').lower()
+    if not reports:
+        raise ValueError('reports are required')
+    if output not in ('pdf', 'zip'):
+        raise ValueError("output must be 'pdf' or 'zip'")
+
+    JobRegistry.update(job_id, total=len(reports), message=f'Rendering {len(reports)} FTR reports...', force=True)
+    path = os.path.join(output_dir, f"FTR_Reports_{len(reports)}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{output}")
+    return _render_ftr_batch_file(_ftr_template_path(), reports, output, payload.get('workers'), output_path=path)
@@ -0,0 +1,230 @@
+"""
+Job Registry Service - records state, progress, counters and results of long-running
+operations in the job_registry table.
+
+Writes go through their own short transactions on db.engine (not db.session), so
+progress is visible to every Waitress process / host immediately and never commits
+or rolls back the caller's own work. Running jobs touch updated_at every
+HEARTBEAT_INTERVAL; the job queue fails (or re-queues) running jobs that stop beating.
+"""
+import os
+import json
+import uuid
+import time
+import socket
+import threading
+from datetime import datetime
+from flask import current_app
+from sqlalchemy import select, update, insert
+from sqlalchemy.exc import IntegrityError
+from app.models.database import db
+from app.models.job_record import JobRecord
+
+# Minimum seconds between two progress writes for the same job (state changes are always written)
+PROGRESS_WRITE_INTERVAL = 1.0
+HEARTBEAT_INTERVAL = 60  # seconds between updated_at writes of a running job
+
+_table = JobRecord.__table__
+_last_write = {}
+
+
+class JobIdInUse(Exception):
+    """A client supplied job_id that another job already has"""
+
+
+def _worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _percent(current, total):
+    if not total:
+        return 0
+    return max(0, min(100, int((current / total) * 100)))
+
+
+class JobRegistry:
+
+    @staticmethod
+    def create(job_type, ref=None, total=0, message='Queued', job_id=None, state='queued', payload=None):
+        """
+        Register a new job and return its job_id. A client supplied job_id must be
+        a UUID (ValueError otherwise) that no other job uses (JobIdInUse). Jobs created
+        'running' without a payload run inline in this process and get a heartbeat
+        until they complete or fail.
+        """
+        job_id = str(uuid.UUID(str(job_id))) if job_id else str(uuid.uuid4())
+        now = datetime.utcnow()
+        values = {
+            'job_id': job_id,
+            'job_type': job_type,
+            'ref': str(ref) if ref is not None else None,
+            'state': state,
+            'percent': 0,
+            'current': 0,
+            'total': total or 0,
+            'message': message,
+            'payload': json.dumps(payload, default=str) if payload is not None else None,
+            'attempts': 0,
+            'created_at': now,
+            'updated_at': now
+        }
+        if state == 'running':
+            values['started_at'] = now
+            values['worker'] = _worker_name()
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(insert(_table).values(**values))
+        except IntegrityError:
+            raise JobIdInUse(f"job_id {job_id} is already in use")
+        if state == 'running' and payload is None:
+            threading.Thread(target=JobRegistry.heartbeat, args=(current_app._get_current_object(), job_id),
+                             daemon=True, name=f'job-heartbeat-{job_id}').start()
+        return job_id
+
+    @staticmethod
+    def heartbeat(app, job_id, stop=None):
+        """Touch updated_at of a running job until `stop` is set or the job leaves 'running'"""
+        stop = stop or threading.Event()
+        while not stop.wait(HEARTBEAT_INTERVAL):
+            try:
+                with app.app_context(), db.engine.begin() as conn:
+                    result = conn.execute(
+                        update(_table)
+                        .where(_table.c.job_id == job_id, _table.c.state == 'running')
+                        .values(updated_at=datetime.utcnow())
+                    )
+                if not result.rowcount:
+                    return
+            except Exception as e:
+                print(f"[JobRegistry] Heartbeat for {job_id} failed: {e}")
+
+    @staticmethod
+    def start(job_id, total=None, message='Running'):
+        """Mark a queued job as running on this worker"""
+        values = {
+            'state': 'running',
+            'started_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow(),
+            'worker': _worker_name(),
+            'message': message
+        }
+        if total is not None:
+            values['total'] = total
+        JobRegistry._write(job_id, values)
+
+    @staticmethod
+    def update(job_id, current=None, total=None, message=None, counters=None, force=False):
+        """
+        Report progress. Writes are throttled to one per PROGRESS_WRITE_INTERVAL
+        per job unless force=True; returns True when the row was written.
+        """
+        if not job_id:
+            return False
+        now = time.monotonic()
+        if not force and now - _last_write.get(job_id, 0) < PROGRESS_WRITE_INTERVAL:
+            return False
+
+        values = {'updated_at': datetime.utcnow()}
+        if current is not None:
+            values['current'] = current
+        if total is not None:
+            values['total'] = total
+        if current is not None and total is not None:
+            values['percent'] = _percent(current, total)
+        elif current is not None:
+            row = JobRegistry._get_row(job_id)
+            if row is not None:
+                values['percent'] = _percent(current, row.total)
+        if message is not None:
+            values['message'] = message[:500]
+        if counters is not None:
+            values['counters'] = json.dumps(counters, default=str)
+
+        JobRegistry._write(job_id, values)
+        _last_write[job_id] = now
+        return True
+
+    @staticmethod
+    def complete(job_id, result_location=None, counters=None, message='Complete!'):
+        """Mark a job completed (100%)"""
+        if not job_id:
+            return
+        row = JobRegistry._get_row(job_id)
+        values = {
+            'state': 'completed',
+            'percent': 100,
+            'message': message,
+            'finished_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        }
+        if row is not None and row.total:
+            values['current'] = row.total
+        if result_location is not None:
+            values['result_location'] = result_location
+        if counters is not None:
+            values['counters'] = json.dumps(counters, default=str)
+        JobRegistry._write(job_id, values)
+        _last_write.pop(job_id, None)
+
+    @staticmethod
+    def fail(job_id, error, message='Failed'):
+        """Mark a job failed with the error text"""
+        if not job_id:
+            return
+        JobRegistry._write(job_id, {
+            'state': 'failed',
+            'message': message,
+            'error': str(error)[:5000],
+            'finished_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        })
+        _last_write.pop(job_id, None)
+
+    @staticmethod
+    def get(job_id):
+        """Job as dict, or None"""
+        row = JobRegistry._get_row(job_id)
+        return JobRecord(**dict(row._mapping)).to_dict() if row is not None else None
+
+    @staticmethod
+    def find_latest(job_type, ref):
+        """Most recent job of a type for a reference (e.g. upload for an order id)"""
+        with db.engine.connect() as conn:
+            row = conn.execute(
+                select(_table)
+                .where(_table.c.job_type == job_type, _table.c.ref == str(ref))
+                .order_by(_table.c.id.desc())
+                .limit(1)
+            ).fetchone()
+        return JobRecord(**dict(row._mapping)).to_dict() if row is not None else None
+
+    @staticmethod
+    def list_jobs(job_type=None, ref=None, state=None, active_only=False, limit=50):
+        """Recent jobs, newest first"""
+        query = select(_table)
+        if job_type:
+            query = query.where(_table.c.job_type == job_type)
+        if ref is not None:
+            query = query.where(_table.c.ref == str(ref))
+        if state:
+            query = query.where(_table.c.state == state)
+        if active_only:
+            query = query.where(_table.c.state.in_(JobRecord.ACTIVE_STATES))
+        query = query.order_by(_table.c.id.desc()).limit(limit)
+        with db.engine.connect() as conn:
+            rows = conn.execute(query).fetchall()
+        return [JobRecord(**dict(row._mapping)).to_dict() for row in rows]
+
+    @staticmethod
+    def _get_row(job_id):
+        with db.engine.connect() as conn:
+            return conn.execute(select(_table).where(_table.c.job_id == job_id)).fetchone()
+
+    @staticmethod
+    def _write(job_id, values):
+        try:
+            with db.engine.begin() as conn:
+                conn.execute(update(_table).where(_table.c.job_id == job_id).values(**values))
+        except Exception as e:
+            # Progress reporting must never break the job itself
+            print(f"[JobRegistry] Could not update job {job_id}: {e}")
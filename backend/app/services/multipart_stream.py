@@ -0,0 +1,71 @@
+"""
+Streaming multipart/form-data reader
+
+request.files parses the whole body before the view runs and holds every part in
+a spooled temp file. read_multipart walks the raw request stream instead and hands
+each file part to a sink chunk by chunk, so a bulk upload is written to its final
+place on disk while it arrives and only one chunk is in memory at a time.
+"""
+from werkzeug.sansio.multipart import MultipartDecoder, Field, File, Data, Epilogue, NeedData
+
+CHUNK_SIZE = 64 * 1024
+MAX_FIELD_SIZE = 2 * 1024 * 1024  # plain form fields (metadata) are kept in memory
+
+
+def read_multipart(stream, boundary, on_field, open_file, chunk_size=CHUNK_SIZE):
+    """
+    Read a multipart body from `stream`.
+
+    on_field(name, value)          called for every plain field (value is str)
+    open_file(name, filename)      called when a file part starts, returns a sink
+                                   with write(bytes) and close(); close() is
+                                   called when the part is complete, close(complete=False)
+                                   when the body ends or reading fails inside the part
+    Returns the number of file parts read.
+    """
+    decoder = MultipartDecoder(boundary.encode('latin-1'), max_form_memory_size=MAX_FIELD_SIZE)
+    current = None  # ('field', name, [bytes]) or ('file', sink)
+    files = 0
+    finished = False
+
+    try:
+        while not finished:
+            chunk = stream.read(chunk_size)
+            decoder.receive_data(chunk or None)
+
+            event = decoder.next_event()
+            while not isinstance(event, NeedData):
+                if isinstance(event, Field):
+                    current = ('field', event.name, [])
+                elif isinstance(event, File):
+                    current = ('file', open_file(event.name, event.filename))
+                    files += 1
+                elif isinstance(event, Data):
+                    if current[0] == 'field':
+                        current[2].append(event.data)
+                        if not event.more_data:
+                            on_field(current[1], b''.join(current[2]).decode('utf-8'))
+                            current = None
+                    else:
+                        if event.data:
+                            current[1].write(event.data)
+                        if not event.more_data:
+                            sink, current = current[1], None
+                            sink.close()
+                elif isinstance(event, Epilogue):
+                    finished = True
+                    break
+                event = decoder.next_event()
+
+            if not chunk:
+                break
+    except BaseException:
+        # Client disconnect / bad body / full disk inside a file part
+        if current is not None and current[0] == 'file':
+            current[1].close(complete=False)
+        raise
+
+    if current is not None and current[0] == 'file':
+        # Body ended inside a file part - let the sink clean up
+        current[1].close(complete=False)
+    return files
@@ -5,10 +5,10 @@ from reportlab.lib.pagesizes import A4, landscape
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from datetime import datetime
 import os
+from app.services.pdf_styles import stylesheet, paragraph_style
 
 
 class IPQCPDFGenerator:
@@ -16,30 +16,30 @@ class IPQCPDFGenerator:
     
     def __init__(self, output_folder):
         self.output_folder = output_folder
-        self.styles = getSampleStyleSheet()
+        self.styles = stylesheet()
         self._setup_custom_styles()
     
     def _setup_custom_styles(self):
-        """Setup custom paragraph styles"""
-        self.header_style = ParagraphStyle(
+        """Setup custom paragraph styles (shared, built once per process)"""
+        self.header_style = paragraph_style(
             'CustomHeader',
-            parent=self.styles['Heading1'],
+            parent='Heading1',
             fontSize=16,
             textColor=colors.HexColor('#1a237e'),
             spaceAfter=10,
             alignment=TA_CENTER
         )
         
-        self.subheader_style = ParagraphStyle(
+        self.subheader_style = paragraph_style(
             'CustomSubHeader',
-            parent=self.styles['Normal'],
+            parent='Normal',
             fontSize=10,
             alignment=TA_CENTER
         )
         
-        self.cell_style = ParagraphStyle(
+        self.cell_style = paragraph_style(
             'CellStyle',
-            parent=self.styles['Normal'],
+            parent='Normal',
             fontSize=8,
             leading=10
         )
@@ -56,14 +56,21 @@ class IPQCPDFGenerator:
         Returns:
             str: Path to generated PDF file
         """
-        # Generate filename
+        filepath = os.path.join(self.output_folder, self.pdf_filename(metadata))
+        self.write_ipqc_pdf(ipqc_data, bom_data, metadata, filepath)
+        return filepath
+    
+    @staticmethod
+    def pdf_filename(metadata):
+        """File name for an IPQC PDF"""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"IPQC_{metadata.get('customer_name', 'Report')}_{timestamp}.pdf"
-        filepath = os.path.join(self.output_folder, filename)
-        
+        return f"IPQC_{metadata.get('customer_name', 'Report')}_{timestamp}.pdf"
+    
+    def write_ipqc_pdf(self, ipqc_data, bom_data, metadata, output):
+        """Build the IPQC PDF into `output` (file path or writable file object)"""
         # Create PDF document
         doc = SimpleDocTemplate(
-            filepath,
+            output,
             pagesize=landscape(A4),
             rightMargin=10*mm,
             leftMargin=10*mm,
@@ -83,8 +90,6 @@ class IPQCPDFGenerator:
         
         # Build PDF with automatic page breaks
         doc.build(story)
-        
-        return filepath
     
     def _create_header(self, metadata):
         """Create document header"""
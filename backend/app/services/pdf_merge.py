@@ -0,0 +1,161 @@
+"""
+PDF Merge Pipeline - disk-backed merging for large reports
+
+- AssetIndex lists each directory once and answers "does this file exist" /
+  size / mtime from that listing, instead of one os.path.exists probe per
+  candidate path.
+- SectionCache stores merged sections (all COC PDFs, all IPQC PDFs, ...) on disk,
+  keyed by a fingerprint of the input files (path, size, mtime). An unchanged
+  section is reused as-is on the next download.
+- merge_pdf_files writes straight to a file. Inputs are opened by path, so PyPDF2
+  reads them from disk lazily instead of copying every file into memory.
+"""
+import os
+import time
+import hashlib
+import tempfile
+from PyPDF2 import PdfMerger
+
+# Cached sections not used for this long are removed
+SECTION_CACHE_MAX_AGE = 14 * 24 * 3600
+# Minimum seconds between two prune runs
+SECTION_CACHE_PRUNE_INTERVAL = 3600
+
+
+class AssetIndex:
+    """Directory listings cached per report build: path -> (size, mtime_ns)"""
+
+    def __init__(self):
+        self._dirs = {}
+
+    def _listing(self, directory):
+        listing = self._dirs.get(directory)
+        if listing is None:
+            listing = {}
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        try:
+                            if entry.is_file():
+                                stat = entry.stat()
+                                listing[entry.name] = (stat.st_size, stat.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError:
+                pass
+            self._dirs[directory] = listing
+        return listing
+
+    def stat(self, path):
+        """(size, mtime_ns) of an existing file, else None"""
+        path = os.path.normpath(path)
+        return self._listing(os.path.dirname(path)).get(os.path.basename(path))
+
+    def exists(self, path):
+        return self.stat(path) is not None
+
+    def resolve(self, candidates):
+        """First candidate path that exists (normalized), else None"""
+        for path in candidates:
+            if path and self.exists(path):
+                return os.path.normpath(path)
+        return None
+
+
+def fingerprint(section, paths, index):
+    """Cache key for a merged section built from `paths` in this order"""
+    digest = hashlib.sha1(section.encode('utf-8'))
+    for path in paths:
+        size, mtime = index.stat(path) or (0, 0)
+        digest.update(f"|{path}|{size}|{mtime}".encode('utf-8'))
+    return digest.hexdigest()
+
+
+def merge_pdf_files(paths, output_path, label='PDF'):
+    """
+    Merge PDF files into `output_path`. Unreadable files are skipped.
+    Returns the number of files added.
+    """
+    merger = PdfMerger()
+    count = 0
+    try:
+        for path in paths:
+            try:
+                merger.append(path)
+                count += 1
+            except Exception as e:
+                print(f"✗ Error adding {label} {path}: {e}")
+        if count:
+            with open(output_path, 'wb') as f:
+                merger.write(f)
+    finally:
+        merger.close()
+    return count
+
+
+class SectionCache:
+    """Merged report sections on disk, keyed by input fingerprint"""
+
+    _last_prune = 0
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, section, key):
+        return os.path.join(self.cache_dir, f"{section}_{key}.pdf")
+
+    def build(self, section, paths, index, label='PDF'):
+        """
+        Merged PDF for `paths`, from cache when the inputs are unchanged.
+        Returns (path, files_added, temporary) - path is None when nothing could be
+        merged, temporary means the caller should delete the file after use.
+        """
+        if not paths:
+            return None, 0, False
+
+        key = fingerprint(section, paths, index)
+        cached = self._path(section, key)
+        if os.path.exists(cached):
+            try:
+                os.utime(cached)
+            except OSError:
+                pass
+            print(f"Using cached {section} section ({len(paths)} files)")
+            self._prune()
+            return cached, len(paths), False
+
+        # Merge into a temp file in the cache folder, then move into place atomically
+        fd, tmp_path = tempfile.mkstemp(suffix='.pdf', dir=self.cache_dir)
+        os.close(fd)
+        try:
+            count = merge_pdf_files(paths, tmp_path, label=label)
+            if not count:
+                os.remove(tmp_path)
+                return None, 0, False
+            if count == len(paths):
+                os.replace(tmp_path, cached)
+                self._prune()
+                return cached, count, False
+            # Some inputs failed - don't cache a partial section under the full key
+            return tmp_path, count, True
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+    def _prune(self):
+        now = time.time()
+        if now - SectionCache._last_prune < SECTION_CACHE_PRUNE_INTERVAL:
+            return
+        SectionCache._last_prune = now
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file() and now - entry.stat().st_mtime > SECTION_CACHE_MAX_AGE:
+                            os.remove(entry.path)
+                    except OSError:
+                        continue
+        except OSError:
+            pass
@@ -0,0 +1,77 @@
+"""
+PDF Style Registry - shared ReportLab styles and images for all PDF generators
+
+Every generator used to start with getSampleStyleSheet(), a handful of
+ParagraphStyle(...) definitions and a fresh decode of its logo. For the small
+one- or two-page reports that fixed setup is most of the render time.
+
+- stylesheet() returns one process-wide sample stylesheet; stylesheet(name, build)
+  returns a named copy extended once by build(sheet) (generators that add their
+  own styles to self.styles).
+- paragraph_style() returns one cached ParagraphStyle per distinct definition.
+- image() returns a platypus Image backed by a cached, already decoded ImageReader.
+
+Cached styles are shared between requests and threads - treat them as read-only
+(define a new paragraph_style() instead of changing attributes on one).
+
+Benchmark: backend/benchmarks/pdf_style_bench.py
+"""
+import os
+import threading
+from functools import lru_cache
+
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.utils import ImageReader
+from reportlab.platypus import Image
+
+_lock = threading.Lock()
+_sheets = {}
+
+
+def stylesheet(name='sample', build=None):
+    """Shared StyleSheet1 with the ReportLab sample styles (+ build(sheet), run once per name)"""
+    sheet = _sheets.get(name)
+    if sheet is None:
+        with _lock:
+            sheet = _sheets.get(name)
+            if sheet is None:
+                sheet = getSampleStyleSheet()
+                if build is not None:
+                    build(sheet)
+                _sheets[name] = sheet
+    return sheet
+
+
+@lru_cache(maxsize=None)
+def paragraph_style(name, parent='Normal', **attrs):
+    """Shared ParagraphStyle; parent is a sample style name or a ParagraphStyle"""
+    if isinstance(parent, str):
+        parent = stylesheet()[parent]
+    return ParagraphStyle(name, parent=parent, **attrs)
+
+
+@lru_cache(maxsize=32)
+def _image_reader(path, mtime):
+    return ImageReader(path)
+
+
+def image_reader(path):
+    """Decoded image for path (reloaded when the file changes); None if it does not exist"""
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        return None
+    reader = _image_reader(os.path.abspath(path), mtime)
+    # Decode once - drawImage() reuses the pixel data on every later report
+    reader.getRGBData()
+    return reader
+
+
+def image(path, width=None, height=None, **kwargs):
+    """platypus Image flowable drawing the cached decode of path; None if it does not exist"""
+    reader = image_reader(path)
+    if reader is None:
+        return None
+    flowable = Image(path, width=width, height=height, **kwargs)
+    flowable._img = reader
+    return flowable
@@ -6,24 +6,43 @@ from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.enums import TA_CENTER, TA_LEFT
 from io import BytesIO
 from datetime import datetime
 from sqlalchemy import text
 from app.models.database import db
 import os
-from PyPDF2 import PdfMerger, PdfReader
 import tempfile
+from app.services.pdf_merge import AssetIndex, SectionCache, merge_pdf_files
+from app.services.pdf_styles import stylesheet, paragraph_style
 
 
 class PDIReportGenerator:
     def __init__(self):
-        self.styles = getSampleStyleSheet()
+        self.styles = stylesheet()
         self.upload_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'uploads')
+        self.section_cache_folder = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), 'generated_pdfs', 'report_sections')
         
     def generate_complete_report(self, pdi_number, company_name):
-        """Generate complete PDI report with all documents"""
+        """Generate complete PDI report with all documents, returned as BytesIO"""
+        fd, tmp_path = tempfile.mkstemp(suffix='.pdf')
+        os.close(fd)
+        try:
+            if not self.build_complete_report(pdi_number, company_name, tmp_path):
+                return None
+            with open(tmp_path, 'rb') as f:
+                return BytesIO(f.read())
+        finally:
+            os.remove(tmp_path)
+
+    def build_complete_report(self, pdi_number, company_name, output_path):
+        """
+        Generate complete PDI report with all documents into `output_path`.
+        COC / IPQC / FTR sections are merged on disk and cached by input fingerprint,
+        so only the summary is rebuilt when the documents haven't changed.
+        Returns True on success.
+        """
+        temp_files = []
         try:
             print(f"Starting report generation for {pdi_number} - {company_name}")
             
@@ -32,72 +51,70 @@ class PDIReportGenerator:
             
             if not production_records:
                 print("No production records found!")
-                return None
+                return False
             
             print(f"Found {len(production_records)} production records")
             
-            # Create PDF merger for combining all documents
-            merger = PdfMerger()
+            index = AssetIndex()
+            cache = SectionCache(self.section_cache_folder)
+            section_files = []
             pages_added = 0
             
             # Step 2: Generate cover page and production summary
             summary_pdf = self._generate_summary_page(pdi_number, company_name)
             if summary_pdf:
+                fd, summary_path = tempfile.mkstemp(suffix='.pdf')
+                with os.fdopen(fd, 'wb') as f:
+                    f.write(summary_pdf.getvalue())
+                temp_files.append(summary_path)
+                section_files.append(summary_path)
+                pages_added += 1
+                print("Added summary page")
+            
+            # Steps 3-5: COC documents, IPQC PDFs, FTR documents
+            sections = [
+                ('coc', 'COC', self._collect_coc_documents),
+                ('ipqc', 'IPQC', self._collect_ipqc_documents),
+                ('ftr', 'FTR', self._collect_ftr_documents),
+            ]
+            for section, label, collect in sections:
                 try:
-                    merger.append(summary_pdf)
-                    pages_added += 1
-                    print("Added summary page")
+                    paths = collect(index, production_records)
+                    section_path, count, temporary = cache.build(section, paths, index, label=label)
+                    if temporary:
+                        temp_files.append(section_path)
+                    if section_path:
+                        section_files.append(section_path)
+                        pages_added += count
+                        print(f"Added {count} {label} documents")
                 except Exception as e:
-                    print(f"Error adding summary page: {e}")
-            
-            # Step 3: Add COC documents
-            try:
-                coc_count = self._add_coc_documents(merger, production_records)
-                if coc_count > 0:
-                    pages_added += coc_count
-                    print(f"Added {coc_count} COC documents")
-            except Exception as e:
-                print(f"Error adding COC documents: {e}")
-            
-            # Step 4: Add IPQC PDFs
-            try:
-                ipqc_count = self._add_ipqc_documents(merger, production_records)
-                if ipqc_count > 0:
-                    pages_added += ipqc_count
-                    print(f"Added {ipqc_count} IPQC documents")
-            except Exception as e:
-                print(f"Error adding IPQC documents: {e}")
-            
-            # Step 5: Add FTR documents
-            try:
-                ftr_count = self._add_ftr_documents(merger, production_records)
-                if ftr_count > 0:
-                    pages_added += ftr_count
-                    print(f"Added {ftr_count} FTR documents")
-            except Exception as e:
-                print(f"Error adding FTR documents: {e}")
+                    print(f"Error adding {label} documents: {e}")
             
             # Check if we have any pages to merge
             if pages_added == 0:
                 print("ERROR: No pages added to report!")
-                return None
+                return False
             
             print(f"Total pages added: {pages_added}")
             
             # Create final PDF
-            output_buffer = BytesIO()
-            merger.write(output_buffer)
-            merger.close()
+            if not merge_pdf_files(section_files, output_path, label='section'):
+                return False
             
-            output_buffer.seek(0)
             print("Report generation successful")
-            return output_buffer
+            return True
             
         except Exception as e:
             print(f"Error generating complete report: {str(e)}")
             import traceback
             traceback.print_exc()
-            return None
+            return False
+        finally:
+            for path in temp_files:
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
     
     def _generate_summary_page(self, pdi_number, company_name):
         """Generate cover page with PDI summary"""
@@ -110,9 +127,9 @@ class PDIReportGenerator:
             story = []
             
             # Title
-            title_style = ParagraphStyle(
+            title_style = paragraph_style(
                 'Title',
-                parent=self.styles['Heading1'],
+                parent='Heading1',
                 fontSize=24,
                 textColor=colors.HexColor('#1976d2'),
                 spaceAfter=20,
@@ -125,9 +142,9 @@ class PDIReportGenerator:
             story.append(Spacer(1, 20*mm))
             
             # PDI Information
-            info_style = ParagraphStyle(
+            info_style = paragraph_style(
                 'Info',
-                parent=self.styles['Normal'],
+                parent='Normal',
                 fontSize=14,
                 alignment=TA_CENTER,
                 spaceAfter=10
@@ -189,9 +206,9 @@ class PDIReportGenerator:
                 story.append(Spacer(1, 20*mm))
                 
                 # Document Index
-                index_style = ParagraphStyle(
+                index_style = paragraph_style(
                     'Index',
-                    parent=self.styles['Normal'],
+                    parent='Normal',
                     fontSize=12,
                     alignment=TA_LEFT,
                     spaceAfter=6
@@ -310,9 +327,9 @@ class PDIReportGenerator:
             print(f"Error getting production records: {str(e)}")
             return []
     
-    def _add_coc_documents(self, merger, production_records):
-        """Add COC documents from BOM materials"""
-        count = 0
+    def _collect_coc_documents(self, index, production_records):
+        """COC document paths from BOM materials (unique, in BOM order)"""
+        paths = []
         try:
             from app.models.database import BomMaterial
             
@@ -321,7 +338,7 @@ class PDIReportGenerator:
             
             if not record_ids:
                 print("No production records to get COC documents from")
-                return 0
+                return paths
             
             # Get all BOM materials for these records
             bom_materials = BomMaterial.query.filter(
@@ -335,109 +352,63 @@ class PDIReportGenerator:
             coc_paths_added = set()
             
             for bom in bom_materials:
-                print(f"Material: {bom.material_name}, Invoice: {bom.lot_number}, Image: '{bom.image_path}'")
+                if not bom.image_path:
+                    continue
                 
-                if bom.image_path:
-                    # Try multiple path formats
-                    possible_paths = [
-                        os.path.join(self.upload_folder, bom.image_path),  # Direct join
-                        os.path.join(self.upload_folder, 'bom_materials', bom.image_path.split('/')[-1]),  # Just filename
-                        bom.image_path if os.path.isabs(bom.image_path) else None  # Absolute path
-                    ]
-                    
-                    pdf_found = False
-                    for full_path in possible_paths:
-                        if full_path:
-                            full_path = os.path.normpath(full_path)
-                            
-                            if os.path.exists(full_path) and full_path not in coc_paths_added:
-                                try:
-                                    merger.append(full_path)
-                                    coc_paths_added.add(full_path)
-                                    count += 1
-                                    print(f"✓ Added COC: {bom.material_name} - {full_path}")
-                                    pdf_found = True
-                                    break
-                                except Exception as e:
-                                    print(f"✗ Error adding COC {full_path}: {e}")
-                    
-                    if not pdf_found:
-                        print(f"✗ COC PDF not found for {bom.material_name}. Tried:")
-                        for p in possible_paths:
-                            if p:
-                                print(f"  - {p} (exists: {os.path.exists(p)})")
+                # Try multiple path formats
+                possible_paths = [
+                    os.path.join(self.upload_folder, bom.image_path),  # Direct join
+                    os.path.join(self.upload_folder, 'bom_materials', bom.image_path.split('/')[-1]),  # Just filename
+                    bom.image_path if os.path.isabs(bom.image_path) else None  # Absolute path
+                ]
+                
+                full_path = index.resolve(possible_paths)
+                if full_path is None:
+                    print(f"✗ COC PDF not found for {bom.material_name}: {bom.image_path}")
+                elif full_path not in coc_paths_added:
+                    coc_paths_added.add(full_path)
+                    paths.append(full_path)
             
-            print(f"=== Added {count} COC documents total ===\n")
-            return count
+            print(f"=== Found {len(paths)} COC documents total ===\n")
+            return paths
             
         except Exception as e:
-            print(f"Error adding COC documents: {str(e)}")
+            print(f"Error collecting COC documents: {str(e)}")
             import traceback
             traceback.print_exc()
-            return count
+            return paths
     
-    def _add_ipqc_documents(self, merger, production_records):
-        """Add IPQC PDF documents"""
-        count = 0
-        try:
-            print(f"\n=== CHECKING IPQC DOCUMENTS ===")
-            for record in production_records:
-                ipqc_pdf = record.get('ipqcPdf')
-                print(f"Record ID {record.get('id')}: ipqc_pdf = '{ipqc_pdf}'")
+    def _collect_ipqc_documents(self, index, production_records):
+        """IPQC PDF paths"""
+        paths = []
+        for record in production_records:
+            ipqc_pdf = record.get('ipqcPdf')
+            if ipqc_pdf and isinstance(ipqc_pdf, str):  # Only process if it's a string path
+                # Try multiple path formats
+                possible_paths = [
+                    os.path.join(self.upload_folder, 'ipqc_pdfs', ipqc_pdf),  # Standard path
+                    os.path.join(self.upload_folder, ipqc_pdf),  # Direct path
+                    ipqc_pdf if os.path.isabs(ipqc_pdf) else None  # Absolute path
+                ]
                 
-                if ipqc_pdf and isinstance(ipqc_pdf, str):  # Only process if it's a string path
-                    # Try multiple path formats
-                    possible_paths = [
-                        os.path.join(self.upload_folder, 'ipqc_pdfs', ipqc_pdf),  # Standard path
-                        os.path.join(self.upload_folder, ipqc_pdf),  # Direct path
-                        ipqc_pdf if os.path.isabs(ipqc_pdf) else None  # Absolute path
-                    ]
-                    
-                    pdf_found = False
-                    for ipqc_path in possible_paths:
-                        if ipqc_path and os.path.exists(ipqc_path):
-                            try:
-                                merger.append(ipqc_path)
-                                count += 1
-                                print(f"✓ Added IPQC PDF: {ipqc_pdf} from {ipqc_path}")
-                                pdf_found = True
-                                break
-                            except Exception as e:
-                                print(f"✗ Error adding IPQC PDF {ipqc_path}: {e}")
-                    
-                    if not pdf_found:
-                        print(f"✗ IPQC PDF not found. Tried paths:")
-                        for p in possible_paths:
-                            if p:
-                                print(f"  - {p} (exists: {os.path.exists(p)})")
-            
-            print(f"=== Added {count} IPQC documents total ===\n")
-            return count
-            
-        except Exception as e:
-            print(f"Error adding IPQC documents: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return count
+                ipqc_path = index.resolve(possible_paths)
+                if ipqc_path:
+                    paths.append(ipqc_path)
+                else:
+                    print(f"✗ IPQC PDF not found for record {record.get('id')}: {ipqc_pdf}")
+        
+        print(f"Found {len(paths)} IPQC documents total")
+        return paths
     
-    def _add_ftr_documents(self, merger, production_records):
-        """Add FTR documents"""
-        count = 0
-        try:
-            for record in production_records:
-                ftr_doc = record.get('ftrDocument')
-                if ftr_doc and isinstance(ftr_doc, str):  # Only process if it's a string path
-                    ftr_path = os.path.join(self.upload_folder, 'ftr_documents', ftr_doc)
-                    if os.path.exists(ftr_path):
-                        merger.append(ftr_path)
-                        count += 1
-                        print(f"Added FTR document: {ftr_doc}")
-            
-            print(f"Added {count} FTR documents total")
-            return count
-            
-        except Exception as e:
-            print(f"Error adding FTR documents: {str(e)}")
-            import traceback
-            traceback.print_exc()
-            return count
+    def _collect_ftr_documents(self, index, production_records):
+        """FTR document paths"""
+        paths = []
+        for record in production_records:
+            ftr_doc = record.get('ftrDocument')
+            if ftr_doc and isinstance(ftr_doc, str):  # Only process if it's a string path
+                ftr_path = index.resolve([os.path.join(self.upload_folder, 'ftr_documents', ftr_doc)])
+                if ftr_path:
+                    paths.append(ftr_path)
+        
+        print(f"Found {len(paths)} FTR documents total")
+        return paths
@@ -0,0 +1,162 @@
+"""
+PDI Values - seeded, columnar synthetic measurements for PDI documentation
+
+synthesize_pdi_values() draws everything a PDI report needs in one call:
+- the AQL sample (sorted module indices + a per-module mask)
+- FTR columns (pmax, isc, voc, ipm, vpm, ff, efficiency) for the requested
+  modules, using measured values where the database has them
+- extra measurement columns (IR, hi-pot, dimensions, ...) for the sampled rows
+  and/or for every module
+
+Values come from one numpy Generator, so the same seed always gives the same
+report. Without an explicit seed it is derived from the PDI number and the
+serial list - regenerating a PDI's documents reproduces the same figures.
+
+Column specs are (low, high, decimals): uniform in [low, high) rounded to
+`decimals`, or with decimals=None an integer in [low, high]. A callable
+spec receives (rng, n, columns_so_far) and returns an array.
+"""
+import hashlib
+from bisect import bisect_left
+
+import numpy as np
+
+FTR_COLUMNS = ('pmax', 'isc', 'voc', 'ipm', 'vpm', 'ff', 'efficiency')
+
+# +/- % variation around the module spec for synthesized FTR values
+FTR_VARIATION = {'pmax': 0.5, 'isc': 0.3, 'voc': 0.2, 'ipm': 0.3, 'vpm': 0.2, 'ff': 0.3, 'efficiency': 0.3}
+
+# FTR column -> MODULE_SPECS key
+SPEC_KEYS = {'efficiency': 'eff'}
+
+
+def pdi_seed(pdi_number, serials):
+    """Stable 64-bit seed for a PDI (same PDI number + serials -> same seed)"""
+    digest = hashlib.sha256(str(pdi_number).encode('utf-8'))
+    for serial in serials:
+        digest.update(b'\0')
+        digest.update(str(serial).encode('utf-8'))
+    return int.from_bytes(digest.digest()[:8], 'big')
+
+
+def aql_lookup(table, lot_size):
+    """Row of an AQL table [(max_lot, value...), ...] sorted by max_lot for a lot size"""
+    idx = bisect_left(table, (lot_size,))
+    if idx >= len(table):
+        idx = len(table) - 1
+    return table[idx][1:]
+
+
+def _column(rng, n, spec, columns):
+    if callable(spec):
+        return spec(rng, n, columns)
+    low, high, decimals = spec
+    if decimals is None:
+        return rng.integers(low, high, size=n, endpoint=True)
+    return np.round(rng.uniform(low, high, size=n), decimals)
+
+
+class PDIValues:
+    """Columnar result of synthesize_pdi_values()"""
+
+    def __init__(self, serials, seed, sample_index, ftr_index, ftr, ftr_measured, binning,
+                 sample_columns, module_columns):
+        self.serials = serials
+        self.seed = seed
+        self.sample_index = sample_index
+        self.sampled = np.zeros(len(serials), dtype=bool)
+        self.sampled[sample_index] = True
+        self._ftr_index = ftr_index
+        self.ftr = ftr
+        self.ftr_measured = ftr_measured
+        self.binning = binning
+        self.sample_columns = sample_columns
+        self.module_columns = module_columns
+
+    @property
+    def sample_size(self):
+        return len(self.sample_index)
+
+    @property
+    def sampled_serials(self):
+        """Sampled serials in serial-list order"""
+        return [self.serials[i] for i in self.sample_index.tolist()]
+
+    def ftr_rows(self):
+        """{serial: {pmax, isc, ..., binning}} for the modules FTR values were made for"""
+        columns = {}
+        for name in FTR_COLUMNS:
+            # NaN marks a measured row with no value in the database
+            columns[name] = [None if v != v else v for v in self.ftr[name].tolist()]
+        rows = {}
+        for pos, idx in enumerate(self._ftr_index.tolist()):
+            row = {name: columns[name][pos] for name in FTR_COLUMNS}
+            row['binning'] = self.binning[pos]
+            rows[self.serials[idx]] = row
+        return rows
+
+    def sample_rows(self, *names):
+        """Rows of (serial, value of each named sample column) for the sampled modules"""
+        return zip(self.sampled_serials, *(self.sample_columns[name].tolist() for name in names))
+
+    def module_rows(self, *names):
+        """Rows of (serial, value of each named module column) for every module"""
+        return zip(self.serials, *(self.module_columns[name].tolist() for name in names))
+
+
+def synthesize_pdi_values(serials, sample_size, specs=None, seed=None, pdi_number='',
+                          ftr_for='sample', measured=None, sample_columns=None, module_columns=None):
+    """
+    Draw the AQL sample and all synthetic per-module values of a PDI.
+
+    serials         list of module serial numbers (report order)
+    sample_size     AQL sample size (>= len(serials) samples every module)
+    specs           MODULE_SPECS entry - FTR values are synthesized around it (None = no FTR)
+    seed            explicit seed; default derived from pdi_number + serials
+    ftr_for         'sample' or 'all' - which modules get FTR values
+    measured        {serial: {pmax, ..., binning}} from the database, used as-is - or a
+                    callable given the serials that need FTR values, returning that dict
+    sample_columns  {name: spec} drawn once per sampled module
+    module_columns  {name: spec} drawn once per module
+    """
+    if seed is None:
+        seed = pdi_seed(pdi_number, serials)
+    rng = np.random.default_rng(seed)
+    n = len(serials)
+
+    if sample_size >= n:
+        sample_index = np.arange(n)
+    else:
+        sample_index = np.sort(rng.choice(n, size=sample_size, replace=False))
+
+    ftr_index = sample_index if ftr_for == 'sample' else np.arange(n)
+    ftr, ftr_measured, binning = {}, np.zeros(len(ftr_index), dtype=bool), []
+    if specs is not None:
+        m = len(ftr_index)
+        for name in FTR_COLUMNS:
+            base = float(specs[SPEC_KEYS.get(name, name)])
+            variation = base * FTR_VARIATION[name] / 100
+            ftr[name] = np.round(base + rng.uniform(-variation, variation, size=m), 2)
+        binning = ['A'] * m
+        if callable(measured):
+            measured = measured([serials[i] for i in ftr_index.tolist()])
+        if measured:
+            for pos, idx in enumerate(ftr_index.tolist()):
+                row = measured.get(serials[idx])
+                if row is None:
+                    continue
+                ftr_measured[pos] = True
+                for name in FTR_COLUMNS:
+                    value = row.get(name)
+                    ftr[name][pos] = np.nan if value is None else value
+                binning[pos] = row.get('binning')
+
+    drawn_sample = {}
+    for name, spec in (sample_columns or {}).items():
+        drawn_sample[name] = _column(rng, len(sample_index), spec, drawn_sample)
+    drawn_modules = {}
+    for name, spec in (module_columns or {}).items():
+        drawn_modules[name] = _column(rng, n, spec, drawn_modules)
+
+    return PDIValues(serials, seed, sample_index, ftr_index, ftr, ftr_measured, binning,
+                     drawn_sample, drawn_modules)
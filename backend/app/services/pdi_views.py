@@ -0,0 +1,152 @@
+"""
+PDI Views - summary / detail serialization for master orders and PDI batches
+
+A batch's serial rows run into the tens of thousands, so list endpoints never walk
+relationships to count or embed them. Each view names its payload and the eager
+loading it needs:
+
+- summary   entity fields + counts computed in SQL (grouped queries, no child rows)
+- detail    summary + the small child collections, loaded with selectinload
+- full      (batches only) detail + every serial, the old payload
+
+Generated serials are stored as ranges (see serial_ranges): counts add the range
+serials that have no row yet, and serial_page() pages a batch's serials by
+expanding its ranges lazily behind a keyset cursor.
+"""
+from sqlalchemy import func, case
+from sqlalchemy.orm import selectinload
+from app.models.database import db
+from app.models.pdi_models import MasterOrder, PDIBatch, ModuleSerialNumber, COCDocument
+from app.services.serial_search import encode_cursor, decode_cursor
+from app.services.serial_ranges import range_counts, iter_batch_serials
+
+ORDER_VIEWS = {
+    'summary': lambda: (),
+    'detail': lambda: (
+        selectinload(MasterOrder.pdi_batches),
+        selectinload(MasterOrder.coc_documents).selectinload(COCDocument.pdi_usage)
+    ),
+}
+
+BATCH_VIEWS = {
+    'summary': lambda: (),
+    'detail': lambda: (
+        selectinload(PDIBatch.raw_materials),
+        selectinload(PDIBatch.coc_usage)
+    ),
+    'full': lambda: (
+        selectinload(PDIBatch.raw_materials),
+        selectinload(PDIBatch.coc_usage)
+    ),
+}
+
+SERIAL_PAGE_SIZE = 500
+
+
+def parse_view(value, views, default):
+    """Requested view name, falling back to `default` for missing/unknown names"""
+    return value if value in views else default
+
+
+def batch_serial_counts(batch_ids):
+    """Serial counts per batch from grouped queries over rows and ranges -> {batch_id: {...}}"""
+    counts = {batch_id: {'total': 0, 'by_status': {}, 'rejected': 0, 'dispatched': 0}
+              for batch_id in batch_ids}
+    if not batch_ids:
+        return counts
+    for batch_id, pending in range_counts(batch_ids).items():
+        if pending:
+            counts[batch_id]['total'] = pending
+            counts[batch_id]['by_status']['pending'] = pending
+    rows = db.session.query(
+        ModuleSerialNumber.pdi_batch_id,
+        ModuleSerialNumber.qc_status,
+        func.count(ModuleSerialNumber.id),
+        func.sum(case((func.coalesce(ModuleSerialNumber.rejection_reason, '') != '', 1), else_=0)),
+        func.sum(case((ModuleSerialNumber.dispatched == True, 1), else_=0))
+    ).filter(ModuleSerialNumber.pdi_batch_id.in_(batch_ids)) \
+        .group_by(ModuleSerialNumber.pdi_batch_id, ModuleSerialNumber.qc_status)
+    for batch_id, status, total, rejected, dispatched in rows:
+        batch = counts[batch_id]
+        batch['total'] += total
+        batch['by_status'][status or 'pending'] = batch['by_status'].get(status or 'pending', 0) + total
+        batch['rejected'] += int(rejected or 0)
+        batch['dispatched'] += int(dispatched or 0)
+    return counts
+
+
+def order_stats(order_ids):
+    """Per-order counts with three grouped queries -> {order_id: {...}}"""
+    stats = {order_id: {} for order_id in order_ids}
+    if not order_ids:
+        return stats
+    batches = db.session.query(
+        PDIBatch.order_id,
+        func.count(PDIBatch.id),
+        func.sum(case((PDIBatch.status == 'completed', 1), else_=0)),
+        func.sum(PDIBatch.planned_modules),
+        func.sum(PDIBatch.actual_modules)
+    ).filter(PDIBatch.order_id.in_(order_ids)).group_by(PDIBatch.order_id)
+    for order_id, count, completed, planned, actual in batches:
+        stats[order_id].update({
+            'batches': count,
+            'completed_batches': int(completed or 0),
+            'planned_modules': int(planned or 0),
+            'actual_modules': int(actual or 0)
+        })
+    serials = db.session.query(PDIBatch.order_id, func.count(ModuleSerialNumber.id)) \
+        .join(ModuleSerialNumber, ModuleSerialNumber.pdi_batch_id == PDIBatch.id) \
+        .filter(PDIBatch.order_id.in_(order_ids)).group_by(PDIBatch.order_id)
+    for order_id, count in serials:
+        stats[order_id]['serials'] = count
+    batch_orders = dict(db.session.query(PDIBatch.id, PDIBatch.order_id).filter(PDIBatch.order_id.in_(order_ids)))
+    for batch_id, pending in range_counts(list(batch_orders)).items():
+        order = stats[batch_orders[batch_id]]
+        order['serials'] = order.get('serials', 0) + pending
+    cocs = db.session.query(COCDocument.order_id, func.count(COCDocument.id)) \
+        .filter(COCDocument.order_id.in_(order_ids)).group_by(COCDocument.order_id)
+    for order_id, count in cocs:
+        stats[order_id]['coc_documents'] = count
+    return stats
+
+
+def serialize_orders(orders, view='summary'):
+    """Orders loaded with ORDER_VIEWS[view] -> list of dicts"""
+    stats = order_stats([order.id for order in orders])
+    if view == 'summary':
+        return [order.to_summary_dict(stats[order.id]) for order in orders]
+    batch_counts = batch_serial_counts([batch.id for order in orders for batch in order.pdi_batches])
+    return [order.to_dict(stats[order.id], batch_counts) for order in orders]
+
+
+def serialize_batches(batches, view='summary'):
+    """Batches loaded with BATCH_VIEWS[view] -> list of dicts"""
+    counts = batch_serial_counts([batch.id for batch in batches])
+    if view == 'summary':
+        return [batch.to_summary_dict(counts[batch.id]) for batch in batches]
+    return [batch.to_dict(counts[batch.id],
+                          serials=[serial for _, serial in iter_batch_serials(batch.id)] if view == 'full' else None)
+            for batch in batches]
+
+
+def serial_page(batch_id, limit, cursor=None, qc_status=None):
+    """One keyset page of a batch's serial dicts -> (serials, next cursor)"""
+    after = decode_cursor(cursor)
+    if qc_status and qc_status != 'pending':
+        # Only stored rows carry a status other than pending
+        query = ModuleSerialNumber.query.filter(ModuleSerialNumber.pdi_batch_id == batch_id,
+                                                ModuleSerialNumber.qc_status == qc_status)
+        if after:
+            query = query.filter(ModuleSerialNumber.id > after[0])
+        rows = query.order_by(ModuleSerialNumber.id).limit(limit + 1).all()
+        page = [([row.id], row.to_dict()) for row in rows]
+    else:
+        page = []
+        for key, serial in iter_batch_serials(batch_id, after):
+            if qc_status and serial['qcStatus'] != qc_status:
+                continue
+            page.append((key, serial))
+            if len(page) > limit:
+                break
+    next_cursor = encode_cursor(page[limit - 1][0]) if len(page) > limit else None
+    return [serial for _, serial in page[:limit]], next_cursor
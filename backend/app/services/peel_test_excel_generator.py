@@ -4,7 +4,7 @@ Generates Excel reports with multiple sheets for Day/Night shifts and Front/Back
 """
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, Alignment, PatternFill, Border, Side
+from app.services import excel_styles as xs
 from openpyxl.drawing.image import Image as OpenpyxlImage
 from datetime import datetime
 import os
@@ -14,18 +14,13 @@ import random
 def create_sheet_data(ws, stringer_name, side_type, date):
     """Create data for one sheet"""
     # Styles
-    header_font = Font(name='Arial', size=11, bold=True)
-    normal_font = Font(name='Arial', size=9)
-    small_font = Font(name='Arial', size=8, bold=True)
+    header_font = xs.font(name='Arial', size=11, bold=True)
+    normal_font = xs.font(name='Arial', size=9)
+    small_font = xs.font(name='Arial', size=8, bold=True)
     
-    border_thin = Border(
-        left=Side(style='thin'),
-        right=Side(style='thin'),
-        top=Side(style='thin'),
-        bottom=Side(style='thin')
-    )
+    border_thin = xs.border('thin')
     
-    gray_fill = PatternFill(start_color='D9D9D9', end_color='D9D9D9', fill_type='solid')
+    gray_fill = xs.solid_fill('D9D9D9')
     
     # Set column widths
     ws.column_dimensions['A'].width = 25
@@ -55,62 +50,62 @@ def create_sheet_data(ws, stringer_name, side_type, date):
     # Columns B-E: Company name (rows 1-3)
     ws.merge_cells('B1:E3')
     ws['B1'] = 'Gautam Solar Private Limited'
-    ws['B1'].font = Font(name='Arial', size=14, bold=True)
-    ws['B1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['B1'].font = xs.font(name='Arial', size=14, bold=True)
+    ws['B1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['B1'].border = border_thin
     
     # Columns F-G: Document labels
     ws.merge_cells('F1:G1')
     ws['F1'] = 'Document No.'
-    ws['F1'].font = Font(name='Arial', size=10, bold=True)
-    ws['F1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['F1'].font = xs.font(name='Arial', size=10, bold=True)
+    ws['F1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['F1'].border = border_thin
     
     ws.merge_cells('F2:G2')
     ws['F2'] = 'Issue Date'
-    ws['F2'].font = Font(name='Arial', size=10, bold=True)
-    ws['F2'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['F2'].font = xs.font(name='Arial', size=10, bold=True)
+    ws['F2'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['F2'].border = border_thin
     
     ws.merge_cells('F3:G3')
     ws['F3'] = 'Rev. No. & Date'
-    ws['F3'].font = Font(name='Arial', size=10, bold=True)
-    ws['F3'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['F3'].font = xs.font(name='Arial', size=10, bold=True)
+    ws['F3'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['F3'].border = border_thin
     
     # Column H: Document values
     ws['H1'] = 'GSPL/IPQC/S5/009'
-    ws['H1'].font = Font(name='Arial', size=10, bold=False)
-    ws['H1'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['H1'].font = xs.font(name='Arial', size=10, bold=False)
+    ws['H1'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['H1'].border = border_thin
     
     ws['H2'] = '01/11/2024'
-    ws['H2'].font = Font(name='Arial', size=10, bold=False)
-    ws['H2'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['H2'].font = xs.font(name='Arial', size=10, bold=False)
+    ws['H2'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['H2'].border = border_thin
     
     ws['H3'] = '0'
-    ws['H3'].font = Font(name='Arial', size=10, bold=False)
-    ws['H3'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['H3'].font = xs.font(name='Arial', size=10, bold=False)
+    ws['H3'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['H3'].border = border_thin
     
     # Row 4: Title section and Page info
     ws.merge_cells('A4:E4')
     ws['A4'] = 'Type of Document:- Peel Test Report\nRibbon to Cell'
-    ws['A4'].font = Font(name='Arial', size=10, bold=True)
-    ws['A4'].alignment = Alignment(horizontal='left', vertical='center', wrap_text=True)
+    ws['A4'].font = xs.font(name='Arial', size=10, bold=True)
+    ws['A4'].alignment = xs.alignment(horizontal='left', vertical='center', wrap_text=True)
     ws['A4'].border = border_thin
     ws.row_dimensions[4].height = 30
     
     ws.merge_cells('F4:G4')
     ws['F4'] = 'Page'
-    ws['F4'].font = Font(name='Arial', size=10, bold=True)
-    ws['F4'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['F4'].font = xs.font(name='Arial', size=10, bold=True)
+    ws['F4'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['F4'].border = border_thin
     
     ws['H4'] = 'Page 1 of 1'
-    ws['H4'].font = Font(name='Arial', size=10, bold=False)
-    ws['H4'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['H4'].font = xs.font(name='Arial', size=10, bold=False)
+    ws['H4'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['H4'].border = border_thin
     
     # Row 5: Empty with border
@@ -123,8 +118,8 @@ def create_sheet_data(ws, stringer_name, side_type, date):
     
     ws.merge_cells('A6:H6')
     ws['A6'] = f'DATE:- {date_str}  STRINGER:- {stringer_name} {side_type} side  SHIFT:- Day'
-    ws['A6'].font = Font(name='Arial', size=10, bold=True)
-    ws['A6'].alignment = Alignment(horizontal='center', vertical='center')
+    ws['A6'].font = xs.font(name='Arial', size=10, bold=True)
+    ws['A6'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws['A6'].border = border_thin
     ws.row_dimensions[6].height = 20
     
@@ -148,8 +143,8 @@ def create_sheet_data(ws, stringer_name, side_type, date):
         col_letter = chr(64 + idx)
         cell = ws[f'{col_letter}8']
         cell.value = header
-        cell.font = Font(name='Arial', size=8, bold=True)
-        cell.alignment = Alignment(horizontal='center', vertical='center', wrap_text=True)
+        cell.font = xs.font(name='Arial', size=8, bold=True)
+        cell.alignment = xs.alignment(horizontal='center', vertical='center', wrap_text=True)
         cell.border = border_thin
         cell.fill = gray_fill
     
@@ -161,7 +156,7 @@ def create_sheet_data(ws, stringer_name, side_type, date):
         
         ws[f'A{row_num}'] = i
         ws[f'A{row_num}'].font = normal_font
-        ws[f'A{row_num}'].alignment = Alignment(horizontal='center', vertical='center')
+        ws[f'A{row_num}'].alignment = xs.alignment(horizontal='center', vertical='center')
         ws[f'A{row_num}'].border = border_thin
         
         for interval in range(7):
@@ -171,7 +166,7 @@ def create_sheet_data(ws, stringer_name, side_type, date):
             cell.value = value
             cell.number_format = '0.000'
             cell.font = normal_font
-            cell.alignment = Alignment(horizontal='center', vertical='center')
+            cell.alignment = xs.alignment(horizontal='center', vertical='center')
             cell.border = border_thin
         
         ws.row_dimensions[row_num].height = 18
@@ -191,36 +186,36 @@ def create_sheet_data(ws, stringer_name, side_type, date):
     # Test Performed By
     ws.merge_cells(f'A{sign_row}:B{sign_row}')
     ws[f'A{sign_row}'] = 'Test Performed By:'
-    ws[f'A{sign_row}'].font = Font(name='Arial', size=9, bold=True)
-    ws[f'A{sign_row}'].alignment = Alignment(horizontal='left', vertical='center')
+    ws[f'A{sign_row}'].font = xs.font(name='Arial', size=9, bold=True)
+    ws[f'A{sign_row}'].alignment = xs.alignment(horizontal='left', vertical='center')
     ws[f'A{sign_row}'].border = border_thin
     
     ws.merge_cells(f'C{sign_row}:D{sign_row}')
     ws[f'C{sign_row}'] = test_by
-    ws[f'C{sign_row}'].font = Font(name='Arial', size=9)
-    ws[f'C{sign_row}'].alignment = Alignment(horizontal='center', vertical='center')
+    ws[f'C{sign_row}'].font = xs.font(name='Arial', size=9)
+    ws[f'C{sign_row}'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws[f'C{sign_row}'].border = border_thin
     
     # Verified By
     ws[f'E{sign_row}'] = 'Verified By:'
-    ws[f'E{sign_row}'].font = Font(name='Arial', size=9, bold=True)
-    ws[f'E{sign_row}'].alignment = Alignment(horizontal='left', vertical='center')
+    ws[f'E{sign_row}'].font = xs.font(name='Arial', size=9, bold=True)
+    ws[f'E{sign_row}'].alignment = xs.alignment(horizontal='left', vertical='center')
     ws[f'E{sign_row}'].border = border_thin
     
     ws[f'F{sign_row}'] = verify_by
-    ws[f'F{sign_row}'].font = Font(name='Arial', size=9)
-    ws[f'F{sign_row}'].alignment = Alignment(horizontal='center', vertical='center')
+    ws[f'F{sign_row}'].font = xs.font(name='Arial', size=9)
+    ws[f'F{sign_row}'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws[f'F{sign_row}'].border = border_thin
     
     # Approved By
     ws[f'G{sign_row}'] = 'Approved By:'
-    ws[f'G{sign_row}'].font = Font(name='Arial', size=9, bold=True)
-    ws[f'G{sign_row}'].alignment = Alignment(horizontal='left', vertical='center')
+    ws[f'G{sign_row}'].font = xs.font(name='Arial', size=9, bold=True)
+    ws[f'G{sign_row}'].alignment = xs.alignment(horizontal='left', vertical='center')
     ws[f'G{sign_row}'].border = border_thin
     
     ws[f'H{sign_row}'] = approve_by
-    ws[f'H{sign_row}'].font = Font(name='Arial', size=9)
-    ws[f'H{sign_row}'].alignment = Alignment(horizontal='center', vertical='center')
+    ws[f'H{sign_row}'].font = xs.font(name='Arial', size=9)
+    ws[f'H{sign_row}'].alignment = xs.alignment(horizontal='center', vertical='center')
     ws[f'H{sign_row}'].border = border_thin
     
     ws.row_dimensions[sign_row].height = 25
@@ -5,13 +5,13 @@ Automatically generates peel test reports for 3 stringers, 2 times per day
 
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import mm, inch
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer
 from reportlab.lib.enums import TA_CENTER
 from datetime import datetime
 import os
 import random
+from app.services.pdf_styles import stylesheet, paragraph_style
 
 
 class PeelTestReportGenerator:
@@ -39,14 +39,19 @@ class PeelTestReportGenerator:
             data.append(row)
         return data
     
-    def generate_report(self, stringer_name, shift_name, date=None):
-        """Generate a single peel test report PDF"""
+    @staticmethod
+    def report_filename(stringer_name, shift_name, date):
+        """File name for a peel test report"""
+        return f"PeelTest_{stringer_name.replace(' ', '_')}_{shift_name}_{date.strftime('%Y%m%d_%H%M')}.pdf"
+    
+    def generate_report(self, stringer_name, shift_name, date=None, filepath=None):
+        """Generate a single peel test report PDF (into output_folder unless filepath is given)"""
         if date is None:
             date = datetime.now()
         
         # Create filename
-        filename = f"PeelTest_{stringer_name.replace(' ', '_')}_{shift_name}_{date.strftime('%Y%m%d_%H%M')}.pdf"
-        filepath = os.path.join(self.output_folder, filename)
+        if filepath is None:
+            filepath = os.path.join(self.output_folder, self.report_filename(stringer_name, shift_name, date))
         
         # Create PDF document
         doc = SimpleDocTemplate(
@@ -62,7 +67,7 @@ class PeelTestReportGenerator:
         elements = []
         
         # Styles
-        styles = getSampleStyleSheet()
+        styles = stylesheet()
         
         # Header table (Company name and document details)
         header_left = Paragraph('<b>☐GAUTAM</b><br/><font size=9>Gautam Solar Private Limited</font>', styles['Normal'])
@@ -115,7 +120,7 @@ class PeelTestReportGenerator:
         # Graph/Chart placeholder
         chart_para = Paragraph(
             '<i><font color="gray">[Graph/Chart Area - Sample measurements visualization]</font></i>',
-            ParagraphStyle('ChartPlaceholder', parent=styles['Normal'], alignment=TA_CENTER, fontSize=9)
+            paragraph_style('ChartPlaceholder', alignment=TA_CENTER, fontSize=9)
         )
         elements.append(chart_para)
         elements.append(Spacer(1, 20*mm))
@@ -156,7 +161,7 @@ class PeelTestReportGenerator:
         elements.append(Spacer(1, 10*mm))
         note_para = Paragraph(
             '<i>Note: Standard specification for peel strength ≥ 1.5 N/mm</i>',
-            ParagraphStyle('Note', parent=styles['Normal'], fontSize=9)
+            paragraph_style('Note', fontSize=9)
         )
         elements.append(note_para)
         
@@ -179,7 +184,7 @@ class PeelTestReportGenerator:
         return generated_files
 
 
-def generate_peel_test_pdf(data):
+def generate_peel_test_pdf(data, filepath=None):
     """
     Generate peel test PDF report
     
@@ -188,6 +193,7 @@ def generate_peel_test_pdf(data):
             - date: Report date
             - stringer: Stringer name (Stringer 1/2/3)
             - shift: Shift name (Morning/Evening)
+        filepath: Optional output path (default: generated_pdfs/PeelTest_<...>.pdf)
     
     Returns:
         str: Path to generated PDF file
@@ -201,6 +207,4 @@ def generate_peel_test_pdf(data):
     if isinstance(report_date, str):
         report_date = datetime.strptime(report_date, '%Y-%m-%d')
     
-    filepath = generator.generate_report(stringer_name, shift_name, report_date)
-    
-    return filepath
+    return generator.generate_report(stringer_name, shift_name, report_date, filepath=filepath)
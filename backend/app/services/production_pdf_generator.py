@@ -1,12 +1,13 @@
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak, Image
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, PageBreak
+from reportlab.lib.styles import ParagraphStyle
 from reportlab.lib.units import mm
 from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
 from io import BytesIO
 from datetime import datetime
 import os
+from app.services.pdf_styles import stylesheet, image
 
 class ProductionPDFGenerator:
     """
@@ -33,15 +34,15 @@ class ProductionPDFGenerator:
     ]
     
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self._create_custom_styles()
+        self.styles = stylesheet('production', self._create_custom_styles)
         
-    def _create_custom_styles(self):
-        """Create custom paragraph styles"""
+    @staticmethod
+    def _create_custom_styles(styles):
+        """Create custom paragraph styles (once per process - the sheet is shared)"""
         # Header title style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='HeaderTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=16,
             fontName='Helvetica-Bold',
             textColor=colors.black,
@@ -50,9 +51,9 @@ class ProductionPDFGenerator:
         ))
         
         # Document type style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='DocType',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=12,
             fontName='Helvetica-Bold',
             textColor=colors.black,
@@ -61,9 +62,9 @@ class ProductionPDFGenerator:
         ))
         
         # Section header
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionHeader',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=14,
             fontName='Helvetica-Bold',
             textColor=colors.HexColor('#1a237e'),
@@ -229,9 +230,8 @@ class ProductionPDFGenerator:
         
         # Try to load logo if exists
         logo_path = os.path.join(os.path.dirname(__file__), '../../static/gautam_logo.png')
-        if os.path.exists(logo_path):
-            logo_img = Image(logo_path, width=45*mm, height=22*mm)
-        else:
+        logo_img = image(logo_path, width=45*mm, height=22*mm)
+        if logo_img is None:
             # Fallback to placeholder if logo not found
             logo_img = Paragraph("<b><font size=10>LOGO</font></b>", self.styles['Normal'])
         
@@ -0,0 +1,218 @@
+"""
+Serial Ranges - range-encoded storage for generated PDI serials
+
+A PDI batch's serials are one contiguous block, f'{prefix}-{n:06d}' for
+start <= n <= end, so generating a batch stores a single pdi_serial_ranges row
+instead of one module_serial_numbers row per serial.
+
+module_serial_numbers keeps the exceptions: a serial only gets a row once it has
+state of its own (QC result, rejection, dispatch) or is reassigned to another
+batch. Its serial_range_id points at the range it came from, so
+- a range serial without a row is 'pending' in the range's batch
+- a row whose pdi_batch_id differs from its range's batch was reassigned
+- rows without a range are serials stored before ranges existed
+
+Lookups resolve a serial to its row, else to the range covering it (one indexed
+range query); batch listings expand ranges lazily, a chunk at a time.
+"""
+import re
+from sqlalchemy import text, func, or_
+from app.models.database import db
+from app.models.pdi_models import ModuleSerialNumber, PDISerialRange
+
+SERIAL_WIDTH = 6
+EXPAND_CHUNK = 1000
+
+_SERIAL_PATTERN = re.compile(r'^(.*)-(\d+)$')
+
+
+def format_serial(prefix, number):
+    return f"{prefix}-{number:0{SERIAL_WIDTH}d}"
+
+
+def parse_serial(serial_number):
+    """'GS-000123' -> ('GS', 123); None when the serial is not in range format"""
+    match = _SERIAL_PATTERN.match(serial_number or '')
+    if not match:
+        return None
+    prefix, number = match.group(1), int(match.group(2))
+    if format_serial(prefix, number) != serial_number:
+        return None
+    return prefix, number
+
+
+def ensure_serial_range_columns():
+    """Add serial_range_id to a module_serial_numbers table created before ranges existed"""
+    try:
+        with db.engine.connect() as conn:
+            existing = {row[0] for row in conn.execute(text("SHOW COLUMNS FROM module_serial_numbers"))}
+            if 'serial_range_id' not in existing:
+                conn.execute(text("ALTER TABLE module_serial_numbers ADD COLUMN serial_range_id INT NULL"))
+                conn.execute(text("CREATE INDEX ix_module_serial_numbers_serial_range_id "
+                                  "ON module_serial_numbers (serial_range_id)"))
+            conn.commit()
+    except Exception as e:
+        print(f"[SerialRanges] Could not check module_serial_numbers columns: {e}")
+
+
+def create_range(batch_id, prefix, start, end):
+    """
+    Record serials prefix-start..prefix-end for a batch (caller commits).
+    Raises ValueError when the block overlaps an existing range or stored serial.
+    """
+    if start > end:
+        raise ValueError(f"Empty serial range {start}..{end}")
+    clash = PDISerialRange.query.filter(
+        PDISerialRange.prefix == prefix,
+        PDISerialRange.start_no <= end,
+        PDISerialRange.end_no >= start
+    ).with_for_update().first()
+    if clash:
+        raise ValueError(f"Serials {format_serial(prefix, max(start, clash.start_no))}.. "
+                         f"already belong to PDI batch {clash.pdi_batch_id}")
+    # Rows stored one per serial before ranges existed (same width sorts numerically)
+    stored = ModuleSerialNumber.query.filter(
+        ModuleSerialNumber.serial_number.between(format_serial(prefix, start), format_serial(prefix, end))
+    ).first()
+    if stored:
+        raise ValueError(f"Serial {stored.serial_number} already belongs to PDI batch {stored.pdi_batch_id}")
+    serial_range = PDISerialRange(pdi_batch_id=batch_id, prefix=prefix, start_no=start, end_no=end)
+    db.session.add(serial_range)
+    return serial_range
+
+
+def range_covering(serial_number):
+    parsed = parse_serial(serial_number)
+    if not parsed:
+        return None
+    prefix, number = parsed
+    return PDISerialRange.query.filter(
+        PDISerialRange.prefix == prefix,
+        PDISerialRange.start_no <= number,
+        PDISerialRange.end_no >= number
+    ).order_by(PDISerialRange.start_no.desc()).first()
+
+
+def _virtual_serial(serial_range, number):
+    """Dict for a range serial that has no row, shaped like ModuleSerialNumber.to_dict()"""
+    return {
+        'id': None,
+        'pdiBatchId': serial_range.pdi_batch_id,
+        'serialNumber': format_serial(serial_range.prefix, number),
+        'productionDate': None,
+        'qcStatus': 'pending',
+        'rejectionReason': None,
+        'dispatched': False,
+        'dispatchDate': None
+    }
+
+
+def find_serial(serial_number):
+    """Current state of one serial (its row, else its range) as a dict, None if unknown"""
+    serial = ModuleSerialNumber.query.filter_by(serial_number=serial_number).first()
+    if serial:
+        return serial.to_dict()
+    serial_range = range_covering(serial_number)
+    if serial_range:
+        return _virtual_serial(serial_range, parse_serial(serial_number)[1])
+    return None
+
+
+def materialize_serial(serial_number):
+    """Row for a serial, created from its range when it has none yet (caller commits)"""
+    serial = ModuleSerialNumber.query.filter_by(serial_number=serial_number).first()
+    if serial:
+        return serial
+    serial_range = range_covering(serial_number)
+    if not serial_range:
+        return None
+    serial = ModuleSerialNumber(
+        pdi_batch_id=serial_range.pdi_batch_id,
+        serial_range_id=serial_range.id,
+        serial_number=serial_number,
+        qc_status='pending'
+    )
+    db.session.add(serial)
+    db.session.flush()
+    return serial
+
+
+def reassign_serial(serial_number, batch_id):
+    """Move one serial to another batch (caller commits); None if the serial is unknown"""
+    serial = materialize_serial(serial_number)
+    if serial:
+        serial.pdi_batch_id = batch_id
+    return serial
+
+
+def range_counts(batch_ids):
+    """Range serials without a row per batch (all 'pending') -> {batch_id: count}"""
+    counts = {batch_id: 0 for batch_id in batch_ids}
+    if not batch_ids:
+        return counts
+    sizes = db.session.query(
+        PDISerialRange.pdi_batch_id,
+        func.sum(PDISerialRange.end_no - PDISerialRange.start_no + 1)
+    ).filter(PDISerialRange.pdi_batch_id.in_(batch_ids)).group_by(PDISerialRange.pdi_batch_id)
+    for batch_id, size in sizes:
+        counts[batch_id] += int(size or 0)
+    stored = db.session.query(PDISerialRange.pdi_batch_id, func.count(ModuleSerialNumber.id)) \
+        .join(ModuleSerialNumber, ModuleSerialNumber.serial_range_id == PDISerialRange.id) \
+        .filter(PDISerialRange.pdi_batch_id.in_(batch_ids)).group_by(PDISerialRange.pdi_batch_id)
+    for batch_id, count in stored:
+        counts[batch_id] -= count
+    return counts
+
+
+def iter_batch_serials(batch_id, after=None):
+    """
+    Yield (key, serial dict) for every serial of a batch: range serials in
+    (range, number) order, then rows that are not from the batch's own ranges
+    (reassigned in, or stored before ranges existed). Keys are JSON-able and
+    increasing, so iteration resumes after any yielded key.
+    """
+    phase = after[0] if after else 0
+    if phase == 0:
+        ranges = PDISerialRange.query.filter(PDISerialRange.pdi_batch_id == batch_id)
+        if after:
+            ranges = ranges.filter(PDISerialRange.id >= after[1])
+        for serial_range in ranges.order_by(PDISerialRange.id).all():
+            number = serial_range.start_no
+            if after and serial_range.id == after[1]:
+                number = after[2] + 1
+            while number <= serial_range.end_no:
+                last = min(number + EXPAND_CHUNK - 1, serial_range.end_no)
+                numbers = [format_serial(serial_range.prefix, n) for n in range(number, last + 1)]
+                stored = {serial.serial_number: serial for serial in ModuleSerialNumber.query.filter(
+                    ModuleSerialNumber.serial_range_id == serial_range.id,
+                    ModuleSerialNumber.serial_number.in_(numbers)
+                )}
+                for n, serial_number in zip(range(number, last + 1), numbers):
+                    serial = stored.get(serial_number)
+                    if serial is None:
+                        yield [0, serial_range.id, n], _virtual_serial(serial_range, n)
+                    elif serial.pdi_batch_id == batch_id:
+                        yield [0, serial_range.id, n], serial.to_dict()
+                number = last + 1
+        after = None
+
+    own_ranges = db.session.query(PDISerialRange.id).filter(PDISerialRange.pdi_batch_id == batch_id)
+    rows = ModuleSerialNumber.query.filter(
+        ModuleSerialNumber.pdi_batch_id == batch_id,
+        or_(ModuleSerialNumber.serial_range_id.is_(None),
+            ModuleSerialNumber.serial_range_id.notin_(own_ranges))
+    )
+    last_id = after[1] if after else 0
+    while True:
+        chunk = rows.filter(ModuleSerialNumber.id > last_id) \
+            .order_by(ModuleSerialNumber.id).limit(EXPAND_CHUNK).all()
+        for serial in chunk:
+            yield [1, serial.id], serial.to_dict()
+        if len(chunk) < EXPAND_CHUNK:
+            return
+        last_id = chunk[-1].id
+
+
+def batch_serial_numbers(batch_id):
+    """Every serial number of a batch, sorted"""
+    return sorted(serial['serialNumber'] for _, serial in iter_batch_serials(batch_id))
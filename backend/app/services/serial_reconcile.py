@@ -0,0 +1,105 @@
+"""
+Serial Reconcile - single-pass differences between two keyed serial sources
+
+Mismatch checks compare a DB serial set (ftr_master_serials, PDI assignments)
+with an MRP serial set (packing / dispatch APIs). reconcile() takes both keyed by
+serial and streams one (kind, serial, left, right, fields) tuple per row:
+
+- left_only    serial only in the left source
+- right_only   serial only in the right source
+- mismatch     in both, and a compared field differs
+- match        in both, compared fields agree
+
+The right source is indexed into a dict once and the left source is streamed
+against it: one probe per left row, and rows are yielded as plain tuples in the
+same pass - no second pass over either side, no per-category set differences.
+Right-only rows are the index keys no left row matched (a C-level filter over
+the keys). Fields are only compared when asked for, and only the kinds asked
+for are yielded.
+
+Serials are compared after normalize_serial (trimmed, upper case). A field only
+counts as a mismatch when both sides have a value for it: unknown is not wrong.
+"""
+from itertools import filterfalse
+
+LEFT_ONLY = 'left_only'
+RIGHT_ONLY = 'right_only'
+MISMATCH = 'mismatch'
+MATCH = 'match'
+
+ALL_KINDS = (LEFT_ONLY, RIGHT_ONLY, MISMATCH, MATCH)
+DIFFERENCE_KINDS = (LEFT_ONLY, RIGHT_ONLY, MISMATCH)
+
+
+def normalize_serial(serial):
+    return str(serial or '').strip().upper()
+
+
+def keyed(rows, key='serial_number'):
+    """(serial, row) for dict-like rows (API items, result.mappings()); rows without a serial are skipped"""
+    for row in rows:
+        serial = str(row.get(key) or '').strip().upper()  # normalize_serial, inlined for 500k-row sources
+        if serial:
+            yield serial, row
+
+
+def index_serials(pairs):
+    """{serial: attrs} from (serial, attrs) pairs; a repeated serial keeps its last attrs"""
+    return pairs if isinstance(pairs, dict) else dict(pairs)
+
+
+def dispatch_serials(dispatch_summary):
+    """
+    (serial, dispatch entry, pallet_no) for every serial of a party-dispatch-history
+    page: each entry's pallet_nos maps a pallet to its space-separated serials
+    """
+    for dispatch in dispatch_summary:
+        pallet_nos = dispatch.get('pallet_nos', {})
+        if not isinstance(pallet_nos, dict):
+            continue
+        for pallet_no, serials in pallet_nos.items():
+            if isinstance(serials, str):
+                for serial in serials.split():
+                    yield serial.upper(), dispatch, pallet_no
+
+
+def reconcile(left, right, fields=(), kinds=DIFFERENCE_KINDS):
+    """
+    Stream (kind, serial, left, right, fields) for the rows of `kinds`: left rows
+    in left order, then right-only rows in right order. fields names the compared
+    fields that differ (mismatch rows only).
+
+    left is (serial, attrs) pairs; right is {serial: attrs} (used as is) or pairs.
+    Repeated left serials are each reported. attrs are passed through untouched;
+    with `fields` they are dicts and those keys are compared.
+    """
+    index = index_serials(right)
+    lookup = index.get
+    want_left, want_mismatch, want_match = LEFT_ONLY in kinds, MISMATCH in kinds, MATCH in kinds
+    # Right serials a left row matched - only kept when right-only rows are wanted
+    matched = set()
+    claim = matched.add if RIGHT_ONLY in kinds else None
+    for serial, left_attrs in left:
+        right_attrs = lookup(serial)
+        if right_attrs is None:
+            if want_left:
+                yield LEFT_ONLY, serial, left_attrs, None, ()
+            continue
+        if claim is not None:
+            claim(serial)
+        if fields:
+            differing = ()
+            for field in fields:
+                a, b = left_attrs.get(field), right_attrs.get(field)
+                # Unequal first: most compared values agree; unknown (None / '') is not wrong
+                if a != b and a is not None and b is not None and a != '' and b != '':
+                    differing += (field,)
+            if differing:
+                if want_mismatch:
+                    yield MISMATCH, serial, left_attrs, right_attrs, differing
+                continue
+        if want_match:
+            yield MATCH, serial, left_attrs, right_attrs, ()
+    if claim is not None:
+        for serial in filterfalse(matched.__contains__, index):
+            yield RIGHT_ONLY, serial, None, index[serial], ()
@@ -0,0 +1,373 @@
+"""
+Serial Registry - one row per module serial with its latest lifecycle state
+
+What is known about a serial is spread over ftr_master_serials, master_modules,
+master_ftr, pdi_serial_numbers, module_serial_numbers, rejected_modules,
+ftr_packed_modules and mrp_dispatch_cache. The write paths of those tables also
+upsert the facts they carry into serial_registry (keyed by serial_number), so a
+trace or lifecycle check is one primary-key read instead of a probe per table.
+
+Each source contributes its own columns; an upsert only overwrites a column when
+the new value is not NULL, so sources never erase each other's facts. Paths that
+take a fact back (PDI unassignment, batch reassignment) pass those columns in
+`replace`; deleting source rows clears what they contributed (forget_*).
+
+Several sources can reject a serial, so each owns one bit of rejected_sources
+(REJECTION_SOURCES) and is_rejected is derived from it: a source withdrawing its
+rejection clears only its own bit, and the reason goes once no bit is left.
+
+lifecycle_state is derived by MySQL from the facts, latest stage first:
+dispatched > packed > rejected > assigned > tested > registered.
+
+Serials generated as PDI serial ranges have no registry row until they get state
+of their own (see serial_ranges); lookups take their batch from the covering range.
+
+The first start after the registry is added fills it from the source tables
+(ensure_serial_registry).
+"""
+from sqlalchemy import text, bindparam
+from app.models.database import db
+from app.services.serial_ranges import range_covering
+
+CREATE_STATEMENT = """
+    CREATE TABLE IF NOT EXISTS serial_registry (
+        serial_number VARCHAR(100) NOT NULL PRIMARY KEY,
+        company_id INT NULL,
+        master_order_id INT NULL COMMENT 'master_modules.order_id',
+        pdi_batch_id INT NULL,
+        pdi_number VARCHAR(50) NULL,
+        binning VARCHAR(20) NULL,
+        class_status VARCHAR(20) NULL,
+        pmax DECIMAL(10,3) NULL,
+        rejected_sources INT NOT NULL DEFAULT 0 COMMENT 'One bit per rejecting source (REJECTION_SOURCES)',
+        is_rejected TINYINT(1) GENERATED ALWAYS AS (rejected_sources != 0) STORED,
+        rejection_reason VARCHAR(500) NULL,
+        pallet_no VARCHAR(100) NULL,
+        packed_at DATETIME NULL,
+        dispatch_party VARCHAR(255) NULL,
+        dispatched_at DATE NULL,
+        last_source VARCHAR(40) NULL COMMENT 'Table whose write last touched the row',
+        lifecycle_state VARCHAR(20) GENERATED ALWAYS AS (CASE
+            WHEN dispatch_party IS NOT NULL AND dispatch_party != '' THEN 'dispatched'
+            WHEN packed_at IS NOT NULL OR pallet_no IS NOT NULL THEN 'packed'
+            WHEN is_rejected = 1 THEN 'rejected'
+            WHEN pdi_number IS NOT NULL OR pdi_batch_id IS NOT NULL THEN 'assigned'
+            WHEN class_status IS NOT NULL OR binning IS NOT NULL OR pmax IS NOT NULL THEN 'tested'
+            ELSE 'registered' END) STORED,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        INDEX idx_company_state (company_id, lifecycle_state),
+        INDEX idx_pdi (pdi_number),
+        INDEX idx_pdi_batch (pdi_batch_id),
+        INDEX idx_master_order (master_order_id)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Latest lifecycle state per module serial'
+"""
+
+# rejected_sources comes before rejection_reason: the reason is cleared from the new flags
+REGISTRY_COLUMNS = (
+    'company_id', 'master_order_id', 'pdi_batch_id', 'pdi_number', 'binning', 'class_status',
+    'pmax', 'rejected_sources', 'rejection_reason', 'pallet_no', 'packed_at', 'dispatch_party',
+    'dispatched_at'
+)
+
+# Source tables that can reject a serial -> their bit in rejected_sources
+REJECTION_SOURCES = {
+    'master_modules': 1,
+    'ftr_master_serials': 2,
+    'module_serial_numbers': 4,
+    'rejected_modules': 8,
+}
+
+# mrp_dispatch_cache columns mirrored into the registry; the cache overwrites them on every sync
+DISPATCH_REGISTRY_REPLACE = ('pallet_no', 'dispatch_party')
+
+LOOKUP_CHUNK_SIZE = 1000
+BACKFILL_LOCK_WAIT = 2  # seconds; a held lock means another process is filling
+
+# Source tables in lifecycle order, replayed into an empty registry: (table, columns, select)
+# Each select returns serial_number followed by the columns, under their registry names
+# (rejected_sources as the table's REJECTION_SOURCES bit)
+BACKFILL_SOURCES = (
+    ('master_modules', ('master_order_id', 'binning', 'pmax', 'rejected_sources', 'rejection_reason'), """
+        SELECT serial_number, order_id AS master_order_id, binning, pmax,
+               CASE WHEN is_rejected THEN 1 ELSE 0 END AS rejected_sources,
+               NULLIF(rejection_reason, '') AS rejection_reason
+        FROM master_modules
+    """),
+    ('ftr_master_serials', ('company_id', 'binning', 'class_status', 'pmax', 'rejected_sources', 'pdi_number'), """
+        SELECT serial_number, company_id, binning, class_status, pmax,
+               CASE WHEN class_status = 'REJECTED' THEN 2 ELSE 0 END AS rejected_sources, pdi_number
+        FROM ftr_master_serials
+    """),
+    ('master_ftr', ('company_id', 'pdi_number'), """
+        SELECT serial_number, company_id, pdi_number FROM master_ftr
+    """),
+    ('pdi_serial_numbers', ('company_id', 'pdi_number'), """
+        SELECT serial_number, company_id, pdi_number FROM pdi_serial_numbers
+    """),
+    ('module_serial_numbers',
+     ('company_id', 'pdi_batch_id', 'pdi_number', 'rejected_sources', 'rejection_reason', 'dispatched_at'), """
+        SELECT msn.serial_number, mo.company_id, msn.pdi_batch_id, pb.pdi_number,
+               CASE WHEN COALESCE(msn.rejection_reason, '') != '' THEN 4 ELSE 0 END AS rejected_sources,
+               NULLIF(msn.rejection_reason, '') AS rejection_reason,
+               CASE WHEN msn.dispatched = 1 THEN COALESCE(msn.dispatch_date, CURDATE()) END AS dispatched_at
+        FROM module_serial_numbers msn
+        JOIN pdi_batches pb ON pb.id = msn.pdi_batch_id
+        JOIN master_orders mo ON mo.id = pb.order_id
+    """),
+    ('rejected_modules', ('company_id', 'rejected_sources', 'rejection_reason'), """
+        SELECT serial_number, company_id, 8 AS rejected_sources, NULLIF(reason, '') AS rejection_reason
+        FROM rejected_modules
+    """),
+    ('ftr_packed_modules', ('company_id', 'packed_at'), """
+        SELECT serial_number, company_id, packed_date AS packed_at FROM ftr_packed_modules
+    """),
+    ('mrp_dispatch_cache', ('pallet_no', 'packed_at', 'dispatch_party', 'dispatched_at'), """
+        SELECT serial_number, pallet_no, COALESCE(dispatch_date, synced_at) AS packed_at,
+               NULLIF(dispatch_party, '') AS dispatch_party,
+               CASE WHEN COALESCE(dispatch_party, '') != '' THEN dispatch_date END AS dispatched_at
+        FROM mrp_dispatch_cache
+    """),
+)
+
+
+def _rejection_flags(source):
+    """rejected_sources after an upsert from `source`: its own bit replaced, other sources' kept"""
+    return f"((rejected_sources & ~{REJECTION_SOURCES[source]}) | VALUES(rejected_sources))"
+
+
+def _assignment(column, replace, source):
+    if column == 'rejected_sources':
+        return f"rejected_sources = {_rejection_flags(source)}"
+    if column == 'rejection_reason' and source in REJECTION_SOURCES:
+        # The flags expression is idempotent, so it reads the same before or after the assignment above
+        return (f"rejection_reason = CASE WHEN {_rejection_flags(source)} = 0 THEN NULL "
+                f"ELSE COALESCE(VALUES(rejection_reason), rejection_reason) END")
+    if column in replace:
+        return f"{column} = VALUES({column})"
+    return f"{column} = COALESCE(VALUES({column}), {column})"
+
+
+def _update_clause(columns, replace, source):
+    return ', '.join([_assignment(column, replace, source) for column in columns]
+                     + ['last_source = VALUES(last_source)'])
+
+
+def _upsert_sql(columns, source, replace=(), placeholder=':{}'):
+    names = ('serial_number',) + columns + ('last_source',)
+    return f"""
+        INSERT INTO serial_registry ({', '.join(names)})
+        VALUES ({', '.join(placeholder.format(name) for name in names)})
+        ON DUPLICATE KEY UPDATE {_update_clause(columns, replace, source)}
+    """
+
+
+def _withdraw_rejection(source):
+    """SET assignments that take one source's rejection back"""
+    bit = REJECTION_SOURCES[source]
+    return (f"rejected_sources = rejected_sources & ~{bit}, "
+            f"rejection_reason = CASE WHEN (rejected_sources & ~{bit}) = 0 THEN NULL ELSE rejection_reason END")
+
+
+def ensure_serial_registry():
+    """Create serial_registry and fill an empty one from the source tables"""
+    try:
+        with db.engine.connect() as conn:
+            existing = {row[0] for row in conn.execute(text("SHOW TABLES LIKE 'serial_registry'"))}
+            if existing:
+                columns = {row[0] for row in conn.execute(text("SHOW COLUMNS FROM serial_registry"))}
+                if 'rejected_sources' not in columns:
+                    # Built before per-source rejection flags: rebuilt from the source tables
+                    conn.execute(text("DROP TABLE serial_registry"))
+            conn.execute(text(CREATE_STATEMENT))
+            conn.commit()
+        _backfill()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[SerialRegistry] Could not prepare serial registry: {e}")
+
+
+def _backfill():
+    # Named lock on its own connection - a second process starting at the same time skips
+    # the fill another process is running instead of blocking its boot on it. (FOR UPDATE on
+    # an empty table only takes gap locks, which do not conflict, so both processes would fill.)
+    with db.engine.connect() as lock:
+        if not lock.execute(text("SELECT GET_LOCK('serial_registry_backfill', :wait)"),
+                            {'wait': BACKFILL_LOCK_WAIT}).scalar():
+            print("[SerialRegistry] Backfill already running in another process, skipped")
+            return
+        try:
+            if db.session.execute(text("SELECT serial_number FROM serial_registry LIMIT 1")).fetchone():
+                db.session.commit()
+                return
+            _fill_from_sources()
+        finally:
+            lock.execute(text("SELECT RELEASE_LOCK('serial_registry_backfill')"))
+
+
+def _fill_from_sources():
+    for source, columns, select in BACKFILL_SOURCES:
+        try:
+            db.session.execute(text("SAVEPOINT registry_source"))
+            db.session.execute(text(f"""
+                INSERT INTO serial_registry (serial_number, {', '.join(columns)}, last_source)
+                SELECT src.serial_number, {', '.join(f'src.{column}' for column in columns)}, '{source}'
+                FROM ({select}) src
+                WHERE src.serial_number IS NOT NULL AND src.serial_number != ''
+                ON DUPLICATE KEY UPDATE {_update_clause(columns, (), source)}
+            """))
+            db.session.execute(text("RELEASE SAVEPOINT registry_source"))
+        except Exception as e:
+            # Source tables created on first use may not exist yet
+            db.session.execute(text("ROLLBACK TO SAVEPOINT registry_source"))
+            print(f"[SerialRegistry] Skipped {source}: {e}")
+    db.session.commit()
+
+
+def record_serials(source, rows, replace=(), cursor=None):
+    """
+    Upsert facts about serials: rows are dicts with serial_number plus any
+    REGISTRY_COLUMNS, and is_rejected for the REJECTION_SOURCES (sets or clears
+    that source's rejection only). Runs in the caller's transaction - db.session,
+    or the DB-API `cursor` of paths that write through a raw pymysql connection.
+    """
+    groups = {}
+    for row in rows:
+        serial = str(row.get('serial_number') or '').strip()
+        if not serial:
+            continue
+        if 'is_rejected' in row:
+            row = dict(row, rejected_sources=REJECTION_SOURCES[source] if row['is_rejected'] else 0,
+                       rejection_reason=row.get('rejection_reason'))
+        columns = tuple(column for column in REGISTRY_COLUMNS if column in row)
+        values = {column: row[column] for column in columns}
+        values.update(serial_number=serial, last_source=source)
+        groups.setdefault(columns, []).append(values)
+
+    for columns, values in groups.items():
+        if cursor is not None:
+            cursor.executemany(_upsert_sql(columns, source, replace, placeholder='%({})s'), values)
+        else:
+            db.session.execute(text(_upsert_sql(columns, source, replace)), values)
+
+
+def record_dispatch_cache(cursor, serial_numbers):
+    """
+    Copy the dispatch facts of `serial_numbers` from their mrp_dispatch_cache rows into
+    the registry, for writers that upsert the cache with raw SQL (sync scripts).
+    Runs on the caller's DB-API cursor, in its transaction.
+    """
+    source, columns, select = next(entry for entry in BACKFILL_SOURCES if entry[0] == 'mrp_dispatch_cache')
+    serials = list(dict.fromkeys(s for s in serial_numbers if s))
+    for start in range(0, len(serials), LOOKUP_CHUNK_SIZE):
+        chunk = serials[start:start + LOOKUP_CHUNK_SIZE]
+        cursor.execute(f"""
+            INSERT INTO serial_registry (serial_number, {', '.join(columns)}, last_source)
+            SELECT src.serial_number, {', '.join(f'src.{column}' for column in columns)}, '{source}'
+            FROM ({select} WHERE serial_number IN ({', '.join(['%s'] * len(chunk))})) src
+            ON DUPLICATE KEY UPDATE {_update_clause(columns, DISPATCH_REGISTRY_REPLACE, source)}
+        """, chunk)
+
+
+def unassign_pdi(company_id, pdi_number, serial_number=None):
+    """Take a PDI assignment back (all serials of the PDI, or one)"""
+    query = """
+        UPDATE serial_registry SET pdi_number = NULL, last_source = 'ftr_master_serials'
+        WHERE company_id = :company_id AND pdi_number = :pdi_number
+    """
+    params = {'company_id': company_id, 'pdi_number': pdi_number}
+    if serial_number:
+        query += " AND serial_number = :serial_number"
+        params['serial_number'] = serial_number
+    db.session.execute(text(query), params)
+
+
+def forget_master_modules(order_id, serial_number=None):
+    """Clear what master_modules contributed for a deleted order (or one deleted module)"""
+    query = f"""
+        UPDATE serial_registry SET master_order_id = NULL, {_withdraw_rejection('master_modules')},
+            last_source = 'master_modules'
+        WHERE master_order_id = :order_id
+    """
+    params = {'order_id': order_id}
+    if serial_number:
+        query += " AND serial_number = :serial_number"
+        params['serial_number'] = serial_number
+    db.session.execute(text(query), params)
+
+
+def forget_pdi_batches(batches):
+    """Clear what module_serial_numbers contributed for deleted PDI batches (before the delete)"""
+    for batch in batches:
+        db.session.execute(text(f"""
+            UPDATE serial_registry SET
+                pdi_number = CASE WHEN pdi_number = :pdi_number THEN NULL ELSE pdi_number END,
+                {_withdraw_rejection('module_serial_numbers')},
+                pdi_batch_id = NULL, last_source = 'module_serial_numbers'
+            WHERE pdi_batch_id = :batch_id
+        """), {'batch_id': batch.id, 'pdi_number': batch.pdi_number})
+
+
+def _registry_dict(row):
+    return {
+        'serial_number': row.serial_number,
+        'company_id': row.company_id,
+        'company_name': row.company_name,
+        'lifecycle_state': row.lifecycle_state,
+        'master_order_id': row.master_order_id,
+        'pdi_batch_id': row.pdi_batch_id,
+        'pdi_number': row.pdi_number,
+        'binning': row.binning,
+        'class_status': row.class_status,
+        'pmax': float(row.pmax) if row.pmax is not None else None,
+        'is_rejected': bool(row.is_rejected),
+        'rejected_by': [source for source, bit in REJECTION_SOURCES.items() if row.rejected_sources & bit],
+        'rejection_reason': row.rejection_reason,
+        'pallet_no': row.pallet_no,
+        'packed_at': str(row.packed_at) if row.packed_at else None,
+        'dispatch_party': row.dispatch_party,
+        'dispatched_at': str(row.dispatched_at) if row.dispatched_at else None,
+        'last_source': row.last_source
+    }
+
+
+def _range_dict(serial_number, serial_range):
+    """Registry-shaped dict for a generated range serial that has no registry row"""
+    return {
+        'serial_number': serial_number, 'company_id': None, 'company_name': None,
+        'lifecycle_state': 'registered', 'master_order_id': None,
+        'pdi_batch_id': serial_range.pdi_batch_id, 'pdi_number': None, 'binning': None,
+        'class_status': None, 'pmax': None, 'is_rejected': False, 'rejected_by': [], 'rejection_reason': None,
+        'pallet_no': None, 'packed_at': None, 'dispatch_party': None, 'dispatched_at': None,
+        'last_source': 'pdi_serial_ranges'
+    }
+
+
+def lookup_serials(serial_numbers, ranges=True):
+    """{serial: registry dict} for the known serials, primary-key reads in chunks of 1000"""
+    serials = list(dict.fromkeys(s for s in serial_numbers if s))
+    found = {}
+    stmt = text("""
+        SELECT r.*, c.company_name
+        FROM serial_registry r
+        LEFT JOIN companies c ON c.id = r.company_id
+        WHERE r.serial_number IN :serials
+    """).bindparams(bindparam('serials', expanding=True))
+    for start in range(0, len(serials), LOOKUP_CHUNK_SIZE):
+        for row in db.session.execute(stmt, {'serials': serials[start:start + LOOKUP_CHUNK_SIZE]}):
+            found[row.serial_number] = _registry_dict(row)
+    if ranges:
+        # Generated serials get their batch from the covering range until they have a row
+        # there; only serials in range format cost a query (one indexed range lookup each)
+        for serial in serials:
+            if serial not in found or found[serial]['pdi_batch_id'] is None:
+                serial_range = range_covering(serial)
+                if serial_range and serial in found:
+                    found[serial]['pdi_batch_id'] = serial_range.pdi_batch_id
+                elif serial_range:
+                    found[serial] = _range_dict(serial, serial_range)
+    return found
+
+
+def lookup_serial(serial_number):
+    """Registry dict of one serial, None if no source knows it"""
+    return lookup_serials([serial_number]).get(serial_number)
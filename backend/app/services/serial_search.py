@@ -0,0 +1,182 @@
+"""
+Serial Search Helpers - keyset pagination, indexed serial matching and
+capped/approximate totals for large serial tables
+(ftr_master_serials, mrp_dispatch_cache, master_modules)
+"""
+import re
+import json
+import base64
+from sqlalchemy import text
+from app.models.database import db
+
+# Exact COUNT(*) is only run up to this many rows, above it the optimizer estimate is used
+EXACT_COUNT_LIMIT = 10000
+MAX_PAGE_SIZE = 1000
+
+# Tables that get a stored REVERSE(serial_number) column so suffix search can use an index
+SERIAL_SEARCH_TABLES = {
+    'ftr_master_serials': [
+        "ALTER TABLE ftr_master_serials ADD COLUMN serial_reversed VARCHAR(100) AS (REVERSE(serial_number)) STORED",
+        "ALTER TABLE ftr_master_serials ADD INDEX idx_serial_rev (company_id, serial_reversed)",
+        "ALTER TABLE ftr_master_serials ADD INDEX idx_company_keyset (company_id, id)",
+    ],
+    'mrp_dispatch_cache': [
+        "ALTER TABLE mrp_dispatch_cache ADD COLUMN serial_reversed VARCHAR(100) AS (REVERSE(serial_number)) STORED",
+        "ALTER TABLE mrp_dispatch_cache ADD INDEX idx_serial_rev (serial_reversed)",
+        "ALTER TABLE mrp_dispatch_cache ADD INDEX idx_synced_keyset (synced_at, id)",
+    ],
+}
+
+_search_columns_ready = set()
+
+# MySQL errors for a column / index that an earlier start already added
+DUPLICATE_COLUMN = 1060
+DUPLICATE_INDEX = 1061
+
+MATCH_MODES = ('auto', 'prefix', 'suffix', 'exact', 'contains')
+
+
+def _error_code(error):
+    """MySQL error number of a (SQLAlchemy wrapped) driver error"""
+    args = getattr(getattr(error, 'orig', error), 'args', ())
+    return args[0] if args else None
+
+
+def ensure_serial_search_columns(table_name):
+    """
+    Add the reversed-serial column and keyset indexes to one table (idempotent).
+    Only "already exists" errors are ignored, any other failure leaves the
+    table unmarked so searches fall back to plain LIKE.
+    """
+    statements = SERIAL_SEARCH_TABLES.get(table_name, [])
+    try:
+        with db.engine.connect() as conn:
+            existing = {row[0] for row in conn.execute(text(f"SHOW COLUMNS FROM {table_name}"))}
+            for stmt in statements:
+                if 'ADD COLUMN serial_reversed' in stmt and 'serial_reversed' in existing:
+                    continue
+                try:
+                    conn.execute(text(stmt))
+                except Exception as e:
+                    if _error_code(e) not in (DUPLICATE_COLUMN, DUPLICATE_INDEX):
+                        raise
+            conn.commit()
+        _search_columns_ready.add(table_name)
+        return True
+    except Exception as e:
+        print(f"[SerialSearch] Could not prepare {table_name}: {e}")
+        return False
+
+
+def ensure_serial_search_tables():
+    """Prepare every existing SERIAL_SEARCH_TABLES table, run once at startup"""
+    try:
+        with db.engine.connect() as conn:
+            tables = {row[0] for row in conn.execute(text("SHOW TABLES"))}
+    except Exception as e:
+        print(f"[SerialSearch] Could not list tables: {e}")
+        return
+    for table_name in SERIAL_SEARCH_TABLES:
+        if table_name in tables:
+            ensure_serial_search_columns(table_name)
+
+
+def serial_search_ready(table_name):
+    """True once the reversed-serial column of a table is in place (no DDL)"""
+    return table_name in _search_columns_ready
+
+
+def escape_like(term):
+    """Escape LIKE wildcards so user input is matched literally"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def resolve_match_mode(term, match='auto'):
+    """
+    Pick a search mode that can use an index.
+    auto: a term starting with a letter is a serial prefix (e.g. GS0489...),
+    a purely numeric term is the running number at the end of the serial.
+    """
+    match = (match or 'auto').lower()
+    if match not in MATCH_MODES:
+        match = 'auto'
+    if match != 'auto':
+        return match
+    if re.match(r'^[A-Za-z]', term):
+        return 'prefix'
+    return 'suffix'
+
+
+def serial_filter(term, match='auto', column='serial_number', reversed_column='serial_reversed',
+                  param='serial_search'):
+    """
+    Build an SQL condition + params for a serial search.
+    prefix/exact use the serial index, suffix uses the reversed-serial index,
+    contains falls back to a scan and should only be used on already narrowed sets.
+    """
+    term = (term or '').strip()
+    if not term:
+        return '', {}, None
+
+    mode = resolve_match_mode(term, match)
+    escaped = escape_like(term)
+
+    if mode == 'exact':
+        return f"{column} = :{param}", {param: term}, mode
+    if mode == 'prefix':
+        return f"{column} LIKE :{param}", {param: f"{escaped}%"}, mode
+    if mode == 'suffix':
+        if reversed_column:
+            return f"{reversed_column} LIKE :{param}", {param: f"{escape_like(term[::-1])}%"}, mode
+        return f"{column} LIKE :{param}", {param: f"%{escaped}"}, mode
+    return f"{column} LIKE :{param}", {param: f"%{escaped}%"}, mode
+
+
+def encode_cursor(values):
+    """Encode the last row's sort key into an opaque URL-safe cursor"""
+    raw = json.dumps(values, default=str, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def decode_cursor(cursor):
+    """Decode a cursor from encode_cursor, returns None for missing/invalid cursors"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        return json.loads(base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8'))
+    except Exception:
+        return None
+
+
+def parse_page_size(value, default=100):
+    """Clamp a requested page size to 1..MAX_PAGE_SIZE"""
+    try:
+        size = int(value)
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, MAX_PAGE_SIZE))
+
+
+def count_rows(from_where, params, limit=EXACT_COUNT_LIMIT):
+    """
+    Count rows for "FROM ... WHERE ..." without scanning everything.
+    Counts exactly up to `limit` rows; past that returns the optimizer's
+    row estimate from EXPLAIN and exact=False.
+    """
+    capped = db.session.execute(
+        text(f"SELECT COUNT(*) FROM (SELECT 1 {from_where} LIMIT :_count_cap) AS capped"),
+        {**params, '_count_cap': limit + 1}
+    ).scalar() or 0
+
+    if capped <= limit:
+        return capped, True
+
+    estimate = capped
+    try:
+        plan = db.session.execute(text(f"EXPLAIN SELECT 1 {from_where}"), params).mappings().fetchall()
+        if plan:
+            estimate = max(int(plan[0].get('rows') or 0), capped)
+    except Exception as e:
+        print(f"[SerialSearch] EXPLAIN estimate failed: {e}")
+    return estimate, False
@@ -0,0 +1,368 @@
+"""
+Material Stock Ledger - append-only running balances per material and company
+
+Every stock movement of a COC material is appended to material_stock_ledger:
+- receipt       a new COC synced from the COC API (received_qty = coc_qty)
+- adjustment    a synced COC whose coc_qty changed (received_qty = the difference)
+- consumption   FIFO allocation of a production entry (consumed_qty per COC)
+
+company_name is the stock owner (coc_documents.company_name); the company the
+material was consumed for is kept in consumer. Each row carries the running
+balance of its (material, company) after the movement, and
+material_stock_balance holds the current balance of each pair - readers get a
+balance row instead of summing coc_documents / material_consumption history.
+
+entry_date is the day the movement was booked, so it only grows with id and the
+balance on a date is the last row booked up to that day (balances_as_of).
+movement_date is the invoice / production date of the movement.
+
+Postings run inside the caller's transaction: the balance rows are updated first
+(INSERT ... ON DUPLICATE KEY UPDATE, which row-locks them), so concurrent postings
+to the same pair are serialized and their running balances never interleave.
+
+The first start after the ledger is added replays the existing COCs and
+material_consumption rows into it (ensure_stock_ledger).
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+from sqlalchemy import text, bindparam
+from app.models.database import db
+
+CREATE_STATEMENTS = (
+    """
+    CREATE TABLE IF NOT EXISTS material_stock_ledger (
+        id BIGINT PRIMARY KEY AUTO_INCREMENT,
+        material_name VARCHAR(100) NOT NULL,
+        company_name VARCHAR(100) NOT NULL COMMENT 'Stock owner (coc_documents.company_name)',
+        entry_type VARCHAR(20) NOT NULL COMMENT 'receipt / adjustment / consumption',
+        entry_date DATE NOT NULL COMMENT 'Day the movement was booked',
+        movement_date DATE NULL COMMENT 'Invoice date / production date',
+        received_qty DECIMAL(14,2) NOT NULL DEFAULT 0,
+        consumed_qty DECIMAL(14,2) NOT NULL DEFAULT 0,
+        balance_received DECIMAL(14,2) NOT NULL,
+        balance_consumed DECIMAL(14,2) NOT NULL,
+        balance_available DECIMAL(14,2) NOT NULL,
+        coc_id INT NULL,
+        consumer VARCHAR(100) NULL COMMENT 'Company the material was consumed for',
+        reference VARCHAR(200) NULL COMMENT 'COC lot / invoice',
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_stock_key (material_name, company_name, id),
+        INDEX idx_company_key (company_name, material_name, id),
+        INDEX idx_entry_date (entry_date),
+        INDEX idx_movement (entry_type, movement_date)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Append-only COC material stock movements'
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS material_stock_balance (
+        id INT PRIMARY KEY AUTO_INCREMENT,
+        material_name VARCHAR(100) NOT NULL,
+        company_name VARCHAR(100) NOT NULL,
+        received_qty DECIMAL(14,2) NOT NULL DEFAULT 0,
+        consumed_qty DECIMAL(14,2) NOT NULL DEFAULT 0,
+        available_qty DECIMAL(14,2) GENERATED ALWAYS AS (received_qty - consumed_qty) STORED,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP,
+        UNIQUE KEY unique_stock_key (material_name, company_name),
+        INDEX idx_company (company_name)
+    ) ENGINE=InnoDB DEFAULT CHARSET=utf8mb4 COMMENT='Current stock per material and company'
+    """,
+)
+
+LEDGER_COLUMNS = (
+    'material_name', 'company_name', 'entry_type', 'entry_date', 'movement_date',
+    'received_qty', 'consumed_qty', 'balance_received', 'balance_consumed', 'balance_available',
+    'coc_id', 'consumer', 'reference'
+)
+
+INSERT_CHUNK_SIZE = 1000
+BACKFILL_LOCK_WAIT = 2  # seconds; a held lock means another process is replaying
+
+ZERO = Decimal('0.00')
+
+
+def _qty(value):
+    return Decimal(str(value or 0)).quantize(Decimal('0.01'))
+
+
+def _day(value, default):
+    if not value:
+        return default
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value if type(value) is date else value.date()
+
+
+def _key(material, company):
+    # material_stock_balance compares names like MySQL does: case-insensitive, no trailing spaces
+    return (str(material).rstrip().lower(), str(company).rstrip().lower())
+
+
+def ensure_stock_ledger():
+    """Create the ledger tables and replay existing stock into an empty ledger"""
+    try:
+        with db.engine.connect() as conn:
+            for stmt in CREATE_STATEMENTS:
+                conn.execute(text(stmt))
+            conn.commit()
+        _backfill()
+    except Exception as e:
+        db.session.rollback()
+        print(f"[StockLedger] Could not prepare stock ledger: {e}")
+
+
+def _backfill():
+    """Replay into an empty ledger, one process at a time"""
+    # Named lock on its own connection - a second process starting at the same time skips
+    # the replay another process is running instead of blocking its boot on it. (FOR UPDATE
+    # on an empty table only takes gap locks, which do not conflict, so both would replay.)
+    with db.engine.connect() as lock:
+        if not lock.execute(text("SELECT GET_LOCK('stock_ledger_backfill', :wait)"),
+                            {'wait': BACKFILL_LOCK_WAIT}).scalar():
+            print("[StockLedger] Backfill already running in another process, skipped")
+            return
+        try:
+            if db.session.execute(text("SELECT id FROM material_stock_ledger LIMIT 1")).fetchone():
+                db.session.commit()
+                return
+            _replay()
+        finally:
+            lock.execute(text("SELECT RELEASE_LOCK('stock_ledger_backfill')"))
+
+
+def _replay():
+    """Replay active COCs and logged consumption into the ledger (one transaction)"""
+    cocs = db.session.execute(text("""
+        SELECT id, material_name, company_name, coc_qty, consumed_qty, invoice_date,
+               lot_batch_no, invoice_no
+        FROM coc_documents
+        WHERE is_active = 1
+    """)).fetchall()
+    consumption = db.session.execute(text("""
+        SELECT mc.coc_id, mc.production_date, mc.consumed_quantity, mc.company_name, mc.lot_number
+        FROM material_consumption mc
+        JOIN coc_documents cd ON cd.id = mc.coc_id
+        WHERE cd.is_active = 1
+        ORDER BY mc.production_date, mc.id
+    """)).fetchall()
+
+    today = date.today()
+    movements = []
+    logged = {}
+    coc_by_id = {}
+    for row in cocs:
+        coc_by_id[row[0]] = row
+        movements.append((_day(row[5], today), 0, row[0], {
+            'material': row[1], 'company': row[2], 'entry_type': 'receipt', 'received': row[3],
+            'coc_id': row[0], 'movement_date': row[5], 'reference': f"{row[6]} (Invoice: {row[7]})"
+        }))
+    for pos, row in enumerate(consumption):
+        coc = coc_by_id[row[0]]
+        logged[row[0]] = logged.get(row[0], ZERO) + _qty(row[2])
+        movements.append((_day(row[1], today), 1, pos, {
+            'material': coc[1], 'company': coc[2], 'entry_type': 'consumption', 'consumed': row[2],
+            'coc_id': row[0], 'movement_date': row[1], 'consumer': row[3], 'reference': row[4]
+        }))
+    movements.sort(key=lambda m: (min(m[0], today), m[1], m[2]))
+
+    entries = [m[3] for m in movements]
+    # consumed_qty edited outside production saves - book the difference so balances match coc_documents
+    for coc in cocs:
+        difference = _qty(coc[4]) - logged.get(coc[0], ZERO)
+        if difference:
+            entries.append({
+                'material': coc[1], 'company': coc[2], 'entry_type': 'adjustment', 'consumed': difference,
+                'coc_id': coc[0], 'reference': 'Consumption not in material_consumption'
+            })
+
+    # Booking dates follow the replay order, capped at today
+    for (day, _, _, entry) in movements:
+        entry['entry_date'] = min(day, today)
+    post_stock_entries(entries)
+    db.session.commit()
+    print(f"[StockLedger] Replayed {len(entries)} stock movements")
+
+
+def post_stock_entries(entries):
+    """
+    Append stock movements to the ledger in the current transaction (caller commits).
+
+    entries: [{material, company, entry_type, received=0, consumed=0, movement_date=None,
+               coc_id=None, consumer=None, reference=None, entry_date=today}]
+    """
+    if not entries:
+        return
+
+    deltas = {}
+    for entry in entries:
+        key = _key(entry['material'], entry['company'])
+        names, received, consumed = deltas.get(key, ((entry['material'], entry['company']), ZERO, ZERO))
+        deltas[key] = (names, received + _qty(entry.get('received')), consumed + _qty(entry.get('consumed')))
+
+    # Apply the totals to the balance rows first - this locks them until the caller commits
+    db.session.execute(text("""
+        INSERT INTO material_stock_balance (material_name, company_name, received_qty, consumed_qty)
+        VALUES (:material, :company, :received, :consumed)
+        ON DUPLICATE KEY UPDATE
+            received_qty = received_qty + VALUES(received_qty),
+            consumed_qty = consumed_qty + VALUES(consumed_qty)
+    """), [{'material': names[0], 'company': names[1], 'received': received, 'consumed': consumed}
+           for names, received, consumed in deltas.values()])
+
+    heads = {}
+    query = text("""
+        SELECT material_name, company_name, received_qty, consumed_qty
+        FROM material_stock_balance
+        WHERE (material_name, company_name) IN :keys
+    """).bindparams(bindparam('keys', expanding=True))
+    for row in db.session.execute(query, {'keys': [names for names, _, _ in deltas.values()]}).fetchall():
+        key = _key(row[0], row[1])
+        if key in deltas:
+            heads[key] = (row[0], row[1], _qty(row[2]), _qty(row[3]))
+
+    # Running balances: start from the balance before this batch and walk forward
+    running = {}
+    for key, (names, received, consumed) in deltas.items():
+        material, company, head_received, head_consumed = heads[key]
+        running[key] = (material, company, head_received - received, head_consumed - consumed)
+
+    today = date.today()
+    rows = []
+    for entry in entries:
+        key = _key(entry['material'], entry['company'])
+        material, company, received, consumed = running[key]
+        received += _qty(entry.get('received'))
+        consumed += _qty(entry.get('consumed'))
+        running[key] = (material, company, received, consumed)
+        rows.append({
+            'material_name': material,
+            'company_name': company,
+            'entry_type': entry['entry_type'],
+            'entry_date': entry.get('entry_date') or today,
+            'movement_date': entry.get('movement_date'),
+            'received_qty': _qty(entry.get('received')),
+            'consumed_qty': _qty(entry.get('consumed')),
+            'balance_received': received,
+            'balance_consumed': consumed,
+            'balance_available': received - consumed,
+            'coc_id': entry.get('coc_id'),
+            'consumer': entry.get('consumer'),
+            'reference': (entry.get('reference') or '')[:200] or None
+        })
+
+    insert_query = text(f"""
+        INSERT INTO material_stock_ledger ({', '.join(LEDGER_COLUMNS)})
+        VALUES ({', '.join(':' + c for c in LEDGER_COLUMNS)})
+    """)
+    for i in range(0, len(rows), INSERT_CHUNK_SIZE):
+        db.session.execute(insert_query, rows[i:i + INSERT_CHUNK_SIZE])
+
+
+def _balance_dict(row):
+    return {
+        'material': row[0],
+        'company': row[1],
+        'received': float(row[2]) if row[2] else 0,
+        'consumed': float(row[3]) if row[3] else 0,
+        'available': float(row[4]) if row[4] else 0
+    }
+
+
+def current_balances(company_name=None, material_name=None):
+    """Current balance rows [{material, company, received, consumed, available}]"""
+    query = """
+        SELECT material_name, company_name, received_qty, consumed_qty, available_qty
+        FROM material_stock_balance
+        WHERE 1 = 1
+    """
+    params = {}
+    if company_name:
+        query += " AND company_name = :company"
+        params['company'] = company_name
+    if material_name:
+        query += " AND material_name = :material"
+        params['material'] = material_name
+    query += " ORDER BY material_name, company_name"
+    return [_balance_dict(row) for row in db.session.execute(text(query), params).fetchall()]
+
+
+def _first_id_after(day, conn):
+    """id of the first ledger row booked after `day` (None if nothing was)"""
+    row = conn.execute(text("""
+        SELECT id FROM material_stock_ledger
+        WHERE entry_date > :day
+        ORDER BY entry_date, id
+        LIMIT 1
+    """), {'day': day}).fetchone()
+    return row[0] if row else None
+
+
+def balances_as_of(as_of, company_name=None, material_name=None, conn=None):
+    """
+    Balance rows as booked at the end of day `as_of` (date or 'YYYY-MM-DD').
+
+    Reads the last ledger row of each (material, company) booked up to that day:
+    entry_date grows with id, so the first id booked after the day bounds the
+    per-pair MAX(id) lookup on idx_stock_key / idx_company_key.
+    conn: a Connection to run on (default db.session).
+    """
+    conn = conn or db.session
+    before_id = _first_id_after(as_of, conn)
+
+    inner = "SELECT MAX(id) AS id FROM material_stock_ledger WHERE 1 = 1"
+    params = {}
+    if before_id is not None:
+        inner += " AND id < :before_id"
+        params['before_id'] = before_id
+    if company_name:
+        inner += " AND company_name = :company"
+        params['company'] = company_name
+    if material_name:
+        inner += " AND material_name = :material"
+        params['material'] = material_name
+    inner += " GROUP BY material_name, company_name"
+
+    query = text(f"""
+        SELECT l.material_name, l.company_name, l.balance_received, l.balance_consumed, l.balance_available
+        FROM material_stock_ledger l
+        JOIN ({inner}) last_entry ON last_entry.id = l.id
+        ORDER BY l.material_name, l.company_name
+    """)
+    return [_balance_dict(row) for row in conn.execute(query, params).fetchall()]
+
+
+def movements_between(from_date, to_date, company_name=None, conn=None):
+    """
+    Received / consumed per material booked from `from_date` to `to_date` (inclusive)
+    -> {material: {received, consumed}}. Bounded to the ids booked in the window.
+    """
+    conn = conn or db.session
+    first_id = _first_id_after(_day(from_date, None) - timedelta(days=1), conn)
+    if first_id is None:
+        return {}
+    query = """
+        SELECT material_name, SUM(received_qty), SUM(consumed_qty)
+        FROM material_stock_ledger
+        WHERE id >= :first_id
+    """
+    params = {'first_id': first_id}
+    before_id = _first_id_after(to_date, conn)
+    if before_id is not None:
+        query += " AND id < :before_id"
+        params['before_id'] = before_id
+    if company_name:
+        query += " AND company_name = :company"
+        params['company'] = company_name
+    query += " GROUP BY material_name"
+    return {
+        row[0]: {'received': float(row[1] or 0), 'consumed': float(row[2] or 0)}
+        for row in conn.execute(text(query), params).fetchall()
+    }
+
+
+def pool_by_material(balances):
+    """Sum balance rows of all companies per material (shared pool) -> {material: {received, consumed, available}}"""
+    pool = {}
+    for row in balances:
+        totals = pool.setdefault(row['material'], {'received': 0, 'consumed': 0, 'available': 0})
+        for field in ('received', 'consumed', 'available'):
+            totals[field] += row[field]
+    return pool
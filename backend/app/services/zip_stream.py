@@ -0,0 +1,71 @@
+"""
+Streaming ZIP writer
+
+stream_zip() yields the bytes of a ZIP archive while its entries are still being
+produced: each entry is compressed into a small in-memory buffer that is handed
+to the response as soon as it fills up, so nothing is staged on disk and the
+client starts receiving the bundle after the first artifact is ready.
+
+Entries are (arcname, content) pairs from any iterable - typically a generator
+that renders one artifact at a time. content may be
+- bytes
+- a file path (copied in chunks)
+- a callable taking a writable file object (writes the entry itself)
+
+The archive uses data descriptors (sizes after each entry), which every common
+unzip tool and the Python zipfile module read without problems.
+"""
+import io
+import os
+import zipfile
+
+CHUNK_SIZE = 64 * 1024
+
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only, non-seekable sink collecting zip output until it is drained"""
+
+    def __init__(self):
+        self._chunks = []
+        self.size = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self.size += len(data)
+        return len(data)
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        self.size = 0
+        return data
+
+
+def stream_zip(entries, compression=zipfile.ZIP_DEFLATED, chunk_size=CHUNK_SIZE):
+    """Generator of ZIP archive bytes for (arcname, content) entries"""
+    sink = _ChunkSink()
+    with zipfile.ZipFile(sink, 'w', compression=compression, allowZip64=True) as zf:
+        for arcname, content in entries:
+            with zf.open(arcname, 'w') as dest:
+                if callable(content):
+                    content(dest)
+                elif isinstance(content, (bytes, bytearray, memoryview)):
+                    view = memoryview(content)
+                    for offset in range(0, len(view), chunk_size):
+                        dest.write(view[offset:offset + chunk_size])
+                        if sink.size >= chunk_size:
+                            yield sink.drain()
+                else:
+                    with open(os.fspath(content), 'rb') as src:
+                        for block in iter(lambda: src.read(chunk_size), b''):
+                            dest.write(block)
+                            if sink.size >= chunk_size:
+                                yield sink.drain()
+            if sink.size:
+                yield sink.drain()
+    # Central directory
+    if sink.size:
+        yield sink.drain()
@@ -0,0 +1,76 @@
+"""
+Excel style benchmark - per-cell write cost of the styling approaches
+
+    cd backend && python benchmarks/excel_style_bench.py [cells]
+
+inline   new Font / PatternFill / Border / Alignment per cell (old generators)
+cached   shared style parts from app.services.excel_styles
+named    one registered named style per cell (excel_styles.apply_style)
+
+Prints microseconds per cell, save time and the size of the saved file.
+"""
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openpyxl import Workbook
+from openpyxl.styles import Font, PatternFill, Border, Side, Alignment
+from app.services import excel_styles as xs
+
+COLUMNS = 10
+
+xs.register_style('bench_cell', font=xs.font(bold=True, size=10), fill=xs.solid_fill('FFFF00'),
+                  border=xs.THIN_BORDER, alignment=xs.CENTER)
+
+
+def inline(ws, cells):
+    for i in range(cells):
+        c = ws.cell(row=i // COLUMNS + 1, column=i % COLUMNS + 1, value=i)
+        c.font = Font(bold=True, size=10)
+        c.fill = PatternFill(start_color='FFFF00', end_color='FFFF00', fill_type='solid')
+        c.border = Border(left=Side(style='thin'), right=Side(style='thin'),
+                          top=Side(style='thin'), bottom=Side(style='thin'))
+        c.alignment = Alignment(horizontal='center', vertical='center')
+
+
+def cached(ws, cells):
+    for i in range(cells):
+        c = ws.cell(row=i // COLUMNS + 1, column=i % COLUMNS + 1, value=i)
+        c.font = xs.font(bold=True, size=10)
+        c.fill = xs.solid_fill('FFFF00')
+        c.border = xs.THIN_BORDER
+        c.alignment = xs.CENTER
+
+
+def named(ws, cells):
+    for i in range(cells):
+        xs.apply_style(ws.cell(row=i // COLUMNS + 1, column=i % COLUMNS + 1, value=i), 'bench_cell')
+
+
+def run(fn, cells):
+    wb = Workbook()
+    start = time.perf_counter()
+    fn(wb.active, cells)
+    write = time.perf_counter() - start
+
+    buf = io.BytesIO()
+    start = time.perf_counter()
+    wb.save(buf)
+    save = time.perf_counter() - start
+    return write, save, buf.tell()
+
+
+def main():
+    cells = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    print(f"{cells} cells, {COLUMNS} columns")
+    print(f"{'approach':<8} {'us/cell':>9} {'write s':>9} {'save s':>8} {'file KB':>9}")
+    for fn in (inline, cached, named):
+        write, save, size = run(fn, cells)
+        print(f"{fn.__name__:<8} {write / cells * 1e6:>9.1f} {write:>9.2f} {save:>8.2f} {size / 1024:>9.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+PDF style benchmark - fixed setup cost of a small ReportLab report
+
+    cd backend && python benchmarks/pdf_style_bench.py [reports]
+
+fresh    getSampleStyleSheet() + new ParagraphStyles + logo decoded per report (old generators)
+cached   shared styles and decoded logo from app.services.pdf_styles
+
+Prints milliseconds per report for the setup alone and for setup + rendering a
+one-page report (header table with logo, title, 30-row table).
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PIL import Image as PILImage
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+from reportlab.lib.units import mm
+from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Image
+from app.services import pdf_styles
+
+ROWS = 30
+
+
+def make_logo(folder):
+    path = os.path.join(folder, 'logo.png')
+    img = PILImage.new('RGB', (900, 440), 'white')
+    for x in range(0, 900, 3):
+        for y in range(0, 440, 40):
+            img.putpixel((x, y), (x % 256, y % 256, 120))
+    img.save(path)
+    return path
+
+
+def fresh_setup(logo):
+    styles = getSampleStyleSheet()
+    title = ParagraphStyle('BenchTitle', parent=styles['Heading1'], fontSize=16,
+                           textColor=colors.HexColor('#1a237e'), alignment=TA_CENTER)
+    cell = ParagraphStyle('BenchCell', parent=styles['Normal'], fontSize=8, leading=10)
+    return styles, title, cell, Image(logo, width=45*mm, height=22*mm)
+
+
+def cached_setup(logo):
+    styles = pdf_styles.stylesheet()
+    title = pdf_styles.paragraph_style('BenchTitle', parent='Heading1', fontSize=16,
+                                       textColor=colors.HexColor('#1a237e'), alignment=TA_CENTER)
+    cell = pdf_styles.paragraph_style('BenchCell', fontSize=8, leading=10)
+    return styles, title, cell, pdf_styles.image(logo, width=45*mm, height=22*mm)
+
+
+def render(setup, logo):
+    styles, title, cell, logo_img = setup(logo)
+    buf = io.BytesIO()
+    doc = SimpleDocTemplate(buf, pagesize=A4)
+    header = Table([[logo_img, Paragraph('Gautam Solar Private Limited', title)]], colWidths=[50*mm, 120*mm])
+    rows = [[Paragraph(str(i), cell), Paragraph(f'Checkpoint {i}', cell), Paragraph('OK', cell)] for i in range(ROWS)]
+    table = Table(rows, colWidths=[20*mm, 100*mm, 50*mm])
+    table.setStyle(TableStyle([('GRID', (0, 0), (-1, -1), 0.5, colors.black)]))
+    doc.build([header, Paragraph('IPQC Report', styles['Heading2']), table])
+    return buf
+
+
+def timed(fn, reports):
+    start = time.perf_counter()
+    for _ in range(reports):
+        fn()
+    return (time.perf_counter() - start) / reports * 1000
+
+
+def main(reports):
+    with tempfile.TemporaryDirectory() as folder:
+        logo = make_logo(folder)
+        cached_setup(logo)  # first report pays the one-off cost
+        print(f"{'mode':>8} {'setup (ms)':>11} {'report (ms)':>12}")
+        for name, setup in (('fresh', fresh_setup), ('cached', cached_setup)):
+            # Setup alone does not touch the image data - include the decode a render would do
+            setup_ms = timed(lambda: setup(logo)[3]._img.getRGBData(), reports)
+            report_ms = timed(lambda: render(setup, logo), reports)
+            print(f"{name:>8} {setup_ms:>11.2f} {report_ms:>12.2f}")
+
+
+if __name__ == '__main__':
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 50)
@@ -0,0 +1,81 @@
+"""
+PDI documentation benchmark - peak memory and time of the 11-sheet workbook
+
+    cd backend && python benchmarks/pdi_docs_bench.py [modules ...]
+
+Builds the /pdi-docs/generate workbook (generated FTR values, no database) for
+PDIs of 1k / 5k / 20k modules by default, with the in-memory openpyxl workbook
+and with the streaming writer. Every run happens in a fresh process, so the
+peak RSS reported is the growth over the process after imports.
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_SIZES = [1000, 5000, 20000]
+MODULES_PER_DAY = 500
+
+
+def request_body(modules):
+    serials = [f"GS04875KG302250{i:06d}" for i in range(modules)]
+    days = []
+    for day, start in enumerate(range(0, modules, MODULES_PER_DAY)):
+        count = min(MODULES_PER_DAY, modules - start)
+        days.append({'date': f"2026-{1 + day // 28:02d}-{1 + day % 28:02d}",
+                     'day_production': count // 2, 'night_production': count - count // 2})
+    return {
+        'serial_numbers': serials,
+        'pdi_number': 'PDI-BENCH',
+        'party_name': 'Benchmark',
+        'production_days': days,
+        'report_date': '01/02/2026',
+    }
+
+
+def child(modules, backend):
+    """One measurement; prints a JSON line"""
+    import resource
+    sys.path.insert(0, BACKEND)
+    import contextlib
+    import io
+    with contextlib.redirect_stdout(io.StringIO()):
+        from app.routes.pdi_documentation_routes import build_pdi_documentation
+
+    body = request_body(modules)
+    random.seed(1)
+    base_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        buffer, _, counters = build_pdi_documentation(body, streaming=(backend == 'stream'))
+    elapsed = time.perf_counter() - start
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        'modules': modules,
+        'backend': backend,
+        'seconds': round(elapsed, 2),
+        'peak_mb': round((peak_kb - base_kb) / 1024, 1),
+        'file_kb': len(buffer.getvalue()) // 1024,
+        'sheets': len(body['production_days']) + 10,
+    }))
+
+
+def main(sizes):
+    print(f"{'modules':>8} {'backend':>8} {'sheets':>7} {'time (s)':>9} {'peak RSS (MB)':>14} {'file (KB)':>10}")
+    for modules in sizes:
+        for backend in ('memory', 'stream'):
+            out = subprocess.run([sys.executable, __file__, '--child', str(modules), backend],
+                                 capture_output=True, text=True, check=True).stdout
+            r = json.loads(out.strip().splitlines()[-1])
+            print(f"{r['modules']:>8} {r['backend']:>8} {r['sheets']:>7} {r['seconds']:>9} {r['peak_mb']:>14} {r['file_kb']:>10}")
+
+
+if __name__ == '__main__':
+    if len(sys.argv) > 1 and sys.argv[1] == '--child':
+        child(int(sys.argv[2]), sys.argv[3])
+    else:
+        main([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
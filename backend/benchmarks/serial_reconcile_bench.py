@@ -0,0 +1,275 @@
+"""
+Serial reconciliation benchmark - DB vs MRP serial set comparison at 500k serials
+
+    cd backend && python benchmarks/serial_reconcile_bench.py [serials ...]
+
+Generates a company's local PDI serials and the MRP packing / dispatch records
+for them (no database, no API): 60% dispatched, 25% packed, the rest not packed,
+plus 4% MRP-only serials and MRP barcodes in lower case for 1% of the matches.
+Each scenario runs the route code serial_reconcile replaced and the route code
+using it on the same data (best of RUNS) and prints both sets of counts, which
+agree. The old missing / binning code compared barcodes as-is and missed the
+lower-case ones; their baselines apply normalize_serial to both sides, i.e. the
+old set arithmetic with the shared normalisation and nothing else:
+
+- status    get_pdi_production_status: per-PDI dispatched / packed / not packed
+            serial lists and pallet groups, extra dispatched / extra packed
+- missing   check_missing_in_mrp + check_extra_in_mrp for one company
+- binning   local binning vs the binning in the MRP running order
+"""
+import gc
+import os
+import random
+import sys
+import time
+from operator import itemgetter
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND)
+
+from app.services.serial_reconcile import (  # noqa: E402
+    reconcile, keyed, normalize_serial, LEFT_ONLY, RIGHT_ONLY, MISMATCH, ALL_KINDS
+)
+
+DEFAULT_SIZES = [500000]
+RUNS = 3
+PDI_SIZE = 25000
+BINNINGS = ('I1', 'I2', 'I3')
+
+
+def make_data(serials):
+    random.seed(7)
+    local = [(f"GS04875KG30225{i:05d}", f"PDI-{i // PDI_SIZE + 1}", random.choice(BINNINGS))
+             for i in range(serials)]
+    dispatched, packed = {}, {}
+    for serial, _, binning in local:
+        roll = random.random()
+        mrp_serial = serial.lower() if random.random() < 0.01 else serial
+        mrp_binning = binning if random.random() < 0.98 else random.choice(BINNINGS)
+        record = {'barcode': mrp_serial, 'pallet_no': str(random.randint(1, 800)), 'party_name': 'NTPC',
+                  'running_order': f"R-{random.randint(1, 3)} i-{mrp_binning[1]}", 'status': 'Packed'}
+        if roll < 0.60:
+            dispatched[mrp_serial.upper()] = {'pallet_no': record['pallet_no'], 'dispatch_party': 'INV-1',
+                                              'vehicle_no': 'RJ14', 'date': '2026-03-01', 'status': 'Dispatched'}
+            packed[mrp_serial.upper()] = record
+        elif roll < 0.85:
+            packed[mrp_serial.upper()] = record
+    for i in range(serials // 25):
+        serial = f"GS04875KG30226{i:05d}"
+        record = {'barcode': serial, 'pallet_no': str(random.randint(800, 900)), 'party_name': 'NTPC',
+                  'running_order': 'R-1 i-2', 'status': 'Packed'}
+        packed[serial] = record
+        if i % 2:
+            dispatched[serial] = {'pallet_no': record['pallet_no'], 'dispatch_party': 'INV-2',
+                                  'vehicle_no': 'RJ14', 'date': '2026-03-02', 'status': 'Dispatched'}
+    return local, dispatched, packed
+
+
+def add_to_pallet(groups, pallet_no, status, serial):
+    pallet_key = pallet_no or 'Unknown'
+    if pallet_key not in groups:
+        groups[pallet_key] = {'pallet_no': pallet_key, 'status': status, 'count': 0, 'serials': []}
+    groups[pallet_key]['count'] += 1
+    if len(groups[pallet_key]['serials']) < 50:
+        groups[pallet_key]['serials'].append(serial)
+
+
+def new_pdi_data():
+    return {'dispatched': 0, 'packed': 0, 'not_packed': 0, 'dispatched_serials': [],
+            'packed_serials': [], 'not_packed_serials': [], 'pallet_groups': {}}
+
+
+def status_counts(pdi_dispatch_data, dispatch_matches, packed_matches, extra_dispatched, extra_packed):
+    return {
+        'dispatched': sum(d['dispatched'] for d in pdi_dispatch_data.values()),
+        'packed': sum(d['packed'] for d in pdi_dispatch_data.values()),
+        'not_packed': sum(d['not_packed'] for d in pdi_dispatch_data.values()),
+        'dispatch_matches': dispatch_matches,
+        'packed_matches': packed_matches,
+        'extra_dispatched': len(extra_dispatched),
+        'extra_packed': len(extra_packed)
+    }
+
+
+# ---- previous implementations (inline in the routes) ----
+
+def status_legacy(local, dispatched_details, packed_lookup):
+    pdi_serials_map = {}
+    for serial, pdi, _ in local:
+        pdi_serials_map.setdefault(pdi, []).append(serial)
+    dispatched_serials_set = set(dispatched_details)
+    pdi_dispatch_data = {}
+    for pdi, serials in pdi_serials_map.items():
+        pdi_dispatch_data[pdi] = new_pdi_data()
+        for serial in serials:
+            serial_upper = serial.strip().upper()
+            if serial_upper in dispatched_serials_set:
+                pdi_dispatch_data[pdi]['dispatched'] += 1
+                dispatch_info = dispatched_details.get(serial_upper, {})
+                packing_info = packed_lookup.get(serial_upper, {})
+                pallet_no = dispatch_info.get('pallet_no') or packing_info.get('pallet_no') or ''
+                pdi_dispatch_data[pdi]['dispatched_serials'].append({
+                    'serial': serial, 'pallet_no': pallet_no,
+                    'dispatch_party': dispatch_info.get('dispatch_party', ''),
+                    'vehicle_no': dispatch_info.get('vehicle_no', ''), 'date': dispatch_info.get('date', ''),
+                    'sub_party': packing_info.get('party_name', ''), 'status': 'Dispatched'
+                })
+                add_to_pallet(pdi_dispatch_data[pdi]['pallet_groups'], pallet_no, 'Dispatched', serial)
+            elif serial_upper in packed_lookup:
+                pdi_dispatch_data[pdi]['packed'] += 1
+                packing_info = packed_lookup[serial_upper]
+                pdi_dispatch_data[pdi]['packed_serials'].append({
+                    'serial': serial, 'pallet_no': packing_info.get('pallet_no', ''),
+                    'party_name': packing_info.get('party_name', ''),
+                    'sub_party': packing_info.get('party_name', ''), 'status': 'Packed'
+                })
+                add_to_pallet(pdi_dispatch_data[pdi]['pallet_groups'], packing_info.get('pallet_no'), 'Packed', serial)
+            else:
+                pdi_dispatch_data[pdi]['not_packed'] += 1
+                pdi_dispatch_data[pdi]['not_packed_serials'].append(
+                    {'serial': serial, 'pallet_no': '', 'status': 'Not Packed'})
+    all_local_serials = []
+    for pdi, serials in pdi_serials_map.items():
+        all_local_serials.extend([s.strip().upper() for s in serials])
+    local_set = set(all_local_serials)
+    dispatch_matches = len(local_set.intersection(dispatched_serials_set))
+    packed_matches = len(local_set.intersection(set(packed_lookup.keys())))
+    extra_dispatched = sorted(dispatched_serials_set - local_set)
+    extra_packed = sorted(set(packed_lookup.keys()) - local_set - dispatched_serials_set)
+    return status_counts(pdi_dispatch_data, dispatch_matches, packed_matches, extra_dispatched, extra_packed)
+
+
+def missing_legacy(local, dispatched, packed):
+    mrp = list(packed.values())
+    # check_missing_in_mrp
+    db_serials = {normalize_serial(serial): pdi for serial, pdi, _ in local}
+    mrp_barcodes = set(normalize_serial(b.get('barcode', '')) for b in mrp)
+    missing = []
+    for serial, pdi in db_serials.items():
+        if serial not in mrp_barcodes:
+            missing.append({'barcode': serial, 'pdi': pdi})
+    # check_extra_in_mrp
+    db_set = set(normalize_serial(serial) for serial, _, _ in local)
+    extra = []
+    for b in mrp:
+        barcode = normalize_serial(b.get('barcode', ''))
+        if barcode and barcode not in db_set:
+            extra.append({'barcode': b.get('barcode', ''), 'pallet': b.get('pallet_no', ''),
+                          'running_order': b.get('running_order', '')})
+    return {'missing': len(missing), 'extra': len(extra)}
+
+
+def binning_legacy(local, dispatched, packed):
+    mrp_binning = {}
+    for b in packed.values():
+        ro = b.get('running_order', '')
+        mrp_binning[normalize_serial(b['barcode'])] = 'I' + ro.split('i-')[1] if 'i-' in ro else None
+    mismatched = []
+    for serial, _, binning in local:
+        other = mrp_binning.get(normalize_serial(serial))
+        if other and binning and other != binning:
+            mismatched.append(serial)
+    return {'mismatch': len(mismatched)}
+
+
+# ---- serial_reconcile ----
+
+def status_reconcile(local, dispatched_details, packed_lookup):
+    mrp_serials = {**packed_lookup, **dispatched_details}
+    pdi_dispatch_data = {pdi: new_pdi_data() for pdi in dict.fromkeys(map(itemgetter(1), local))}
+    extra_dispatched, extra_packed = [], []
+    local_pairs = zip(map(str.upper, map(itemgetter(0), local)), local)
+    for kind, key, row, mrp, _ in reconcile(local_pairs, mrp_serials, kinds=ALL_KINDS):
+        if kind is RIGHT_ONLY:
+            (extra_dispatched if mrp['status'] == 'Dispatched' else extra_packed).append(key)
+            continue
+        serial, pdi, _ = row
+        pdi_data = pdi_dispatch_data[pdi]
+        if kind is LEFT_ONLY:
+            pdi_data['not_packed'] += 1
+            pdi_data['not_packed_serials'].append({'serial': serial, 'pallet_no': '', 'status': 'Not Packed'})
+            continue
+        packing_info = packed_lookup.get(key, {})
+        if mrp['status'] == 'Dispatched':
+            dispatch_info = mrp
+            pdi_data['dispatched'] += 1
+            pallet_no = dispatch_info.get('pallet_no') or packing_info.get('pallet_no') or ''
+            pdi_data['dispatched_serials'].append({
+                'serial': serial, 'pallet_no': pallet_no,
+                'dispatch_party': dispatch_info.get('dispatch_party', ''),
+                'vehicle_no': dispatch_info.get('vehicle_no', ''), 'date': dispatch_info.get('date', ''),
+                'sub_party': packing_info.get('party_name', ''), 'status': 'Dispatched'
+            })
+            add_to_pallet(pdi_data['pallet_groups'], pallet_no, 'Dispatched', serial)
+        else:
+            pdi_data['packed'] += 1
+            pdi_data['packed_serials'].append({
+                'serial': serial, 'pallet_no': packing_info.get('pallet_no', ''),
+                'party_name': packing_info.get('party_name', ''),
+                'sub_party': packing_info.get('party_name', ''), 'status': 'Packed'
+            })
+            add_to_pallet(pdi_data['pallet_groups'], packing_info.get('pallet_no'), 'Packed', serial)
+    dispatch_matches = len(dispatched_details) - len(extra_dispatched)
+    packed_matches = len(packed_lookup) - sum(1 for key in extra_dispatched + extra_packed if key in packed_lookup)
+    return status_counts(pdi_dispatch_data, dispatch_matches, packed_matches,
+                         sorted(extra_dispatched), sorted(extra_packed))
+
+
+def missing_reconcile(local, dispatched, packed):
+    mrp = list(packed.values())
+    missing, extra = [], []
+    local_pairs = zip(map(str.upper, map(str.strip, map(itemgetter(0), local))), local)
+    for kind, serial, row, b, _ in reconcile(local_pairs, keyed(mrp, key='barcode')):
+        if kind is LEFT_ONLY:
+            missing.append({'barcode': serial, 'pdi': row[1]})
+        else:
+            extra.append({'barcode': b.get('barcode', ''), 'pallet': b.get('pallet_no', ''),
+                          'running_order': b.get('running_order', '')})
+    return {'missing': len(missing), 'extra': len(extra)}
+
+
+def binning_reconcile(local, dispatched, packed):
+    mrp_binning = {}
+    for serial, b in keyed(packed.values(), key='barcode'):
+        ro = b.get('running_order', '')
+        mrp_binning[serial] = {'binning': 'I' + ro.split('i-')[1] if 'i-' in ro else None}
+    local_pairs = ((serial.strip().upper(), {'binning': binning}) for serial, _, binning in local)
+    mismatched = [serial for _, serial, _, _, _ in reconcile(local_pairs, mrp_binning, fields=('binning',),
+                                                             kinds=(MISMATCH,))]
+    return {'mismatch': len(mismatched)}
+
+
+SCENARIOS = (
+    ('status', status_legacy, status_reconcile),
+    ('missing', missing_legacy, missing_reconcile),
+    ('binning', binning_legacy, binning_reconcile),
+)
+
+
+def timed(fn, *args):
+    best = None
+    for _ in range(RUNS):
+        gc.collect()
+        start = time.perf_counter()
+        result = fn(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return result, best
+
+
+def main(sizes):
+    print(f"{'serials':>8} {'scenario':>9} {'legacy (s)':>11} {'reconcile (s)':>14}  counts (legacy | reconcile)")
+    for serials in sizes:
+        data = make_data(serials)
+        # The generated records live for the whole run; keep the collector from rescanning them
+        gc.freeze()
+        for name, legacy, engine in SCENARIOS:
+            old, old_s = timed(legacy, *data)
+            new, new_s = timed(engine, *data)
+            shared = {key: new[key] for key in old if key in new}
+            print(f"{serials:>8} {name:>9} {old_s:>11.2f} {new_s:>14.2f}  {old} | {shared}")
+        gc.unfreeze()
+
+
+if __name__ == '__main__':
+    main([int(a) for a in sys.argv[1:]] or DEFAULT_SIZES)
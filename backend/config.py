@@ -42,6 +42,29 @@ class Config:
     MAX_CONTENT_LENGTH = int(os.getenv('MAX_CONTENT_LENGTH', 524288000))  # 500MB default
     UPLOAD_FOLDER = os.getenv('UPLOAD_FOLDER', 'uploads')
     GENERATED_PDF_FOLDER = os.getenv('GENERATED_PDF_FOLDER', 'generated_pdfs')
+
+    # Generated-artifact store (repeat report requests are served from here)
+    ARTIFACT_STORE_FOLDER = os.getenv('ARTIFACT_STORE_FOLDER', '')  # default: generated_pdfs/artifacts
+    ARTIFACT_STORE_MAX_MB = int(os.getenv('ARTIFACT_STORE_MAX_MB', 2048))
+    ARTIFACT_STORE_MAX_AGE_DAYS = float(os.getenv('ARTIFACT_STORE_MAX_AGE_DAYS', 14))
+    
+    # Local mirror of the MRP COC APIs (supplier pickers, COC lists, FIFO suggestions)
+    COC_CATALOG_REFRESH_SECONDS = int(os.getenv('COC_CATALOG_REFRESH_SECONDS', 300))  # 0 = always fetch live
+    COC_CATALOG_WINDOW_DAYS = int(os.getenv('COC_CATALOG_WINDOW_DAYS', 180))
+    
+    # Background job queue - worker threads per process and max concurrent jobs per type (all processes)
+    JOB_WORKERS = int(os.getenv('JOB_WORKERS', 2))
+    JOB_RETENTION_DAYS = int(os.getenv('JOB_RETENTION_DAYS', 7))
+    JOB_CONCURRENCY = {
+        'pdi_complete_report': int(os.getenv('JOB_LIMIT_PDI_REPORT', 1)),
+        'consolidated_report': int(os.getenv('JOB_LIMIT_CONSOLIDATED', 1)),
+        'pdi_documentation': int(os.getenv('JOB_LIMIT_PDI_DOCS', 1)),
+        'ipqc_complete': int(os.getenv('JOB_LIMIT_IPQC', 2)),
+        'ftr_merged_report': int(os.getenv('JOB_LIMIT_FTR_MERGED', 1)),
+        'ftr_batch_render': int(os.getenv('JOB_LIMIT_FTR_BATCH', 1)),
+    }
+    # Process pool size for batch FTR PDF rendering (1 = render in the request / job process)
+    FTR_RENDER_WORKERS = int(os.getenv('FTR_RENDER_WORKERS', 1))
     
     # CORS Configuration
     FRONTEND_URL = os.getenv('FRONTEND_URL', 'http://localhost:3000')
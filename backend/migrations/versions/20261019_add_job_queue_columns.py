@@ -0,0 +1,13 @@
+"""
+Alembic migration script to add background job queue columns to job_registry
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.add_column('job_registry', sa.Column('payload', sa.Text, nullable=True))
+    op.add_column('job_registry', sa.Column('attempts', sa.Integer, server_default='0'))
+
+def downgrade():
+    op.drop_column('job_registry', 'attempts')
+    op.drop_column('job_registry', 'payload')
@@ -0,0 +1,32 @@
+"""
+Alembic migration script to add job_registry table
+"""
+from alembic import op
+import sqlalchemy as sa
+
+def upgrade():
+    op.create_table(
+        'job_registry',
+        sa.Column('id', sa.Integer, primary_key=True),
+        sa.Column('job_id', sa.String(36), nullable=False, unique=True),
+        sa.Column('job_type', sa.String(50), nullable=False),
+        sa.Column('ref', sa.String(200), nullable=True),
+        sa.Column('state', sa.String(20), nullable=False, server_default='queued'),
+        sa.Column('percent', sa.Integer, server_default='0'),
+        sa.Column('current', sa.Integer, server_default='0'),
+        sa.Column('total', sa.Integer, server_default='0'),
+        sa.Column('message', sa.String(500), nullable=True),
+        sa.Column('counters', sa.Text, nullable=True),
+        sa.Column('result_location', sa.String(500), nullable=True),
+        sa.Column('error', sa.Text, nullable=True),
+        sa.Column('worker', sa.String(100), nullable=True),
+        sa.Column('created_at', sa.DateTime, server_default=sa.func.now()),
+        sa.Column('started_at', sa.DateTime, nullable=True),
+        sa.Column('updated_at', sa.DateTime, server_default=sa.func.now()),
+        sa.Column('finished_at', sa.DateTime, nullable=True),
+    )
+    op.create_index('idx_job_type_ref', 'job_registry', ['job_type', 'ref'])
+    op.create_index('idx_job_state', 'job_registry', ['state'])
+
+def downgrade():
+    op.drop_table('job_registry')
@@ -1,6 +1,7 @@
 """
 FAST Sync MRP dispatch data - Uses NEW optimized API (party-dispatch-history1.php)
 Uses barcodes_only mode for maximum speed
+Every committed batch is copied into serial_registry (pallet / dispatch facts)
 """
 import requests
 import pymysql
@@ -8,6 +9,7 @@ import sys
 import time
 sys.path.insert(0, '/root/ipqc/backend')
 from config import Config
+from app.services.serial_registry import record_dispatch_cache
 
 # NEW API endpoint
 API_URL = 'https://umanmrp.in/api/party-dispatch-history1.php'
@@ -75,6 +77,7 @@ def sync_fast():
             
             # Insert barcodes
             inserted = 0
+            synced = []
             for barcode in barcodes:
                 barcode = barcode.strip().upper() if barcode else ''
                 if barcode:
@@ -86,15 +89,19 @@ def sync_fast():
                             ON DUPLICATE KEY UPDATE
                             synced_at = NOW()
                         ''', (barcode, '', 'Dispatched', '', '', None, company, party_id))
+                        synced.append(barcode)
                         inserted += 1
                     except Exception as e:
                         pass
                 
                 # Commit every 10000
                 if inserted % 10000 == 0:
+                    record_dispatch_cache(cursor, synced)
+                    synced.clear()
                     conn.commit()
                     print(f"  Inserted {inserted}/{total_barcodes}...")
             
+            record_dispatch_cache(cursor, synced)
             conn.commit()
             company_time = time.time() - company_start
             print(f"{company}: {inserted} barcodes in {company_time:.1f}s")
@@ -152,6 +159,7 @@ def sync_with_details():
         print(f"{'='*50}")
         
         company_count = 0
+        synced = []
         page = 1
         
         while True:
@@ -192,6 +200,7 @@ def sync_with_details():
                                     VALUES (%s, %s, %s, NOW())
                                     ON DUPLICATE KEY UPDATE synced_at = NOW()
                                 ''', (barcode, company, party_id))
+                                synced.append(barcode)
                                 company_count += 1
                             except:
                                 pass
@@ -216,6 +225,7 @@ def sync_with_details():
                                                 VALUES (%s, %s, %s, %s, %s, %s, NOW())
                                                 ON DUPLICATE KEY UPDATE synced_at = NOW()
                                             ''', (s, pallet, vehicle_no, dispatch_date or None, company, party_id))
+                                            synced.append(s)
                                             company_count += 1
                                 elif isinstance(serials, str):
                                     # Space-separated format
@@ -228,11 +238,14 @@ def sync_with_details():
                                                 VALUES (%s, %s, %s, %s, %s, %s, NOW())
                                                 ON DUPLICATE KEY UPDATE synced_at = NOW()
                                             ''', (s, pallet, vehicle_no, dispatch_date or None, company, party_id))
+                                            synced.append(s)
                                             company_count += 1
                 else:
                     print(f"No more data at page {page}")
                     break
                 
+                record_dispatch_cache(cursor, synced)
+                synced.clear()
                 conn.commit()
                 print(f"Page {page}: Total {company_count} barcodes")
                 
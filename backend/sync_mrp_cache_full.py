@@ -1,11 +1,13 @@
 """
 Sync ALL MRP dispatch data to local cache - Uses config for DB credentials
+Every committed batch is copied into serial_registry (pallet / dispatch facts)
 """
 import requests
 import pymysql
 import sys
 sys.path.insert(0, '/root/ipqc/backend')
 from config import Config
+from app.services.serial_registry import record_dispatch_cache
 
 PARTY_IDS = {
     'Rays Power': '931db2c5-b016-4914-b378-69e9f22562a7',
@@ -36,6 +38,7 @@ def sync_all():
         
         company_count = 0
         empty_pages = 0
+        synced = []
         
         for page in range(1, 1001):
             try:
@@ -86,6 +89,7 @@ def sync_all():
                                                 status = VALUES(status),
                                                 synced_at = NOW()
                                             ''', (s, pallet, status, dispatch_party, vehicle_no, dispatch_date if dispatch_date else None, company, party_id))
+                                            synced.append(s)
                                             page_count += 1
                                         except Exception as e:
                                             pass
@@ -93,6 +97,8 @@ def sync_all():
                 company_count += page_count
                 
                 if page % 20 == 0:
+                    record_dispatch_cache(cursor, synced)
+                    synced.clear()
                     conn.commit()
                     print(f"Page {page}: +{page_count} serials (Total: {company_count})")
                     
@@ -100,6 +106,7 @@ def sync_all():
                 print(f"Error on page {page}: {e}")
                 continue
         
+        record_dispatch_cache(cursor, synced)
         conn.commit()
         total_inserted += company_count
         print(f"\n{company}: {company_count} serials synced")
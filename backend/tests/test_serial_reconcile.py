@@ -0,0 +1,61 @@
+"""
+serial_reconcile - field comparison (mismatch) path
+
+    cd backend && python -m pytest tests
+"""
+from app.services.serial_reconcile import (
+    reconcile, keyed, LEFT_ONLY, RIGHT_ONLY, MISMATCH, MATCH, ALL_KINDS
+)
+
+
+def test_mismatch_names_the_differing_fields():
+    left = [('S1', {'binning': 'I1', 'pallet_no': '7'}), ('S2', {'binning': 'I2', 'pallet_no': '8'})]
+    right = {'S1': {'binning': 'I3', 'pallet_no': '7'}, 'S2': {'binning': 'I2', 'pallet_no': '9'}}
+
+    rows = list(reconcile(left, right, fields=('binning', 'pallet_no'), kinds=ALL_KINDS))
+
+    assert rows == [
+        (MISMATCH, 'S1', left[0][1], right['S1'], ('binning',)),
+        (MISMATCH, 'S2', left[1][1], right['S2'], ('pallet_no',)),
+    ]
+
+
+def test_unknown_values_are_not_mismatches():
+    left = [('S1', {'binning': None}), ('S2', {'binning': ''}), ('S3', {})]
+    right = {'S1': {'binning': 'I1'}, 'S2': {'binning': 'I2'}, 'S3': {'binning': 'I3'}}
+
+    kinds = [kind for kind, *_ in reconcile(left, right, fields=('binning',), kinds=ALL_KINDS)]
+
+    assert kinds == [MATCH, MATCH, MATCH]
+
+
+def test_mismatch_rows_are_not_matches():
+    left = [('S1', {'binning': 'I1'}), ('S2', {'binning': 'I2'}), ('S3', {'binning': 'I1'})]
+    right = {'S1': {'binning': 'I1'}, 'S2': {'binning': 'I1'}, 'S4': {'binning': 'I1'}}
+
+    only_mismatch = [serial for _, serial, *_ in reconcile(left, right, fields=('binning',), kinds=(MISMATCH,))]
+    only_match = [serial for _, serial, *_ in reconcile(left, right, fields=('binning',), kinds=(MATCH,))]
+    differences = [(kind, serial) for kind, serial, *_ in reconcile(left, right, fields=('binning',))]
+
+    assert only_mismatch == ['S2']
+    assert only_match == ['S1']
+    assert differences == [(MISMATCH, 'S2'), (LEFT_ONLY, 'S3'), (RIGHT_ONLY, 'S4')]
+
+
+def test_without_fields_every_pair_matches():
+    left = [('S1', {'binning': 'I1'})]
+    right = {'S1': {'binning': 'I2'}}
+
+    assert [kind for kind, *_ in reconcile(left, right, kinds=ALL_KINDS)] == [MATCH]
+
+
+def test_binning_check_on_keyed_rows():
+    # check_binning_mismatch shape: MRP barcodes (any case) against DB rows keyed by serial
+    mrp = [{'barcode': ' gs001 ', 'binning': 'I2', 'pallet_no': '5'}, {'barcode': 'GS002', 'binning': 'I1'}]
+    db_rows = [{'serial_number': 'GS001', 'binning': 'I1'}, {'serial_number': 'GS002', 'binning': 'I1'}]
+
+    mismatches = [(serial, mrp_row['pallet_no'], db_row['binning'])
+                  for _, serial, mrp_row, db_row, _ in reconcile(keyed(mrp, key='barcode'), dict(keyed(db_rows)),
+                                                                 fields=('binning',), kinds=(MISMATCH,))]
+
+    assert mismatches == [('GS001', '5', 'I1')]
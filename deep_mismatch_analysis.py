@@ -1,9 +1,14 @@
 """
 Deep analysis: Find the root cause of 500-600 serial mismatch
 """
+import os
+import sys
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'backend'))
+
 import requests
 from datetime import datetime, timedelta
 import time
+from app.services.serial_reconcile import reconcile, dispatch_serials, LEFT_ONLY, RIGHT_ONLY, MATCH, ALL_KINDS
 
 to_d = datetime.now().strftime('%Y-%m-%d')
 from_d = (datetime.now() - timedelta(days=730)).strftime('%Y-%m-%d')
@@ -21,15 +26,8 @@ r1 = requests.post('https://umanmrp.in/api/party-dispatch-history.php', json={
     'page': 1, 'limit': 10000
 }, timeout=180)
 d1 = r1.json()
-old_serials = set()
 ds = d1.get('dispatch_summary', [])
-for item in ds:
-    pn = item.get('pallet_nos', {})
-    if isinstance(pn, dict):
-        for k, v in pn.items():
-            if isinstance(v, str):
-                for s in v.strip().split():
-                    old_serials.add(s.strip().upper())
+old_serials = {serial: {'pallet_no': pallet_no} for serial, _, pallet_no in dispatch_serials(ds)}
 print(f"   Entries: {len(ds)}, Serials: {len(old_serials)}, Time: {time.time()-t1:.1f}s")
 
 # 2. Get NEW API data (barcodes_only, historical)
@@ -40,31 +38,37 @@ r2 = requests.post('https://umanmrp.in/api/party-dispatch-history1.php', json={
     'barcodes_only': True
 }, timeout=300)
 d2 = r2.json()
-new_serials = set()
-for entry in d2.get('barcodes', []):
-    if entry and isinstance(entry, str):
-        for s in entry.strip().split():
-            new_serials.add(s.strip().upper())
+
+
+def barcode_serials(entries):
+    """(serial, {}) for the space-separated barcode strings of the barcodes_only API"""
+    for entry in entries:
+        if entry and isinstance(entry, str):
+            for s in entry.split():
+                yield s.upper(), {}
+
+
+new_serials = dict(barcode_serials(d2.get('barcodes', [])))
 print(f"   Entries: {len(d2.get('barcodes', []))}, Serials: {len(new_serials)}, Time: {time.time()-t2:.1f}s")
 
-# 3. Compare
-combined = old_serials | new_serials
-only_old = old_serials - new_serials
-only_new = new_serials - old_serials
-both = old_serials & new_serials
+# 3. Compare - one pass over both serial sets
+only_old, only_new, both = [], [], []
+for kind, serial, _, _, _ in reconcile(old_serials.items(), new_serials, kinds=ALL_KINDS):
+    {LEFT_ONLY: only_old, RIGHT_ONLY: only_new, MATCH: both}[kind].append(serial)
+combined_count = len(only_old) + len(only_new) + len(both)
 
 print(f"\n{'='*60}")
 print(f"COMPARISON:")
 print(f"  OLD API only:     {len(only_old)} serials")
 print(f"  NEW API only:     {len(only_new)} serials")
 print(f"  In BOTH:          {len(both)} serials")
-print(f"  Combined total:   {len(combined)} serials")
+print(f"  Combined total:   {combined_count} serials")
 print(f"{'='*60}")
 
 if only_old:
-    print(f"\n  Sample OLD-only: {list(only_old)[:5]}")
+    print(f"\n  Sample OLD-only: {only_old[:5]}")
 if only_new:
-    print(f"  Sample NEW-only: {list(only_new)[:5]}")
+    print(f"  Sample NEW-only: {only_new[:5]}")
 
 # 4. Call AGAIN to check if counts change (stability test)
 print(f"\n3. STABILITY TEST - calling APIs again...")
@@ -75,39 +79,30 @@ r3 = requests.post('https://umanmrp.in/api/party-dispatch-history1.php', json={
     'barcodes_only': True
 }, timeout=300)
 d3 = r3.json()
-new_serials_2 = set()
-for entry in d3.get('barcodes', []):
-    if entry and isinstance(entry, str):
-        for s in entry.strip().split():
-            new_serials_2.add(s.strip().upper())
+new_serials_2 = dict(barcode_serials(d3.get('barcodes', [])))
 
-diff = new_serials.symmetric_difference(new_serials_2)
+diff = [serial for _, serial, _, _, _ in reconcile(new_serials.items(), new_serials_2)]
 print(f"   NEW API call 1: {len(new_serials)} serials")
 print(f"   NEW API call 2: {len(new_serials_2)} serials")
 print(f"   Difference between calls: {len(diff)} serials")
 if diff:
-    print(f"   Changed serials: {list(diff)[:10]}")
+    print(f"   Changed serials: {diff[:10]}")
 
 r4 = requests.post('https://umanmrp.in/api/party-dispatch-history.php', json={
     'party_id': party_id, 'from_date': from_d, 'to_date': to_d,
     'page': 1, 'limit': 10000
 }, timeout=180)
 d4 = r4.json()
-old_serials_2 = set()
-for item in d4.get('dispatch_summary', []):
-    pn = item.get('pallet_nos', {})
-    if isinstance(pn, dict):
-        for k, v in pn.items():
-            if isinstance(v, str):
-                for s in v.strip().split():
-                    old_serials_2.add(s.strip().upper())
-
-diff_old = old_serials.symmetric_difference(old_serials_2)
+old_serials_2 = {serial: {'pallet_no': pallet_no}
+                 for serial, _, pallet_no in dispatch_serials(d4.get('dispatch_summary', []))}
+
+# Same serials on a different pallet count as changed too
+diff_old = [serial for _, serial, _, _, _ in reconcile(old_serials.items(), old_serials_2, fields=('pallet_no',))]
 print(f"\n   OLD API call 1: {len(old_serials)} serials")
 print(f"   OLD API call 2: {len(old_serials_2)} serials")
 print(f"   Difference between calls: {len(diff_old)} serials")
 if diff_old:
-    print(f"   Changed serials: {list(diff_old)[:10]}")
+    print(f"   Changed serials: {diff_old[:10]}")
 
 # 5. Check for pagination issues with OLD API
 print(f"\n4. PAGINATION CHECK - OLD API...")
@@ -119,13 +114,7 @@ for page in range(1, 4):
     }, timeout=180)
     d = r.json()
     ds_page = d.get('dispatch_summary', [])
-    page_serial_count = 0
-    for item in ds_page:
-        pn = item.get('pallet_nos', {})
-        if isinstance(pn, dict):
-            for k, v in pn.items():
-                if isinstance(v, str):
-                    page_serial_count += len(v.strip().split())
+    page_serial_count = sum(1 for _ in dispatch_serials(ds_page))
     page_counts.append((page, len(ds_page), page_serial_count))
     print(f"   Page {page}: {len(ds_page)} entries, {page_serial_count} serials")
     if len(ds_page) == 0:
@@ -136,5 +125,5 @@ print(f"CONCLUSION:")
 total_old_all_pages = sum(c[2] for c in page_counts)
 print(f"  OLD API total (all pages): {total_old_all_pages}")
 print(f"  NEW API total: {len(new_serials)}")
-print(f"  Combined (no duplicates): {len(combined)}")
+print(f"  Combined (no duplicates): {combined_count}")
 print(f"{'='*60}")
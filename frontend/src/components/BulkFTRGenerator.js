@@ -249,24 +249,20 @@ const BulkFTRGenerator = () => {
       // Construct proper API endpoint (avoid double /api)
       const endpoint = API_BASE_URL.endsWith('/api') ? `${API_BASE_URL}/ftr/upload-bulk` : `${API_BASE_URL}/api/ftr/upload-bulk`;
       
-      // Convert blobs to base64
-      const reports = await Promise.all(pdfDataArray.map(async (item) => {
-        const base64 = await new Promise((resolve) => {
-          const reader = new FileReader();
-          reader.onloadend = () => resolve(reader.result);
-          reader.readAsDataURL(item.blob);
-        });
-        
-        return {
-          pdfData: base64,
-          serialNumber: item.serialNumber,
-          moduleType: item.moduleType,
-          pmax: item.pmax
-        };
-      }));
+      // Multipart upload - the server writes each PDF to disk as it arrives
+      // (metadata goes first so it is known before the files)
+      const formData = new FormData();
+      formData.append('meta', JSON.stringify(pdfDataArray.map((item) => ({
+        serialNumber: item.serialNumber,
+        moduleType: item.moduleType,
+        pmax: item.pmax
+      }))));
+      pdfDataArray.forEach((item) => {
+        formData.append('files', item.blob, `${item.serialNumber}.pdf`);
+      });
       
-      const response = await axios.post(endpoint, {
-        reports: reports
+      const response = await axios.post(endpoint, formData, {
+        headers: { 'Content-Type': 'multipart/form-data' }
       });
       
       return response.data;
@@ -211,7 +211,7 @@ function COCDashboard() {
       });
       
       if (response.data.success) {
-        setMessage(`✅ Synced: ${response.data.synced} new, ${response.data.updated} updated (${fromDate} to ${toDate})`);
+        setMessage(`✅ Synced: ${response.data.synced} new, ${response.data.updated} updated, ${response.data.unchanged ?? 0} unchanged (${fromDate} to ${toDate})`);
         loadCOCData();
         loadStockData();
         loadCompanies();
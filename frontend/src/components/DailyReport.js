@@ -1428,13 +1428,10 @@ function DailyReport() {
 
       setShowMaterialCocModal(false);
 
-      // Refresh company data
+      // Refresh company data (the list only has summaries - reload the selected company in full)
       const refreshedCompanies = await companyService.getAllCompanies();
       setCompanies(refreshedCompanies);
-      const updatedCompany = refreshedCompanies.find(c => c.id === selectedCompany.id);
-      if (updatedCompany) {
-        setSelectedCompany(updatedCompany);
-      }
+      await refreshSelectedCompany();
     } catch (error) {
       console.error('Error assigning COC to material:', error);
       alert('❌ Failed to assign COC to material');
@@ -2659,11 +2656,11 @@ function DailyReport() {
               )}
               <div className="info-row">
                 <span className="info-label">📊 Production Records</span>
-                <span className="info-value highlight-blue">{company.productionRecords?.length || 0}</span>
+                <span className="info-value highlight-blue">{company.productionRecordCount ?? company.productionRecords?.length ?? 0}</span>
               </div>
               <div className="info-row">
                 <span className="info-label">🚫 Rejections</span>
-                <span className="info-value highlight-red">{company.rejectedModules?.length || 0}</span>
+                <span className="info-value highlight-red">{company.rejectedModuleCount ?? company.rejectedModules?.length ?? 0}</span>
               </div>
             </div>
             <div className="card-actions">
@@ -3499,10 +3496,7 @@ function DailyReport() {
                         }
 
                         await loadCompanies();
-                        if (selectedCompany) {
-                          const updatedCompany = companies.find(c => c.id === selectedCompany.id);
-                          if (updatedCompany) setSelectedCompany(updatedCompany);
-                        }
+                        await refreshSelectedCompany();
 
                         setLoading(false);
                         alert(`✅ Bulk Update Complete!\n\nSuccess: ${successCount}\nFailed: ${failCount}`);
@@ -6,6 +6,7 @@ import '../styles/FTRManagement.css';
 const FTRManagement = () => {
   const [companies, setCompanies] = useState([]);
   const [selectedCompany, setSelectedCompany] = useState(null);
+  const [companyPdis, setCompanyPdis] = useState([]);
   const [ftrData, setFtrData] = useState(null);
   const [loading, setLoading] = useState(false);
   
@@ -94,6 +95,7 @@ const FTRManagement = () => {
       const response = await axios.get(`${API_BASE_URL}/api/ftr/company/${companyId}`);
       setFtrData(response.data);
       setSelectedCompany(companies.find(c => c.id === companyId));
+      loadCompanyPdis(companyId);
     } catch (error) {
       console.error('Failed to load FTR data:', error);
       setFtrData(null);
@@ -102,6 +104,26 @@ const FTRManagement = () => {
     }
   };
 
+  // The company list only carries summaries, page through the production records for the PDI dropdown
+  const loadCompanyPdis = async (companyId) => {
+    try {
+      const API_BASE_URL = getAPIBaseURL();
+      const pdis = new Set();
+      let cursor = null;
+      do {
+        const response = await axios.get(`${API_BASE_URL}/api/companies/${companyId}/production-records`, {
+          params: { limit: 1000, cursor: cursor || undefined }
+        });
+        (response.data.data || []).forEach(r => r.pdi && pdis.add(r.pdi));
+        cursor = response.data.nextCursor;
+      } while (cursor);
+      setCompanyPdis([...pdis]);
+    } catch (error) {
+      console.error('Failed to load production records:', error);
+      setCompanyPdis([]);
+    }
+  };
+
   const handleMasterFTRFileSelect = (e) => {
     const file = e.target.files[0];
     if (file) {
@@ -809,9 +831,9 @@ const FTRManagement = () => {
         <div className="company-grid">
           {companies.map(company => {
             // Get unique PDI count
-            const uniquePDIs = company.productionRecords 
+            const uniquePDIs = company.pdiCount ?? (company.productionRecords 
               ? [...new Set(company.productionRecords.map(r => r.pdi))].filter(Boolean).length 
-              : 0;
+              : 0);
             
             return (
               <div 
@@ -1307,11 +1329,9 @@ const FTRManagement = () => {
                 }}
               >
                 <option value="">-- Select PDI Number --</option>
-                {selectedCompany && selectedCompany.productionRecords && 
-                  [...new Set(selectedCompany.productionRecords.map(r => r.pdi))].filter(Boolean).map(pdi => (
-                    <option key={pdi} value={pdi}>{pdi}</option>
-                  ))
-                }
+                {companyPdis.map(pdi => (
+                  <option key={pdi} value={pdi}>{pdi}</option>
+                ))}
               </select>
             </div>
 
@@ -64,8 +64,8 @@ export const pdiBatchAPI = {
   // Close PDI batch
   close: (batchId) => api.post(`/pdi-batches/${batchId}/close`),
 
-  // Get serial numbers
-  getSerials: (batchId) => api.get(`/pdi-batches/${batchId}/serials`),
+  // Get serial numbers (one page; pass { cursor, limit, status })
+  getSerials: (batchId, params = {}) => api.get(`/pdi-batches/${batchId}/serials`, { params }),
 };
 
 // ============================================================================
@@ -107,6 +107,14 @@ export const cocAPI = {
 export const serialAPI = {
   // Update serial status
   update: (serialId, statusData) => api.put(`/serials/${serialId}`, statusData),
+
+  // Update serial status by serial number (works for generated serials without a row yet)
+  updateByNumber: (serialNumber, statusData) =>
+    api.put(`/serials/number/${encodeURIComponent(serialNumber)}`, statusData),
+
+  // Move a serial to another PDI batch
+  reassign: (serialNumber, batchId) =>
+    api.post(`/serials/number/${encodeURIComponent(serialNumber)}/reassign`, { batchId }),
 };
 
 export default api;